@@ -7,6 +7,7 @@ Análisis individual de BTC, ETH, XRP y SOL con contexto de mercado completo
 import os
 import json
 import time
+import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 from dotenv import load_dotenv
@@ -36,6 +37,13 @@ except ImportError:
     REQUESTS_AVAILABLE = False
     print("⚠️ requests no disponible")
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    print("⚠️ aiohttp no disponible")
+
 # Configuración de APIs mediante variables de entorno (Railway)
 CRYPTOPANIC_API_KEY = os.getenv("CRYPTOPANIC_API_KEY")
 CRYPTOPANIC_AVAILABLE = bool(CRYPTOPANIC_API_KEY)
@@ -56,6 +64,22 @@ else:
     print("   Obtener API key gratuita: https://www.coingecko.com/en/api")
 
 # CoinGecko API (usamos requests directamente, no necesitamos pycoingecko)
+COINGECKO_BASE_URL = "https://api.coingecko.com/api/v3"
+CRYPTOPANIC_BASE_URL = "https://cryptopanic.com/api/v3"
+
+# Timeout por fuente en la recolección async (una fuente lenta no tumba la valoración)
+FEED_TIMEOUT = 5
+
+# Cache TTL de las fuentes, compartida por todas las instancias y símbolos
+_feed_flight = None
+
+
+def _get_feed_flight():
+    global _feed_flight
+    if _feed_flight is None:
+        from nexus_system.uplink.single_flight import SingleFlight
+        _feed_flight = SingleFlight(max_entries=256)
+    return _feed_flight
 
 
 class AICryptoValuation:
@@ -74,6 +98,7 @@ class AICryptoValuation:
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.xai_api_key = os.getenv("XAI_API_KEY")
         self.xai_base_url = "https://api.x.ai/v1"
+        self._session = None  # aiohttp, para la recolección async
 
         # Modelo principal configurado: GPT-4o Mini (mejor balance calidad/costo)
         self.primary_model = {
@@ -197,51 +222,54 @@ class AICryptoValuation:
             if response.status_code != 200:
                 return {"error": f"Error HTTP {response.status_code}", "success": False}
 
-            coin_data = response.json()
-
-            # Nota: Algunos campos no están disponibles en el plan gratuito
-            # Usamos valores por defecto o datos disponibles
-            metrics = {
-                # Scores (no disponibles en plan gratuito)
-                "community_score": coin_data.get("community_score", 0),
-                "developer_score": coin_data.get("developer_score", 0),
-                "liquidity_score": coin_data.get("liquidity_score", 0),
-                "public_interest_score": coin_data.get("public_interest_score", 0),
-
-                # Métricas sociales (parcialmente disponibles)
-                "twitter_followers": coin_data.get("community_data", {}).get("twitter_followers", 0),
-                "reddit_subscribers": coin_data.get("community_data", {}).get("reddit_subscribers", 0),
-                "telegram_channel_user_count": coin_data.get("community_data", {}).get("telegram_channel_user_count", 0),
-
-                # Métricas de desarrollo (limitadas en plan gratuito)
-                "github_repos": len(coin_data.get("developer_data", {}).get("repos", [])),
-                "github_stars": sum(repo.get("stargazers_count", 0) for repo in coin_data.get("developer_data", {}).get("repos", [])),
-                "github_forks": sum(repo.get("forks_count", 0) for repo in coin_data.get("developer_data", {}).get("repos", [])),
-                "github_contributors": coin_data.get("developer_data", {}).get("pull_request_contributors", 0),
-                "github_commits_last_4_weeks": coin_data.get("developer_data", {}).get("commit_count_4_weeks", 0),
-
-                # Métricas de mercado (disponibles)
-                "total_supply": coin_data.get("market_data", {}).get("total_supply"),
-                "circulating_supply": coin_data.get("market_data", {}).get("circulating_supply"),
-                "max_supply": coin_data.get("market_data", {}).get("max_supply"),
-                "fully_diluted_valuation": coin_data.get("market_data", {}).get("fully_diluted_valuation"),
-
-                # Rankings (disponibles)
-                "market_cap_rank": coin_data.get("market_cap_rank"),
-                "coingecko_rank": coin_data.get("coingecko_rank"),
-
-                # Categorías y plataformas
-                "categories": coin_data.get("categories", []),
-                "platforms": coin_data.get("platforms", {}),
-
-                "success": True
-            }
-
-            return metrics
+            return self._parse_coingecko_metrics(response.json())
 
         except Exception as e:
             return {"error": f"Error obteniendo métricas CoinGecko: {str(e)}", "success": False}
 
+    @staticmethod
+    def _parse_coingecko_metrics(coin_data: Dict) -> Dict[str, Any]:
+        """Métricas de una respuesta /coins/{id} de CoinGecko."""
+        # Nota: Algunos campos no están disponibles en el plan gratuito
+        # Usamos valores por defecto o datos disponibles
+        metrics = {
+            # Scores (no disponibles en plan gratuito)
+            "community_score": coin_data.get("community_score", 0),
+            "developer_score": coin_data.get("developer_score", 0),
+            "liquidity_score": coin_data.get("liquidity_score", 0),
+            "public_interest_score": coin_data.get("public_interest_score", 0),
+
+            # Métricas sociales (parcialmente disponibles)
+            "twitter_followers": coin_data.get("community_data", {}).get("twitter_followers", 0),
+            "reddit_subscribers": coin_data.get("community_data", {}).get("reddit_subscribers", 0),
+            "telegram_channel_user_count": coin_data.get("community_data", {}).get("telegram_channel_user_count", 0),
+
+            # Métricas de desarrollo (limitadas en plan gratuito)
+            "github_repos": len(coin_data.get("developer_data", {}).get("repos", [])),
+            "github_stars": sum(repo.get("stargazers_count", 0) for repo in coin_data.get("developer_data", {}).get("repos", [])),
+            "github_forks": sum(repo.get("forks_count", 0) for repo in coin_data.get("developer_data", {}).get("repos", [])),
+            "github_contributors": coin_data.get("developer_data", {}).get("pull_request_contributors", 0),
+            "github_commits_last_4_weeks": coin_data.get("developer_data", {}).get("commit_count_4_weeks", 0),
+
+            # Métricas de mercado (disponibles)
+            "total_supply": coin_data.get("market_data", {}).get("total_supply"),
+            "circulating_supply": coin_data.get("market_data", {}).get("circulating_supply"),
+            "max_supply": coin_data.get("market_data", {}).get("max_supply"),
+            "fully_diluted_valuation": coin_data.get("market_data", {}).get("fully_diluted_valuation"),
+
+            # Rankings (disponibles)
+            "market_cap_rank": coin_data.get("market_cap_rank"),
+            "coingecko_rank": coin_data.get("coingecko_rank"),
+
+            # Categorías y plataformas
+            "categories": coin_data.get("categories", []),
+            "platforms": coin_data.get("platforms", {}),
+
+            "success": True
+        }
+
+        return metrics
+
     def get_fear_greed_index(self) -> Dict[str, Any]:
         """Obtener Fear & Greed Index de CoinGecko."""
         if not self.coingecko_available:
@@ -258,19 +286,23 @@ class AICryptoValuation:
             if response.status_code != 200:
                 return {"error": f"Error HTTP {response.status_code}", "success": False}
 
-            data = response.json()
-            fgi_data = data.get("data", {})
-
-            return {
-                "value": fgi_data.get("fear_greed_index", {}).get("value"),
-                "value_text": fgi_data.get("fear_greed_index", {}).get("value_text"),
-                "timestamp": fgi_data.get("fear_greed_index", {}).get("timestamp"),
-                "success": True
-            }
+            return self._parse_fear_greed(response.json())
 
         except Exception as e:
             return {"error": f"Error obteniendo Fear & Greed Index: {str(e)}", "success": False}
 
+    @staticmethod
+    def _parse_fear_greed(data: Dict) -> Dict[str, Any]:
+        """Fear & Greed Index de una respuesta /global de CoinGecko."""
+        fgi_data = data.get("data", {})
+
+        return {
+            "value": fgi_data.get("fear_greed_index", {}).get("value"),
+            "value_text": fgi_data.get("fear_greed_index", {}).get("value_text"),
+            "timestamp": fgi_data.get("fear_greed_index", {}).get("timestamp"),
+            "success": True
+        }
+
     def get_global_crypto_data(self) -> Dict[str, Any]:
         """Obtener métricas globales del mercado crypto."""
         if not self.coingecko_available:
@@ -287,25 +319,28 @@ class AICryptoValuation:
             if response.status_code != 200:
                 return {"error": f"Error HTTP {response.status_code}", "success": False}
 
-            data = response.json()
-
-            return {
-                "active_cryptocurrencies": data.get("data", {}).get("active_cryptocurrencies"),
-                "upcoming_icos": data.get("data", {}).get("upcoming_icos"),
-                "ongoing_icos": data.get("data", {}).get("ongoing_icos"),
-                "ended_icos": data.get("data", {}).get("ended_icos"),
-                "markets": data.get("data", {}).get("markets"),
-                "total_market_cap": data.get("data", {}).get("total_market_cap", {}),
-                "total_volume": data.get("data", {}).get("total_volume", {}),
-                "market_cap_percentage": data.get("data", {}).get("market_cap_percentage", {}),
-                "market_cap_change_percentage_24h_usd": data.get("data", {}).get("market_cap_change_percentage_24h_usd"),
-                "updated_at": data.get("data", {}).get("updated_at"),
-                "success": True
-            }
+            return self._parse_global_crypto(response.json())
 
         except Exception as e:
             return {"error": f"Error obteniendo datos globales: {str(e)}", "success": False}
 
+    @staticmethod
+    def _parse_global_crypto(data: Dict) -> Dict[str, Any]:
+        """Métricas globales de una respuesta /global de CoinGecko."""
+        return {
+            "active_cryptocurrencies": data.get("data", {}).get("active_cryptocurrencies"),
+            "upcoming_icos": data.get("data", {}).get("upcoming_icos"),
+            "ongoing_icos": data.get("data", {}).get("ongoing_icos"),
+            "ended_icos": data.get("data", {}).get("ended_icos"),
+            "markets": data.get("data", {}).get("markets"),
+            "total_market_cap": data.get("data", {}).get("total_market_cap", {}),
+            "total_volume": data.get("data", {}).get("total_volume", {}),
+            "market_cap_percentage": data.get("data", {}).get("market_cap_percentage", {}),
+            "market_cap_change_percentage_24h_usd": data.get("data", {}).get("market_cap_change_percentage_24h_usd"),
+            "updated_at": data.get("data", {}).get("updated_at"),
+            "success": True
+        }
+
     def get_trending_coins(self) -> Dict[str, Any]:
         """Obtener criptomonedas en tendencia."""
         if not self.coingecko_available:
@@ -322,28 +357,31 @@ class AICryptoValuation:
             if response.status_code != 200:
                 return {"error": f"Error HTTP {response.status_code}", "success": False}
 
-            trending = response.json()
-
-            coins = []
-            for coin in trending.get("coins", []):
-                item = coin.get("item", {})
-                coins.append({
-                    "id": item.get("id"),
-                    "name": item.get("name"),
-                    "symbol": item.get("symbol"),
-                    "market_cap_rank": item.get("market_cap_rank"),
-                    "thumb": item.get("thumb"),
-                    "price_btc": item.get("price_btc")
-                })
-
-            return {
-                "trending_coins": coins,
-                "success": True
-            }
+            return self._parse_trending(response.json())
 
         except Exception as e:
             return {"error": f"Error obteniendo trending coins: {str(e)}", "success": False}
 
+    @staticmethod
+    def _parse_trending(trending: Dict) -> Dict[str, Any]:
+        """Monedas en tendencia de una respuesta /search/trending de CoinGecko."""
+        coins = []
+        for coin in trending.get("coins", []):
+            item = coin.get("item", {})
+            coins.append({
+                "id": item.get("id"),
+                "name": item.get("name"),
+                "symbol": item.get("symbol"),
+                "market_cap_rank": item.get("market_cap_rank"),
+                "thumb": item.get("thumb"),
+                "price_btc": item.get("price_btc")
+            })
+
+        return {
+            "trending_coins": coins,
+            "success": True
+        }
+
     def run_optimized_valuation(self) -> Dict[str, Any]:
         """Ejecutar valoración optimizada usando GPT-4o Mini como modelo principal."""
 
@@ -493,6 +531,18 @@ class AICryptoValuation:
             print(f"      ❌ Error con modelo principal: {str(e)}")
             return {"error": f"Error con modelo principal: {str(e)}", "success": False}
 
+    async def get_primary_valuation_async(self, crypto: Dict, payload: Dict) -> Dict[str, Any]:
+        """Versión async de get_primary_valuation (sin hilos: LLM gateway compartido)."""
+        result = await self.get_openai_valuation_with_model_async(crypto, payload, self.primary_model['id'])
+        if "error" in result:
+            return {"error": f"Modelo principal falló: {result['error']}", "success": False}
+        return {
+            "primary_model": self.primary_model['name'],
+            "valuation": result,
+            "cost_estimate": 0.002,
+            "success": True
+        }
+
     def get_cryptopanic_news(self, limit: int = 10) -> Dict[str, Any]:
         """Obtener noticias de CryptoPanic con análisis de sentimiento."""
         if not CRYPTOPANIC_AVAILABLE:
@@ -514,60 +564,63 @@ class AICryptoValuation:
             if response.status_code != 200:
                 return {"error": f"Error HTTP {response.status_code}", "success": False}
 
-            data = response.json()
-
-            # Procesar noticias
-            processed_news = []
-            sentiment_counts = {"bullish": 0, "bearish": 0, "neutral": 0}
-
-            for post in data.get("results", []):
-                sentiment = "neutral"
-                if post.get("votes", {}).get("ludicrous", 0) > post.get("votes", {}).get("toxic", 0):
-                    sentiment = "bullish"
-                elif post.get("votes", {}).get("toxic", 0) > post.get("votes", {}).get("ludicrous", 0):
-                    sentiment = "bearish"
-
-                sentiment_counts[sentiment] += 1
-
-                news_item = {
-                    "title": post.get("title", ""),
-                    "url": post.get("url", ""),
-                    "source": post.get("domain", ""),
-                    "published_at": post.get("published_at", ""),
-                    "sentiment": sentiment,
-                    "importance": "high" if post.get("is_hot", False) else "medium",
-                    "tags": [tag.get("name", "") for tag in post.get("tags", [])],
-                    "currencies": [curr.get("code", "") for curr in post.get("currencies", [])]
-                }
-                processed_news.append(news_item)
-
-            # Calcular métricas de sentimiento
-            total_news = len(processed_news)
-            sentiment_metrics = {}
-            for sentiment, count in sentiment_counts.items():
-                sentiment_metrics[sentiment] = {
-                    "count": count,
-                    "percentage": (count / total_news * 100) if total_news > 0 else 0
-                }
+            return self._parse_cryptopanic(response.json())
 
-            # Determinar sentimiento general del mercado
-            if sentiment_metrics["bullish"]["percentage"] > 60:
-                market_sentiment = "BULLISH"
-            elif sentiment_metrics["bearish"]["percentage"] > 60:
-                market_sentiment = "BEARISH"
-            else:
-                market_sentiment = "NEUTRAL"
+        except Exception as e:
+            return {"error": f"Error obteniendo noticias CryptoPanic: {str(e)}", "success": False}
 
-            return {
-                "news": processed_news,
-                "sentiment_metrics": sentiment_metrics,
-                "market_sentiment": market_sentiment,
-                "total_news": total_news,
-                "success": True
+    @staticmethod
+    def _parse_cryptopanic(data: Dict) -> Dict[str, Any]:
+        """Noticias y sentimiento de una respuesta /posts/ de CryptoPanic."""
+        # Procesar noticias
+        processed_news = []
+        sentiment_counts = {"bullish": 0, "bearish": 0, "neutral": 0}
+
+        for post in data.get("results", []):
+            sentiment = "neutral"
+            if post.get("votes", {}).get("ludicrous", 0) > post.get("votes", {}).get("toxic", 0):
+                sentiment = "bullish"
+            elif post.get("votes", {}).get("toxic", 0) > post.get("votes", {}).get("ludicrous", 0):
+                sentiment = "bearish"
+
+            sentiment_counts[sentiment] += 1
+
+            news_item = {
+                "title": post.get("title", ""),
+                "url": post.get("url", ""),
+                "source": post.get("domain", ""),
+                "published_at": post.get("published_at", ""),
+                "sentiment": sentiment,
+                "importance": "high" if post.get("is_hot", False) else "medium",
+                "tags": [tag.get("name", "") for tag in post.get("tags", [])],
+                "currencies": [curr.get("code", "") for curr in post.get("currencies", [])]
+            }
+            processed_news.append(news_item)
+
+        # Calcular métricas de sentimiento
+        total_news = len(processed_news)
+        sentiment_metrics = {}
+        for sentiment, count in sentiment_counts.items():
+            sentiment_metrics[sentiment] = {
+                "count": count,
+                "percentage": (count / total_news * 100) if total_news > 0 else 0
             }
 
-        except Exception as e:
-            return {"error": f"Error obteniendo noticias CryptoPanic: {str(e)}", "success": False}
+        # Determinar sentimiento general del mercado
+        if sentiment_metrics["bullish"]["percentage"] > 60:
+            market_sentiment = "BULLISH"
+        elif sentiment_metrics["bearish"]["percentage"] > 60:
+            market_sentiment = "BEARISH"
+        else:
+            market_sentiment = "NEUTRAL"
+
+        return {
+            "news": processed_news,
+            "sentiment_metrics": sentiment_metrics,
+            "market_sentiment": market_sentiment,
+            "total_news": total_news,
+            "success": True
+        }
 
     def get_market_news(self) -> List[Dict[str, Any]]:
         """Obtener noticias recientes del mercado crypto."""
@@ -645,6 +698,122 @@ class AICryptoValuation:
         except Exception as e:
             return {"error": str(e)}
 
+    # --- Recolección async: fuentes en paralelo con aiohttp y cache TTL compartida ---
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=16, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=FEED_TIMEOUT),
+            )
+        return self._session
+
+    async def _fetch_json_async(self, url: str, headers: Dict = None, params: Dict = None,
+                                kind: str = 'market_context') -> Dict[str, Any]:
+        """
+        GET JSON compartido: peticiones idénticas en vuelo se unen y la respuesta
+        se reutiliza durante SINGLE_FLIGHT_TTL[kind]. Los errores no se cachean.
+        """
+        from nexus_system.uplink.single_flight import flight_ttl
+
+        async def fetch():
+            if not AIOHTTP_AVAILABLE:
+                raise RuntimeError("aiohttp no disponible")
+            session = await self._get_session()
+            async with session.get(url, headers=headers, params=params) as response:
+                if response.status != 200:
+                    raise RuntimeError(f"Error HTTP {response.status}")
+                return await response.json(content_type=None)
+
+        key = (url, tuple(sorted((params or {}).items())))
+        return await _get_feed_flight().do(key, fetch, ttl=flight_ttl(kind))
+
+    async def get_coingecko_metrics_async(self, coingecko_id: str) -> Dict[str, Any]:
+        """Versión async de get_coingecko_metrics (cacheada por moneda)."""
+        if not self.coingecko_available:
+            return {"error": "CoinGecko no disponible"}
+        try:
+            params = {
+                'localization': 'false',
+                'tickers': 'false',
+                'market_data': 'true',
+                'community_data': 'true',
+                'developer_data': 'true',
+                'sparkline': 'false'
+            }
+            data = await self._fetch_json_async(
+                f"{COINGECKO_BASE_URL}/coins/{coingecko_id}", headers={"x-cg-demo-api-key": COINGECKO_API_KEY},
+                params=params, kind='coin_metrics')
+            return self._parse_coingecko_metrics(data)
+        except Exception as e:
+            return {"error": f"Error obteniendo métricas CoinGecko: {str(e)}", "success": False}
+
+    async def get_fear_greed_index_async(self) -> Dict[str, Any]:
+        """Versión async de get_fear_greed_index (comparte la respuesta /global)."""
+        if not self.coingecko_available:
+            return {"error": "CoinGecko no disponible"}
+        try:
+            data = await self._fetch_json_async(
+                f"{COINGECKO_BASE_URL}/global", headers={"x-cg-demo-api-key": COINGECKO_API_KEY})
+            return self._parse_fear_greed(data)
+        except Exception as e:
+            return {"error": f"Error obteniendo Fear & Greed Index: {str(e)}", "success": False}
+
+    async def get_global_crypto_data_async(self) -> Dict[str, Any]:
+        """Versión async de get_global_crypto_data (comparte la respuesta /global)."""
+        if not self.coingecko_available:
+            return {"error": "CoinGecko no disponible"}
+        try:
+            data = await self._fetch_json_async(
+                f"{COINGECKO_BASE_URL}/global", headers={"x-cg-demo-api-key": COINGECKO_API_KEY})
+            return self._parse_global_crypto(data)
+        except Exception as e:
+            return {"error": f"Error obteniendo datos globales: {str(e)}", "success": False}
+
+    async def get_trending_coins_async(self) -> Dict[str, Any]:
+        """Versión async de get_trending_coins."""
+        if not self.coingecko_available:
+            return {"error": "CoinGecko no disponible"}
+        try:
+            data = await self._fetch_json_async(
+                f"{COINGECKO_BASE_URL}/search/trending", headers={"x-cg-demo-api-key": COINGECKO_API_KEY})
+            return self._parse_trending(data)
+        except Exception as e:
+            return {"error": f"Error obteniendo trending coins: {str(e)}", "success": False}
+
+    async def get_cryptopanic_news_async(self, limit: int = 10) -> Dict[str, Any]:
+        """Versión async de get_cryptopanic_news."""
+        if not CRYPTOPANIC_AVAILABLE:
+            return {"error": "CryptoPanic API no disponible", "success": False}
+        try:
+            params = {"auth_token": CRYPTOPANIC_API_KEY, "limit": limit, "public": "true"}
+            data = await self._fetch_json_async(
+                f"{CRYPTOPANIC_BASE_URL}/posts/", headers={"accept": "application/json"}, params=params)
+            return self._parse_cryptopanic(data)
+        except Exception as e:
+            return {"error": f"Error obteniendo noticias CryptoPanic: {str(e)}", "success": False}
+
+    async def gather_market_context_async(self, coingecko_id: str, news_limit: int = 10) -> Dict[str, Any]:
+        """
+        Todas las fuentes de una valoración a la vez: el coste es el de la más
+        lenta, no la suma. Las globales (fear/greed, métricas globales,
+        trending, noticias) se piden una vez por TTL para todos los símbolos.
+        """
+        coingecko_metrics, global_crypto, fear_greed, trending_coins, cryptopanic_news = await asyncio.gather(
+            self.get_coingecko_metrics_async(coingecko_id),
+            self.get_global_crypto_data_async(),
+            self.get_fear_greed_index_async(),
+            self.get_trending_coins_async(),
+            self.get_cryptopanic_news_async(limit=news_limit),
+        )
+        return {
+            "coingecko_metrics": coingecko_metrics,
+            "global_crypto": global_crypto,
+            "fear_greed": fear_greed,
+            "trending_coins": trending_coins,
+            "cryptopanic_news": cryptopanic_news,
+        }
+
     def create_valuation_payload(self, crypto: Dict, crypto_data: Dict, coingecko_metrics: Dict, market_news: List, cryptopanic_news: Dict, global_context: Dict, fear_greed: Dict, global_crypto: Dict, trending_coins: Dict) -> Dict[str, Any]:
         """Crear payload estructurado para valoración."""
 
@@ -719,6 +888,73 @@ class AICryptoValuation:
 
         return payload
 
+    def _openai_valuation_prompt(self, crypto: Dict, payload: Dict) -> str:
+        """Prompt de valoración OpenAI (compartido por la versión síncrona y la async)."""
+        return f"""
+        Eres un analista senior de criptomonedas con 15+ años de experiencia en mercados financieros.
+
+        DATOS TÉCNICOS DE {crypto['name']} ({crypto['short']}):
+        - Precio actual: ${payload['technical_data']['price']:,.2f}
+        - Cambio 1h: {payload['technical_data']['change_1h']:.2f}%
+        - Cambio 24h: {payload['technical_data']['change_24h']:.2f}%
+        - Volumen 24h: ${payload['technical_data']['volume_24h']/1e9:.1f}B
+        - Market Cap: ${payload['technical_data']['market_cap']/1e12:.2f}T
+
+        MÉTRICAS COINGECKO DETALLADAS:
+        - Developer Score: {payload['coingecko_metrics'].get('developer_score', 'N/A')}/100
+        - Community Score: {payload['coingecko_metrics'].get('community_score', 'N/A')}/100
+        - Liquidity Score: {payload['coingecko_metrics'].get('liquidity_score', 'N/A')}/100
+        - GitHub Stars: {payload['coingecko_metrics'].get('github_stars', 0):,}
+        - GitHub Commits (4 semanas): {payload['coingecko_metrics'].get('github_commits_last_4_weeks', 0)}
+        - Twitter Followers: {payload['coingecko_metrics'].get('twitter_followers', 0):,}
+        - Reddit Subscribers: {payload['coingecko_metrics'].get('reddit_subscribers', 0):,}
+        - Market Cap Rank: #{payload['coingecko_metrics'].get('market_cap_rank', 'N/A')}
+
+        SENTIMIENTO DE MERCADO GLOBAL:
+        - Fear & Greed Index: {payload['market_sentiment']['fear_greed_index'].get('value', 'N/A')} ({payload['market_sentiment']['fear_greed_index'].get('value_text', 'Unknown')})
+        - Market Cap Total: ${payload['market_sentiment']['global_crypto_metrics'].get('total_market_cap', {}).get('usd', 0)/1e12:.2f}T
+        - BTC Dominance: {payload['market_sentiment']['global_crypto_metrics'].get('market_cap_percentage', {}).get('btc', 0):.1f}%
+
+        ANÁLISIS DE SENTIMIENTO CRYPTOPANIC:
+        - Sentimiento General: {payload['market_news'].get('market_sentiment_cryptopanic', 'UNKNOWN')}
+        - Bullish: {payload['market_news'].get('cryptopanic_sentiment', {}).get('bullish', {}).get('percentage', 0):.1f}%
+        - Bearish: {payload['market_news'].get('cryptopanic_sentiment', {}).get('bearish', {}).get('percentage', 0):.1f}%
+        - Neutral: {payload['market_news'].get('cryptopanic_sentiment', {}).get('neutral', {}).get('percentage', 0):.1f}%
+
+        NOTICIAS GENERALES:
+        {json.dumps(payload['market_news']['general_news'], indent=2, ensure_ascii=False)}
+
+        NOTICIAS CRYPTOPANIC CON SENTIMIENTO:
+        {json.dumps(payload['market_news']['cryptopanic_news'], indent=2, ensure_ascii=False)}
+
+        CONTEXTO ECONÓMICO GLOBAL:
+        {json.dumps(payload['global_economic_context'], indent=2, ensure_ascii=False)}
+
+        TAREA: Proporciona una valoración COMPREHENSIVA de {crypto['short']} considerando TODAS las métricas disponibles, especialmente las de desarrollo, comunidad y sentimiento de mercado.
+
+        FORMATO DE RESPUESTA (JSON estricto):
+        {{
+            "long_signal": 0.750,
+            "short_signal": 0.250,
+            "confidence_level": 0.85,
+            "price_target_long": 95000,
+            "price_target_short": 85000,
+            "key_drivers_long": ["driver1", "driver2"],
+            "key_drivers_short": ["driver1", "driver2"],
+            "technical_analysis": "análisis técnico detallado",
+            "fundamental_analysis": "análisis fundamental incluyendo métricas CoinGecko",
+            "coingecko_insights": "análisis específico de developer score, community engagement, etc.",
+            "market_sentiment": "NEUTRAL",
+            "investment_thesis": "tesis de inversión considerando todas las métricas"
+        }}
+        """
+
+    def _valuation_messages(self, crypto: Dict, payload: Dict) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": "Eres un analista de inversiones experto. Responde ÚNICAMENTE con JSON válido."},
+            {"role": "user", "content": self._openai_valuation_prompt(crypto, payload)}
+        ]
+
     def get_openai_valuation_with_model(self, crypto: Dict, payload: Dict, model_id: str) -> Dict[str, Any]:
         """Obtener valoración de OpenAI con modelo específico."""
 
@@ -728,82 +964,57 @@ class AICryptoValuation:
         try:
             client = openai.OpenAI(api_key=self.openai_api_key)
 
-            prompt = f"""
-            Eres un analista senior de criptomonedas con 15+ años de experiencia en mercados financieros.
-
-            DATOS TÉCNICOS DE {crypto['name']} ({crypto['short']}):
-            - Precio actual: ${payload['technical_data']['price']:,.2f}
-            - Cambio 1h: {payload['technical_data']['change_1h']:.2f}%
-            - Cambio 24h: {payload['technical_data']['change_24h']:.2f}%
-            - Volumen 24h: ${payload['technical_data']['volume_24h']/1e9:.1f}B
-            - Market Cap: ${payload['technical_data']['market_cap']/1e12:.2f}T
+            start_time = time.time()
 
-            MÉTRICAS COINGECKO DETALLADAS:
-            - Developer Score: {payload['coingecko_metrics'].get('developer_score', 'N/A')}/100
-            - Community Score: {payload['coingecko_metrics'].get('community_score', 'N/A')}/100
-            - Liquidity Score: {payload['coingecko_metrics'].get('liquidity_score', 'N/A')}/100
-            - GitHub Stars: {payload['coingecko_metrics'].get('github_stars', 0):,}
-            - GitHub Commits (4 semanas): {payload['coingecko_metrics'].get('github_commits_last_4_weeks', 0)}
-            - Twitter Followers: {payload['coingecko_metrics'].get('twitter_followers', 0):,}
-            - Reddit Subscribers: {payload['coingecko_metrics'].get('reddit_subscribers', 0):,}
-            - Market Cap Rank: #{payload['coingecko_metrics'].get('market_cap_rank', 'N/A')}
+            response = client.chat.completions.create(
+                model=model_id,
+                messages=self._valuation_messages(crypto, payload),
+                max_tokens=1000,
+                temperature=0.3,
+                response_format={"type": "json_object"}
+            )
 
-            SENTIMIENTO DE MERCADO GLOBAL:
-            - Fear & Greed Index: {payload['market_sentiment']['fear_greed_index'].get('value', 'N/A')} ({payload['market_sentiment']['fear_greed_index'].get('value_text', 'Unknown')})
-            - Market Cap Total: ${payload['market_sentiment']['global_crypto_metrics'].get('total_market_cap', {}).get('usd', 0)/1e12:.2f}T
-            - BTC Dominance: {payload['market_sentiment']['global_crypto_metrics'].get('market_cap_percentage', {}).get('btc', 0):.1f}%
+            end_time = time.time()
 
-            ANÁLISIS DE SENTIMIENTO CRYPTOPANIC:
-            - Sentimiento General: {payload['market_news'].get('market_sentiment_cryptopanic', 'UNKNOWN')}
-            - Bullish: {payload['market_news'].get('cryptopanic_sentiment', {}).get('bullish', {}).get('percentage', 0):.1f}%
-            - Bearish: {payload['market_news'].get('cryptopanic_sentiment', {}).get('bearish', {}).get('percentage', 0):.1f}%
-            - Neutral: {payload['market_news'].get('cryptopanic_sentiment', {}).get('neutral', {}).get('percentage', 0):.1f}%
+            result_text = response.choices[0].message.content.strip()
 
-            NOTICIAS GENERALES:
-            {json.dumps(payload['market_news']['general_news'], indent=2, ensure_ascii=False)}
+            try:
+                result_json = json.loads(result_text)
+            except:
+                result_json = {"error": "Respuesta no es JSON válido", "raw_response": result_text}
 
-            NOTICIAS CRYPTOPANIC CON SENTIMIENTO:
-            {json.dumps(payload['market_news']['cryptopanic_news'], indent=2, ensure_ascii=False)}
+            return {
+                "provider": "OpenAI",
+                "model": model_id,
+                "crypto": crypto['short'],
+                "response_time": round(end_time - start_time, 2),
+                "result": result_json,
+                "timestamp": datetime.now().isoformat()
+            }
 
-            CONTEXTO ECONÓMICO GLOBAL:
-            {json.dumps(payload['global_economic_context'], indent=2, ensure_ascii=False)}
+        except Exception as e:
+            return {"error": f"Error con OpenAI {model_id}: {str(e)}"}
 
-            TAREA: Proporciona una valoración COMPREHENSIVA de {crypto['short']} considerando TODAS las métricas disponibles, especialmente las de desarrollo, comunidad y sentimiento de mercado.
+    async def get_openai_valuation_with_model_async(self, crypto: Dict, payload: Dict, model_id: str) -> Dict[str, Any]:
+        """Versión async de get_openai_valuation_with_model vía el LLM gateway compartido (pool, cache, breaker)."""
+        from servos.llm_gateway import get_llm_gateway
 
-            FORMATO DE RESPUESTA (JSON estricto):
-            {{
-                "long_signal": 0.750,
-                "short_signal": 0.250,
-                "confidence_level": 0.85,
-                "price_target_long": 95000,
-                "price_target_short": 85000,
-                "key_drivers_long": ["driver1", "driver2"],
-                "key_drivers_short": ["driver1", "driver2"],
-                "technical_analysis": "análisis técnico detallado",
-                "fundamental_analysis": "análisis fundamental incluyendo métricas CoinGecko",
-                "coingecko_insights": "análisis específico de developer score, community engagement, etc.",
-                "market_sentiment": "NEUTRAL",
-                "investment_thesis": "tesis de inversión considerando todas las métricas"
-            }}
-            """
+        gateway = get_llm_gateway()
+        if not gateway.is_available('openai'):
+            return {"error": "OpenAI no disponible"}
 
+        try:
             start_time = time.time()
-
-            response = client.chat.completions.create(
+            result_text = await gateway.chat(
                 model=model_id,
-                messages=[
-                    {"role": "system", "content": "Eres un analista de inversiones experto. Responde ÚNICAMENTE con JSON válido."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._valuation_messages(crypto, payload),
                 max_tokens=1000,
                 temperature=0.3,
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                ttl=600
             )
-
             end_time = time.time()
 
-            result_text = response.choices[0].message.content.strip()
-
             try:
                 result_json = json.loads(result_text)
             except:
@@ -2,7 +2,7 @@ from aiogram import Router, types
 from aiogram.filters import Command
 from aiogram.types import Message
 import os
-from servos.db import add_system_user, remove_system_user, get_all_system_users, get_user_role
+from servos.db_async import nexus_db
 from datetime import datetime
 from servos.auth import admin_only, owner_only
 
@@ -23,7 +23,7 @@ async def cmd_addsub(message: Message):
         target_chat_id = args[2]
         days = int(args[3])
         
-        success, res = add_system_user(name, target_chat_id, days, 'user')
+        success, res = await nexus_db.add_system_user(name, target_chat_id, days, 'user')
         
         if success:
             expiry = datetime.now().timestamp() + (days * 86400)
@@ -50,7 +50,7 @@ async def cmd_addadmin(message: Message):
         name = args[1]
         target_chat_id = args[2]
         
-        success, res = add_system_user(name, target_chat_id, None, 'admin')
+        success, res = await nexus_db.add_system_user(name, target_chat_id, None, 'admin')
         
         if success:
             await message.answer(f"✅ Admin Agregado\n🛡️ {name} (ID: {res})\n♾️ Acceso Permanente")
@@ -71,7 +71,7 @@ async def cmd_remsub(message: Message):
             return
             
         user_id = int(args[1])
-        if remove_system_user(user_id):
+        if await nexus_db.remove_system_user(user_id):
             await message.answer(f"🗑️ Usuario {user_id} eliminado de la DB.")
         else:
             await message.answer(f"⚠️ No se encontró el ID {user_id}.")
@@ -83,7 +83,7 @@ async def cmd_remsub(message: Message):
 @admin_only
 async def cmd_subs(message: Message):
         
-    users = get_all_system_users()
+    users = await nexus_db.get_all_system_users()
     
     # Get Owner from ENV for display
     env_owner = os.getenv('TELEGRAM_CHAT_ID', '').split(',')
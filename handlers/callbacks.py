@@ -101,9 +101,9 @@ async def handle_cmd_callback(callback: CallbackQuery, **kwargs):
             session.set_mode('WATCHER')
             await session_manager.save_sessions()
             
-            from servos.db import get_user_name
+            from servos.db_async import nexus_db
             from servos.personalities import PersonalityManager
-            user_name = get_user_name(callback.message.chat.id)
+            user_name = await nexus_db.get_user_name(callback.message.chat.id)
             p_key = session.config.get('personality', 'STANDARD_ES')
             msg = PersonalityManager().get_message(p_key, 'WATCHER_ON', user_name=user_name)
             
@@ -117,9 +117,9 @@ async def handle_cmd_callback(callback: CallbackQuery, **kwargs):
             session.set_mode('COPILOT')
             await session_manager.save_sessions()
             
-            from servos.db import get_user_name
+            from servos.db_async import nexus_db
             from servos.personalities import PersonalityManager
-            user_name = get_user_name(callback.message.chat.id)
+            user_name = await nexus_db.get_user_name(callback.message.chat.id)
             p_key = session.config.get('personality', 'STANDARD_ES')
             msg = PersonalityManager().get_message(p_key, 'COPILOT_ON', user_name=user_name)
             
@@ -133,9 +133,9 @@ async def handle_cmd_callback(callback: CallbackQuery, **kwargs):
             session.set_mode('PILOT')
             await session_manager.save_sessions()
             
-            from servos.db import get_user_name
+            from servos.db_async import nexus_db
             from servos.personalities import PersonalityManager
-            user_name = get_user_name(callback.message.chat.id)
+            user_name = await nexus_db.get_user_name(callback.message.chat.id)
             p_key = session.config.get('personality', 'STANDARD_ES')
             msg = PersonalityManager().get_message(p_key, 'PILOT_ON', user_name=user_name)
             
@@ -444,11 +444,11 @@ async def handle_strategy_toggle(callback: CallbackQuery, **kwargs):
         aq_config.ML_CLASSIFIER_ENABLED = new_state
         
         # Persist to DB
-        from servos.db import save_bot_state
+        from servos.db_async import nexus_db
         from system_directive import GROUP_CONFIG
         gc_copy = dict(GROUP_CONFIG)
         gc_copy['_ML_CLASSIFIER'] = new_state  # Store ML flag
-        save_bot_state(aq_config.ENABLED_STRATEGIES, gc_copy, list(aq_config.DISABLED_ASSETS), aq_config.AI_FILTER_ENABLED)
+        await nexus_db.save_bot_state(aq_config.ENABLED_STRATEGIES, gc_copy, list(aq_config.DISABLED_ASSETS), aq_config.AI_FILTER_ENABLED)
         
         status = "🟢 ACTIVADO" if new_state else "🔴 DESACTIVADO"
         
@@ -1192,7 +1192,7 @@ async def handle_asset_toggle(callback: CallbackQuery, **kwargs):
         # ALSO update GLOBAL DISABLED_ASSETS (used by NexusCore)
         from system_directive import DISABLED_ASSETS
         from system_directive import ASSET_GROUPS, GROUP_CONFIG
-        from servos.db import save_bot_state
+        from servos.db_async import nexus_db
         import system_directive as aq_config
         
         if is_now_disabled:
@@ -1202,7 +1202,7 @@ async def handle_asset_toggle(callback: CallbackQuery, **kwargs):
         
         # Persist to database so it survives restarts
         from system_directive import ENABLED_STRATEGIES
-        save_bot_state(ENABLED_STRATEGIES, GROUP_CONFIG, list(DISABLED_ASSETS), aq_config.AI_FILTER_ENABLED)
+        await nexus_db.save_bot_state(ENABLED_STRATEGIES, GROUP_CONFIG, list(DISABLED_ASSETS), aq_config.AI_FILTER_ENABLED)
         
         if is_now_disabled:
             await safe_answer(callback, f"❌ {asset} desactivado (Global + Session)")
@@ -13,7 +13,7 @@ from aiogram import Router, F
 from aiogram.filters import Command, CommandStart
 from aiogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery
 from servos.auth import admin_only, is_authorized_admin, owner_only
-from servos.db import get_user_name
+from servos.db_async import nexus_db
 
 router = Router(name="commands")
 
@@ -78,7 +78,7 @@ async def cmd_start(message: Message, **kwargs):
         # 2. Obtener datos de sesión
         chat_id = str(message.chat.id)
         session = session_manager.get_session(chat_id) if session_manager else None
-        user_name = get_user_name(chat_id)
+        user_name = await nexus_db.get_user_name(chat_id)
 
         # 3. Valores por defecto
         mode = "WATCHER"
@@ -311,7 +311,7 @@ async def cmd_help(message: Message):
     user_id = message.from_user.id if message.from_user else "unknown"
     logger.info(f"📖 Help command requested by user {user_id}")
 
-    is_admin = is_authorized_admin(str(message.chat.id))
+    is_admin = await is_authorized_admin(str(message.chat.id))
 
     # Contador de comandos disponibles
     command_count = {
@@ -1088,17 +1088,17 @@ async def cmd_risk(message: Message, **kwargs):
 @router.message(Command("news"))
 async def cmd_news(message: Message, **kwargs):
     """AI market briefing"""
-    from servos.ai_analyst import NexusAnalyst
+    from servos.ai_analyst import get_nexus_analyst
     
     msg = await message.answer("🗞️ *Leyendo las noticias...* (Consultando via AI)", parse_mode='Markdown')
     
     try:
-        analyst = NexusAnalyst()
-        if not analyst.client:
+        analyst = get_nexus_analyst()
+        if not analyst.available:
             await msg.edit_text("⚠️ IA no disponible. Configura OPENAI_API_KEY.")
             return
         
-        report = analyst.generate_market_briefing()
+        report = await analyst.generate_market_briefing()
         await msg.edit_text(f"📰 **BOLETÍN DE MERCADO**\n\n{report}", parse_mode='Markdown')
     except Exception as e:
         await msg.edit_text(f"❌ Error: {e}")
@@ -1177,7 +1177,7 @@ async def cmd_ai_status(message: Message, **kwargs):
 @router.message(Command("fomc"))
 async def cmd_fomc(message: Message, **kwargs):
     """Federal Reserve (FED) analysis"""
-    from servos.ai_analyst import NexusAnalyst
+    from servos.ai_analyst import get_nexus_analyst
     
     session_manager = kwargs.get('session_manager')
     chat_id = str(message.chat.id)
@@ -1188,12 +1188,12 @@ async def cmd_fomc(message: Message, **kwargs):
     msg = await message.answer("🏦 *Analizando situación de la FED...* (Tasas, Bonos, Powell)", parse_mode='Markdown')
     
     try:
-        analyst = NexusAnalyst()
-        if not analyst.client:
+        analyst = get_nexus_analyst()
+        if not analyst.available:
             await msg.edit_text("⚠️ IA no disponible. Configura OPENAI_API_KEY.")
             return
         
-        report = analyst.analyze_fomc(personality=p_key)
+        report = await analyst.analyze_fomc(personality=p_key)
         await msg.edit_text(f"🏦 **ANÁLISIS FOMC (FED)**\n\n{report}", parse_mode='Markdown')
     except Exception as e:
         await msg.edit_text(f"❌ Error: {e}")
@@ -1205,7 +1205,7 @@ async def cmd_analyze(message: Message, **kwargs):
     Análisis AI por activo: /analyze BTC - Usa la personalidad activa del usuario.
     Migrado a versión async usando MarketStream.
     """
-    from servos.ai_analyst import NexusAnalyst
+    from servos.ai_analyst import get_nexus_analyst
     from nexus_system.utils.market_data import get_market_data_async
     from servos.personalities import PersonalityManager
     
@@ -1255,8 +1255,8 @@ async def cmd_analyze(message: Message, **kwargs):
         volume = float(df['volume'].iloc[-1]) if 'volume' in df.columns else 0
         avg_vol = float(df['volume'].mean()) if 'volume' in df.columns else 1
         
-        analyst = NexusAnalyst()
-        if not analyst.client:
+        analyst = get_nexus_analyst()
+        if not analyst.available:
             await msg.edit_text("⚠️ IA no disponible.")
             return
         
@@ -1270,7 +1270,7 @@ async def cmd_analyze(message: Message, **kwargs):
         }
         
         # Pass personality key for character-based analysis
-        analysis = analyst.analyze_signal(symbol, '1h', indicators, personality=p_key)
+        analysis = await analyst.analyze_signal(symbol, '1h', indicators, personality=p_key)
         
         await msg.edit_text(
             f"🔬 **ANÁLISIS: {symbol}**\n\n"
@@ -1364,7 +1364,7 @@ async def cmd_cooldowns(message: Message, **kwargs):
     await message.reply("\n".join(lines), parse_mode="Markdown")
     
     # Persist to database
-    save_bot_state(ENABLED_STRATEGIES, GROUP_CONFIG, [], aq_config.AI_FILTER_ENABLED)
+    await nexus_db.save_bot_state(ENABLED_STRATEGIES, GROUP_CONFIG, [], aq_config.AI_FILTER_ENABLED)
     
     await message.reply(
         f"✅ **Assets Reset**\n"
@@ -1661,7 +1661,7 @@ async def cmd_sync_crypto(message: Message, **kwargs):
         return
 
     # Verificar permisos de admin
-    if not is_authorized_admin(str(message.chat.id)):
+    if not await is_authorized_admin(str(message.chat.id)):
         await message.answer("⚠️ Este comando requiere permisos de administrador.")
         return
 
@@ -1680,6 +1680,12 @@ async def cmd_sync_crypto(message: Message, **kwargs):
         # Ejecutar sincronización
         sync_result = await bridge.sync_crypto_assets()
 
+        # Re-align the live kline subscriptions with the configured universe
+        engine = getattr(session_manager, 'engine', None)
+        if engine is not None:
+            from system_directive import get_all_assets
+            await engine.market_stream.update_symbols(get_all_assets())
+
         # Generar reporte
         binance_count = len(sync_result.get('BINANCE', []))
         bybit_count = len(sync_result.get('BYBIT', []))
@@ -1893,27 +1899,23 @@ async def cmd_price(message: Message, **kwargs):
         
         # --- 3. FETCH & PROCESS CRYPTO (Binance) ---
         crypto_str = ""
+        from nexus_system.uplink.stream import get_market_stream
+        from nexus_system.utils.market_data import get_market_data_async
+        stream = await get_market_stream()  # Shared warm stream (no new client per request)
         for symbol in crypto_targets[:6]:  # Limit 6
             try:
                 # A. Get Price & 24h Change
-                ticker_url = f"https://fapi.binance.com/fapi/v1/ticker/24hr?symbol={symbol}"
+                ticker = await stream.get_ticker(symbol)
                 # B. Get Klines for RSI (4h interval, 20 candles)
-                klines_url = f"https://fapi.binance.com/fapi/v1/klines?symbol={symbol}&interval=4h&limit=20"
-                
-                # Fetch (async)
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(ticker_url, timeout=aiohttp.ClientTimeout(total=2)) as t_response:
-                        t_resp = await t_response.json()
-                    async with session.get(klines_url, timeout=aiohttp.ClientTimeout(total=2)) as k_response:
-                        k_resp = await k_response.json()
+                klines = await get_market_data_async(symbol, timeframe='4h', limit=20, market_stream=stream)
                 
-                if 'lastPrice' in t_resp:
+                if ticker.get('last') and not klines.empty:
                     # Data Extraction
-                    price = float(t_resp['lastPrice'])
-                    pct_change = float(t_resp['priceChangePercent'])
+                    price = float(ticker['last'])
+                    pct_change = float(ticker.get('percentage') or 0.0)
                     
                     # RSI Calc
-                    closes = [float(k[4]) for k in k_resp] # Index 4 is Close
+                    closes = klines['close'].astype(float).tolist()
                     rsi_series = calculate_rsi(closes)
                     rsi = float(rsi_series.iloc[-1]) if hasattr(rsi_series, 'iloc') else float(rsi_series)
                     
@@ -2072,8 +2074,8 @@ async def cmd_timezone(message: Message, **kwargs):
     
     if len(args) < 2:
         # Display current timezone
-        current_tz = get_user_timezone(user_id)
-        current_time = get_current_time_str(user_id, "%Y-%m-%d %H:%M:%S %Z")
+        current_tz = await get_user_timezone(user_id)
+        current_time = get_current_time_str(current_tz, "%Y-%m-%d %H:%M:%S %Z")
         
         aliases = ", ".join(TIMEZONE_ALIASES.keys())
         
@@ -2092,10 +2094,10 @@ async def cmd_timezone(message: Message, **kwargs):
     # Set new timezone
     tz_input = args[1].strip()
     resolved = resolve_timezone(tz_input)
-    success, msg_text = set_user_timezone(user_id, resolved)
+    success, msg_text = await set_user_timezone(user_id, resolved)
     
     if success:
-        current_time = get_current_time_str(user_id, "%Y-%m-%d %H:%M:%S %Z")
+        current_time = get_current_time_str(resolved, "%Y-%m-%d %H:%M:%S %Z")
         await message.answer(
             f"{msg_text}\n🕐 Hora actual: `{current_time}`",
             parse_mode="Markdown"
@@ -2111,7 +2113,7 @@ async def cmd_schedule(message: Message, **kwargs):
     Example: /schedule analyze BTC every day at 9am
     """
     from servos.task_scheduler import get_scheduler
-    from servos.timezone_manager import get_user_timezone, get_current_time_str
+    from servos.timezone_manager import get_user_timezone
     
     user_id = message.from_user.id
     args = message.text.split(maxsplit=1)
@@ -2137,7 +2139,7 @@ async def cmd_schedule(message: Message, **kwargs):
     
     try:
         scheduler = get_scheduler()
-        user_tz = get_user_timezone(user_id)
+        user_tz = await get_user_timezone(user_id)
         
         # Parse with LLM
         parsed = await scheduler.parse_task_with_llm(task_description, user_id, user_tz)
@@ -2165,12 +2167,12 @@ async def cmd_schedule(message: Message, **kwargs):
 async def cmd_tasks(message: Message, **kwargs):
     """List all scheduled tasks for the user."""
     from servos.task_scheduler import get_scheduler
-    from servos.timezone_manager import convert_from_utc, get_user_timezone
+    from servos.timezone_manager import get_user_timezone
     from datetime import datetime
     
     user_id = message.from_user.id
     scheduler = get_scheduler()
-    tasks = scheduler.list_tasks(user_id)
+    tasks = await scheduler.list_tasks(user_id)
     
     if not tasks:
         await message.answer(
@@ -2182,7 +2184,7 @@ async def cmd_tasks(message: Message, **kwargs):
         )
         return
     
-    user_tz = get_user_timezone(user_id)
+    user_tz = await get_user_timezone(user_id)
     
     msg = "📋 **Tareas Programadas**\n━━━━━━━━━━━━━━━━━━\n\n"
     
@@ -2239,7 +2241,7 @@ async def cmd_cancel(message: Message, **kwargs):
     
     task_id = args[1]
     scheduler = get_scheduler()
-    success, result_msg = scheduler.cancel_task(user_id, task_id)
+    success, result_msg = await scheduler.cancel_task(user_id, task_id)
     
     await message.answer(result_msg, parse_mode="Markdown")
 
@@ -2272,10 +2274,10 @@ async def owner_chat_handler(message: Message, **kwargs):
     personality = session.config.get('personality', 'STANDARD_ES')
     
     # Get OpenAI client
-    from servos.ai_analyst import NexusAnalyst
-    analyst = NexusAnalyst()
+    from servos.ai_analyst import get_nexus_analyst
+    analyst = get_nexus_analyst()
     
-    if not analyst.client:
+    if not analyst.available:
         await message.reply("⚠️ OpenAI no configurado. Verifica `OPENAI_API_KEY`.")
         return
     
@@ -2300,17 +2302,16 @@ REGLAS:
         # Send typing action
         await message.chat.do('typing')
         
-        response = analyst.client.chat.completions.create(
+        reply = await analyst.gateway.chat(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": message.text}
             ],
             max_tokens=500,
-            temperature=0.8
+            temperature=0.8,
+            ttl=0  # Conversational: only identical in-flight messages are shared
         )
-        
-        reply = response.choices[0].message.content
         await message.reply(reply)
         
     except Exception as e:
@@ -2321,11 +2322,9 @@ REGLAS:
 # ASSET GROUP MANAGEMENT (/assets)
 # ========================================================
 
-from servos.db import get_user_enabled_groups, set_user_enabled_groups
-
-def _build_assets_keyboard(chat_id: str) -> InlineKeyboardMarkup:
+async def _build_assets_keyboard(chat_id: str) -> InlineKeyboardMarkup:
     """Build inline keyboard showing current asset group toggles with subgroups."""
-    groups = get_user_enabled_groups(chat_id)
+    groups = await nexus_db.get_user_enabled_groups(chat_id)
 
     def icon(enabled: bool) -> str:
         return "✅" if enabled else "❌"
@@ -2383,7 +2382,7 @@ async def cmd_assets(message: Message, **kwargs):
     Allows users to enable/disable scanning for Crypto, Stocks, or ETFs.
     """
     chat_id = str(message.chat.id)
-    keyboard = _build_assets_keyboard(chat_id)
+    keyboard = await _build_assets_keyboard(chat_id)
     
     await message.answer(
         "⚙️ **Configuración de Activos**\n\n"
@@ -2406,16 +2405,22 @@ async def callback_toggle_group(callback: CallbackQuery, **kwargs):
     group_name = callback.data.split(":")[1]
     
     # Get current settings
-    groups = get_user_enabled_groups(chat_id)
+    groups = await nexus_db.get_user_enabled_groups(chat_id)
     
     # Toggle
     groups[group_name] = not groups.get(group_name, True)
     
     # Save
-    set_user_enabled_groups(chat_id, groups)
+    await nexus_db.set_user_enabled_groups(chat_id, groups)
+
+    # Apply to signal dispatch now instead of after the session's groups cache expires
+    session_manager = kwargs.get('session_manager')
+    session = session_manager.get_session(chat_id) if session_manager else None
+    if session:
+        session.set_enabled_groups(groups)
     
     # Update keyboard
-    keyboard = _build_assets_keyboard(chat_id)
+    keyboard = await _build_assets_keyboard(chat_id)
     
     status = "✅ Habilitado" if groups[group_name] else "❌ Deshabilitado"
     await callback.answer(f"{group_name}: {status}")
@@ -2744,11 +2749,7 @@ async def execute_scanner(message, exchange_filter: str = 'ALL'):
     """
     from system_directive import ASSET_GROUPS, get_display_name
     from system_directive import DISABLED_ASSETS, ML_CLASSIFIER_ENABLED
-    from nexus_system.cortex.classifier import MarketClassifier
-    from nexus_system.cortex.factory import StrategyFactory
-    from nexus_system.utils.market_data import get_market_data_async
-    from servos.indicators import calculate_rsi, calculate_adx, calculate_atr, calculate_ema, calculate_bollinger_bands
-    import pandas as pd
+    from servos.scanner import get_market_scanner
     import html
     import asyncio
     
@@ -2817,10 +2818,44 @@ async def execute_scanner(message, exchange_filter: str = 'ALL'):
         f"{icon} <b>NEXUS SCANNER - {display_name}</b>",
         "━━━━━━━━━━━━━━━━━━━━━━━━━"
     ]
+    trend_labels = {'BULL': "🐂 BULL", 'UP_WEAK': "📈 UP-Weak", 'BEAR': "🐻 BEAR", 'DN_WEAK': "📉 DN-Weak"}
 
+    scanner = get_market_scanner()
     total_assets = 0
     signals_would_fire = 0
 
+    # Report pages: the scanner message itself, plus follow-ups once it outgrows one message
+    pages = [message]
+    page_texts = [None]
+
+    def chunk_report(lines):
+        chunks = []
+        current_chunk = ""
+        for line in lines:
+            if len(current_chunk) + len(line) + 1 > 2500:
+                chunks.append(current_chunk)
+                current_chunk = line + "\n"
+            else:
+                current_chunk += line + "\n"
+        if current_chunk:
+            chunks.append(current_chunk)
+        return chunks
+
+    async def publish(footer_lines):
+        """Edit pages whose text changed; append new pages as the report grows."""
+        for i, text in enumerate(chunk_report(report_lines + footer_lines)):
+            try:
+                if i < len(pages):
+                    if page_texts[i] != text:
+                        await pages[i].edit_text(text, parse_mode="HTML")
+                        page_texts[i] = text
+                else:
+                    pages.append(await message.answer(text, parse_mode="HTML"))
+                    page_texts.append(text)
+                    await asyncio.sleep(0.3)
+            except Exception as e:
+                print(f"⚠️ Scanner report update failed: {e}")
+
     for group_item in groups_to_scan:
         if isinstance(group_item, tuple):
             # Thematic category: (group_name, specific_assets)
@@ -2836,103 +2871,47 @@ async def execute_scanner(message, exchange_filter: str = 'ALL'):
         group_icon = '🟡' if group_name == 'CRYPTO' else '⬛' if group_name == 'BYBIT' else '📈' if group_name == 'STOCKS' else '📦'
         report_lines.append(f"\n{group_icon} <b>{group_name}</b> ({len(assets)} activos)")
         report_lines.append("─" * 30)
-        
-        for asset in assets:
-            total_assets += 1
-            tag = "⛔ " if asset in DISABLED_ASSETS else ""
-            
-            try:
-                # Obtener datos de forma async
-                df = await get_market_data_async(asset, timeframe='15m', limit=250)
-                
-                if df is None or df.empty or len(df) < 50:
-                    display = html.escape(get_display_name(asset))
+
+        async def on_chunk(batch, done, total):
+            nonlocal signals_would_fire
+            for result in batch:
+                display = html.escape(get_display_name(result.symbol))
+                if result.status == 'no_data':
                     report_lines.append(f"• <code>{display}</code>: ❌ No data")
                     continue
-                
-                # Calculate indicators
-                df['rsi'] = calculate_rsi(df['close'], 14)
-                df['ema_20'] = calculate_ema(df['close'], 20)
-                df['ema_50'] = calculate_ema(df['close'], 50)
-                df['ema_200'] = calculate_ema(df['close'], 200)
-                df['atr'] = calculate_atr(df, 14)
-                adx_data = calculate_adx(df, 14)
-                df['adx'] = adx_data['adx']
-                bb = calculate_bollinger_bands(df['close'], 20, 2.0)
-                df['bb_upper'] = bb['upper']
-                df['bb_lower'] = bb['lower']
-                
-                last = df.iloc[-1]
-                close = float(last['close'])
-                rsi = float(last.get('rsi', 50))
-                adx = float(last.get('adx', 0))
-                atr = float(last.get('atr', 0))
-                atr_pct = (atr / close) * 100 if close > 0 else 0
-                
-                ema_20 = float(last.get('ema_20', close))
-                ema_50 = float(last.get('ema_50', close))
-                ema_200 = float(last.get('ema_200', close))
-                
-                bb_width = ((float(last['bb_upper']) - float(last['bb_lower'])) / close) * 100 if close > 0 else 0
-                
-                # Trend
-                if close > ema_200:
-                    trend = "🐂 BULL" if ema_20 > ema_50 else "📈 UP-Weak"
-                else:
-                    trend = "🐻 BEAR" if ema_20 < ema_50 else "📉 DN-Weak"
-                
-                # Regime & Signal
-                market_data = {'dataframe': df, 'symbol': asset}
-                regime = MarketClassifier.classify(market_data)
-                strategy = StrategyFactory.get_strategy(asset, market_data)
-                
-                try:
-                    signal = await strategy.analyze(market_data)
-                except:
-                    signal = None
-                
-                if signal and signal.action not in ['HOLD', 'WAIT', None]:
-                    action_safe = html.escape(str(signal.action))
-                    signal_str = f"🚨 <b>{action_safe}</b> ({signal.confidence:.0%})"
+                if result.status == 'skipped':
+                    report_lines.append(f"• <code>{display}</code>: ⏳ Sin presupuesto REST (reintentar luego)")
+                    continue
+                if result.status == 'error':
+                    err_safe = html.escape(result.error[:20])
+                    report_lines.append(f"• <code>{display}</code>: ⚠️ Error: {err_safe}")
+                    continue
+
+                if result.fires:
+                    action_safe = html.escape(str(result.signal.action))
+                    signal_str = f"🚨 <b>{action_safe}</b> ({result.signal.confidence:.0%})"
                     signals_would_fire += 1
                 else:
                     signal_str = "💤 HOLD"
-                
-                display = html.escape(get_display_name(asset))
-                strat_safe = html.escape(strategy.name)
-                
-                report_lines.append(f"📌 <b>{tag}{display}</b> | <code>${close:,.2f}</code> | {trend}")
-                report_lines.append(f"   RSI: <code>{rsi:.1f}</code> | ADX: <code>{adx:.1f}</code> | ATR: <code>{atr_pct:.2f}%</code>")
-                report_lines.append(f"   EMA200: <code>${ema_200:,.2f}</code> | BB-W: <code>{bb_width:.1f}%</code>")
-                report_lines.append(f"   ⚙️ {regime} | {strat_safe} → {signal_str}")
+
+                tag = "⛔ " if result.symbol in DISABLED_ASSETS else ""
+                strat_safe = html.escape(result.strategy or "-")
+                report_lines.append(f"📌 <b>{tag}{display}</b> | <code>${result.close:,.2f}</code> | {trend_labels.get(result.trend, result.trend)}")
+                report_lines.append(f"   RSI: <code>{result.rsi:.1f}</code> | ADX: <code>{result.adx:.1f}</code> | ATR: <code>{result.atr_pct:.2f}%</code>")
+                report_lines.append(f"   EMA200: <code>${result.ema_200:,.2f}</code> | BB-W: <code>{result.bb_width:.1f}%</code>")
+                report_lines.append(f"   ⚙️ {result.regime} | {strat_safe} → {signal_str}")
                 report_lines.append("")
-                
-            except Exception as e:
-                display = html.escape(get_display_name(asset))
-                err_safe = html.escape(str(e)[:20])
-                report_lines.append(f"• <code>{display}</code>: ⚠️ Error: {err_safe}")
+            await publish([f"⏳ <i>{group_name}: {done}/{total}...</i>"])
+
+        await scanner.scan(assets, timeframe='15m', limit=250, on_chunk=on_chunk)
+        total_assets += len(assets)
     
     # Summary
-    report_lines.append("━" * 20)
-    report_lines.append(f"🏁 <b>Total Escaneado:</b> {total_assets} Activos")
-    report_lines.append(f"🔥 <b>Señales Potenciales:</b> {signals_would_fire}")
-    
-    # Chunk and send
-    chunks = []
-    current_chunk = ""
-    for line in report_lines:
-        if len(current_chunk) + len(line) + 1 > 2500:
-            chunks.append(current_chunk)
-            current_chunk = line + "\n"
-        else:
-            current_chunk += line + "\n"
-    if current_chunk:
-        chunks.append(current_chunk)
-    
-    await message.edit_text(chunks[0], parse_mode="HTML")
-    for chunk in chunks[1:]:
-        await message.answer(chunk, parse_mode="HTML")
-        await asyncio.sleep(0.3)
+    await publish([
+        "━" * 20,
+        f"🏁 <b>Total Escaneado:</b> {total_assets} Activos",
+        f"🔥 <b>Señales Potenciales:</b> {signals_would_fire}",
+    ])
 
 
 
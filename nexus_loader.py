@@ -25,7 +25,7 @@ from dotenv import load_dotenv
 # except ImportError:
 #     print("⚠️  Compatibility imports not found - some features may not work")
 
-from servos.db import get_user_name
+from servos.db_async import nexus_db
 from servos.media_manager import MediaManager
 from servos.voight_kampff import voight_kampff as nexus_logger
 
@@ -139,7 +139,6 @@ class SessionMiddleware(BaseMiddleware):
 
 
 # --- GATEKEEPER MIDDLEWARE (Auth) ---
-from servos.db import get_user_role
 
 class GatekeeperMiddleware(BaseMiddleware):
     """
@@ -165,7 +164,7 @@ class GatekeeperMiddleware(BaseMiddleware):
             
         if user and chat_id:
             # Check DB / ENV
-            allowed, role = get_user_role(str(user.id))
+            allowed, role = await nexus_db.get_user_role(str(user.id))
             
             if not allowed:
                 # REJECTION LOGIC
@@ -222,13 +221,426 @@ cooldown_manager = DynamicCooldownManager(default_cooldown=300)  # 5 min default
 # This is CRITICAL for signal filtering to work correctly
 from system_directive import STRATEGY_CONFIG_MAP as STRATEGY_NAME_TO_CONFIG_KEY
 
+# === SESSION FAN-OUT ===
+# symbol -> interested sessions index + bounded concurrent delivery
+from servos.session_index import get_dispatch_budget, resolve_asset_group
+
+async def _dispatch_to_session(bot: Bot, session, symbol: str, side: str, price, strategy: str,
+                               strategy_config_key: str, reason: str, atr,
+                               asset_group: str = None, asset_subgroup: str = None):
+    """
+    Deliver a signal to one session (filters, routing, WATCHER/COPILOT/PILOT handling).
+    Exchange calls run under the per-exchange dispatch budget.
+
+    Returns the exchange that processed the signal, or None if the session skipped it.
+    """
+    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+
+    budget = get_dispatch_budget()
+
+    # --- FILTER: Strategy Enabled? ---
+    if not session.is_strategy_enabled(strategy_config_key):
+        logger.info(f"⏭️ {session.chat_id}: Estrategia {strategy_config_key} deshabilitada", group=True)
+        return None
+
+    # --- FILTER: Group Enabled? ---
+    if asset_group and not session.is_group_enabled(asset_group):
+        logger.info(f"⏭️ {session.chat_id}: Grupo {asset_group} deshabilitado", group=True)
+        return None
+
+    # --- FILTER: Subgroup Enabled? (for CRYPTO assets) ---
+    if asset_subgroup and not session.is_group_enabled(asset_subgroup):
+        logger.info(f"⏭️ {session.chat_id}: Subgrupo {asset_subgroup} deshabilitado para {symbol}", group=True)
+        return None
+
+    # --- FILTER: Exchange Available for CRYPTO assets? ---
+    # For CRYPTO assets, check if user has enabled at least one crypto exchange
+    if asset_group == 'CRYPTO':
+        user_exchange_prefs = session.get_exchange_preferences()
+        crypto_exchanges_available = user_exchange_prefs.get('BINANCE', False) or user_exchange_prefs.get('BYBIT', False)
+        if not crypto_exchanges_available:
+            logger.info(f"⏭️ {session.chat_id}: No hay exchanges crypto habilitados para {symbol}", group=True)
+            return None
+
+    # --- ENHANCED FILTER: Exchange Available and Enabled? ---
+    # Check if user has the required exchange connected AND enabled in preferences
+
+    # Determine target exchange for this session/symbol combination
+    user_exchange_prefs = session.get_exchange_preferences()
+    target_exchange = session.bridge._route_symbol(symbol, user_exchange_prefs) if session.bridge else 'BINANCE'
+    
+    # Per-exchange cooldown check
+    if cooldown_manager.is_on_cooldown(symbol, target_exchange):
+        logger.info(f"⏳ {session.chat_id}: {symbol} omitido en {target_exchange} (cooldown)", group=True)
+        return None
+
+    user_exchange_prefs = session.get_exchange_preferences()
+
+    if not user_exchange_prefs.get(target_exchange, False):
+        logger.info(f"⏭️ {session.chat_id}: Exchange {target_exchange} deshabilitado en preferencias para {symbol}", group=True)
+        return None
+
+    # Double-check adapter connectivity
+    if not hasattr(session, 'bridge') or not session.bridge or target_exchange not in session.bridge.adapters:
+        logger.info(f"⏭️ {session.chat_id}: Exchange {target_exchange} no conectado para {symbol}", group=True)
+        return None
+
+    # --- FILTER: Blacklisted? ---
+    if session.is_asset_disabled(symbol):
+        logger.info(f"⏭️ {session.chat_id}: Asset {symbol} en blacklist", group=True)
+        return None
+        
+    try:
+        mode = session.mode
+        p_key = session.config.get('personality', 'STANDARD_ES')
+        user_name = await nexus_db.get_user_name(session.chat_id)
+
+        # --- FILTER: Sufficient Balance? ---
+        # Check liquidity on the SAME exchange we already routed to (critical in multi-exchange mode)
+        async with budget.exchange(target_exchange):
+            has_liquidity, available_balance, liquidity_msg = await session.check_liquidity(symbol, exchange=target_exchange)
+
+        # EXCHANGE FALLBACK LOGIC: If target exchange has insufficient balance,
+        # try to fallback to another available exchange with sufficient balance
+        if not has_liquidity and session.bridge:
+            original_exchange = target_exchange
+            user_prefs = session.get_exchange_preferences()
+
+            # For crypto symbols, try fallback between BINANCE ↔ BYBIT
+            if 'USDT' in symbol and target_exchange in ['BINANCE', 'BYBIT']:
+                fallback_exchange = 'BYBIT' if target_exchange == 'BINANCE' else 'BINANCE'
+
+                # Check if fallback exchange is available and has balance
+                if (fallback_exchange in user_prefs and user_prefs[fallback_exchange] and
+                    fallback_exchange in session.bridge.adapters):
+
+                    # Check liquidity on fallback exchange
+                    async with budget.exchange(fallback_exchange):
+                        fallback_liquidity, fallback_balance, _ = await session.check_liquidity(symbol, exchange=fallback_exchange)
+
+                    if fallback_liquidity:
+                        logger.info(f"🔄 {session.chat_id}: Fallback {symbol} de {original_exchange} → {fallback_exchange} (saldo insuficiente)", group=True)
+                        target_exchange = fallback_exchange
+                        has_liquidity, available_balance, liquidity_msg = fallback_liquidity, fallback_balance, f"Balance OK en {fallback_exchange}"
+                    else:
+                        logger.info(f"⚠️ {session.chat_id}: Fallback rechazado - {fallback_exchange} tampoco tiene saldo suficiente", group=True)
+
+        # Check balance per exchange - force WATCHER only for the exchange without balance
+        # Other exchanges with sufficient balance can still execute in PILOT/COPILOT mode
+        force_watcher_mode = not has_liquidity
+        if force_watcher_mode:
+            logger.info(f"⏭️ {session.chat_id}: Balance insuficiente para {symbol} en {target_exchange} - Forzando modo WATCHER solo para este exchange", group=True)
+
+        # Calculate SL/TP/TS preview
+        sl_prev, tp_prev, ts_prev = session.get_trade_preview(symbol, side, price) if price else (0, 0, 0)
+
+        # Use target_exchange already determined above
+        exchange_display = 'Binance' if 'BINANCE' in target_exchange else 'Bybit' if 'BYBIT' in target_exchange else 'Alpaca'
+
+        # Fetch Personality Data
+        profile = personality_manager.PROFILES.get(p_key, personality_manager.PROFILES.get('STANDARD_ES'))
+        title = profile.get('NAME', 'Nexus Bot')
+        quote = random.choice(profile.get('GREETING', ["Online."]))
+
+        # Determine effective mode (force WATCHER only if THIS exchange has insufficient balance)
+        effective_mode = 'WATCHER' if force_watcher_mode else mode
+
+        if effective_mode == 'WATCHER':
+            # Use personality message
+            if side == 'LONG':
+                msg = personality_manager.get_message(
+                    p_key, 'TRADE_LONG',
+                    asset=symbol, price=price, reason=reason,
+                    tp=tp_prev, sl=sl_prev, ts=ts_prev,
+                    title=title, quote=quote, strategy_name=strategy,
+                    user_name=user_name, exchange=exchange_display
+                )
+            else:
+                msg = personality_manager.get_message(
+                    p_key, 'TRADE_SHORT',
+                    asset=symbol, price=price, reason=reason,
+                    tp=tp_prev, sl=sl_prev, ts=ts_prev,
+                    title=title, quote=quote, strategy_name=strategy,
+                    user_name=user_name, exchange=exchange_display
+                )
+
+            # Add low balance warning if forced to watcher mode
+            if force_watcher_mode:
+                msg += f"\n\n{liquidity_msg}"
+
+            await safe_send_message(bot, session.chat_id, msg, parse_mode="Markdown")
+
+        elif effective_mode == 'COPILOT':
+            # Safe casting to float to avoid "Unknown format code 'f' for object of type 'str'"
+            safe_price = float(price) if price is not None else 0.0
+            safe_tp = float(tp_prev) if tp_prev is not None else 0.0
+            safe_sl = float(sl_prev) if sl_prev is not None else 0.0
+            safe_ts = float(ts_prev) if ts_prev is not None else 0.0
+
+            if side == 'LONG':
+                msg = personality_manager.get_message(
+                    p_key, 'TRADE_LONG',
+                    asset=symbol, price=safe_price, reason=reason,
+                    tp=safe_tp, sl=safe_sl, ts=safe_ts,
+                    title=title, quote=quote, strategy_name=strategy,
+                    user_name=user_name, exchange=exchange_display
+                )
+            else:
+                msg = personality_manager.get_message(
+                    p_key, 'TRADE_SHORT',
+                    asset=symbol, price=safe_price, reason=reason,
+                    tp=safe_tp, sl=safe_sl, ts=safe_ts,
+                    title=title, quote=quote, strategy_name=strategy,
+                    user_name=user_name, exchange=exchange_display
+                )
+
+            # Change header for COPILOT mode
+            msg = msg.replace("📢 SIGNAL TRADE TRIGGER 🤖", "🚨 CO-PILOT TRADE TRIGGER 🤖")
+
+            # Add low balance warning if forced to copilot mode
+            if force_watcher_mode:
+                msg += f"\n\n{liquidity_msg}"
+
+            keyboard = InlineKeyboardMarkup(inline_keyboard=[
+                [
+                    InlineKeyboardButton(
+                        text="✅ Execute Protocol",
+                        callback_data=f"TRADE|ACCEPT|{symbol}|{side}|{strategy}"
+                    ),
+                    InlineKeyboardButton(
+                        text="❌ Abort",
+                        callback_data=f"TRADE|REJECT|{symbol}|{side}|{strategy}"
+                    )
+                ]
+            ])
+            await safe_send_message(bot, session.chat_id, msg,
+                reply_markup=keyboard,
+                parse_mode="Markdown"
+            )
+
+        elif effective_mode == 'PILOT':
+            # If forced to watcher mode due to low balance, show signal without executing
+            if force_watcher_mode:
+                # Show signal like WATCHER mode but with PILOT context
+                if side == 'LONG':
+                    msg = personality_manager.get_message(
+                        p_key, 'TRADE_LONG',
+                        asset=symbol, price=price, reason=reason,
+                        tp=tp_prev, sl=sl_prev, ts=ts_prev,
+                        title=title, quote=quote, strategy_name=strategy,
+                        user_name=user_name, exchange=exchange_display
+                    )
+                else:
+                    msg = personality_manager.get_message(
+                        p_key, 'TRADE_SHORT',
+                        asset=symbol, price=price, reason=reason,
+                        tp=tp_prev, sl=sl_prev, ts=ts_prev,
+                        title=title, quote=quote, strategy_name=strategy,
+                        user_name=user_name, exchange=exchange_display
+                    )
+
+                # Add specific message for PILOT forced to watcher
+                msg += f"\n\n{liquidity_msg}\n\n⚠️ **Modo PILOT suspendido temporalmente por bajo saldo**"
+
+                await safe_send_message(bot, session.chat_id, msg, parse_mode="Markdown")
+                return None
+
+            # Normal PILOT execution
+            # Check if position already exists - DON'T trigger update on every signal
+            # Check if position already exists
+            try:
+                async with budget.exchange(target_exchange):
+                    positions = await session.get_active_positions()
+                existing_pos = next((p for p in positions if p['symbol'] == symbol), None)
+
+                if existing_pos:
+                    # Check for Reversal / Flip opportunity
+                    existing_amt = float(existing_pos.get('amt', 0))
+                    is_existing_long = existing_amt > 0
+                    is_signal_long = (side == 'LONG')
+
+                    if is_existing_long == is_signal_long:
+                         logger.info(f"⏭️ {symbol}: Posición {side} activa, omitiendo", group=True)
+                         return None
+                    else:
+                         logger.info(f"🔄 FLIP: {symbol} {'LONG→SHORT' if is_existing_long else 'SHORT→LONG'}", group=True)
+                         # Proceed to execution (trading_manager handles the flip)
+            except:
+                pass  # If check fails, proceed with trade attempt
+
+            # Auto-execute (no "entering pilot mode" message)
+            # Force execution on the already-determined target_exchange to avoid re-routing
+            try:
+                if side == 'LONG':
+                    async with budget.exchange(target_exchange):
+                        success, result = await session.execute_long_position(symbol, atr=atr, strategy=strategy, force_exchange=target_exchange)
+                else:
+                    async with budget.exchange(target_exchange):
+                        success, result = await session.execute_short_position(symbol, atr=atr, strategy=strategy, force_exchange=target_exchange)
+
+                # Validate return values to prevent None formatting errors
+                if not isinstance(success, bool) or result is None:
+                    logger.error(f"Invalid return from execute_{side.lower()}_position for {symbol}: success={success}, result={result}")
+                    success, result = False, "Invalid function return (None or non-boolean success)"
+
+            except Exception as exec_error:
+                logger.error(f"Exception during execute_{side.lower()}_position for {symbol}: {exec_error}")
+                success, result = False, f"Execution Exception: {str(exec_error)}"
+
+            if success:
+                logger.info(f"✅ Position executed successfully: {symbol} {side} on {target_exchange}")
+                logger.info(f"✅ Position executed successfully: {symbol} {side} on {target_exchange}")
+                # Build enhanced AUTOPILOT message
+                timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+                
+                # Determine exchange based on Bridge routing
+                if 'USDT' not in symbol:
+                    exchange = "Alpaca"
+                else:
+                    # Use Bridge routing if available
+                    if session.bridge:
+                        routed_exchange = session.bridge._route_symbol(symbol)
+                        exchange = routed_exchange.title()  # BYBIT -> Bybit
+                    elif session.config.get('primary_exchange', 'BINANCE') == 'BYBIT':
+                        exchange = "Bybit"
+                    else:
+                        exchange = "Binance"
+
+                
+                # Direction styling
+                direction = "🟢 LONG (Activo)" if side == 'LONG' else "🔴 SHORT (Activo)"
+                
+                # Format prices safely with smart decimals for low-value assets
+                def smart_price_format(p):
+                    """Format price with appropriate decimals based on magnitude."""
+                    if p is None or p == 0:
+                        return "N/A"
+                    pf = float(p)
+                    if pf >= 1000:
+                        return f"${pf:,.2f}"
+                    elif pf >= 1:
+                        return f"${pf:.4f}"
+                    elif pf >= 0.01:
+                        return f"${pf:.5f}"
+                    else:
+                        return f"${pf:.6f}"
+                
+                price_str = smart_price_format(price)
+                ts_str = smart_price_format(ts_prev)
+                tp_str = smart_price_format(tp_prev)
+                sl_str = smart_price_format(sl_prev)
+
+                # Format other variables safely
+                formatted_quote = str(quote).rstrip('.!?,;:') if quote else "Online."
+                safe_user_name = str(user_name) if user_name else "Trader"
+                safe_title = str(title) if title else "Nexus Bot"
+                safe_symbol = str(symbol) if symbol else "UNKNOWN"
+                safe_exchange = str(exchange) if exchange else "Unknown"
+                safe_direction = str(direction) if direction else "UNKNOWN"
+                
+                caption = (
+                    f"⚡ AUTOPILOT ENGAGED 🤖\n"
+                    f"🕐 `{timestamp}`\n\n"
+                    f"\"{formatted_quote}, *{safe_user_name}*.\"\n"
+                    f"{safe_title}\n\n"
+                    f"*Activo:* `{safe_symbol}`\n"
+                    f"*Exchange:* {safe_exchange}\n"
+                    f"*Dirección:* {safe_direction}\n"
+                    f"*Estrategia:* {strategy}\n"
+                    f"*Precio Actual:* {price_str}\n\n"
+                    f"💸 *TS:* {ts_str}\n"
+                    f"🎯 *TP:* {tp_str}\n"
+                    f"🛑 *SL:* {sl_str}\n\n"
+                    f"*Parámetros:*\n"
+                    f"`{reason}`"
+                )
+                
+                await safe_send_message(bot, session.chat_id, caption, parse_mode="Markdown")
+
+                # Check circuit breaker after trade
+                cb_triggered, cb_msg = await session.check_circuit_breaker()
+                if cb_triggered:
+                    cb_alert = personality_manager.get_message(p_key, 'CB_TRIGGER')
+                    await safe_send_message(bot, session.chat_id, cb_alert, parse_mode="Markdown")
+            else:
+                logger.info(f"❌ Position execution failed: {symbol} {side} on {target_exchange} - Result: {result}")
+                # Only log errors, don't spam user with cooldown messages
+                ignore_phrases = ["Wait", "cooldown", "duplicate", "Alpaca Client not initialized", "SILENT_REJECTION", "Cupo lleno"]
+                
+                if any(x in result for x in ignore_phrases):
+                    return None
+
+                # Determine exchange for error messages using Bridge routing
+                if 'USDT' not in symbol:
+                    error_exchange = "Alpaca"
+                elif session.bridge:
+                    error_exchange = session.bridge._route_symbol(symbol).title()
+                elif session.config.get('primary_exchange', 'BINANCE') == 'BYBIT':
+                    error_exchange = "Bybit"
+                else:
+                    error_exchange = "Binance"
+
+                
+                # Handle Margin Insufficient errors with friendly message
+                if "INSUFFICIENT_MARGIN" in result or "Margin is insufficient" in result:
+                    await safe_send_message(bot, session.chat_id,
+                        f"⚠️ No se ejecutó operación automática para *{symbol}* "
+                        f"en el exchange *{error_exchange}* por fondos insuficientes ⚠️",
+                        parse_mode="Markdown"
+                    )
+                
+                # Special handling for "Insufficient capital" (Min Notional)
+                elif "MIN_NOTIONAL" in result or "Insufficient capital" in result:
+                    # 1. Trigger Long Cooldown (1 hour) to stop spam (scoped to exchange + strategy)
+                    cooldown_manager.set_cooldown(symbol, seconds=3600, exchange=target_exchange, strategy=strategy)
+
+                    # 2. SILENCED: No notification sent to chat (user requested silence for min notional warnings)
+                    # Cooldown applied but no spam to user chat
+                    logger.debug(f"💰 Min notional cooldown applied: {symbol} on {target_exchange} (1 hour) - SILENCED")
+                
+                else:
+                    # Filter out balance/insufficient funds errors to avoid spam
+                    balance_error_phrases = [
+                        "ab not enough for new order",  # Bybit insufficient balance
+                        "insufficient balance",  # Generic insufficient balance
+                        "not enough",  # Various "not enough" messages
+                        "balance",  # Any message containing "balance"
+                        "funds",  # Any message containing "funds"
+                        "INSUFFICIENT_MARGIN",  # Already handled above but extra filter
+                        "MIN_NOTIONAL",  # Already handled above but extra filter
+                        "Flip Aborted",  # Position flip failures
+                        "failed to close",  # Position closing failures
+                        "after 3 attempts",  # Retry failures
+                        "retCode\":110007",  # Bybit insufficient balance error code
+                        "retMsg\":\"ab not enough",  # Bybit specific error message
+                        "Bridge Error",  # All bridge errors (usually balance related)
+                    ]
+
+                    is_balance_error = any(phrase.lower() in result.lower() for phrase in balance_error_phrases)
+
+                    if not is_balance_error:
+                        # Safe formatting to handle None values
+                        result_str = str(result) if result is not None else "Unknown Error (None)"
+                        await safe_send_message(bot, session.chat_id,
+                            f"❌ Effector Error: {result_str}",
+                            parse_mode=None
+                        )
+                    else:
+                        # Log balance errors but don't spam the chat
+                        logger.info(f"💰 Balance error filtered (not sent to chat): {symbol} on {target_exchange} - {result}")
+                
+        return target_exchange
+    except Exception as e:
+        logger.error(f"Synapse dispatch error for {session.chat_id}: {e}")
+
 async def dispatch_nexus_signal(bot: Bot, signal, session_manager):
     """
     Dispatch trading signals from NexusCore to all active sessions.
     The 'Synapse' dispatch system.
+
+    Only sessions indexed as interested in the symbol are visited, and they
+    are processed concurrently (see servos.session_index).
     """
-    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-    
     symbol = signal.symbol
     action = signal.action.upper()  # BUY, SELL, HOLD
     confidence = getattr(signal, 'confidence', 0.5)
@@ -271,45 +683,52 @@ async def dispatch_nexus_signal(bot: Bot, signal, session_manager):
     # Map action to side
     side = 'LONG' if action == 'BUY' else 'SHORT'
 
-    # === AI FILTER: Intelligent Signal Filtering ===
-    # Apply AI-powered filtering based on market sentiment
-    signal_data = {
-        'symbol': symbol,
-        'side': side,
-        'entry_price': price,
-        'strategy': strategy,
-        'confidence': confidence,
-        'timestamp': datetime.now().isoformat()
-    }
-
-    # Check if any active session has AI Filter enabled
-    ai_filter_applied = False
-    filter_reason = ""
-    filter_analysis = {}
-
-    for session in session_manager.get_all_sessions():
-        if session.config.get('sentiment_filter', True):  # AI Filter enabled
-            try:
-                from servos.ai_filter import should_filter_signal
-                should_filter, reason, analysis = await should_filter_signal(signal_data, session.config)
+    # Sessions that can act on this symbol (group/subgroup enabled, not blacklisted)
+    targets = session_manager.index.signal_sessions(symbol)
+    if not targets:
+        logger.debug(f"📭 Signal for {symbol} not dispatched (no interested sessions)")
+        return
 
+    # === AI FILTER: Intelligent Signal Filtering ===
+    # The market analysis does not depend on the session: it runs once per
+    # (symbol, side, candle) and each session only applies its own policy
+    # (on/off, threshold) to the shared result.
+    if any(session.config.get('sentiment_filter', True) for session in targets):
+        signal_data = {
+            'symbol': symbol,
+            'side': side,
+            'entry_price': price,
+            'strategy': strategy,
+            'confidence': confidence,
+            'candle_time': getattr(signal, 'candle_time', None),
+            'timestamp': datetime.now().isoformat()
+        }
+        try:
+            from servos.ai_filter import analyze_signal, apply_filter_policy
+            filter_analysis = await analyze_signal(signal_data)
+            allowed = []
+            for session in targets:
+                should_filter, reason, _ = apply_filter_policy(filter_analysis, session.config)
                 if should_filter:
-                    logger.warning(f"🚫 AI FILTER BLOCKED: {symbol} {side} | Reason: {reason}", group=True)
-                    ai_filter_applied = True
-                    filter_reason = reason
-                    filter_analysis = analysis
-                    break  # Si una sesión filtra, bloqueamos para todas
-
-            except Exception as e:
-                logger.error(f"❌ AI Filter error for {symbol}: {e}")
-                # Continue without filtering on error (fail-safe)
-
-    if ai_filter_applied:
-        # Log detailed analysis for monitoring
-        logger.info(f"📊 AI Filter Analysis: {symbol} | Fear/Greed: {filter_analysis.get('sentiment_data', {}).get('fear_greed', {}).get('value', 'N/A')} | "
-                   f"Volatility: {filter_analysis.get('sentiment_data', {}).get('volatility', {}).get('classification', 'N/A')} | "
-                   f"Momentum: {filter_analysis.get('sentiment_data', {}).get('momentum', {}).get('direction', 'N/A')}", group=False)
-        return  # Signal blocked by AI Filter
+                    block_reason = reason
+                    logger.debug(f"🚫 AI FILTER BLOCKED for {session.chat_id}: {symbol} {side}")
+                else:
+                    allowed.append(session)
+        except Exception as e:
+            logger.error(f"❌ AI Filter error for {symbol}: {e}")
+            allowed = targets  # Continue without filtering on error (fail-safe)
+
+        if len(allowed) < len(targets):
+            sentiment = filter_analysis.get('sentiment_data', {})
+            logger.warning(f"🚫 AI FILTER BLOCKED: {symbol} {side} for {len(targets) - len(allowed)}/{len(targets)} sessions | "
+                           f"Reason: {block_reason}", group=True)
+            # Log detailed analysis for monitoring
+            logger.info(f"📊 AI Filter Analysis: {symbol} | Fear/Greed: {sentiment.get('fear_greed', {}).get('value', 'N/A')} | "
+                       f"Volatility: {sentiment.get('volatility', {}).get('classification', 'N/A')} | "
+                       f"Momentum: {sentiment.get('momentum', {}).get('direction', 'N/A')}", group=False)
+        targets = allowed
+        if not targets:
+            return  # Signal blocked by AI Filter for every session
 
     # Map strategy name to config key for filtering
     strategy_config_key = STRATEGY_NAME_TO_CONFIG_KEY.get(strategy, strategy.upper())
@@ -321,423 +740,26 @@ async def dispatch_nexus_signal(bot: Bot, signal, session_manager):
     
     logger.info(f"📡 Signal: {action} {symbol} (Conf: {confidence:.0%}, {strategy})", group=True)
     
-    # Dispatch to all sessions with enhanced multi-exchange filtering
-    from system_directive import ASSET_GROUPS
-
     # Determine Asset Group and Subgroup
-    asset_group = None
-    asset_subgroup = None
-
-    # First check main groups
-    for group_name, assets in ASSET_GROUPS.items():
-        if symbol in assets:
-            asset_group = group_name
-            break
-
-    # If it's a crypto asset, determine the thematic subgroup
-    if asset_group == 'CRYPTO':
-        for subgroup_name, assets in CRYPTO_SUBGROUPS.items():
-            if symbol in assets:
-                asset_subgroup = subgroup_name
-                break
-
-    # For CRYPTO assets, determine target exchange based on user preferences
-    # This will be handled later in the session filtering logic
+    asset_group, asset_subgroup = resolve_asset_group(symbol)
 
-    # Track if at least one session processed the signal (per-exchange)
-    processed_exchanges = set()
+    # For CRYPTO assets, the target exchange is resolved per session in _dispatch_to_session
     atr = getattr(signal, 'atr', None)
 
-    for session in session_manager.get_all_sessions():
-        # --- FILTER: Strategy Enabled? ---
-        if not session.is_strategy_enabled(strategy_config_key):
-            logger.info(f"⏭️ {session.chat_id}: Estrategia {strategy_config_key} deshabilitada", group=True)
-            continue
-
-        # --- FILTER: Group Enabled? ---
-        if asset_group and not session.is_group_enabled(asset_group):
-            logger.info(f"⏭️ {session.chat_id}: Grupo {asset_group} deshabilitado", group=True)
-            continue
-
-        # --- FILTER: Subgroup Enabled? (for CRYPTO assets) ---
-        if asset_subgroup and not session.is_group_enabled(asset_subgroup):
-            logger.info(f"⏭️ {session.chat_id}: Subgrupo {asset_subgroup} deshabilitado para {symbol}", group=True)
-            continue
-
-        # --- FILTER: Exchange Available for CRYPTO assets? ---
-        # For CRYPTO assets, check if user has enabled at least one crypto exchange
-        if asset_group == 'CRYPTO':
-            user_exchange_prefs = session.get_exchange_preferences()
-            crypto_exchanges_available = user_exchange_prefs.get('BINANCE', False) or user_exchange_prefs.get('BYBIT', False)
-            if not crypto_exchanges_available:
-                logger.info(f"⏭️ {session.chat_id}: No hay exchanges crypto habilitados para {symbol}", group=True)
-                continue
-
-        # --- ENHANCED FILTER: Exchange Available and Enabled? ---
-        # Check if user has the required exchange connected AND enabled in preferences
-
-        # Determine target exchange for this session/symbol combination
-        user_exchange_prefs = session.get_exchange_preferences()
-        target_exchange = session.bridge._route_symbol(symbol, user_exchange_prefs) if session.bridge else 'BINANCE'
-        
-        # Per-exchange cooldown check
-        if cooldown_manager.is_on_cooldown(symbol, target_exchange):
-            logger.info(f"⏳ {session.chat_id}: {symbol} omitido en {target_exchange} (cooldown)", group=True)
-            continue
-
-        user_exchange_prefs = session.get_exchange_preferences()
-
-        if not user_exchange_prefs.get(target_exchange, False):
-            logger.info(f"⏭️ {session.chat_id}: Exchange {target_exchange} deshabilitado en preferencias para {symbol}", group=True)
-            continue
-
-        # Double-check adapter connectivity
-        if not hasattr(session, 'bridge') or not session.bridge or target_exchange not in session.bridge.adapters:
-            logger.info(f"⏭️ {session.chat_id}: Exchange {target_exchange} no conectado para {symbol}", group=True)
-            continue
-
-        # --- FILTER: Blacklisted? ---
-        if session.is_asset_disabled(symbol):
-            logger.info(f"⏭️ {session.chat_id}: Asset {symbol} en blacklist", group=True)
-            continue
-            
-        try:
-            mode = session.mode
-            p_key = session.config.get('personality', 'STANDARD_ES')
-            user_name = get_user_name(session.chat_id)
-
-            # --- FILTER: Sufficient Balance? ---
-            # Check liquidity on the SAME exchange we already routed to (critical in multi-exchange mode)
-            has_liquidity, available_balance, liquidity_msg = await session.check_liquidity(symbol, exchange=target_exchange)
-
-            # EXCHANGE FALLBACK LOGIC: If target exchange has insufficient balance,
-            # try to fallback to another available exchange with sufficient balance
-            if not has_liquidity and session.bridge:
-                original_exchange = target_exchange
-                user_prefs = session.get_exchange_preferences()
-
-                # For crypto symbols, try fallback between BINANCE ↔ BYBIT
-                if 'USDT' in symbol and target_exchange in ['BINANCE', 'BYBIT']:
-                    fallback_exchange = 'BYBIT' if target_exchange == 'BINANCE' else 'BINANCE'
-
-                    # Check if fallback exchange is available and has balance
-                    if (fallback_exchange in user_prefs and user_prefs[fallback_exchange] and
-                        fallback_exchange in session.bridge.adapters):
-
-                        # Check liquidity on fallback exchange
-                        fallback_liquidity, fallback_balance, _ = await session.check_liquidity(symbol, exchange=fallback_exchange)
-
-                        if fallback_liquidity:
-                            logger.info(f"🔄 {session.chat_id}: Fallback {symbol} de {original_exchange} → {fallback_exchange} (saldo insuficiente)", group=True)
-                            target_exchange = fallback_exchange
-                            has_liquidity, available_balance, liquidity_msg = fallback_liquidity, fallback_balance, f"Balance OK en {fallback_exchange}"
-                        else:
-                            logger.info(f"⚠️ {session.chat_id}: Fallback rechazado - {fallback_exchange} tampoco tiene saldo suficiente", group=True)
-
-            # Check balance per exchange - force WATCHER only for the exchange without balance
-            # Other exchanges with sufficient balance can still execute in PILOT/COPILOT mode
-            force_watcher_mode = not has_liquidity
-            if force_watcher_mode:
-                logger.info(f"⏭️ {session.chat_id}: Balance insuficiente para {symbol} en {target_exchange} - Forzando modo WATCHER solo para este exchange", group=True)
-
-            # Calculate SL/TP/TS preview
-            sl_prev, tp_prev, ts_prev = session.get_trade_preview(symbol, side, price) if price else (0, 0, 0)
-
-            # Use target_exchange already determined above
-            exchange_display = 'Binance' if 'BINANCE' in target_exchange else 'Bybit' if 'BYBIT' in target_exchange else 'Alpaca'
-
-            # Fetch Personality Data
-            profile = personality_manager.PROFILES.get(p_key, personality_manager.PROFILES.get('STANDARD_ES'))
-            title = profile.get('NAME', 'Nexus Bot')
-            quote = random.choice(profile.get('GREETING', ["Online."]))
-
-            # Determine effective mode (force WATCHER only if THIS exchange has insufficient balance)
-            effective_mode = 'WATCHER' if force_watcher_mode else mode
-
-            if effective_mode == 'WATCHER':
-                # Use personality message
-                if side == 'LONG':
-                    msg = personality_manager.get_message(
-                        p_key, 'TRADE_LONG',
-                        asset=symbol, price=price, reason=reason,
-                        tp=tp_prev, sl=sl_prev, ts=ts_prev,
-                        title=title, quote=quote, strategy_name=strategy,
-                        user_name=user_name, exchange=exchange_display
-                    )
-                else:
-                    msg = personality_manager.get_message(
-                        p_key, 'TRADE_SHORT',
-                        asset=symbol, price=price, reason=reason,
-                        tp=tp_prev, sl=sl_prev, ts=ts_prev,
-                        title=title, quote=quote, strategy_name=strategy,
-                        user_name=user_name, exchange=exchange_display
-                    )
-
-                # Add low balance warning if forced to watcher mode
-                if force_watcher_mode:
-                    msg += f"\n\n{liquidity_msg}"
-
-                await safe_send_message(bot, session.chat_id, msg, parse_mode="Markdown")
-
-            elif effective_mode == 'COPILOT':
-                # Safe casting to float to avoid "Unknown format code 'f' for object of type 'str'"
-                safe_price = float(price) if price is not None else 0.0
-                safe_tp = float(tp_prev) if tp_prev is not None else 0.0
-                safe_sl = float(sl_prev) if sl_prev is not None else 0.0
-                safe_ts = float(ts_prev) if ts_prev is not None else 0.0
-
-                if side == 'LONG':
-                    msg = personality_manager.get_message(
-                        p_key, 'TRADE_LONG',
-                        asset=symbol, price=safe_price, reason=reason,
-                        tp=safe_tp, sl=safe_sl, ts=safe_ts,
-                        title=title, quote=quote, strategy_name=strategy,
-                        user_name=user_name, exchange=exchange_display
-                    )
-                else:
-                    msg = personality_manager.get_message(
-                        p_key, 'TRADE_SHORT',
-                        asset=symbol, price=safe_price, reason=reason,
-                        tp=safe_tp, sl=safe_sl, ts=safe_ts,
-                        title=title, quote=quote, strategy_name=strategy,
-                        user_name=user_name, exchange=exchange_display
-                    )
-
-                # Change header for COPILOT mode
-                msg = msg.replace("📢 SIGNAL TRADE TRIGGER 🤖", "🚨 CO-PILOT TRADE TRIGGER 🤖")
-
-                # Add low balance warning if forced to copilot mode
-                if force_watcher_mode:
-                    msg += f"\n\n{liquidity_msg}"
-
-                keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                    [
-                        InlineKeyboardButton(
-                            text="✅ Execute Protocol",
-                            callback_data=f"TRADE|ACCEPT|{symbol}|{side}|{strategy}"
-                        ),
-                        InlineKeyboardButton(
-                            text="❌ Abort",
-                            callback_data=f"TRADE|REJECT|{symbol}|{side}|{strategy}"
-                        )
-                    ]
-                ])
-                await safe_send_message(bot, session.chat_id, msg,
-                    reply_markup=keyboard,
-                    parse_mode="Markdown"
-                )
-
-            elif effective_mode == 'PILOT':
-                # If forced to watcher mode due to low balance, show signal without executing
-                if force_watcher_mode:
-                    # Show signal like WATCHER mode but with PILOT context
-                    if side == 'LONG':
-                        msg = personality_manager.get_message(
-                            p_key, 'TRADE_LONG',
-                            asset=symbol, price=price, reason=reason,
-                            tp=tp_prev, sl=sl_prev, ts=ts_prev,
-                            title=title, quote=quote, strategy_name=strategy,
-                            user_name=user_name, exchange=exchange_display
-                        )
-                    else:
-                        msg = personality_manager.get_message(
-                            p_key, 'TRADE_SHORT',
-                            asset=symbol, price=price, reason=reason,
-                            tp=tp_prev, sl=sl_prev, ts=ts_prev,
-                            title=title, quote=quote, strategy_name=strategy,
-                            user_name=user_name, exchange=exchange_display
-                        )
-
-                    # Add specific message for PILOT forced to watcher
-                    msg += f"\n\n{liquidity_msg}\n\n⚠️ **Modo PILOT suspendido temporalmente por bajo saldo**"
-
-                    await safe_send_message(bot, session.chat_id, msg, parse_mode="Markdown")
-                    continue
-
-                # Normal PILOT execution
-                # Check if position already exists - DON'T trigger update on every signal
-                # Check if position already exists
-                try:
-                    positions = await session.get_active_positions()
-                    existing_pos = next((p for p in positions if p['symbol'] == symbol), None)
-
-                    if existing_pos:
-                        # Check for Reversal / Flip opportunity
-                        existing_amt = float(existing_pos.get('amt', 0))
-                        is_existing_long = existing_amt > 0
-                        is_signal_long = (side == 'LONG')
-
-                        if is_existing_long == is_signal_long:
-                             logger.info(f"⏭️ {symbol}: Posición {side} activa, omitiendo", group=True)
-                             continue
-                        else:
-                             logger.info(f"🔄 FLIP: {symbol} {'LONG→SHORT' if is_existing_long else 'SHORT→LONG'}", group=True)
-                             # Proceed to execution (trading_manager handles the flip)
-                except:
-                    pass  # If check fails, proceed with trade attempt
-
-                # Auto-execute (no "entering pilot mode" message)
-                # Force execution on the already-determined target_exchange to avoid re-routing
-                try:
-                    if side == 'LONG':
-                        success, result = await session.execute_long_position(symbol, atr=atr, strategy=strategy, force_exchange=target_exchange)
-                    else:
-                        success, result = await session.execute_short_position(symbol, atr=atr, strategy=strategy, force_exchange=target_exchange)
-
-                    # Validate return values to prevent None formatting errors
-                    if not isinstance(success, bool) or result is None:
-                        logger.error(f"Invalid return from execute_{side.lower()}_position for {symbol}: success={success}, result={result}")
-                        success, result = False, "Invalid function return (None or non-boolean success)"
-
-                except Exception as exec_error:
-                    logger.error(f"Exception during execute_{side.lower()}_position for {symbol}: {exec_error}")
-                    success, result = False, f"Execution Exception: {str(exec_error)}"
-
-                if success:
-                    logger.info(f"✅ Position executed successfully: {symbol} {side} on {target_exchange}")
-                    logger.info(f"✅ Position executed successfully: {symbol} {side} on {target_exchange}")
-                    # Build enhanced AUTOPILOT message
-                    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
-                    
-                    # Determine exchange based on Bridge routing
-                    if 'USDT' not in symbol:
-                        exchange = "Alpaca"
-                    else:
-                        # Use Bridge routing if available
-                        if session.bridge:
-                            routed_exchange = session.bridge._route_symbol(symbol)
-                            exchange = routed_exchange.title()  # BYBIT -> Bybit
-                        elif session.config.get('primary_exchange', 'BINANCE') == 'BYBIT':
-                            exchange = "Bybit"
-                        else:
-                            exchange = "Binance"
-
-                    
-                    # Direction styling
-                    direction = "🟢 LONG (Activo)" if side == 'LONG' else "🔴 SHORT (Activo)"
-                    
-                    # Format prices safely with smart decimals for low-value assets
-                    def smart_price_format(p):
-                        """Format price with appropriate decimals based on magnitude."""
-                        if p is None or p == 0:
-                            return "N/A"
-                        pf = float(p)
-                        if pf >= 1000:
-                            return f"${pf:,.2f}"
-                        elif pf >= 1:
-                            return f"${pf:.4f}"
-                        elif pf >= 0.01:
-                            return f"${pf:.5f}"
-                        else:
-                            return f"${pf:.6f}"
-                    
-                    price_str = smart_price_format(price)
-                    ts_str = smart_price_format(ts_prev)
-                    tp_str = smart_price_format(tp_prev)
-                    sl_str = smart_price_format(sl_prev)
-
-                    # Format other variables safely
-                    formatted_quote = str(quote).rstrip('.!?,;:') if quote else "Online."
-                    safe_user_name = str(user_name) if user_name else "Trader"
-                    safe_title = str(title) if title else "Nexus Bot"
-                    safe_symbol = str(symbol) if symbol else "UNKNOWN"
-                    safe_exchange = str(exchange) if exchange else "Unknown"
-                    safe_direction = str(direction) if direction else "UNKNOWN"
-                    
-                    caption = (
-                        f"⚡ AUTOPILOT ENGAGED 🤖\n"
-                        f"🕐 `{timestamp}`\n\n"
-                        f"\"{formatted_quote}, *{safe_user_name}*.\"\n"
-                        f"{safe_title}\n\n"
-                        f"*Activo:* `{safe_symbol}`\n"
-                        f"*Exchange:* {safe_exchange}\n"
-                        f"*Dirección:* {safe_direction}\n"
-                        f"*Estrategia:* {strategy}\n"
-                        f"*Precio Actual:* {price_str}\n\n"
-                        f"💸 *TS:* {ts_str}\n"
-                        f"🎯 *TP:* {tp_str}\n"
-                        f"🛑 *SL:* {sl_str}\n\n"
-                        f"*Parámetros:*\n"
-                        f"`{reason}`"
-                    )
-                    
-                    await safe_send_message(bot, session.chat_id, caption, parse_mode="Markdown")
-
-                    # Check circuit breaker after trade
-                    cb_triggered, cb_msg = await session.check_circuit_breaker()
-                    if cb_triggered:
-                        cb_alert = personality_manager.get_message(p_key, 'CB_TRIGGER')
-                        await safe_send_message(bot, session.chat_id, cb_alert, parse_mode="Markdown")
-                else:
-                    logger.info(f"❌ Position execution failed: {symbol} {side} on {target_exchange} - Result: {result}")
-                    # Only log errors, don't spam user with cooldown messages
-                    ignore_phrases = ["Wait", "cooldown", "duplicate", "Alpaca Client not initialized", "SILENT_REJECTION", "Cupo lleno"]
-                    
-                    if any(x in result for x in ignore_phrases):
-                        continue
-
-                    # Determine exchange for error messages using Bridge routing
-                    if 'USDT' not in symbol:
-                        error_exchange = "Alpaca"
-                    elif session.bridge:
-                        error_exchange = session.bridge._route_symbol(symbol).title()
-                    elif session.config.get('primary_exchange', 'BINANCE') == 'BYBIT':
-                        error_exchange = "Bybit"
-                    else:
-                        error_exchange = "Binance"
-
-                    
-                    # Handle Margin Insufficient errors with friendly message
-                    if "INSUFFICIENT_MARGIN" in result or "Margin is insufficient" in result:
-                        await safe_send_message(bot, session.chat_id,
-                            f"⚠️ No se ejecutó operación automática para *{symbol}* "
-                            f"en el exchange *{error_exchange}* por fondos insuficientes ⚠️",
-                            parse_mode="Markdown"
-                        )
-                    
-                    # Special handling for "Insufficient capital" (Min Notional)
-                    elif "MIN_NOTIONAL" in result or "Insufficient capital" in result:
-                        # 1. Trigger Long Cooldown (1 hour) to stop spam (scoped to exchange + strategy)
-                        cooldown_manager.set_cooldown(symbol, seconds=3600, exchange=target_exchange, strategy=strategy)
-
-                        # 2. SILENCED: No notification sent to chat (user requested silence for min notional warnings)
-                        # Cooldown applied but no spam to user chat
-                        logger.debug(f"💰 Min notional cooldown applied: {symbol} on {target_exchange} (1 hour) - SILENCED")
-                    
-                    else:
-                        # Filter out balance/insufficient funds errors to avoid spam
-                        balance_error_phrases = [
-                            "ab not enough for new order",  # Bybit insufficient balance
-                            "insufficient balance",  # Generic insufficient balance
-                            "not enough",  # Various "not enough" messages
-                            "balance",  # Any message containing "balance"
-                            "funds",  # Any message containing "funds"
-                            "INSUFFICIENT_MARGIN",  # Already handled above but extra filter
-                            "MIN_NOTIONAL",  # Already handled above but extra filter
-                            "Flip Aborted",  # Position flip failures
-                            "failed to close",  # Position closing failures
-                            "after 3 attempts",  # Retry failures
-                            "retCode\":110007",  # Bybit insufficient balance error code
-                            "retMsg\":\"ab not enough",  # Bybit specific error message
-                            "Bridge Error",  # All bridge errors (usually balance related)
-                        ]
-
-                        is_balance_error = any(phrase.lower() in result.lower() for phrase in balance_error_phrases)
-
-                        if not is_balance_error:
-                            # Safe formatting to handle None values
-                            result_str = str(result) if result is not None else "Unknown Error (None)"
-                            await safe_send_message(bot, session.chat_id,
-                                f"❌ Effector Error: {result_str}",
-                                parse_mode=None
-                            )
-                        else:
-                            # Log balance errors but don't spam the chat
-                            logger.info(f"💰 Balance error filtered (not sent to chat): {symbol} on {target_exchange} - {result}")
-                    
-            processed_exchanges.add(target_exchange)
-        except Exception as e:
-            logger.error(f"Synapse dispatch error for {session.chat_id}: {e}")
+    # Deliver to all interested sessions concurrently (bounded by the dispatch budget)
+    results = await get_dispatch_budget().gather(
+        _dispatch_to_session(
+            bot, session, symbol, side, price, strategy, strategy_config_key, reason, atr,
+            asset_group=asset_group, asset_subgroup=asset_subgroup
+        )
+        for session in targets
+    )
+    processed_exchanges = set()
+    for session, result in zip(targets, results):
+        if isinstance(result, Exception):
+            logger.error(f"Synapse dispatch error for {session.chat_id}: {result}")
+        elif result:
+            processed_exchanges.add(result)
     
     # Set cooldown ONLY for exchanges that processed the signal
     if processed_exchanges:
@@ -819,13 +841,12 @@ async def main():
     # Phase 3: Database & Persistence
     nexus_logger.phase_start(3, "DATABASE & PERSISTENCE", "🗄️")
 
-    # 3. Initialize Database (PostgreSQL)
+    # 3. Initialize Database (PostgreSQL connection pool)
     try:
-        from servos.db import init_db, load_bot_state
-        init_db()
+        await nexus_db.init_pool()
         
         # Load persisted strategies from DB
-        bot_state = load_bot_state()
+        bot_state = await nexus_db.load_bot_state()
         if bot_state:
             from system_directive import ENABLED_STRATEGIES, GROUP_CONFIG, DISABLED_ASSETS
             import system_directive as system_directive
@@ -858,8 +879,7 @@ async def main():
                 GROUP_CONFIG.update(gc)
                 
                 # Persist migration immediately
-                from servos.db import save_bot_state
-                save_bot_state(ENABLED_STRATEGIES, GROUP_CONFIG, list(DISABLED_ASSETS), system_directive.AI_FILTER_ENABLED)
+                await nexus_db.save_bot_state(ENABLED_STRATEGIES, GROUP_CONFIG, list(DISABLED_ASSETS), system_directive.AI_FILTER_ENABLED)
                 
             # 3. Disabled Assets
             if bot_state.get('disabled_assets'):
@@ -879,7 +899,8 @@ async def main():
     # 4. Initialize Session Manager
     from servos.trading_manager import AsyncSessionManager
     session_manager = AsyncSessionManager()
-    await session_manager.load_sessions()
+    # Sessions join signal dispatch as they connect; Phase 5 waits for the rest
+    await session_manager.load_sessions(wait=False)
 
     # Initialize Shark Sentinel (Black Swan & Shark Mode Defense)
     try:
@@ -964,9 +985,9 @@ async def main():
 
             # Check Nexus Analyst connection
             try:
-                from servos.ai_analyst import NexusAnalyst
-                analyst = NexusAnalyst()
-                if analyst.client:
+                from servos.ai_analyst import get_nexus_analyst
+                analyst = get_nexus_analyst()
+                if analyst.available:
                     nexus_logger.phase_success("Nexus Analyst connected", f"Model: {analyst.model}")
                 else:
                     nexus_logger.phase_warning("Nexus Analyst not configured", "OpenAI API key missing")
@@ -1049,6 +1070,7 @@ async def main():
 
     # Display Nexus Bridge connectivity status
     if session_manager:
+        await session_manager.wait_ready()
         session_manager.display_exchange_status()
         nexus_logger.phase_success("Exchange clients initialized", f"{len(session_manager.sessions)} sessions active")
 
@@ -1138,6 +1160,7 @@ async def main():
                 pass
         
         await session_manager.close_all()
+        await nexus_db.close_pool()
         await bot.session.close()
 
 
@@ -1,129 +1,92 @@
 import asyncio
+import os
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List
-from ..strategies.factory import StrategyFactory
-from ..streams.stream import MarketStream
+from ..cortex.base import IStrategy
+from ..cortex.factory import StrategyFactory
+from ..uplink.stream import MarketStream
+from .vectorized import backtest_asset
 
 class BacktestEngine:
-    def __init__(self, assets: List[str], initial_capital: float = 1000.0, days: int = 30):
+    """
+    Batch backtester.
+
+    History is fetched concurrently, then each asset is simulated in a worker
+    process with indicators computed once and strategy rules evaluated as
+    vectorized arrays (see backtest.vectorized).
+    """
+
+    def __init__(self, assets: List[str], initial_capital: float = 1000.0, days: int = 30,
+                 max_workers: int = None, fee_rate: float = 0.001):
         self.assets = assets
         self.initial_capital = initial_capital
         self.days = days
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.fee_rate = fee_rate
         self.market_stream = MarketStream()
-        
+
     async def run(self, strategy_override: IStrategy = None):
         print(f"\n🚀 STARTING BACKTEST SIMULATION (Pilot Mode)")
         print(f"🎯 Assets: {self.assets}")
         print(f"💰 Initial Capital: ${self.initial_capital:,.2f} per asset")
         print(f"🗓️  Period: Last {self.days} Days\n{'='*50}")
-        
+
         await self.market_stream.initialize()
-        
-        results = {}
-        
-        for asset in self.assets:
-            print(f"\n🔍 Analyzing {asset}...")
-            
-            # 1. Fetch History
-            df = await self.market_stream.get_historical_candles(asset, days=self.days)
+
+        try:
+            # 1. Fetch History (concurrently, bounded to stay under exchange rate limits)
+            frames = await self._fetch_histories()
+        finally:
+            await self.market_stream.close()
+
+        # 2. Simulate all assets across the process pool (off the event loop)
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(None, self.run_batch, frames, strategy_override)
+
+        for asset, result in results.items():
+            print(f"🏁 {asset} [{result['strategy']}]: ${result['final_balance']:,.2f} "
+                  f"({result['roi']:+.2f}%) | Trades: {result['trades']}")
+
+        return results
+
+    async def _fetch_histories(self, concurrency: int = 4) -> Dict[str, pd.DataFrame]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(asset):
+            async with semaphore:
+                df = await self.market_stream.get_historical_candles(asset, days=self.days)
             if df.empty:
                 print(f"❌ No data for {asset}")
-                continue
-                
-            # 2. Setup Simulation State
-            balance = self.initial_capital
-            position = None # {'entry': float, 'size': float}
-            trades_log = []
-            
-            if strategy_override:
-                strategy = strategy_override
-            else:
-                strategy = StrategyFactory.get_strategy(asset.replace('USDT',''), volatility_index=0.5)
-            print(f"⚙️  Strategy: {strategy.name}")
-            
-            # 3. Iterate (Skip warmup)
-            warmup = 50
-            for i in range(warmup, len(df)):
-                # Create window for strategy
-                msg_df = df.iloc[:i+1] # Strategy analyzes full df up to now
-                # In a real efficient backtester we'd optimize this slicing, but for 3000 rows it's fine.
-                
-                # Mock current candle
-                current_price = df.iloc[i]['close']
-                timestamp = df.iloc[i]['timestamp']
-                
-                # Analyze
-                # Since strategy.analyze expects specific format
-                market_data = {
-                    "symbol": asset,
-                    "timeframe": "15m",
-                    "dataframe": msg_df
-                }
-                
-                signal = await strategy.analyze(market_data)
-                
-                if not signal:
-                    continue
-                    
-                # Execution Logic (Simple Spot)
-                fee = 0.001 # 0.1% Binance Spot Fee
-                
-                # BUY CONDITION
-                if signal.action == "BUY" and position is None:
-                    entry_price = current_price
-                    size = (balance * 0.99) / entry_price # 99% usage to cover fees safe
-                    cost = size * entry_price
-                    balance -= cost
-                    
-                    position = {
-                        'entry': entry_price,
-                        'size': size,
-                        'time': timestamp
-                    }
-                    trades_log.append({
-                        'type': 'BUY',
-                        'price': entry_price,
-                        'time': timestamp,
-                        'balance': balance
-                    })
-                    
-                # SELL CONDITION
-                elif (signal.action == "SELL" or signal.action == "EXIT") and position is not None:
-                    exit_price = current_price
-                    revenue = position['size'] * exit_price * (1 - fee)
-                    
-                    pnl = revenue - (position['size'] * position['entry'])
-                    pnl_pct = (pnl / (position['size'] * position['entry'])) * 100
-                    
-                    balance += revenue
-                    position = None
-                    
-                    trades_log.append({
-                        'type': 'SELL',
-                        'price': exit_price,
-                        'time': timestamp,
-                        'balance': balance,
-                        'pnl': pnl,
-                        'pnl_pct': pnl_pct
-                    })
-
-            # Check open position at end
-            if position:
-                # Mark to market
-                current_val = position['size'] * df.iloc[-1]['close']
-                balance += current_val
-            
-            roi = ((balance - self.initial_capital) / self.initial_capital) * 100
-            
-            results[asset] = {
-                'final_balance': balance,
-                'roi': roi,
-                'trades': len(trades_log),
-                'history': trades_log
-            }
-            
-            print(f"🏁 Result: ${balance:,.2f} ({roi:+.2f}%) | Trades: {len(trades_log)}")
+            return asset, df
 
-        await self.market_stream.close()
-        return results
+        fetched = await asyncio.gather(*(fetch(asset) for asset in self.assets))
+        return {asset: df for asset, df in fetched if not df.empty}
+
+    def run_batch(self, frames: Dict[str, pd.DataFrame], strategy_override: IStrategy = None) -> Dict[str, dict]:
+        """
+        Backtest pre-loaded histories (one DataFrame per asset).
+
+        Strategy assignment happens here (StrategyFactory on the full history
+        unless overridden); simulation is fanned out across worker processes.
+        """
+        jobs = []
+        for asset, df in frames.items():
+            strategy = strategy_override or StrategyFactory.get_strategy(
+                asset, {'symbol': asset, 'dataframe': df}
+            )
+            jobs.append((asset, df, strategy))
+
+        if self.max_workers <= 1 or len(jobs) <= 1:
+            return {asset: self._backtest(asset, df, strategy) for asset, df, strategy in jobs}
+
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as pool:
+            futures = {
+                asset: pool.submit(backtest_asset, asset, df, strategy,
+                                   self.initial_capital, self.fee_rate)
+                for asset, df, strategy in jobs
+            }
+            return {asset: future.result() for asset, future in futures.items()}
 
+    def _backtest(self, asset: str, df: pd.DataFrame, strategy: IStrategy) -> dict:
+        return backtest_asset(asset, df, strategy, self.initial_capital, self.fee_rate)
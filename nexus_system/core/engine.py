@@ -1,8 +1,9 @@
 import asyncio
 from ..cortex.factory import StrategyFactory
 from ..shield.manager import RiskManager
-from ..uplink.stream import MarketStream
+from ..uplink.stream import MarketStream, clear_market_stream, set_market_stream
 from ..core.exit_manager import ExitManager
+from ..shield.correlation_matrix import get_correlation_matrix
 from system_directive import DISABLED_ASSETS
 
 
@@ -66,13 +67,21 @@ class NexusCore:
         crypto_symbols = [a for a in self.assets if 'USDT' in a]
         
         # Register Event Listener BEFORE initializing stream
-        self.market_stream.add_callback(self._on_price_update)
+        self.market_stream.add_callback(self._on_price_update, closed_only=True)
         
         await self.market_stream.initialize(
             alpaca_key=ak, 
             alpaca_secret=asec,
             crypto_symbols=crypto_symbols
         )
+        # Serve handlers/servos (/analyze, /scanner, diagnostics) from this warm stream
+        set_market_stream(self.market_stream)
+
+        # Shield: rolling correlation matrix (seeded in background, then updated on candle closes)
+        self.correlation_matrix = get_correlation_matrix()
+        self._correlation_task = asyncio.create_task(
+            self.correlation_matrix.attach(self.market_stream, crypto_symbols)
+        )
         
         # Simulating Async Config / DB Load
         await asyncio.sleep(0.5)
@@ -116,83 +125,105 @@ class NexusCore:
         """
         Check exit conditions for all active positions on this symbol across all sessions.
         Execute partial exits, trailing stops, and time stops when triggered.
+
+        Only sessions indexed with an exit plan on the symbol are visited, concurrently.
         """
         if not self.session_manager:
             return
 
         try:
-            # Get all active sessions
-            for chat_id, session in self.session_manager.sessions.items():
-                if not hasattr(session, 'exit_manager') or not session.exit_manager:
-                    continue
+            index = getattr(self.session_manager, 'index', None)
+            if index is not None:
+                sessions = index.exit_sessions(symbol)
+            else:
+                sessions = list(self.session_manager.sessions.values())
+            if not sessions:
+                return
+
+            from servos.session_index import get_dispatch_budget
+            await get_dispatch_budget().gather(
+                self._check_session_exits(session, symbol, current_price) for session in sessions
+            )
+
+        except Exception as e:
+            self.logger.error(f"Exit condition check error for {symbol}: {e}")
 
-                # Check if this session has an active exit plan for this symbol
-                if symbol in session.exit_manager.active_exit_plans:
-                    exit_plan = session.exit_manager.active_exit_plans[symbol]
+    async def _check_session_exits(self, session, symbol: str, current_price: float):
+        """Evaluate and execute triggered exits of one session's plan on symbol."""
+        if not hasattr(session, 'exit_manager') or not session.exit_manager:
+            return
 
-                    # Check exit conditions
-                    triggered_exits = session.exit_manager.check_exit_conditions(symbol, current_price)
+        # Check if this session has an active exit plan for this symbol
+        if symbol not in session.exit_manager.active_exit_plans:
+            return
+        exit_plan = session.exit_manager.active_exit_plans[symbol]
 
-                    # Execute triggered exits
-                    for rule, quantity_to_close in triggered_exits:
+        # Check exit conditions
+        triggered_exits = session.exit_manager.check_exit_conditions(symbol, current_price)
+
+        # Execute triggered exits
+        for rule, quantity_to_close in triggered_exits:
+            try:
+                # Execute the partial exit via trading session
+                success, msg = await session._execute_partial_exit(symbol, rule, quantity_to_close, exit_plan)
+
+                if success:
+                    self.logger.info(f"🎯 Exit Executed: {symbol} - {rule.description} ({quantity_to_close:.4f} qty)")
+                    # Send notification to user
+                    if session.manager and hasattr(session.manager, 'bot'):
                         try:
-                            # Execute the partial exit via trading session
-                            success, msg = await session._execute_partial_exit(symbol, rule, quantity_to_close, exit_plan)
-
-                            if success:
-                                self.logger.info(f"🎯 Exit Executed: {symbol} - {rule.description} ({quantity_to_close:.4f} qty)")
-                                # Send notification to user
-                                if session.manager and hasattr(session.manager, 'bot'):
-                                    try:
-                                        await session.manager.bot.send_message(
-                                            session.chat_id,
-                                            f"🎯 **EXIT TRIGGERED**\n{symbol}: {rule.description}\nClosed: {quantity_to_close:.4f} units\n💰 {msg}",
-                                            parse_mode="Markdown"
-                                        )
-                                    except Exception as notify_error:
-                                        self.logger.debug(f"Exit notification failed: {notify_error}")
-                            else:
-                                self.logger.warning(f"Exit Failed: {symbol} - {rule.description} - {msg}")
-
-                        except Exception as exit_error:
-                            self.logger.error(f"Exit execution error for {symbol}: {exit_error}")
+                            await session.manager.bot.send_message(
+                                session.chat_id,
+                                f"🎯 **EXIT TRIGGERED**\n{symbol}: {rule.description}\nClosed: {quantity_to_close:.4f} units\n💰 {msg}",
+                                parse_mode="Markdown"
+                            )
+                        except Exception as notify_error:
+                            self.logger.debug(f"Exit notification failed: {notify_error}")
+                else:
+                    self.logger.warning(f"Exit Failed: {symbol} - {rule.description} - {msg}")
 
-        except Exception as e:
-            self.logger.error(f"Exit condition check error for {symbol}: {e}")
+            except Exception as exit_error:
+                self.logger.error(f"Exit execution error for {symbol}: {exit_error}")
 
     async def _process_symbol_event(self, asset: str):
 
-        """Execute strategy analysis for a single symbol with MTF filtering."""
-        async with self._semaphore:
-            try:
+        """Execute strategy analysis for a single symbol with MTF filtering.
+
+        Strategy selection runs outside the semaphore: every symbol closing on
+        the same bar must reach the ML batcher together for one model call.
+        """
+        try:
+            async with self._semaphore:
                 # 1. Fetch Multi-Timeframe Data for confluence analysis
                 # Use get_multiframe_candles which fetches 1m, 15m, 4h
                 mtf_data = await self.market_stream.get_multiframe_candles(asset)
-                
+
                 # Use main timeframe for strategy analysis
                 market_data = mtf_data.get('main', {})
-                
+
                 if market_data.get('dataframe') is None or market_data['dataframe'].empty:
                     return
-    
+
                 # --- SENTINEL OVERRIDE CHECK (Black Swan / Shark) ---
                 override_action = await self.risk_guardian.get_override_action(asset, market_data)
-                
-                strategy = None
-                
-                if override_action in ['BLACK_SWAN', 'SHARK_MODE']:
-                    from ..cortex.sentinel import SentinelStrategy
-                    strategy = SentinelStrategy()
-                    # Inject Mode into Context
-                    market_data['sentinel_mode'] = override_action
-                    
-                    if override_action == 'BLACK_SWAN':
-                         self.logger.critical(f"🦢 SENTINEL ACTIVATED: {override_action} on {asset}")
-                
-                else:
-                     # Standard Factory Selection (Normal Market)
-                     strategy = StrategyFactory.get_strategy(asset, market_data)
-                
+
+            strategy = None
+
+            if override_action in ['BLACK_SWAN', 'SHARK_MODE']:
+                from ..cortex.sentinel import SentinelStrategy
+                strategy = SentinelStrategy()
+                # Inject Mode into Context
+                market_data['sentinel_mode'] = override_action
+
+                if override_action == 'BLACK_SWAN':
+                     self.logger.critical(f"🦢 SENTINEL ACTIVATED: {override_action} on {asset}")
+
+            else:
+                 # Standard Factory Selection (Normal Market)
+                 # ML inference is batched across symbols closing on the same bar
+                 strategy = await StrategyFactory.get_strategy_async(asset, market_data)
+
+            async with self._semaphore:
                 # 3. Analyze
                 signal = await strategy.analyze(market_data)
                 
@@ -223,13 +254,15 @@ class NexusCore:
                 
                 # 6. Emit Signal
                 signal.strategy = strategy.name
+                if 'timestamp' in market_data['dataframe']:
+                    signal.candle_time = str(market_data['dataframe']['timestamp'].iloc[-1])
                 self.logger.info(f"⚡ EVENT TRIGGER: {signal.action} on {asset} ({strategy.name}) | Conf: {signal.confidence:.2f}")
                 
                 if self.signal_callback:
                     await self.signal_callback(signal)
     
-            except Exception as e:
-                self.logger.error_debounced(f"Event Error ({asset}): {e}", interval=300)
+        except Exception as e:
+            self.logger.error_debounced(f"Event Error ({asset}): {e}", interval=300)
 
     async def core_loop(self):
         """
@@ -271,6 +304,7 @@ class NexusCore:
     async def stop(self):
         self.running = False
         print("🛑 Engine Stopping...")
+        clear_market_stream(self.market_stream)
         await self.market_stream.close()
 
 
@@ -56,6 +56,7 @@ class ExitManager:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.active_exit_plans: Dict[str, ExitPlan] = {}  # symbol -> ExitPlan
+        self.on_change = None  # Optional hook: on_change(symbol, active) when a plan opens/closes
 
     def create_exit_plan(self, symbol: str, side: str, entry_price: float,
                         quantity: float, atr: float = None, risk_multipliers: Optional['RiskMultipliers'] = None) -> ExitPlan:
@@ -89,6 +90,8 @@ class ExitManager:
         )
 
         self.active_exit_plans[symbol] = plan
+        if self.on_change:
+            self.on_change(symbol, True)
         return plan
 
     def _create_partial_tp_rules(self, side: str, entry_price: float, atr: float = None, risk_multipliers: Optional['RiskMultipliers'] = None) -> List[ExitRule]:
@@ -296,6 +299,8 @@ class ExitManager:
         # Si se cerró todo, remover el plan
         if plan.current_quantity <= 0.001:
             del self.active_exit_plans[symbol]
+            if self.on_change:
+                self.on_change(symbol, False)
 
     def calculate_real_breakeven(self, entry_price: float, fee_rate: float = 0.001,
                                 slippage: float = 0.0005, side: str = 'LONG') -> float:
@@ -23,6 +23,7 @@ from nexus_system.uplink.adapters.base import IExchangeAdapter
 from nexus_system.uplink.adapters.binance_adapter import BinanceAdapter
 from nexus_system.uplink.adapters.bybit_adapter import BybitAdapter
 from nexus_system.uplink.adapters.alpaca_adapter import AlpacaAdapter
+from nexus_system.uplink.user_stream import UserDataStream, create_user_stream
 from nexus_system.core.shadow_wallet import ShadowWallet
 
 # Lazy import to avoid circular dependencies
@@ -50,6 +51,7 @@ class NexusBridge:
         self.shadow_wallet = shadow_wallet
         self.chat_id = chat_id
         self.adapters: Dict[str, IExchangeAdapter] = {}  # Diccionario de adapters conectados
+        self.user_streams: Dict[str, UserDataStream] = {}  # Streams privados (órdenes/posiciones/balance) por exchange
         self.primary_exchange = 'BINANCE'  # Exchange por defecto
 
     async def connect_exchange(self, name: str, **credentials) -> bool:
@@ -105,6 +107,9 @@ class NexusBridge:
                         print(f"⚠️ NexusBridge: Error syncing {name} to Shadow Wallet: {e}")
                         # Continue anyway - adapter is connected
 
+                    # Private user-data stream: keeps Shadow Wallet current without polling
+                    await self._start_user_stream(name, adapter)
+
                     # NOTA: No sincronizar activos automáticamente para mantener lista optimizada
                     # La sincronización manual solo debe hacerse con /sync_crypto si es necesario
                     # if name in ['BINANCE', 'BYBIT']:
@@ -174,15 +179,11 @@ class NexusBridge:
         if not adapter:
             return 0.0
 
-        # Format symbol for the adapter
-        formatted_symbol = adapter._format_symbol(symbol) if hasattr(adapter, '_format_symbol') else symbol
-
-        # Method 1: Try to use fetch_ticker (faster, no rate limiting issues)
+        # Method 1: Ticker (concurrent lookups of the same symbol share one request)
         try:
-            if hasattr(adapter, '_exchange') and adapter._exchange:
-                ticker = await adapter._exchange.fetch_ticker(formatted_symbol)
-                if ticker and 'last' in ticker and ticker['last']:
-                    return float(ticker['last'])
+            price = await adapter.get_market_price(symbol)
+            if price:
+                return float(price)
         except Exception as ticker_err:
             # Ticker failed, try candles as fallback
             pass
@@ -1051,8 +1052,12 @@ class NexusBridge:
         """
         synced = 0
         for name, adapter in self.adapters.items():
+            if self.is_streaming(name):
+                continue  # Shadow Wallet is already fed by the user-data stream
             try:
-                positions = await adapter.get_positions()
+                # strict: a failed fetch raises instead of returning [], which would wipe the exchange
+                positions = await adapter.get_positions(strict=True)
+                fresh = {}
                 for pos in positions:
                     # Normalize symbol for consistent storage
                     symbol = pos.get('symbol', '')
@@ -1061,17 +1066,19 @@ class NexusBridge:
                     else:
                         normalized_symbol = self.normalize_symbol(symbol)
 
-                    self.shadow_wallet.update_position(self.chat_id, normalized_symbol, {
+                    fresh[normalized_symbol] = {
                         'symbol': normalized_symbol,
                         'quantity': pos.get('quantity', 0),
                         'side': pos.get('side', 'LONG'),
                         'entry_price': pos.get('entryPrice', 0),
                         'unrealized_pnl': pos.get('unrealizedPnl', 0),
                         'exchange': name
-                    })
-                    synced += 1
+                    }
+                # Replace the exchange's positions so ones closed elsewhere drop out too
+                self.shadow_wallet.replace_positions(self.chat_id, name, fresh)
+                synced += len(fresh)
             except Exception as e:
-                print(f"⚠️ Position sync failed for {name}: {e}")
+                print(f"⚠️ Position sync failed for {name}: {e} (keeping last known positions)")
         return synced
 
     def _categorize_new_assets(self, new_assets: list) -> Dict[str, list]:
@@ -1153,8 +1160,28 @@ class NexusBridge:
 
         return categorized
 
+    async def _start_user_stream(self, name: str, adapter: IExchangeAdapter):
+        """Start (or restart) the private user-data stream for a connected adapter."""
+        old = self.user_streams.pop(name, None)
+        if old:
+            await old.close()
+        stream = create_user_stream(name, adapter, self.shadow_wallet, self.chat_id)
+        if stream:
+            adapter._user_stream = stream
+            self.user_streams[name] = stream
+            await stream.start()
+
+    def is_streaming(self, exchange: str) -> bool:
+        """True while the exchange's Shadow Wallet state is kept live by its user-data stream."""
+        stream = self.user_streams.get(exchange.upper())
+        return bool(stream and stream.live)
+
     async def close_all(self):
         """Shutdown all connections."""
+        for stream in self.user_streams.values():
+            await stream.close()
+        self.user_streams.clear()
+
         for name, adapter in self.adapters.items():
             try:
                 print(f"🔌 Bridge: Disconnecting {name}...")
@@ -2,83 +2,231 @@
 Shadow Wallet - Real-time Local State Manager
 Maintains an in-memory mirror of account balances and positions to reduce API latency.
 PER-USER ISOLATION: Each chat_id has its own wallet state.
+
+Copy-on-write: each user's state is an immutable WalletSnapshot. Every
+update builds a new snapshot and swaps it in, so a reader holding one
+always sees a consistent view (never half of an update). Running
+aggregates (notional per exchange / cluster / symbol, long-short split,
+unrealized PnL, equity) are adjusted by the changed position only, so
+risk checks read them in O(1) however many positions are open.
 """
 
-from typing import Dict, Any, Optional
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
 import time
 
+_EMPTY: Mapping = MappingProxyType({})
+
+
+def _freeze(d: Dict) -> Mapping:
+    return MappingProxyType(d)
+
+
+def _cluster_of(symbol: str) -> str:
+    """Exposure cluster (same grouping as RiskPolicy)."""
+    from nexus_system.shield.risk_policy import _get_subgroup
+    return _get_subgroup(symbol)
+
+
+def _position_figures(position: Mapping[str, Any]) -> Tuple[str, str, float, float]:
+    """(exchange, side, notional, unrealized PnL) of a stored position (adapter or legacy keys)."""
+    qty = abs(float(position.get('quantity', 0) or 0))
+    entry = float(position.get('entryPrice') or position.get('entry_price') or 0)
+    pnl = float(position.get('unrealizedPnl') or position.get('unrealized_pnl') or 0)
+    return position.get('exchange', 'BINANCE'), position.get('side', 'LONG'), qty * entry, pnl
+
+
+def _adjust(totals: Mapping[str, float], key: str, delta: float) -> Mapping[str, float]:
+    """Copy of `totals` with `delta` added to `key` (keys falling to ~0 are dropped)."""
+    if not delta:
+        return totals
+    result = dict(totals)
+    value = result.get(key, 0.0) + delta
+    if abs(value) < 1e-9:
+        result.pop(key, None)
+    else:
+        result[key] = value
+    return _freeze(result)
+
+
+@dataclass(frozen=True, eq=False)
+class WalletSnapshot:
+    """
+    Immutable view of one user's wallet.
+
+    Supports the legacy dict access (`snapshot['positions']`, `['balances']`,
+    `['orders']`, `['last_update']`); the mappings are read-only, updates go
+    through ShadowWallet.
+    """
+    balances: Mapping[str, Mapping[str, float]]
+    positions: Mapping[str, Mapping[str, Any]]
+    orders: Mapping[str, Mapping[str, Any]] = field(default_factory=lambda: _EMPTY)
+    notional_by_exchange: Mapping[str, float] = field(default_factory=lambda: _EMPTY)
+    notional_by_cluster: Mapping[str, float] = field(default_factory=lambda: _EMPTY)
+    notional_by_symbol: Mapping[str, float] = field(default_factory=lambda: _EMPTY)
+    long_notional: float = 0.0
+    short_notional: float = 0.0
+    unrealized_pnl: float = 0.0
+    equity: float = 0.0
+    last_update: float = 0
+    version: int = 0
+
+    def __getitem__(self, key: str):
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def with_position(self, symbol: str, position: Optional[Mapping[str, Any]]) -> 'WalletSnapshot':
+        """New snapshot with `symbol` set (or removed when `position` is None)."""
+        snap = self
+        old = self.positions.get(symbol)
+        if old is not None:
+            snap = snap._account(symbol, old, -1)
+        positions = dict(self.positions)
+        if position is None:
+            positions.pop(symbol, None)
+        else:
+            positions[symbol] = _freeze(dict(position))
+            snap = snap._account(symbol, position, 1)
+        return replace(snap, positions=_freeze(positions))
+
+    def _account(self, symbol: str, position: Mapping[str, Any], sign: int) -> 'WalletSnapshot':
+        exchange, side, notional, pnl = _position_figures(position)
+        long_delta = sign * notional if side == 'LONG' else 0.0
+        return replace(
+            self,
+            notional_by_exchange=_adjust(self.notional_by_exchange, exchange, sign * notional),
+            notional_by_cluster=_adjust(self.notional_by_cluster, _cluster_of(symbol), sign * notional),
+            notional_by_symbol=_adjust(self.notional_by_symbol, symbol, sign * notional),
+            long_notional=self.long_notional + long_delta,
+            short_notional=self.short_notional + (sign * notional - long_delta),
+            unrealized_pnl=self.unrealized_pnl + sign * pnl,
+        )
+
+
+def _empty_snapshot() -> WalletSnapshot:
+    return WalletSnapshot(
+        balances=_freeze({
+            'BINANCE': _freeze({'total': 0.0, 'available': 0.0}),
+            'BYBIT': _freeze({'total': 0.0, 'available': 0.0}),
+            'ALPACA': _freeze({'total': 0.0, 'available': 0.0}),
+        }),
+        positions=_EMPTY,
+    )
+
+
 class ShadowWallet:
     """
     Per-user isolated wallet state manager.
-    Structure: {chat_id: {'balances': {...}, 'positions': {...}}}
+    Structure: {chat_id: WalletSnapshot} (balances, positions, orders + aggregates)
     """
     def __init__(self, chat_id: str = None):
         # Per-user isolation: each chat_id has its own wallet state
         self.chat_id = chat_id
-        self.user_wallets: Dict[str, Dict[str, Any]] = {}
+        self.user_wallets: Dict[str, WalletSnapshot] = {}
 
         # Global listeners (shared across all users)
         self._listeners = []
 
-    def _get_user_wallet(self, chat_id: str) -> Dict[str, Any]:
-        """Get or create wallet state for a specific user."""
+    def _get_user_wallet(self, chat_id: str) -> WalletSnapshot:
+        """Get (or create) the current wallet snapshot for a specific user."""
         if chat_id not in self.user_wallets:
-            self.user_wallets[chat_id] = {
-                'balances': {
-                    'BINANCE': {'total': 0.0, 'available': 0.0},
-                    'BYBIT': {'total': 0.0, 'available': 0.0},
-                    'ALPACA': {'total': 0.0, 'available': 0.0}
-                },
-                'positions': {},
-                'last_update': 0
-            }
+            self.user_wallets[chat_id] = _empty_snapshot()
         return self.user_wallets[chat_id]
 
+    def snapshot(self, chat_id: str) -> WalletSnapshot:
+        """Consistent, immutable view of a user's wallet (O(1))."""
+        return self._get_user_wallet(chat_id)
+
+    def _commit(self, chat_id: str, snap: WalletSnapshot):
+        self.user_wallets[chat_id] = replace(snap, last_update=time.time(), version=snap.version + 1)
+
     # LEGACY METHODS - Kept for backward compatibility but now per-user
     @property
-    def balances(self) -> Dict[str, Dict[str, float]]:
+    def balances(self) -> Mapping[str, Mapping[str, float]]:
         """Legacy: Get balances for current user (if set) or raise error."""
         if not self.chat_id:
             raise ValueError("ShadowWallet: chat_id not set. Use update_balance(chat_id, exchange, balance_data)")
-        return self._get_user_wallet(self.chat_id)['balances']
+        return self._get_user_wallet(self.chat_id).balances
 
     @property
-    def positions(self) -> Dict[str, Dict[str, Any]]:
+    def positions(self) -> Mapping[str, Mapping[str, Any]]:
         """Legacy: Get positions for current user (if set) or raise error."""
         if not self.chat_id:
             raise ValueError("ShadowWallet: chat_id not set. Use update_position(chat_id, symbol, position_data)")
-        return self._get_user_wallet(self.chat_id)['positions']
+        return self._get_user_wallet(self.chat_id).positions
 
     @property
     def last_update(self) -> float:
         """Legacy: Get last update for current user."""
         if not self.chat_id:
             return 0
-        return self._get_user_wallet(self.chat_id)['last_update']
+        return self._get_user_wallet(self.chat_id).last_update
 
     def update_balance(self, chat_id: str, exchange: str, balance_data: Dict[str, float]):
         """Update balance for a specific user and exchange."""
-        user_wallet = self._get_user_wallet(chat_id)
+        snap = self._get_user_wallet(chat_id)
         exchange = exchange.upper()
 
-        if exchange in user_wallet['balances']:
-            user_wallet['balances'][exchange].update(balance_data)
-            user_wallet['last_update'] = time.time()
+        if exchange in snap.balances:
+            balances = dict(snap.balances)
+            balances[exchange] = _freeze({**balances[exchange], **balance_data})
+            equity = sum(float(b.get('total', 0.0) or 0.0) for b in balances.values())
+            self._commit(chat_id, replace(snap, balances=_freeze(balances), equity=equity))
             self._notify_listeners('balance', f"{chat_id}:{exchange}")
 
     def update_position(self, chat_id: str, symbol: str, position_data: Dict[str, Any]):
         """Update a specific position for a user."""
-        user_wallet = self._get_user_wallet(chat_id)
+        snap = self._get_user_wallet(chat_id)
 
         if position_data.get('quantity', 0) == 0:
-            if symbol in user_wallet['positions']:
-                del user_wallet['positions'][symbol]
+            snap = snap.with_position(symbol, None) if symbol in snap.positions else snap
         else:
-            user_wallet['positions'][symbol] = position_data
+            snap = snap.with_position(symbol, position_data)
 
-        user_wallet['last_update'] = time.time()
+        self._commit(chat_id, snap)
         self._notify_listeners('position', f"{chat_id}:{symbol}")
 
+    def replace_positions(self, chat_id: str, exchange: str, positions: Dict[str, Dict[str, Any]]):
+        """
+        Replace one exchange's positions with a fresh snapshot ({symbol: position}).
+        Published as one new WalletSnapshot: readers never see a half-replaced wallet.
+        """
+        snap = self._get_user_wallet(chat_id)
+        exchange = exchange.upper()
+        changed = [s for s, p in snap.positions.items() if p.get('exchange') == exchange and s not in positions]
+        for symbol in changed:
+            snap = snap.with_position(symbol, None)
+        for symbol, position in positions.items():
+            if position.get('quantity', 0) == 0:
+                if symbol in snap.positions:
+                    snap = snap.with_position(symbol, None)
+                    changed.append(symbol)
+            else:
+                snap = snap.with_position(symbol, {**position, 'exchange': exchange})
+                changed.append(symbol)
+
+        self._commit(chat_id, snap)
+        for symbol in changed:
+            self._notify_listeners('position', f"{chat_id}:{symbol}")
+
+    def update_order(self, chat_id: str, order_id: str, order_data: Dict[str, Any], closed: bool = False):
+        """Track an order seen on a user-data stream; closed (filled/cancelled) orders are dropped."""
+        snap = self._get_user_wallet(chat_id)
+        orders = dict(snap.orders)
+        if closed:
+            orders.pop(order_id, None)
+        else:
+            orders[order_id] = _freeze({**order_data, 'id': order_id})
+
+        self._commit(chat_id, replace(snap, orders=_freeze(orders)))
+        key = f"{chat_id}:{order_data.get('symbol', '')}"
+        self._notify_listeners('order', key)
+        if order_data.get('last_fill_price'):
+            self._notify_listeners('fill', key)
+
     # LEGACY METHODS - For backward compatibility during migration
     def update_balance_legacy(self, exchange: str, balance_data: Dict[str, float]):
         """Legacy method - requires chat_id to be set."""
@@ -93,17 +241,34 @@ class ShadowWallet:
         self.update_position(self.chat_id, symbol, position_data)
 
     def get_unified_equity(self, chat_id: str) -> float:
-        """Get total equity across all exchanges for a specific user."""
-        user_wallet = self._get_user_wallet(chat_id)
-        total = 0.0
-        for b in user_wallet['balances'].values():
-            total += b.get('total', 0.0)
-        return total
+        """Get total equity across all exchanges for a specific user (running total, O(1))."""
+        return self._get_user_wallet(chat_id).equity
+
+    def get_balance(self, chat_id: str, exchange: str) -> Mapping[str, float]:
+        """Get the balance record ({'total', 'available'}) for a user and exchange."""
+        return self._get_user_wallet(chat_id).balances.get(exchange.upper(), _EMPTY)
+
+    def get_position(self, chat_id: str, symbol: str) -> Mapping[str, Any]:
+        """Get one position for a user (empty mapping if flat)."""
+        return self._get_user_wallet(chat_id).positions.get(symbol, _EMPTY)
+
+    def get_positions(self, chat_id: str, exchange: str = None) -> list:
+        """Get a user's positions, optionally for one exchange only."""
+        positions = self._get_user_wallet(chat_id).positions.values()
+        if exchange:
+            return [p for p in positions if p.get('exchange') == exchange.upper()]
+        return list(positions)
+
+    def get_open_orders(self, chat_id: str, symbol: str = None, exchange: str = None) -> list:
+        """Get a user's open orders seen on user-data streams."""
+        return [
+            o for o in self._get_user_wallet(chat_id).orders.values()
+            if (symbol is None or o.get('symbol') == symbol) and (exchange is None or o.get('exchange') == exchange.upper())
+        ]
 
     def get_available_balance(self, chat_id: str, exchange: str) -> float:
         """Get available balance for a specific user and exchange."""
-        user_wallet = self._get_user_wallet(chat_id)
-        return user_wallet['balances'].get(exchange.upper(), {}).get('available', 0.0)
+        return self.get_balance(chat_id, exchange).get('available', 0.0)
 
     # LEGACY METHODS - For backward compatibility
     def get_unified_equity_legacy(self) -> float:
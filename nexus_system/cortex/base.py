@@ -10,6 +10,7 @@ class Signal:
     price: float
     metadata: Dict[str, Any]
     strategy: Optional[str] = None
+    candle_time: Optional[str] = None  # Open time of the candle that produced the signal
 
 class IStrategy(abc.ABC):
     """
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, Tuple
 from dataclasses import dataclass
@@ -127,3 +128,47 @@ class MarketClassifier:
             reason=f"Normal Market (ADX: {adx:.1f})"
         )
 
+    @staticmethod
+    def classify_frame(snapshot: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized classify() over many symbols at once.
+
+        `snapshot` holds one row per symbol with the last candle's close, atr,
+        adx, ema_20/50/200, upper_bb and lower_bb. Returns the same index with
+        regime, suggested_strategy and confidence columns (same rules and
+        thresholds as classify()).
+        """
+        def col(name: str) -> np.ndarray:
+            if name not in snapshot:
+                return np.zeros(len(snapshot))
+            return pd.to_numeric(snapshot[name], errors='coerce').to_numpy(float)
+
+        close, atr, adx = col('close'), col('atr'), col('adx')
+        ema_20, ema_50, ema_200 = col('ema_20'), col('ema_50'), col('ema_200')
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            valid = close > 0
+            atr_pct = np.where(valid, atr / close * 100, 0.0)
+            trend_strength = np.where(valid, np.abs(ema_20 - ema_50) / close * 1000, 0.0)
+            bb_width_pct = (col('upper_bb') - col('lower_bb')) / close * 100
+
+        aligned = ((close > ema_200) & (ema_20 > ema_50)) | ((close < ema_200) & (ema_20 < ema_50))
+        ranging = (adx < 18) & (trend_strength < 3.0)
+        conditions = [
+            atr_pct > 2.0,
+            (adx > 30) & (trend_strength > 5.0),
+            (atr_pct > 1.0) & (adx < 30),
+            (adx > 20) | (trend_strength > 4.0),
+            ranging & (bb_width_pct < 2.5),
+            ranging,
+        ]
+        regime = np.select(conditions, ['VOLATILE', 'TREND', 'VOLATILE', 'TREND', 'RANGE_TIGHT', 'RANGE_WIDE'], 'NORMAL')
+        strategy = np.select(conditions, ['Scalping', 'TrendFollowing', 'Scalping', 'TrendFollowing', 'Grid', 'MeanReversion'], 'MeanReversion')
+        confidence = np.select(conditions, [
+            0.85, np.where(aligned, 0.85, 0.70), 0.75, np.where(aligned, 0.75, 0.60), 0.7, 0.7,
+        ], 0.5)
+        return pd.DataFrame(
+            {'regime': regime, 'suggested_strategy': strategy, 'confidence': confidence},
+            index=snapshot.index,
+        )
+
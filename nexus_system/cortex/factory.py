@@ -42,6 +42,30 @@ class StrategyFactory:
             except Exception as e:
                 print(f"⚠️ ML Classifier Failed: {e}")
         
+        return StrategyFactory._select_strategy(symbol, market_data, regime_result)
+
+    @staticmethod
+    async def get_strategy_async(symbol: str, market_data: Dict[str, Any], regime=None) -> IStrategy:
+        """
+        Same as get_strategy, but ML inference is batched with every other
+        symbol classified in the same tick (one model call per bar close).
+        `regime`: rule-based MarketRegime already computed by the caller
+        (e.g. MarketClassifier.classify_frame), used when ML is off or fails.
+        """
+        regime_result = None
+        
+        if qconfig.ML_CLASSIFIER_ENABLED:
+            try:
+                from .ml_classifier import get_ml_batcher
+                regime_result = await get_ml_batcher().classify(market_data)
+            except Exception as e:
+                print(f"⚠️ ML Classifier Failed: {e}")
+        
+        return StrategyFactory._select_strategy(symbol, market_data, regime_result or regime)
+
+    @staticmethod
+    def _select_strategy(symbol: str, market_data: Dict[str, Any], regime_result) -> IStrategy:
+        """Steps 1B-6: rule-based fallback, config gate, registry instantiation."""
         # B. Fallback to Rule-Based if ML disabled or failed
         if regime_result is None:
             regime_result = MarketClassifier.classify(market_data)
@@ -10,9 +10,43 @@ from ta.momentum import RSIIndicator, WilliamsRIndicator, UltimateOscillator, St
 from ta.volatility import AverageTrueRange, BollingerBands, UlcerIndex
 from ta.volume import MFIIndicator, ChaikinMoneyFlowIndicator, EaseOfMovementIndicator, ForceIndexIndicator, VolumeWeightedAveragePrice
 from ta.others import DailyReturnIndicator, CumulativeReturnIndicator
+from scipy.signal import lfilter
 import math
 
 
+# Feature vector consumed by the ML model (order matters - MUST match FEATURE_COLUMNS from cloud trainer)
+FEATURE_COLUMNS = [
+    # Core (original)
+    'rsi', 'adx', 'atr_pct', 'trend_str', 'vol_change',
+    # v3.0 features
+    'macd_hist_norm', 'bb_pct', 'bb_width',
+    'roc_5', 'roc_10', 'obv_change',
+    'price_position', 'body_pct',
+    'above_ema200', 'ema_cross',
+    # v3.1 features
+    'ema20_slope', 'mfi', 'dist_50_high', 'dist_50_low',
+    'hour_of_day', 'day_of_week',
+    # v3.2 features
+    'roc_21', 'roc_50', 'williams_r', 'cci', 'ultimate_osc',
+    'volume_roc_5', 'volume_roc_21', 'chaikin_mf', 'force_index', 'ease_movement',
+    'dist_sma20', 'dist_sma50', 'pivot_dist', 'fib_dist',
+    'morning_volatility', 'afternoon_volatility', 'gap_up', 'gap_down', 'range_change',
+    'bull_power', 'bear_power', 'momentum_div', 'vpt', 'intraday_momentum',
+    # v3.3 features
+    'market_regime',
+    # v3.4 ADVANCED FEATURES
+    'stoch_rsi', 'kst', 'dpo',
+    'ulcer_index', 'vwap',
+    'market_regime_advanced', 'sentiment_proxy',
+    'rsi_stoch_rsi', 'cci_kst', 'vol_price_change', 'regime_volatility',
+    'returns_skew', 'returns_kurtosis',
+    'hour_sin', 'hour_cos', 'day_sin', 'day_cos'
+]
+
+# Below this many rows the last-row path defers to the full pipeline
+LAST_ROW_MIN_ROWS = 64
+
+
 def calculate_adx(df: pd.DataFrame, period: int = 14) -> pd.Series:
     """Calculate ADX using ta library."""
     try:
@@ -188,11 +222,17 @@ def calculate_sentiment_proxy(df: pd.DataFrame) -> pd.Series:
         return pd.Series(0, index=df.index)
 
 
-def add_indicators(df: pd.DataFrame) -> pd.DataFrame:
+def add_indicators(df: pd.DataFrame, last_row_only: bool = False) -> pd.DataFrame:
     """
     Calculate ALL technical indicators for inference.
     MUST match the feature set from ML Cloud Trainer NTB/indicators.py
+
+    With last_row_only=True, returns only the final FEATURE_COLUMNS row
+    (see extract_last_features) and leaves df untouched.
     """
+    if last_row_only:
+        return extract_last_features(df)
+
     close = df['close']
     high = df['high']
     low = df['low']
@@ -440,3 +480,316 @@ def add_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df = df.fillna(0)
 
     return df
+
+
+# === LAST-ROW FEATURE EXTRACTION ===
+# Inference only needs the final feature vector. Windowed features are
+# computed on the minimal tail; recursive ones (EMA/Wilder smoothing, OBV,
+# VPT) replay the exact ta recurrences with lfilter over the history.
+
+def _ewm(x: np.ndarray, alpha: float, min_periods: int) -> np.ndarray:
+    """pandas ewm(alpha, adjust=False).mean() for a series whose NaNs are all leading."""
+    out = np.full(len(x), np.nan)
+    valid = np.flatnonzero(~np.isnan(x))
+    if len(valid) == 0:
+        return out
+    k = valid[0]
+    out[k] = x[k]
+    if k + 1 < len(x):
+        out[k + 1:], _ = lfilter([alpha], [1.0, alpha - 1.0], x[k + 1:], zi=[(1.0 - alpha) * x[k]])
+    out[:k + min_periods - 1] = np.nan
+    return out
+
+
+def _wilder_sum(x: np.ndarray, first: float, window: int) -> np.ndarray:
+    """ta's ADX smoothing: s[0] = first, s[i] = s[i-1] - s[i-1] / window + x[i-1]."""
+    out = np.empty(len(x) + 1)
+    out[0] = first
+    if len(x):
+        out[1:], _ = lfilter([1.0], [1.0, -(1.0 - 1.0 / window)], x, zi=[(1.0 - 1.0 / window) * first])
+    return out
+
+
+def _wilder_mean(x: np.ndarray, first: float, window: int) -> float:
+    """Last value of ta's ATR/ADX recurrence: a[0] = first, a[i] = (a[i-1] * (w - 1) + x[i-1]) / w."""
+    if not len(x):
+        return first
+    y, _ = lfilter([1.0 / window], [1.0, -(window - 1.0) / window], x, zi=[(window - 1.0) / window * first])
+    return y[-1]
+
+
+def _last_adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> float:
+    """Last value of ta.trend.ADXIndicator(...).adx() (same seeding and quirks)."""
+    n = len(close)
+    prev_close = np.concatenate(([np.nan], close[:-1]))
+    dm = np.fmax(high, prev_close) - np.fmin(low, prev_close)
+    diff_up = high[1:] - high[:-1]
+    diff_down = low[:-1] - low[1:]
+    pos = np.where((diff_up > diff_down) & (diff_up > 0), diff_up, 0.0)  # pos[k] is bar k + 1
+    neg = np.where((diff_down > diff_up) & (diff_down > 0), diff_down, 0.0)
+
+    # Smoothed sums s[0..L-2]; ta never fills the last slot, so the final DX is unused
+    length = n - (window - 1)
+    if length <= window:
+        return 0.0  # ta raises on short input -> calculate_adx default
+    trs = _wilder_sum(dm[window + 1:], dm[:window].sum(), window)
+    dip = _wilder_sum(pos[window:], pos[:window].sum(), window)
+    din = _wilder_sum(neg[window:], neg[:window].sum(), window)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dip_pct = np.where(trs != 0, 100 * (dip / trs), 0.0)
+        din_pct = np.where(trs != 0, 100 * (din / trs), 0.0)
+        dx = np.where(dip_pct + din_pct != 0,
+                      100 * np.abs((dip_pct - din_pct) / (dip_pct + din_pct)), 0.0)
+
+    first = dx[:window].mean()
+    adx = _wilder_mean(dx[window:length - 1], first, window)
+    return float(np.clip(adx, 0, 100))
+
+
+def extract_last_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Final FEATURE_COLUMNS row of add_indicators(df), without computing the
+    full indicator frame.
+
+    Returns a one-row DataFrame indexed like df.iloc[-1:]. Frames shorter
+    than LAST_ROW_MIN_ROWS go through the full pipeline instead.
+    """
+    if len(df) < LAST_ROW_MIN_ROWS:
+        return add_indicators(df.copy())[FEATURE_COLUMNS].iloc[-1:]
+
+    o = df['open'].to_numpy(dtype=float)
+    h = df['high'].to_numpy(dtype=float)
+    l = df['low'].to_numpy(dtype=float)
+    c = df['close'].to_numpy(dtype=float)
+    v = df['volume'].to_numpy(dtype=float)
+    n = len(c)
+    f = {}
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cl, hl, ll, ol, vl = c[-1], h[-1], l[-1], o[-1], v[-1]
+        diff = np.diff(c, prepend=np.nan)
+
+        # RSI (series needed for StochRSI / momentum_div)
+        up = np.where(diff > 0, diff, 0.0)
+        down = -np.where(diff < 0, diff, 0.0)
+        emaup = _ewm(up, 1 / 14, 14)
+        emadn = _ewm(down, 1 / 14, 14)
+        rsi_raw = np.where(emadn == 0, 100, 100 - (100 / (1 + emaup / emadn)))
+        rsi = np.clip(np.where(np.isnan(rsi_raw), 50.0, rsi_raw), 0, 100)
+        f['rsi'] = rsi[-1]
+
+        # ATR (series needed for session volatility)
+        prev_close = np.concatenate(([np.nan], c[:-1]))
+        tr = np.fmax(np.fmax(h - l, np.abs(h - prev_close)), np.abs(l - prev_close))
+        atr = np.zeros(n)
+        atr[13] = tr[:14].mean()
+        atr[14:], _ = lfilter([1 / 14], [1.0, -13 / 14], tr[14:], zi=[13 / 14 * atr[13]])
+        atr_pct = (atr / c) * 100
+        f['atr_pct'] = atr_pct[-1]
+
+        f['adx'] = _last_adx(h, l, c, 14)
+
+        # EMAs (ta: min_periods=window, NaN -> close)
+        ema = {}
+        for w in (20, 50, 200):
+            series = _ewm(c, 2 / (w + 1), w)
+            ema[w] = np.where(np.isnan(series), c, series)
+        f['trend_str'] = (ema[20][-1] - ema[50][-1]) / cl * 100
+
+        vol_ma_5 = v[-5:].mean()
+        vol_ma_20 = v[-20:].mean()
+        f['vol_change'] = (vol_ma_5 - vol_ma_20) / (vol_ma_20 + 1e-10)
+
+        # MACD
+        macd = _ewm(c, 2 / 13, 12) - _ewm(c, 2 / 27, 26)
+        macd_signal = _ewm(macd, 2 / 10, 9)
+        macd_hist = macd[-1] - macd_signal[-1]
+        f['macd_hist_norm'] = (0.0 if np.isnan(macd_hist) else macd_hist) / cl * 100
+
+        # Bollinger Bands
+        window20 = c[-20:]
+        bb_middle = window20.mean()
+        bb_mstd = window20.std(ddof=0)
+        bb_upper = bb_middle + 2 * bb_mstd
+        bb_lower = bb_middle - 2 * bb_mstd
+        bb_std = (bb_upper - bb_middle) / 2
+        f['bb_width'] = (bb_std * 2) / (bb_middle + 1e-10) * 100
+        f['bb_pct'] = (cl - bb_lower) / (bb_upper - bb_lower + 1e-10)
+
+        def roc(values, lag):
+            return (values[-1] - values[-1 - lag]) / values[-1 - lag] * 100 if n > lag else np.nan
+
+        f['roc_5'] = roc(c, 5)
+        f['roc_10'] = roc(c, 10)
+
+        # OBV (cumulative over the whole history)
+        obv = np.cumsum(np.sign(diff[1:]) * v[1:])
+        f['obv_change'] = (obv[-1] - obv[-6]) / (obv[-20:].mean() + 1e-10)
+
+        f['price_position'] = (cl - ll) / (hl - ll + 1e-10)
+        f['body_pct'] = abs(cl - ol) / (hl - ll + 1e-10) * 100
+        f['above_ema200'] = int(cl > ema[200][-1])
+        f['ema_cross'] = int((cl > ema[20][-1]) and (ema[20][-1] > ema[50][-1]))
+        f['ema20_slope'] = ema[20][-1] - ema[20][-6]
+
+        # MFI
+        tp = (h + l + c) / 3.0
+        tp_prev = np.concatenate(([np.nan], tp[:-1]))
+        up_down = np.where(tp > tp_prev, 1, np.where(tp < tp_prev, -1, 0))
+        mfr = (tp * v * up_down)[-14:]
+        mfi = 100 - (100 / (1 + np.sum(np.where(mfr >= 0.0, mfr, 0.0)) / abs(np.sum(np.where(mfr < 0.0, mfr, 0.0)))))
+        f['mfi'] = float(np.clip(50.0 if np.isnan(mfi) else mfi, 0, 100))
+
+        f['dist_50_high'] = (cl - h[-50:].max()) / cl * 100
+        f['dist_50_low'] = (cl - l[-50:].min()) / cl * 100
+
+        # Time-based features
+        # Only datetime-like indexes expose .hour (checked on the type to avoid
+        # materializing the whole hour array)
+        timed = isinstance(df.index, (pd.DatetimeIndex, pd.PeriodIndex))
+        last_ts = df.index[-1]
+        f['hour_of_day'] = last_ts.hour if timed else 12
+        f['day_of_week'] = last_ts.dayofweek if timed else 0
+
+        f['roc_21'] = roc(c, 21)
+        f['roc_50'] = roc(c, 50)
+
+        # Williams %R
+        hh, ll14 = h[-14:].max(), l[-14:].min()
+        williams_r = -100 * (hh - cl) / (hh - ll14)
+        f['williams_r'] = -50 if np.isnan(williams_r) else williams_r
+
+        # CCI
+        tp20 = tp[-20:]
+        cci = (tp[-1] - tp20.mean()) / (0.015 * np.mean(np.abs(tp20 - np.mean(tp20))))
+        f['cci'] = 0 if np.isnan(cci) else cci
+
+        # Ultimate Oscillator
+        bp = c - np.fmin(l, prev_close)
+        bp[0] = np.nan  # min(skipna=False) with the missing previous close
+        uo_avgs = [bp[-w:].sum() / tr[-w:].sum() for w in (7, 14, 28)]
+        uo = 100.0 * ((4.0 * uo_avgs[0]) + (2.0 * uo_avgs[1]) + (1.0 * uo_avgs[2])) / 7.0
+        f['ultimate_osc'] = 50 if np.isnan(uo) else uo
+
+        f['volume_roc_5'] = (vl - v[-6]) / (v[-6] + 1e-10) * 100
+        f['volume_roc_21'] = (vl - v[-22]) / (v[-22] + 1e-10) * 100
+
+        # Chaikin Money Flow
+        mfv = ((c[-20:] - l[-20:]) - (h[-20:] - c[-20:])) / (h[-20:] - l[-20:])
+        mfv = np.where(np.isnan(mfv), 0.0, mfv) * v[-20:]
+        cmf = mfv.sum() / v[-20:].sum()
+        f['chaikin_mf'] = 0 if np.isnan(cmf) else cmf
+
+        # Force Index
+        force = _ewm(diff * v, 2 / 14, 13)[-1]
+        f['force_index'] = 0 if np.isnan(force) else force
+
+        # Ease of Movement
+        eom = ((hl - h[-2]) + (ll - l[-2])) * (hl - ll) / (2 * vl) * 100000000
+        f['ease_movement'] = 0 if np.isnan(eom) else eom
+
+        f['dist_sma20'] = (cl - c[-20:].mean()) / cl * 100
+        f['dist_sma50'] = (cl - c[-50:].mean()) / cl * 100
+        f['pivot_dist'] = (cl - tp[-1]) / cl * 100
+
+        recent_high, recent_low = h[-20:].max(), l[-20:].min()
+        fib_382 = recent_low + (recent_high - recent_low) * 0.382
+        f['fib_dist'] = (cl - fib_382) / cl * 100
+
+        f['morning_volatility'] = atr_pct[-8:].mean()
+        f['afternoon_volatility'] = atr_pct[-16:].mean()
+
+        gap = (ol - c[-2]) / c[-2] * 100
+        f['gap_up'] = max(gap, 0.0) if not np.isnan(gap) else gap
+        f['gap_down'] = abs(min(gap, 0.0)) if not np.isnan(gap) else gap
+
+        f['range_change'] = ((hl - ll) - (h[-2] - l[-2])) / (h[-2] - l[-2]) * 100
+        f['bull_power'] = hl - ema[20][-1]
+        f['bear_power'] = ll - ema[20][-1]
+        f['momentum_div'] = rsi[-1] - rsi[-6]
+
+        # Volume Price Trend (cumulative over the whole history)
+        f['vpt'] = np.cumsum((c[1:] / c[:-1] - 1) * v[1:])[-1]
+        f['intraday_momentum'] = (cl - ol) / ol * 100
+
+        # calculate_market_regime / calculate_market_regime_advanced reference an
+        # undefined calculate_atr and therefore always return their 0 default
+        f['market_regime'] = 0
+
+        # Stochastic RSI (%K over the raw RSI series)
+        rsi_tail = rsi_raw[-16:]
+        windows = np.lib.stride_tricks.sliding_window_view(rsi_tail, 14)
+        lowest, highest = windows.min(axis=1), windows.max(axis=1)
+        stoch_rsi = ((rsi_tail[-3:] - lowest) / (highest - lowest)).mean()
+        f['stoch_rsi'] = 0.5 if np.isnan(stoch_rsi) else stoch_rsi
+
+        # KST
+        def rocma(r, w):
+            return np.mean((c[-w:] - c[-w - r:n - r]) / c[-w - r:n - r])
+
+        kst = 100 * (rocma(10, 10) + 2 * rocma(15, 10) + 3 * rocma(20, 10) + 4 * rocma(30, 15))
+        f['kst'] = 0 if np.isnan(kst) else kst
+
+        dpo = c[-12] - c[-20:].mean()
+        f['dpo'] = 0 if np.isnan(dpo) else dpo
+
+        # Ulcer Index
+        close_tail = c[-27:]
+        ui_max = np.lib.stride_tricks.sliding_window_view(close_tail, 14).max(axis=1)
+        r_i = 100 * (close_tail[-14:] - ui_max) / ui_max
+        ulcer = np.sqrt((r_i ** 2 / 14).sum())
+        f['ulcer_index'] = 0 if np.isnan(ulcer) else ulcer
+
+        vwap = (tp[-14:] * v[-14:]).sum() / v[-14:].sum()
+        f['vwap'] = cl if np.isnan(vwap) else vwap
+
+        f['market_regime_advanced'] = 0
+
+        # Sentiment proxy (last 5 candles, each against its 10-candle volume mean)
+        sentiment = []
+        for j in range(n - 5, n):
+            above_avg_volume = v[j] > v[j - 9:j + 1].mean()
+            if c[j] > o[j] and c[j] > c[j - 1] and above_avg_volume:
+                sentiment.append(1)
+            elif c[j] < o[j] and c[j] < c[j - 1] and above_avg_volume:
+                sentiment.append(-1)
+            else:
+                sentiment.append(0)
+        f['sentiment_proxy'] = np.mean(sentiment)
+
+        # Feature interactions
+        f['rsi_stoch_rsi'] = f['rsi'] * f['stoch_rsi']
+        f['cci_kst'] = f['cci'] * f['kst']
+        f['vol_price_change'] = f['atr_pct'] * abs(f['roc_5'])
+        f['regime_volatility'] = f['market_regime'] * f['atr_pct']
+
+        # Statistical features (same estimator as pandas rolling skew/kurt)
+        returns = c[-20:] / c[-21:-1] - 1
+        f['returns_skew'], f['returns_kurtosis'] = _skew_kurt(returns)
+
+        f['hour_sin'] = np.sin(2 * np.pi * f['hour_of_day'] / 24)
+        f['hour_cos'] = np.cos(2 * np.pi * f['hour_of_day'] / 24)
+        f['day_sin'] = np.sin(2 * np.pi * f['day_of_week'] / 7)
+        f['day_cos'] = np.cos(2 * np.pi * f['day_of_week'] / 7)
+
+    values = np.array([[f[col] for col in FEATURE_COLUMNS]], dtype=float)
+    values[np.isnan(values)] = 0  # same as the pipeline's fillna(0); inf is kept
+    return pd.DataFrame(values, columns=FEATURE_COLUMNS, index=df.index[-1:])
+
+
+def _skew_kurt(x: np.ndarray) -> tuple:
+    """Bias-corrected sample skewness and excess kurtosis (pandas rolling semantics)."""
+    nobs = len(x)
+    mean = x.mean()
+    dev = x - mean
+    m2 = (dev ** 2).mean()
+    if np.all(x == x[0]):
+        return 0.0, -3.0  # pandas' constant-window result
+    if m2 <= 1e-14 or not np.isfinite(m2):
+        return 0.0, 0.0  # pandas yields NaN -> filled with 0
+    m3 = (dev ** 3).mean()
+    m4 = (dev ** 4).mean()
+    skew = np.sqrt(nobs * (nobs - 1)) * m3 / ((nobs - 2) * m2 ** 1.5)
+    kurt = ((nobs * nobs - 1) * m4 / (m2 * m2) - 3 * (nobs - 1) ** 2) / ((nobs - 2) * (nobs - 3))
+    return skew, kurt
@@ -2,7 +2,8 @@ import os
 import joblib
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional
+import asyncio
+from typing import Dict, Any, List, Optional, Tuple
 from .classifier import MarketClassifier, MarketRegime
 from servos.indicators import calculate_ema, calculate_rsi, calculate_atr, calculate_adx
 import pandas_ta as ta
@@ -11,6 +12,7 @@ import pandas_ta as ta
 FEATURE_ENGINEERING_AVAILABLE = False
 add_indicators = None
 add_all_new_features = None
+FEATURE_COLUMNS = None
 
 print("🧠 ML Classifier: Checking feature engineering availability...")
 
@@ -28,7 +30,7 @@ except ImportError as ta_error:
 
 if ta_available:
     try:
-        from nexus_system.cortex.feature_engineering import add_indicators, add_all_new_features
+        from nexus_system.cortex.feature_engineering import add_indicators, add_all_new_features, FEATURE_COLUMNS
         FEATURE_ENGINEERING_AVAILABLE = True
         print("🧠 ML Classifier: Advanced feature engineering loaded successfully")
     except ImportError as ie:
@@ -139,38 +141,13 @@ class MLClassifier:
         try:
             # Apply feature engineering pipeline
             if FEATURE_ENGINEERING_AVAILABLE and add_indicators is not None and add_all_new_features is not None:
-                # Full pipeline available - use advanced features
-                df_with_indicators = add_indicators(df.copy())
+                # Full pipeline available - last-row mode computes only the final
+                # feature vector (parity with the full frame is covered by tests)
+                df_with_indicators = add_indicators(df, last_row_only=True)
                 df_with_all_features = add_all_new_features(df_with_indicators)
 
-                # Extract advanced feature columns (46 features expected by model)
-                X_cols = [
-                    # Core (original)
-                    'rsi', 'adx', 'atr_pct', 'trend_str', 'vol_change',
-                    # v3.0 features
-                    'macd_hist_norm', 'bb_pct', 'bb_width',
-                    'roc_5', 'roc_10', 'obv_change',
-                    'price_position', 'body_pct',
-                    'above_ema200', 'ema_cross',
-                    # v3.1 features
-                    'ema20_slope', 'mfi', 'dist_50_high', 'dist_50_low',
-                    'hour_of_day', 'day_of_week',
-                    # v3.2 features
-                    'roc_21', 'roc_50', 'williams_r', 'cci', 'ultimate_osc',
-                    'volume_roc_5', 'volume_roc_21', 'chaikin_mf', 'force_index', 'ease_movement',
-                    'dist_sma20', 'dist_sma50', 'pivot_dist', 'fib_dist',
-                    'morning_volatility', 'afternoon_volatility', 'gap_up', 'gap_down', 'range_change',
-                    'bull_power', 'bear_power', 'momentum_div', 'vpt', 'intraday_momentum',
-                    # v3.3 features
-                    'market_regime',
-                    # v3.4 ADVANCED FEATURES
-                    'stoch_rsi', 'kst', 'dpo',
-                    'ulcer_index', 'vwap',
-                    'market_regime_advanced', 'sentiment_proxy',
-                    'rsi_stoch_rsi', 'cci_kst', 'vol_price_change', 'regime_volatility',
-                    'returns_skew', 'returns_kurtosis',
-                    'hour_sin', 'hour_cos', 'day_sin', 'day_cos'
-                ]
+                # Feature columns that match training (FEATURE_COLUMNS from cloud trainer)
+                X_cols = FEATURE_COLUMNS
             else:
                 # Fallback: use basic features only (21 features)
                 print("⚠️  ML features extraction failed - using basic features only")
@@ -180,35 +157,6 @@ class MLClassifier:
                 basic_features = MLClassifier._extract_basic_features(df)
                 return basic_features, True  # True = basic features
 
-            # Extract the feature columns that match training (must match FEATURE_COLUMNS from cloud trainer)
-            X_cols = [
-                # Core (original)
-                'rsi', 'adx', 'atr_pct', 'trend_str', 'vol_change',
-                # v3.0 features
-                'macd_hist_norm', 'bb_pct', 'bb_width',
-                'roc_5', 'roc_10', 'obv_change',
-                'price_position', 'body_pct',
-                'above_ema200', 'ema_cross',
-                # v3.1 features
-                'ema20_slope', 'mfi', 'dist_50_high', 'dist_50_low',
-                'hour_of_day', 'day_of_week',
-                # v3.2 features
-                'roc_21', 'roc_50', 'williams_r', 'cci', 'ultimate_osc',
-                'volume_roc_5', 'volume_roc_21', 'chaikin_mf', 'force_index', 'ease_movement',
-                'dist_sma20', 'dist_sma50', 'pivot_dist', 'fib_dist',
-                'morning_volatility', 'afternoon_volatility', 'gap_up', 'gap_down', 'range_change',
-                'bull_power', 'bear_power', 'momentum_div', 'vpt', 'intraday_momentum',
-                # v3.3 features
-                'market_regime',
-                # v3.4 ADVANCED FEATURES
-                'stoch_rsi', 'kst', 'dpo',
-                'ulcer_index', 'vwap',
-                'market_regime_advanced', 'sentiment_proxy',
-                'rsi_stoch_rsi', 'cci_kst', 'vol_price_change', 'regime_volatility',
-                'returns_skew', 'returns_kurtosis',
-                'hour_sin', 'hour_cos', 'day_sin', 'day_cos'
-            ]
-
             # Filter to available features (some may not be calculated if data is insufficient)
             available_features = [col for col in X_cols if col in df_with_all_features.columns]
 
@@ -222,7 +170,7 @@ class MLClassifier:
                 return None
 
             # Return the feature vector (last row only, as numpy array)
-            features_df = df_with_all_features[available_features].iloc[-1:].copy()
+            features_df = df_with_all_features[available_features].iloc[-1:]
 
             # NUEVO: Validar que no haya demasiados NaN
             nan_count = features_df.isna().sum().sum()
@@ -244,24 +192,11 @@ class MLClassifier:
 
 
     @classmethod
-    def classify(cls, market_data: Dict[str, Any]) -> Optional[MarketRegime]:
+    def _should_bypass(cls, symbol: str) -> bool:
         """
-        Predicts regime using ML model. Returns None if:
-        - Model missing/fails
-        - Confidence below CONFIDENCE_THRESHOLD (0.70)
-        - Asset not in training data (bypass for new assets)
+        True if the asset is not in training data (bypass for new assets).
+        This prevents errors with newly added assets before model retraining.
         """
-        # Ensure model is loaded
-        if not cls._model_loaded:
-            cls.load_model()
-
-        if not cls._model:
-            return None # Trigger fallback
-
-        # 🔄 BYPASS CHECK: If asset is not in training data, skip ML and use rule-based
-        # This prevents errors with newly added assets before model retraining
-        symbol = market_data.get('symbol', '')
-
         # Check if we have metadata with trained symbols
         model_metadata = getattr(cls, '_model_metadata', None)
 
@@ -270,7 +205,7 @@ class MLClassifier:
             trained_symbols = model_metadata['symbols']
             if symbol and symbol not in trained_symbols:
                 print(f"🔄 ML Bypass: {symbol} not in training data ({len(trained_symbols)} symbols), using rule-based classifier")
-                return None  # Trigger fallback to rule-based
+                return True  # Trigger fallback to rule-based
         elif hasattr(cls, '_feature_names') and cls._feature_names:
             # Legacy check: look for symbol in feature names (less reliable)
             # Only bypass if we're very confident the symbol wasn't trained
@@ -279,91 +214,146 @@ class MLClassifier:
                 feature_name_check = any(symbol.upper() in str(name).upper() for name in cls._feature_names[:20])
                 if not feature_name_check:
                     print(f"🔄 ML Bypass: {symbol} likely not in training data (legacy check), using rule-based classifier")
-                return None  # Trigger fallback to rule-based
+                return True  # Trigger fallback to rule-based
+        return False
 
-        extracted = cls._extract_features(market_data.get('dataframe'))
-        if extracted is None:
-            return None
+    @classmethod
+    def _scale(cls, features: pd.DataFrame, is_basic: bool) -> np.ndarray:
+        """Apply the scaler matching the feature set (basic or advanced)."""
+        if is_basic:
+            # Use basic scaler for basic features (21 features)
+            if hasattr(cls, '_basic_scaler') and cls._basic_scaler is not None:
+                print(f"🔧 Using basic scaler for {features.shape[1]} features")
+                return cls._basic_scaler.transform(features)
+
+            # Create basic scaler on first use
+            print(f"🔧 Creating basic scaler for {features.shape[1]} features")
+            from sklearn.preprocessing import RobustScaler
+            cls._basic_scaler = RobustScaler()
+            # Fit on dummy data with same shape to initialize
+            dummy_data = np.random.randn(100, features.shape[1])
+            cls._basic_scaler.fit(dummy_data)
+            # Save for future use
+            try:
+                joblib.dump(cls._basic_scaler, BASIC_SCALER_PATH)
+                print(f"💾 Basic scaler saved to {BASIC_SCALER_PATH}")
+            except Exception as save_err:
+                print(f"⚠️ Failed to save basic scaler: {save_err}")
 
-        features, is_basic = extracted
+            return cls._basic_scaler.transform(features)
 
-        try:
-            # Use appropriate scaler based on feature type
-            if is_basic:
-                # Use basic scaler for basic features (21 features)
-                if hasattr(cls, '_basic_scaler') and cls._basic_scaler is not None:
-                    features_scaled = cls._basic_scaler.transform(features)
-                    print(f"🔧 Using basic scaler for {features.shape[1]} features")
-                else:
-                    # Create basic scaler on first use
-                    print(f"🔧 Creating basic scaler for {features.shape[1]} features")
-                    from sklearn.preprocessing import RobustScaler
-                    cls._basic_scaler = RobustScaler()
-                    # Fit on dummy data with same shape to initialize
-                    dummy_data = np.random.randn(100, features.shape[1])
-                    cls._basic_scaler.fit(dummy_data)
-                    # Save for future use
-                    try:
-                        joblib.dump(cls._basic_scaler, BASIC_SCALER_PATH)
-                        print(f"💾 Basic scaler saved to {BASIC_SCALER_PATH}")
-                    except Exception as save_err:
-                        print(f"⚠️ Failed to save basic scaler: {save_err}")
-
-                    features_scaled = cls._basic_scaler.transform(features)
+        # Use full scaler for advanced features (46 features)
+        if cls._scaler is not None:
+            return cls._scaler.transform(features)
+        return features.values  # Use raw features if no scaler
+
+    @classmethod
+    def _predict(cls, features_scaled: np.ndarray) -> List[Optional[MarketRegime]]:
+        """One model call for a stacked feature matrix -> regime per row."""
+        n_rows = features_scaled.shape[0]
+
+        # Get probabilities (the prediction is their argmax, so no separate predict() call)
+        if hasattr(cls._model, "predict_proba"):
+            probs = cls._model.predict_proba(features_scaled)
+            confidences = probs.max(axis=1)
+            classes = getattr(cls._model, "classes_", None)
+            if classes is not None:
+                predictions = np.asarray(classes)[np.argmax(probs, axis=1)]
             else:
-                # Use full scaler for advanced features (46 features)
-                if cls._scaler is not None:
-                    features_scaled = cls._scaler.transform(features)
-                else:
-                    features_scaled = features.values  # Use raw features if no scaler
-            
-            # Predict
-            prediction = cls._model.predict(features_scaled)[0]
-            
-            # Get probabilities
-            confidence = 0.8 # Default
-            if hasattr(cls._model, "predict_proba"):
-                probs = cls._model.predict_proba(features_scaled)
-                confidence = float(np.max(probs))
-            
+                predictions = cls._model.predict(features_scaled)
+        else:
+            predictions = cls._model.predict(features_scaled)
+            confidences = np.full(n_rows, 0.8)  # Default
+
+        # Decode predictions if label encoder is available
+        if cls._label_encoder is not None:
+            pred_labels = cls._label_encoder.inverse_transform(predictions)
+        else:
+            pred_labels = [str(prediction) for prediction in predictions]
+
+        # Map Prediction Label to Regime/Strategy
+        strategy_map = {
+            "trend": ("TREND", "TrendFollowing"),
+            "scalp": ("VOLATILE", "Scalping"),
+            "grid": ("RANGE_TIGHT", "Grid"),
+            "mean_rev": ("RANGE_WIDE", "MeanReversion")
+        }
+
+        results = []
+        for pred_label, confidence in zip(pred_labels, confidences):
+            confidence = float(confidence)
+
             # CONFIDENCE THRESHOLD CHECK
             if confidence < CONFIDENCE_THRESHOLD:
                 # Low confidence - fallback to rule-based
-                return None
-            
-            # Decode prediction if label encoder is available
-            if cls._label_encoder is not None:
-                pred_label = cls._label_encoder.inverse_transform([prediction])[0]
-            else:
-                pred_label = str(prediction)
-            
-            # Map Prediction Label to Regime/Strategy
-            strategy_map = {
-                "trend": ("TREND", "TrendFollowing"),
-                "scalp": ("VOLATILE", "Scalping"),
-                "grid": ("RANGE_TIGHT", "Grid"),
-                "mean_rev": ("RANGE_WIDE", "MeanReversion")
-            }
-            
+                results.append(None)
+                continue
+
             # Handle if prediction is int or string
             pred_key = str(pred_label).lower()
-            
+
             # Mapping logic
             if "trend" in pred_key: mapping = strategy_map["trend"]
             elif "scalp" in pred_key: mapping = strategy_map["scalp"]
             elif "grid" in pred_key: mapping = strategy_map["grid"]
             else: mapping = strategy_map["mean_rev"]
-            
-            return MarketRegime(
+
+            results.append(MarketRegime(
                 regime=mapping[0],
                 suggested_strategy=mapping[1],
                 confidence=confidence,
                 reason=f"🤖 ML Prediction ({pred_key.upper()}, conf: {confidence:.0%})"
-            )
-            
-        except Exception as e:
-            print(f"⚠️ ML Inference Error: {e}")
-            return None
+            ))
+        return results
+
+    @classmethod
+    def classify_batch(cls, batch: List[Dict[str, Any]]) -> List[Optional[MarketRegime]]:
+        """
+        Predicts regimes for several symbols with one scaler transform and one
+        predict_proba per feature set (rows are stacked into a single matrix).
+
+        Returns a list aligned with `batch`; None entries mean "use rule-based".
+        """
+        # Ensure model is loaded
+        if not cls._model_loaded:
+            cls.load_model()
+
+        results: List[Optional[MarketRegime]] = [None] * len(batch)
+        if not cls._model:
+            return results  # Trigger fallback
+
+        # Group feature rows by layout (basic vs advanced, same columns) so they stack
+        groups: Dict[tuple, List[tuple]] = {}
+        for i, market_data in enumerate(batch):
+            if cls._should_bypass(market_data.get('symbol', '')):
+                continue
+            extracted = cls._extract_features(market_data.get('dataframe'))
+            if extracted is None or extracted[0] is None:
+                continue
+            features, is_basic = extracted
+            groups.setdefault((is_basic, tuple(features.columns)), []).append((i, features))
+
+        for (is_basic, _), rows in groups.items():
+            try:
+                features = pd.concat([f for _, f in rows], ignore_index=True)
+                regimes = cls._predict(cls._scale(features, is_basic))
+            except Exception as e:
+                print(f"⚠️ ML Inference Error: {e}")
+                continue
+            for (i, _), regime in zip(rows, regimes):
+                results[i] = regime
+
+        return results
+
+    @classmethod
+    def classify(cls, market_data: Dict[str, Any]) -> Optional[MarketRegime]:
+        """
+        Predicts regime using ML model. Returns None if:
+        - Model missing/fails
+        - Confidence below CONFIDENCE_THRESHOLD (0.70)
+        - Asset not in training data (bypass for new assets)
+        """
+        return cls.classify_batch([market_data])[0]
 
     @staticmethod
     def _extract_basic_features(df: pd.DataFrame) -> Optional[pd.DataFrame]:
@@ -420,3 +410,71 @@ class MLClassifier:
             print(f"❌ Error in basic feature extraction: {e}")
             return None
 
+
+class MLInferenceBatcher:
+    """
+    Micro-batcher for MLClassifier on candle close.
+
+    All symbols close together at a bar boundary; requests arriving within
+    `window_ms` of the first one are stacked and classified with a single
+    model call (off the event loop), then routed back to each caller.
+    """
+
+    def __init__(self, window_ms: float = 25, max_batch: int = 64):
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def classify(self, market_data: Dict[str, Any]) -> Optional[MarketRegime]:
+        """Queue a classification and wait for its batch to be evaluated."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((market_data, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        # Load once on the loop thread so concurrent batches never race the load
+        if not MLClassifier._model_loaded:
+            MLClassifier.load_model()
+
+        try:
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(
+                None, MLClassifier.classify_batch, [market_data for market_data, _ in batch]
+            )
+        except Exception as e:
+            print(f"⚠️ ML Batch Inference Error: {e}")
+            results = [None] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+_ml_batcher: Optional[MLInferenceBatcher] = None
+
+
+def get_ml_batcher() -> MLInferenceBatcher:
+    """Get global ML inference batcher."""
+    global _ml_batcher
+    if _ml_batcher is None:
+        try:
+            from system_directive import ML_BATCH_WINDOW_MS, ML_BATCH_MAX_SIZE
+        except ImportError:
+            ML_BATCH_WINDOW_MS, ML_BATCH_MAX_SIZE = 25, 64
+        _ml_batcher = MLInferenceBatcher(ML_BATCH_WINDOW_MS, ML_BATCH_MAX_SIZE)
+    return _ml_batcher
@@ -2,17 +2,28 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
 
+from .correlation_matrix import RollingCorrelationMatrix
+
 class CorrelationManager:
     """
     Shield 2.0: Portfolio Correlation Guard.
     Prevents over-concentration in highly correlated assets.
+
+    With a RollingCorrelationMatrix attached, pairs it tracks are O(1)
+    lookups; the price-history path is the fallback for anything else.
     """
-    def __init__(self, max_correlation: float = 0.85, window_size: int = 50):
+    def __init__(self, max_correlation: float = 0.85, window_size: int = 50,
+                 matrix: Optional[RollingCorrelationMatrix] = None):
         self.max_correlation = max_correlation
         self.window_size = window_size
+        self.matrix = matrix
         # Cache of price history for active references: {symbol: pd.Series(prices)}
         self.price_history: Dict[str, pd.Series] = {}
 
+    def covers(self, symbols: List[str]) -> bool:
+        """True if the rolling matrix can answer every pair among symbols."""
+        return self.matrix is not None and all(self.matrix.is_ready(s) for s in symbols)
+
     def update_price_history(self, symbol: str, prices: pd.Series):
         """
         Updates the price history for a symbol. 
@@ -23,9 +34,10 @@ class CorrelationManager:
         # Store only the last N closing prices
         self.price_history[symbol] = prices.iloc[-self.window_size:].copy()
 
-    def check_correlation(self, candidate_symbol: str, candidate_prices: pd.Series, active_positions: List[str]) -> bool:
+    def check_correlation(self, candidate_symbol: str, candidate_prices: Optional[pd.Series], active_positions: List[str]) -> bool:
         """
         Checks if the candidate symbol is too correlated with any CURRENTLY ACTIVE position.
+        candidate_prices may be None when covers() is True for all symbols.
         Returns:
             True if Safe (Correlation < Threshold)
             False if Unsafe (Correlation > Threshold)
@@ -33,7 +45,22 @@ class CorrelationManager:
         # If no active positions, it's always safe (unless we check against a benchmark, but here strict portfolio risk)
         if not active_positions:
             return True
-            
+
+        # Fast path: pairs tracked by the rolling matrix
+        if self.matrix is not None:
+            remaining = []
+            for position_symbol in active_positions:
+                if position_symbol == candidate_symbol: continue
+                corr = self.matrix.get(candidate_symbol, position_symbol)
+                if corr is None:
+                    remaining.append(position_symbol)
+                elif corr > self.max_correlation:
+                    print(f"🚫 Shield Alert: {candidate_symbol} is {corr:.2f} correlated with active position {position_symbol}.")
+                    return False # UNSAFE
+            active_positions = remaining
+            if not active_positions or candidate_prices is None:
+                return True
+
         # Ensure we have the candidate's history
         self.update_price_history(candidate_symbol, candidate_prices)
         candidate_series = self.price_history.get(candidate_symbol)
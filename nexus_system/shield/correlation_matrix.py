@@ -0,0 +1,329 @@
+"""
+Shield 2.0: Rolling Correlation Matrix.
+
+Keeps a rolling window of log returns for the whole asset universe in a
+NumPy ring buffer, with running sums and cross-products updated on each
+candle close. The full correlation matrix is derived once per bar, so
+pair / benchmark lookups are O(1) for the risk checks.
+"""
+
+import asyncio
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..utils.logger import get_logger
+
+
+def _ts_ms(value) -> int:
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(pd.Timestamp(value).value // 1_000_000)
+
+
+class RollingCorrelationMatrix:
+    """
+    Incremental correlation / beta matrix over the last `window` bars.
+
+    Closed candles for the same bar are collected per symbol; the bar is
+    committed when every symbol has reported or when the next bar starts.
+    Symbols missing a close carry their last price forward (zero return),
+    and a pair is only reported once both symbols have `min_periods` real
+    returns inside the window.
+    """
+
+    def __init__(self, symbols: Iterable[str] = (), window: int = 50,
+                 min_periods: int = 40, benchmark: str = 'BTCUSDT'):
+        self.window = window
+        self.min_periods = min(min_periods, window)
+        self.benchmark = benchmark
+        self.logger = get_logger("CorrelationMatrix")
+        self._set_universe(list(dict.fromkeys(symbols)))
+
+    # --- Universe / state ---
+
+    def _set_universe(self, symbols: List[str]):
+        n = len(symbols)
+        self.symbols = symbols
+        self._index = {symbol: i for i, symbol in enumerate(symbols)}
+
+        self._returns = np.zeros((self.window, n))
+        self._valid = np.zeros((self.window, n), dtype=bool)
+        self._head = 0      # next ring slot
+        self._rows = 0      # rows filled (<= window)
+        self._pushes = 0
+
+        self._sum = np.zeros(n)
+        self._cross = np.zeros((n, n))
+        self._obs = np.zeros(n, dtype=np.int64)
+
+        self._last_close = np.full(n, np.nan)
+        self._bar_ts: Optional[int] = None        # bar being collected
+        self._bar_closes: Dict[int, float] = {}
+        self._committed_ts: Optional[int] = None  # last bar in the buffer
+
+        self._corr = np.full((n, n), np.nan)
+        self._beta = np.full(n, np.nan)
+        self._dirty = False
+
+    def set_universe(self, symbols: Iterable[str]):
+        """Replace the tracked universe (clears all history)."""
+        self._set_universe(list(dict.fromkeys(symbols)))
+
+    # --- Updates ---
+
+    def seed(self, closes: Dict[str, pd.Series]):
+        """
+        Fill the window from close histories (Series indexed by bar time).
+
+        Histories are aligned on their timestamps (gaps carry the last price
+        forward) and the last `window` bars of log returns become the window.
+        """
+        frame = pd.DataFrame({s: c for s, c in closes.items() if s in self._index and not c.empty})
+        if frame.empty:
+            return
+        frame = frame.sort_index().iloc[-(self.window + 1):]
+        for ts, row in frame.iterrows():
+            self._bar_ts = _ts_ms(ts)
+            self._bar_closes = {self._index[s]: float(v) for s, v in row.items() if pd.notna(v)}
+            self._commit()
+
+    def on_close(self, symbol: str, close: float, timestamp) -> bool:
+        """
+        Record a closed candle. Returns True if it completed a bar.
+        """
+        i = self._index.get(symbol)
+        if i is None or not close or close <= 0:
+            return False
+        ts = _ts_ms(timestamp)
+
+        if self._committed_ts is not None and ts <= self._committed_ts:
+            return False  # Late close for a bar already in the window
+        if self._bar_ts is not None and ts > self._bar_ts:
+            self._commit()  # Next bar started before every symbol reported
+        if self._bar_ts is None:
+            self._bar_ts = ts
+
+        self._bar_closes[i] = float(close)
+        if len(self._bar_closes) == len(self.symbols):
+            self._commit()
+            return True
+        return False
+
+    async def on_candle(self, symbol: str, candle: dict):
+        """MarketStream callback (only closed candles are used)."""
+        if candle.get('is_closed', False):
+            self.on_close(symbol, candle.get('close', 0), candle.get('timestamp'))
+
+    def _commit(self):
+        if self._bar_ts is None:
+            return
+        n = len(self.symbols)
+        closes = self._last_close.copy()
+        for i, close in self._bar_closes.items():
+            closes[i] = close
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.log(closes / self._last_close)
+        valid = np.zeros(n, dtype=bool)
+        reported = list(self._bar_closes)
+        valid[reported] = np.isfinite(returns[reported])
+
+        # The very first bar only establishes reference prices
+        if valid.any():
+            self._push_row(np.where(valid, returns, 0.0), valid)
+        self._last_close = np.where(np.isnan(closes), self._last_close, closes)
+        self._committed_ts = self._bar_ts
+        self._bar_ts = None
+        self._bar_closes = {}
+
+    def _push_row(self, returns: np.ndarray, valid: np.ndarray):
+        slot = self._head
+        if self._rows == self.window:
+            old = self._returns[slot]
+            self._sum -= old
+            self._cross -= np.outer(old, old)
+            self._obs -= self._valid[slot]
+        else:
+            self._rows += 1
+
+        self._returns[slot] = returns
+        self._valid[slot] = valid
+        self._sum += returns
+        self._cross += np.outer(returns, returns)
+        self._obs += valid
+        self._head = (slot + 1) % self.window
+
+        self._pushes += 1
+        if self._pushes % self.window == 0:
+            # Periodic exact resum keeps add/subtract rounding from drifting
+            rows = self._returns[:self._rows]
+            self._sum = rows.sum(axis=0)
+            self._cross = rows.T @ rows
+        self._dirty = True
+
+    # --- Derived matrices ---
+
+    def _refresh(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        n = self._rows
+        if n < 2:
+            return
+        mean = self._sum / n
+        cov = (self._cross - n * np.outer(mean, mean)) / (n - 1)
+        var = np.diag(cov).copy()
+        var[var <= 1e-18] = np.nan
+        std = np.sqrt(var)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = cov / np.outer(std, std)
+        ready = self._obs >= self.min_periods
+        corr[~ready, :] = np.nan
+        corr[:, ~ready] = np.nan
+        self._corr = np.clip(corr, -1.0, 1.0)
+
+        b = self._index.get(self.benchmark)
+        if b is not None and ready[b] and np.isfinite(var[b]):
+            self._beta = np.where(ready, cov[:, b] / var[b], np.nan)
+        else:
+            self._beta = np.full(len(self.symbols), np.nan)
+
+    def is_ready(self, symbol: str) -> bool:
+        """True if symbol has enough returns in the window for lookups."""
+        i = self._index.get(symbol)
+        return i is not None and self._obs[i] >= self.min_periods
+
+    def get(self, a: str, b: str) -> Optional[float]:
+        """Correlation of log returns between a and b, or None if unknown."""
+        i, j = self._index.get(a), self._index.get(b)
+        if i is None or j is None:
+            return None
+        self._refresh()
+        value = self._corr[i, j]
+        return float(value) if np.isfinite(value) else None
+
+    def beta(self, symbol: str) -> Optional[float]:
+        """Beta of symbol's returns to the benchmark, or None if unknown."""
+        i = self._index.get(symbol)
+        if i is None:
+            return None
+        self._refresh()
+        value = self._beta[i]
+        return float(value) if np.isfinite(value) else None
+
+    def matrix(self) -> pd.DataFrame:
+        """Full correlation matrix (NaN where not ready)."""
+        self._refresh()
+        return pd.DataFrame(self._corr.copy(), index=self.symbols, columns=self.symbols)
+
+    # --- Views for PortfolioState ---
+
+    def pairs(self) -> 'CorrelationPairs':
+        return CorrelationPairs(self)
+
+    def to_benchmark(self, kind: str = 'corr') -> 'BenchmarkView':
+        return BenchmarkView(self, kind)
+
+    # --- Background service ---
+
+    async def attach(self, market_stream, symbols: Iterable[str], concurrency: int = 5):
+        """
+        Track `symbols` from a MarketStream: seed from cached candles, then
+        update on every closed candle via the stream callback.
+        """
+        self.set_universe(symbols)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def history(symbol):
+            async with semaphore:
+                try:
+                    data = await market_stream.get_candles(symbol, limit=self.window + 1)
+                except Exception as e:
+                    self.logger.debug(f"Seed failed for {symbol}: {e}")
+                    return symbol, None
+            df = data.get('dataframe')
+            if df is None or df.empty:
+                return symbol, None
+            index = df['timestamp'] if 'timestamp' in df.columns else df.index
+            return symbol, pd.Series(df['close'].to_numpy(dtype=float), index=pd.to_datetime(index))
+
+        results = await asyncio.gather(*(history(s) for s in self.symbols))
+        self.seed({s: closes for s, closes in results if closes is not None})
+        market_stream.add_callback(self.on_candle, closed_only=True)
+        self.logger.info(f"📐 Correlation matrix tracking {len(self.symbols)} assets ({self._rows} bars seeded)")
+
+
+class CorrelationPairs(Mapping):
+    """Read-only {(a, b): corr} view over a RollingCorrelationMatrix."""
+
+    def __init__(self, source: RollingCorrelationMatrix):
+        self._source = source
+
+    def _ready(self) -> List[str]:
+        return [s for s in self._source.symbols if self._source.is_ready(s)]
+
+    def __getitem__(self, key: Tuple[str, str]) -> float:
+        value = self._source.get(*key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        ready = self._ready()
+        return ((a, b) for a in ready for b in ready if a != b)
+
+    def __len__(self) -> int:
+        k = len(self._ready())
+        return k * (k - 1)
+
+
+class BenchmarkView(Mapping):
+    """Read-only {symbol: corr or beta to benchmark} view (benchmark itself excluded)."""
+
+    def __init__(self, source: RollingCorrelationMatrix, kind: str = 'corr'):
+        self._source = source
+        self._kind = kind
+
+    def __getitem__(self, symbol: str) -> float:
+        source = self._source
+        if symbol == source.benchmark:
+            raise KeyError(symbol)
+        if self._kind == 'beta':
+            value = source.beta(symbol)
+        else:
+            value = source.get(symbol, source.benchmark)
+        if value is None:
+            raise KeyError(symbol)
+        return value
+
+    def __iter__(self):
+        source = self._source
+        if not source.is_ready(source.benchmark):
+            return iter(())
+        return (s for s in source.symbols if s != source.benchmark and source.is_ready(s))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+# Global singleton for shared access
+_correlation_matrix: Optional[RollingCorrelationMatrix] = None
+
+
+def get_correlation_matrix() -> RollingCorrelationMatrix:
+    """Get global rolling correlation matrix (settings from system_directive)."""
+    global _correlation_matrix
+    if _correlation_matrix is None:
+        try:
+            from system_directive import CORRELATION_WINDOW, CORRELATION_MIN_PERIODS, CORRELATION_BENCHMARK
+        except ImportError:
+            CORRELATION_WINDOW, CORRELATION_MIN_PERIODS, CORRELATION_BENCHMARK = 50, 40, 'BTCUSDT'
+        _correlation_matrix = RollingCorrelationMatrix(
+            window=CORRELATION_WINDOW,
+            min_periods=CORRELATION_MIN_PERIODS,
+            benchmark=CORRELATION_BENCHMARK,
+        )
+    return _correlation_matrix
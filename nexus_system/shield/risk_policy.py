@@ -2,9 +2,12 @@
 Risk Policy Engine - Fase 2: Centralización de Lógica de Riesgo
 Unifica aprobación de trades, límites de exposición y ajustes dinámicos de tamaño.
 """
-from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
-from dataclasses import dataclass
+from typing import Dict, Any, FrozenSet, List, Mapping, Optional, Tuple, TYPE_CHECKING
+from dataclasses import dataclass, field
 from enum import Enum
+import weakref
+
+from .correlation_matrix import get_correlation_matrix
 
 if TYPE_CHECKING:
     from nexus_system.core.risk_scaler import RiskMultipliers
@@ -50,8 +53,15 @@ class PortfolioState:
     exposure_by_cluster: Dict[str, float]  # cluster = subgroup (MAJOR_CAPS, MEME_COINS, etc.)
     net_direction_exposure: Dict[str, float]  # long_notional, short_notional
     drawdown: float
-    corr_matrix: Dict[Tuple[str, str], float]   # sobre returns
-    corr_to_bench: Dict[str, float]         # corr con BTC/ETH, opcional
+    corr_matrix: Mapping[Tuple[str, str], float]   # sobre returns
+    corr_to_bench: Mapping[str, float]         # corr con BTC/ETH, opcional
+    beta_to_bench: Mapping[str, float] = field(default_factory=dict)  # beta vs benchmark
+    exposure_by_symbol: Mapping[str, float] = field(default_factory=dict)  # fracción del equity por símbolo
+    symbols: FrozenSet[str] = frozenset()  # símbolos con posición abierta
+
+    def __post_init__(self):
+        if not self.symbols and self.positions:
+            self.symbols = frozenset(p.symbol for p in self.positions)
 
 
 @dataclass
@@ -157,7 +167,7 @@ class RiskPolicy:
 
         # 4) Symbol exposure limits (máximo 10% por símbolo individual)
         symbol_limit = self.config.get('max_symbol_exposure', 0.10)
-        current_symbol_exposure = sum(p.notional_value for p in portfolio.positions if p.symbol == intent.symbol)
+        current_symbol_exposure = portfolio.exposure_by_symbol.get(intent.symbol, 0.0)
         if current_symbol_exposure >= symbol_limit:
             return self._deny(f"Símbolo expuesto al límite ({intent.symbol}: {current_symbol_exposure:.1%})")
 
@@ -314,10 +324,7 @@ class RiskPolicy:
             return True, ""
         
         # Contar posiciones existentes en el mismo grupo
-        existing_in_group = sum(
-            1 for p in portfolio.positions 
-            if p.symbol in self.high_corr_groups[symbol_group]
-        )
+        existing_in_group = len(self.high_corr_groups[symbol_group] & portfolio.symbols)
         
         if existing_in_group >= max_per_corr_group:
             group_symbols = ', '.join(list(self.high_corr_groups[symbol_group])[:3]) + '...'
@@ -359,6 +366,13 @@ class RiskPolicy:
         if abs(corr_to_bench) > 0.8:  # Alta correlación con benchmark
             adjusted *= 0.8
 
+        # 4) Beta adjustment: la exposición equivalente al benchmark (tamaño × |beta|)
+        #    no supera la de un activo con beta máxima permitida
+        max_beta = self.config.get('max_bench_beta', 1.0)
+        beta_to_bench = portfolio.beta_to_bench.get(intent.symbol, 0.0)
+        if abs(beta_to_bench) > max_beta:
+            adjusted *= max_beta / abs(beta_to_bench)
+
         return min(adjusted, base_size_pct)  # Nunca aumentar sobre base
 
     def _compute_sl_tp(self, intent: StrategyIntent, config: Dict[str, Any], risk_multipliers: Optional['RiskMultipliers'] = None) -> Tuple[float | None, float | None]:
@@ -410,107 +424,78 @@ class RiskPolicy:
         return sl_price, tp_price
 
 
-async def build_portfolio_state(session, shadow_wallet) -> PortfolioState:
+# Un PortfolioState por snapshot inmutable del ShadowWallet (se construye una sola vez por versión)
+_portfolio_cache: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+def portfolio_from_snapshot(snapshot) -> PortfolioState:
     """
-    Construye estado completo de la cartera desde ShadowWallet y Bridge.
-    MEJORADO: Calcula drawdown real basado en P&L no realizado.
+    Estado de la cartera a partir de un WalletSnapshot.
+    Los agregados (nocional por exchange/cluster/símbolo, PnL, equity) ya vienen
+    mantenidos por el ShadowWallet, así que no se recorre ninguna posición por evaluación.
+    Exposición por cluster/símbolo = fracción del equity (como los caps de RiskPolicy).
     """
-    positions = []
-    exposure_notional_by_exchange = {'BINANCE': 0.0, 'BYBIT': 0.0, 'ALPACA': 0.0}
-    exposure_by_cluster = {}
-    net_direction_exposure = {'long': 0.0, 'short': 0.0}
-    total_unrealized_pnl = 0.0
-
-    try:
-        # Obtener posiciones activas del bridge
-        if session.bridge:
-            bridge_positions = await session.bridge.get_positions()
-            for pos_data in bridge_positions:
-                symbol = pos_data.get('symbol', '')
-                qty = float(pos_data.get('quantity', 0) or pos_data.get('amt', 0))
-                entry_price = float(pos_data.get('entry', 0) or pos_data.get('avgPrice', 0))
-                exchange = pos_data.get('exchange', 'BINANCE')  # Default assumption
-                unrealized_pnl = float(pos_data.get('unrealizedPnl', 0) or pos_data.get('unRealizedProfit', 0))
-
-                if abs(qty) > 0.001:  # Ignorar posiciones dust
-                    side = 'LONG' if qty > 0 else 'SHORT'
-                    notional_value = abs(qty) * entry_price
-
-                    pos = Position(
-                        symbol=symbol,
-                        side=side,
-                        quantity=abs(qty),
-                        entry_price=entry_price,
-                        exchange=exchange,
-                        notional_value=notional_value,
-                        unrealized_pnl=unrealized_pnl
-                    )
-                    positions.append(pos)
-
-                    # Acumular P&L no realizado
-                    total_unrealized_pnl += unrealized_pnl
-
-                    # Actualizar exposiciones
-                    exposure_notional_by_exchange[exchange] = exposure_notional_by_exchange.get(exchange, 0.0) + notional_value
-
-                    cluster = _get_subgroup(symbol)
-                    exposure_by_cluster[cluster] = exposure_by_cluster.get(cluster, 0.0) + notional_value
-
-                    # Exposición direccional
-                    if side == 'LONG':
-                        net_direction_exposure['long'] += notional_value
-                    else:
-                        net_direction_exposure['short'] += notional_value
-    except Exception as e:
-        print(f"⚠️ Error building portfolio state: {e}")
-        # Fallback: usar datos de ShadowWallet si bridge falla
-        pass
-
-    # NUEVO: Calcular drawdown real basado en P&L no realizado
-    drawdown = 0.0
-    try:
-        # Obtener equity total
-        total_equity = 0.0
-        if shadow_wallet:
-            # Intentar obtener equity de ShadowWallet
-            wallet_data = shadow_wallet.get_combined_balance() if hasattr(shadow_wallet, 'get_combined_balance') else None
-            if wallet_data:
-                total_equity = float(wallet_data.get('total', 0) or wallet_data.get('equity', 0))
-        
-        # Si no tenemos equity de shadow_wallet, intentar obtenerlo de session
-        if total_equity <= 0 and session:
-            if hasattr(session, 'get_total_equity'):
-                total_equity = await session.get_total_equity() or 0.0
-            elif hasattr(session, 'bridge') and session.bridge:
-                try:
-                    equity_data = await session.bridge.get_total_equity()
-                    total_equity = float(equity_data) if equity_data else 0.0
-                except:
-                    pass
-        
-        # Calcular drawdown como pérdida no realizada / equity total
-        if total_equity > 0 and total_unrealized_pnl < 0:
-            drawdown = abs(total_unrealized_pnl) / total_equity
-            drawdown = min(drawdown, 1.0)  # Cap at 100%
-        
-        # Si hay pérdidas significativas, loguear
-        if drawdown > 0.05:
-            print(f"📉 Portfolio drawdown: {drawdown:.1%} (P&L: ${total_unrealized_pnl:.2f}, Equity: ${total_equity:.2f})")
-    
-    except Exception as e:
-        print(f"⚠️ Error calculating drawdown: {e}")
-        # Fallback conservador: asumir 5% DD si falla el cálculo
-        drawdown = 0.05
+    portfolio = _portfolio_cache.get(snapshot)
+    if portfolio is not None:
+        return portfolio
+
+    equity = snapshot.equity
+    pnl = snapshot.unrealized_pnl
+
+    def share(notional: Mapping[str, float]) -> Dict[str, float]:
+        return {key: value / equity for key, value in notional.items()} if equity > 0 else {}
 
-    return PortfolioState(
+    positions = []
+    for symbol, p in snapshot.positions.items():
+        quantity = abs(float(p.get('quantity', 0) or 0))
+        entry_price = float(p.get('entryPrice') or p.get('entry_price') or 0)
+        positions.append(Position(
+            symbol=symbol,
+            side=p.get('side', 'LONG'),
+            quantity=quantity,
+            entry_price=entry_price,
+            exchange=p.get('exchange', 'BINANCE'),
+            unrealized_pnl=float(p.get('unrealizedPnl') or p.get('unrealized_pnl') or 0),
+            notional_value=quantity * entry_price,
+        ))
+
+    # Drawdown = pérdida no realizada / equity total
+    drawdown = min(abs(pnl) / equity, 1.0) if equity > 0 and pnl < 0 else 0.0
+    if drawdown > 0.05:
+        print(f"📉 Portfolio drawdown: {drawdown:.1%} (P&L: ${pnl:.2f}, Equity: ${equity:.2f})")
+
+    correlations = get_correlation_matrix()
+    portfolio = PortfolioState(
         positions=positions,
-        exposure_notional_by_exchange=exposure_notional_by_exchange,
-        exposure_by_cluster=exposure_by_cluster,
-        net_direction_exposure=net_direction_exposure,
+        exposure_notional_by_exchange={'BINANCE': 0.0, 'BYBIT': 0.0, 'ALPACA': 0.0, **snapshot.notional_by_exchange},
+        exposure_by_cluster=share(snapshot.notional_by_cluster),
+        net_direction_exposure={'long': snapshot.long_notional, 'short': snapshot.short_notional},
         drawdown=drawdown,
-        corr_matrix={},  # Se calcula bajo demanda
-        corr_to_bench={}  # Se calcula bajo demanda
+        # Vistas O(1) sobre la matriz de correlación rolling (actualizada en cada cierre de vela)
+        corr_matrix=correlations.pairs(),
+        corr_to_bench=correlations.to_benchmark('corr'),
+        beta_to_bench=correlations.to_benchmark('beta'),
+        exposure_by_symbol=share(snapshot.notional_by_symbol),
+        symbols=frozenset(snapshot.positions),
     )
+    _portfolio_cache[snapshot] = portfolio
+    return portfolio
+
+
+async def build_portfolio_state(session, shadow_wallet) -> PortfolioState:
+    """
+    Construye estado completo de la cartera desde el snapshot del ShadowWallet.
+    Solo se consulta el bridge para exchanges sin stream privado activo
+    (con streams en vivo la evaluación no hace ninguna llamada REST).
+    """
+    bridge = getattr(session, 'bridge', None)
+    if bridge:
+        try:
+            await bridge.sync_all_positions()
+        except Exception as e:
+            print(f"⚠️ Error building portfolio state: {e}")
+
+    return portfolio_from_snapshot(shadow_wallet.snapshot(session.chat_id))
 
 
 def _get_subgroup(symbol: str) -> str:
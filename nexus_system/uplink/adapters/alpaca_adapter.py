@@ -267,9 +267,11 @@ class AlpacaAdapter(IExchangeAdapter):
             print(f"⚠️ AlpacaAdapter: cancel_orders error: {e}")
             return False
 
-    async def get_positions(self) -> List[Dict[str, Any]]:
-        """Get active positions."""
+    async def get_positions(self, strict: bool = False) -> List[Dict[str, Any]]:
+        """Get active positions (strict: raise on errors instead of returning [])."""
         if not self._trading_client:
+            if strict:
+                raise ConnectionError("AlpacaAdapter not initialized")
             return []
             
         try:
@@ -287,6 +289,8 @@ class AlpacaAdapter(IExchangeAdapter):
                 })
             return result
         except Exception as e:
+            if strict:
+                raise
             print(f"⚠️ AlpacaAdapter: get_positions error: {e}")
             return []
 
@@ -88,6 +88,13 @@ class IExchangeAdapter(abc.ABC):
         """
         pass
 
+    async def get_market_price(self, symbol: str) -> float:
+        """
+        Get last traded price.
+        Default returns 0.0 (callers fall back to candles). Override if supported.
+        """
+        return 0.0
+
     async def get_symbol_info(self, symbol: str) -> Dict[str, Any]:
         """
         Get symbol rules (precision, filters).
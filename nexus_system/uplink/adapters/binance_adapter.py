@@ -9,19 +9,17 @@ from typing import Dict, Any, List, Optional, Callable
 import ccxt.async_support as ccxt
 
 from .base import IExchangeAdapter
+from ..market_registry import get_market_registry
+from ..rate_limiter import get_rate_limiter, rate_lane
+from ..single_flight import flight_ttl, get_single_flight
 
 
 class BinanceAdapter(IExchangeAdapter):
     """
     Binance USD-M Futures implementation.
     Uses CCXT for REST and custom WebSocket for streaming.
+    REST calls draw from the shared Binance budget (see rate_limiter).
     """
-    
-    # Rate limiting for fetch_candles (prevents API rate limit errors)
-    _candles_rate_limiter: Dict[str, float] = {}  # Per-symbol last call time
-    _candles_global_last_call: float = 0
-    _candles_min_interval: float = 0.5  # Minimum 0.5 seconds between ANY candle calls (Binance is less strict)
-    _candles_per_symbol_interval: float = 15.0  # Minimum 15 seconds between calls for SAME symbol
 
     def __init__(self, api_key: str = None, api_secret: str = None, **kwargs):
         self._api_key = api_key or os.getenv('BINANCE_API_KEY', '')
@@ -29,6 +27,8 @@ class BinanceAdapter(IExchangeAdapter):
         self._ws_manager = None
         self._price_cache = None
         self._is_hedge_mode = False # Default to One-Way
+        self._markets_key = 'BINANCE'  # Shared market catalogue key
+        self._user_stream = None  # Private user-data stream (set by NexusBridge)
 
     @property
     def name(self) -> str:
@@ -84,23 +84,25 @@ class BinanceAdapter(IExchangeAdapter):
             if use_testnet:
                 config['options']['defaultType'] = 'future'
                 config['options']['test'] = True
+                self._markets_key = 'BINANCE_TESTNET'
                 print(f"🧪 BinanceAdapter: TESTNET mode enabled")
             
             # Unified Proxy Config (CCXT Async uses aiohttp_proxy, NOT proxies dict)
             http_proxy = kwargs.get('http_proxy') or os.getenv('PROXY_URL') or os.getenv('HTTP_PROXY') or os.getenv('http_proxy')
 
             self._exchange = ccxt.binanceusdm(config)
+            get_rate_limiter().attach(self._exchange, self._markets_key)
             
             # For async CCXT, proxy must be set via aiohttp_proxy property AFTER creation
             if http_proxy:
                 self._exchange.aiohttp_proxy = http_proxy
             
             # Step 1: Test public endpoint first (no auth needed)
-            try:
-                await self._exchange.load_markets()
+            # Markets come from the process-wide registry (downloaded once, shared by all sessions)
+            if await get_market_registry().ensure(self._markets_key, self._exchange):
                 if verbose: print(f"✅ BinanceAdapter: Markets loaded (public endpoint OK)")
-            except Exception as market_err:
-                if verbose: print(f"⚠️ BinanceAdapter: load_markets failed - {market_err}")
+            elif verbose:
+                print(f"⚠️ BinanceAdapter: load_markets failed")
                 # Markets load can fail for non-auth reasons, try to continue
 
             # Step 1.5: Load time difference for timestamp synchronization
@@ -162,40 +164,33 @@ class BinanceAdapter(IExchangeAdapter):
             return False
 
     async def fetch_candles(
-        self, 
-        symbol: str, 
-        timeframe: str = '15m', 
+        self,
+        symbol: str,
+        timeframe: str = '15m',
         limit: int = 100
     ) -> pd.DataFrame:
-        """Fetch OHLCV data from Binance Futures with rate limiting."""
-        import time
-        
+        """Fetch OHLCV data; identical concurrent requests share one REST call (see single_flight)."""
+        if not self._exchange:
+            return pd.DataFrame()
+        df = await get_single_flight().do(
+            ('candles', self._markets_key, symbol, timeframe, limit),
+            lambda: self._fetch_candles(symbol, timeframe, limit),
+            ttl=flight_ttl('candles'),
+            keep=lambda df: not df.empty,
+        )
+        return df.copy()  # Callers add indicator columns in place
+
+    @rate_lane('candles')
+    async def _fetch_candles(self, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+        """Fetch OHLCV data from Binance Futures (candles lane of the shared rate limiter)."""
         if not self._exchange:
             return pd.DataFrame()
-        
-        # === RATE LIMITING ===
-        current_time = time.time()
-        
-        # Global rate limit: minimum 0.5 seconds between ANY candle calls
-        time_since_global = current_time - BinanceAdapter._candles_global_last_call
-        if time_since_global < self._candles_min_interval:
-            return pd.DataFrame()  # Too fast - silently skip
-        
-        # Per-symbol rate limit: minimum 15 seconds between calls for SAME symbol
-        cache_key = f"{symbol}:{timeframe}"
-        last_call = BinanceAdapter._candles_rate_limiter.get(cache_key, 0)
-        if current_time - last_call < self._candles_per_symbol_interval:
-            return pd.DataFrame()  # Too soon for this symbol/timeframe
             
         try:
             # Format symbol for CCXT (BTC/USDT:USDT for futures)
             formatted = self._format_symbol(symbol)
             ohlcv = await self._exchange.fetch_ohlcv(formatted, timeframe, limit=limit)
             
-            # Update rate limiters on SUCCESS
-            BinanceAdapter._candles_global_last_call = time.time()
-            BinanceAdapter._candles_rate_limiter[cache_key] = time.time()
-            
             df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
             df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
             return df
@@ -207,8 +202,9 @@ class BinanceAdapter(IExchangeAdapter):
             
             # Detect rate limiting errors and back off
             if '418' in err_msg or '429' in err_msg or 'rate limit' in err_msg.lower() or 'too many' in err_msg.lower() or 'banned' in err_msg.lower():
-                BinanceAdapter._candles_rate_limiter[cache_key] = time.time() + 300  # 5 min backoff for 418
-                print(f"⏳ BinanceAdapter: Rate limited on {symbol}, backing off 5 min")
+                # 418 = IP ban after ignored 429s: pause every Binance REST path, not just candles
+                get_rate_limiter().penalize(self._markets_key, 300 if '418' in err_msg or 'banned' in err_msg.lower() else 60)
+                print(f"⏳ BinanceAdapter: Rate limited on {symbol}, backing off")
                 return pd.DataFrame()
             
             match = re.search(r'\{.*"code":.*\}', err_msg)
@@ -223,9 +219,17 @@ class BinanceAdapter(IExchangeAdapter):
             print(f"⚠️ BinanceAdapter: fetch_candles error ({symbol}): {err_msg}")
             return pd.DataFrame()
 
-    async def get_account_balance(self) -> Dict[str, float]:
-        """Get Binance Futures account balance."""
+    @rate_lane('positions')
+    async def get_account_balance(self, refresh: bool = False, strict: bool = False) -> Dict[str, float]:
+        """
+        Get Binance Futures account balance (from the user-data stream while live, unless refresh).
+        strict: raise on errors instead of returning a zero balance.
+        """
+        if self._user_stream and self._user_stream.live and not refresh:
+            return self._user_stream.balance()
         if not self._exchange:
+            if strict:
+                raise ConnectionError("BinanceAdapter not initialized")
             return {'total': 0, 'available': 0, 'currency': 'USDT'}
             
         try:
@@ -237,6 +241,8 @@ class BinanceAdapter(IExchangeAdapter):
                 'currency': 'USDT'
             }
         except Exception as e:
+            if strict:
+                raise
             # Parse error
             err_msg = str(e)
             import re, json
@@ -252,6 +258,7 @@ class BinanceAdapter(IExchangeAdapter):
             print(f"⚠️ BinanceAdapter: get_balance error: {err_msg}")
             return {'total': 0, 'available': 0, 'currency': 'USDT'}
 
+    @rate_lane('positions')
     async def set_leverage(self, symbol: str, leverage: int) -> bool:
         """Set leverage for a symbol (required before placing orders)."""
         if not self._exchange:
@@ -269,6 +276,7 @@ class BinanceAdapter(IExchangeAdapter):
             print(f"⚠️ BinanceAdapter: set_leverage error ({symbol}, {leverage}x): {e}")
             return False
 
+    @rate_lane('positions')
     async def set_margin_mode(self, symbol: str, mode: str = 'CROSS') -> bool:
         """Set margin mode (CROSS or ISOLATED) for a symbol."""
         if not self._exchange:
@@ -284,26 +292,54 @@ class BinanceAdapter(IExchangeAdapter):
             print(f"⚠️ BinanceAdapter: set_margin_mode error ({symbol}, {mode}): {e}")
             return False
 
+    async def get_market_price(self, symbol: str) -> float:
+        """Get current market price for a symbol (one shared ticker request per symbol, see single_flight)."""
+        if not self._exchange:
+            return 0.0
+
+        try:
+            return await get_single_flight().do(
+                ('ticker', self._markets_key, symbol),
+                lambda: self._fetch_last_price(symbol),
+                ttl=flight_ttl('ticker'),
+                keep=bool,
+            )
+        except Exception as e:
+            print(f"⚠️ BinanceAdapter: get_market_price error ({symbol}): {e}")
+            return 0.0
+
+    async def _fetch_last_price(self, symbol: str) -> float:
+        ticker = await self._exchange.fetch_ticker(self._format_symbol(symbol))
+        return float(ticker.get('last') or 0)
+
     async def get_symbol_info(self, symbol: str) -> Dict[str, Any]:
-        """Get symbol precision, tick size, and limits."""
-        if not self._exchange: 
+        """Get symbol precision, tick size, and limits (coalesced per exchange and symbol)."""
+        if not self._exchange:
             print(f"⚠️ BinanceAdapter.get_symbol_info: No exchange instance for {symbol}")
             return {}
-        
+        info = await get_single_flight().do(
+            ('symbol_info', self._markets_key, symbol),
+            lambda: self._get_symbol_info(symbol),
+            ttl=flight_ttl('symbol_info'),
+            keep=bool,
+        )
+        return dict(info)
+
+    async def _get_symbol_info(self, symbol: str) -> Dict[str, Any]:
         try:
             formatted = self._format_symbol(symbol)
             
             # Check if markets are loaded
             if not self._exchange.markets:
                 print(f"🔄 BinanceAdapter: Loading markets for symbol info...")
-                await self._exchange.load_markets()
+                await get_market_registry().ensure(self._markets_key, self._exchange)
             
             # Try to get market info
             try:
                 market = self._exchange.market(formatted)
             except Exception as market_err:
                 print(f"⚠️ BinanceAdapter: Market '{formatted}' not found, reloading markets...")
-                await self._exchange.load_markets()
+                await get_market_registry().reload(self._markets_key, self._exchange)
                 try:
                     market = self._exchange.market(formatted)
                 except Exception as reload_err:
@@ -356,6 +392,7 @@ class BinanceAdapter(IExchangeAdapter):
             return {}
 
 
+    @rate_lane('orders')
     async def place_order(
         self, 
         symbol: str, 
@@ -564,6 +601,7 @@ class BinanceAdapter(IExchangeAdapter):
             clean_msg = f"Binance Error {code}: {msg}" if code else f"Error: {error_msg}"
             return {'error': clean_msg}
 
+    @rate_lane('orders')
     async def cancel_order(self, symbol: str, order_id: str) -> bool:
         """Cancel an order."""
         if not self._exchange:
@@ -576,9 +614,17 @@ class BinanceAdapter(IExchangeAdapter):
             print(f"⚠️ BinanceAdapter: cancel_order error: {e}")
             return False
 
-    async def get_positions(self) -> List[Dict[str, Any]]:
-        """Get active positions."""
+    @rate_lane('positions')
+    async def get_positions(self, refresh: bool = False, strict: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get active positions (from the user-data stream while live, unless refresh).
+        strict: raise on errors instead of returning [] (callers replacing state need to tell "flat" from "failed").
+        """
+        if self._user_stream and self._user_stream.live and not refresh:
+            return self._user_stream.positions()
         if not self._exchange:
+            if strict:
+                raise ConnectionError("BinanceAdapter not initialized")
             return []
             
         try:
@@ -598,6 +644,8 @@ class BinanceAdapter(IExchangeAdapter):
                     })
             return active
         except Exception as e:
+            if strict:
+                raise
             # Parse error - try to extract meaningful error message
             err_msg = str(e)
             error_type = type(e).__name__
@@ -630,6 +678,7 @@ class BinanceAdapter(IExchangeAdapter):
             print(f"⚠️ BinanceAdapter: get_positions error: {err_msg}")
             return []
 
+    @rate_lane('positions')
     async def get_open_orders(self, symbol: str = None) -> List[Dict[str, Any]]:
         """
         Obtener órdenes abiertas (estándar + condicionales) para un símbolo.
@@ -792,6 +841,7 @@ class BinanceAdapter(IExchangeAdapter):
         'stop_market', 'take_profit_market', 'trailing_stop_market'
     ]
 
+    @rate_lane('protection')
     async def cancel_conditional_orders_only(
         self, 
         symbol: str, 
@@ -915,6 +965,7 @@ class BinanceAdapter(IExchangeAdapter):
         except Exception as e:
             return {'cancelled': total_cancelled, 'remaining': -1, 'success': False, 'error': str(e)}
 
+    @rate_lane('orders')
     async def cancel_orders(self, symbol: str, max_retries: int = 3) -> bool:
         """
         Cancel all open orders for symbol (standard + conditional).
@@ -1172,6 +1223,7 @@ class BinanceAdapter(IExchangeAdapter):
             print(f"⚠️ BinanceAdapter Cancel Error ({symbol}): {e}")
             return False
 
+    @rate_lane('orders')
     async def close_position(self, symbol: str) -> bool:
         """Close specific position (Market)."""
         if not self._exchange: return False
@@ -10,6 +10,9 @@ from typing import Dict, Any, List, Optional, Callable
 import ccxt.async_support as ccxt
 
 from .base import IExchangeAdapter
+from ..market_registry import get_market_registry
+from ..rate_limiter import get_rate_limiter, rate_lane
+from ..single_flight import flight_ttl, get_single_flight
 
 
 class BybitAdapter(IExchangeAdapter):
@@ -23,24 +26,20 @@ class BybitAdapter(IExchangeAdapter):
     - amend_order(): Hot-edit orders without cancel+replace
     """
 
-    # Class-level cache for balance (persists across instances)
+    # Balance cache defaults (per instance once written: each adapter is one account)
     _balance_cache: Dict[str, Any] = {'total': 0, 'available': 0, 'currency': 'USDT', 'timestamp': 0}
     _balance_cache_ttl: float = 30.0  # Cache TTL in seconds
     _last_balance_call: float = 0
     _balance_rate_limit: float = 10.0  # Minimum seconds between balance API calls
-    
-    # Rate limiting for fetch_candles (prevents API rate limit errors)
-    _candles_rate_limiter: Dict[str, float] = {}  # Per-symbol last call time
-    _candles_global_last_call: float = 0
-    _candles_min_interval: float = 1.0  # Minimum 1 second between ANY candle calls
-    _candles_per_symbol_interval: float = 30.0  # Minimum 30 seconds between calls for SAME symbol
 
     def __init__(self, api_key: str = None, api_secret: str = None, **kwargs):
         self._api_key = api_key or os.getenv('BYBIT_API_KEY', '')
         self._api_secret = api_secret or os.getenv('BYBIT_API_SECRET', '')
         self._exchange: Optional[ccxt.bybit] = None
         self._testnet = os.getenv('BYBIT_TESTNET', 'false').lower() == 'true'
+        self._markets_key = 'BYBIT_TESTNET' if self._testnet else 'BYBIT'  # Shared market catalogue key
         self._proxy_config = kwargs
+        self._user_stream = None  # Private user-data stream (set by NexusBridge)
 
     @property
     def name(self) -> str:
@@ -75,6 +74,7 @@ class BybitAdapter(IExchangeAdapter):
                 config['sandbox'] = True
 
             self._exchange = ccxt.bybit(config)
+            get_rate_limiter().attach(self._exchange, self._markets_key)
 
             # DIRECT TIMESTAMP PATCHING FOR BYBIT - BEFORE ANY API CALLS
             # Bybit has extremely strict timestamp validation that can't be fixed with standard CCXT methods
@@ -101,7 +101,10 @@ class BybitAdapter(IExchangeAdapter):
             if http_proxy:
                 self._exchange.aiohttp_proxy = http_proxy
 
-            await self._exchange.load_markets()
+            # Markets come from the process-wide registry (downloaded once, shared by all sessions)
+            if not await get_market_registry().ensure(self._markets_key, self._exchange):
+                if verbose: print(f"❌ BybitAdapter: Init failed - markets unavailable")
+                return False
 
             # Clear cache for known available symbols that might have been incorrectly cached
             known_available = ['SUIUSDT', 'SEIUSDT', 'NEARUSDT', 'MATICUSDT', 'APTUSDT', 'OPUSDT', 'ARBUSDT', 'ATOMUSDT']
@@ -156,9 +159,20 @@ class BybitAdapter(IExchangeAdapter):
         timeframe: str = '15m',
         limit: int = 100
     ) -> pd.DataFrame:
-        """Fetch OHLCV data from Bybit with rate limiting."""
-        import time
-        
+        """Fetch OHLCV data; identical concurrent requests share one REST call (see single_flight)."""
+        if not self._exchange:
+            return pd.DataFrame()
+        df = await get_single_flight().do(
+            ('candles', self._markets_key, symbol, timeframe, limit),
+            lambda: self._fetch_candles(symbol, timeframe, limit),
+            ttl=flight_ttl('candles'),
+            keep=lambda df: not df.empty,
+        )
+        return df.copy()  # Callers add indicator columns in place
+
+    @rate_lane('candles')
+    async def _fetch_candles(self, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+        """Fetch OHLCV data from Bybit (candles lane of the shared rate limiter)."""
         if not self._exchange:
             return pd.DataFrame()
 
@@ -166,30 +180,10 @@ class BybitAdapter(IExchangeAdapter):
         if not await self.check_symbol_availability(symbol):
             return pd.DataFrame()  # Silently skip unavailable symbols
 
-        # === RATE LIMITING ===
-        current_time = time.time()
-        
-        # Global rate limit: minimum 1 second between ANY candle calls
-        time_since_global = current_time - BybitAdapter._candles_global_last_call
-        if time_since_global < self._candles_min_interval:
-            # Too fast - silently skip (will retry next cycle)
-            return pd.DataFrame()
-        
-        # Per-symbol rate limit: minimum 30 seconds between calls for SAME symbol
-        cache_key = f"{symbol}:{timeframe}"
-        last_call = BybitAdapter._candles_rate_limiter.get(cache_key, 0)
-        if current_time - last_call < self._candles_per_symbol_interval:
-            # Too soon for this symbol/timeframe - silently skip
-            return pd.DataFrame()
-
         try:
             # Format symbol for CCXT (BTC/USDT:USDT for linear)
             formatted = self._format_symbol(symbol)
             ohlcv = await self._exchange.fetch_ohlcv(formatted, timeframe, limit=limit)
-            
-            # Update rate limiters on SUCCESS
-            BybitAdapter._candles_global_last_call = time.time()
-            BybitAdapter._candles_rate_limiter[cache_key] = time.time()
 
             df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
             df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
@@ -200,8 +194,8 @@ class BybitAdapter(IExchangeAdapter):
             
             # Detect rate limiting errors and back off
             if '429' in error_str or 'rate limit' in error_str or 'too many' in error_str:
-                # Rate limited - set a longer backoff for this symbol
-                BybitAdapter._candles_rate_limiter[cache_key] = time.time() + 60  # 1 min extra backoff
+                # Rate limited - pause every Bybit REST path sharing this IP budget
+                get_rate_limiter().penalize(self._markets_key, 60)
                 print(f"⏳ BybitAdapter: Rate limited on {symbol}, backing off 60s")
                 return pd.DataFrame()
             
@@ -215,27 +209,35 @@ class BybitAdapter(IExchangeAdapter):
                 print(f"⚠️ BybitAdapter: fetch_candles error ({symbol}): {e}")
             return pd.DataFrame()
 
-    async def get_account_balance(self) -> Dict[str, float]:
-        """Get Bybit UTA (Unified Trading Account) balance with rate limiting and caching."""
+    @rate_lane('positions')
+    async def get_account_balance(self, refresh: bool = False, strict: bool = False) -> Dict[str, float]:
+        """
+        Get Bybit UTA (Unified Trading Account) balance with rate limiting and caching.
+        Served from the user-data stream while it is live; refresh forces a REST read.
+        strict: raise on errors instead of falling back to the cached or a zero balance.
+        """
         import time
 
+        if self._user_stream and self._user_stream.live and not refresh:
+            return self._user_stream.balance()
+
         # 1. Return cached balance if within TTL (prevent excessive API calls)
         current_time = time.time()
-        cache_age = current_time - BybitAdapter._balance_cache.get('timestamp', 0)
+        cache_age = current_time - self._balance_cache.get('timestamp', 0)
 
-        if cache_age < self._balance_cache_ttl and BybitAdapter._balance_cache.get('available', 0) > 0:
+        if not refresh and cache_age < self._balance_cache_ttl and self._balance_cache.get('available', 0) > 0:
             # Cache is fresh and has valid data
             return {
-                'total': BybitAdapter._balance_cache.get('total', 0),
-                'available': BybitAdapter._balance_cache.get('available', 0),
+                'total': self._balance_cache.get('total', 0),
+                'available': self._balance_cache.get('available', 0),
                 'currency': 'USDT'
             }
 
         # 2. Rate limit: Minimum 10 seconds between API calls
-        time_since_last_call = current_time - BybitAdapter._last_balance_call
-        if time_since_last_call < self._balance_rate_limit:
+        time_since_last_call = current_time - self._last_balance_call
+        if not refresh and time_since_last_call < self._balance_rate_limit:
             # Too soon - return cached balance (even if stale)
-            cached = BybitAdapter._balance_cache
+            cached = self._balance_cache
             if cached.get('available', 0) > 0:
                 return {
                     'total': cached.get('total', 0),
@@ -246,10 +248,12 @@ class BybitAdapter(IExchangeAdapter):
             return {'total': 0, 'available': 0, 'currency': 'USDT'}
 
         if not self._exchange:
+            if strict:
+                raise ConnectionError("BybitAdapter not initialized")
             return {'total': 0, 'available': 0, 'currency': 'USDT'}
 
         # 3. Attempt API call with rate limiting
-        BybitAdapter._last_balance_call = current_time
+        self._last_balance_call = current_time
 
         try:
             # CCXT's fetch_balance for Bybit V5 can vary by account type / permissions.
@@ -272,8 +276,10 @@ class BybitAdapter(IExchangeAdapter):
                     continue
 
             if balance is None:
+                if strict:
+                    raise ConnectionError("Bybit fetch_balance failed for every account type")
                 # All attempts failed - return cached balance if available
-                cached = BybitAdapter._balance_cache
+                cached = self._balance_cache
                 if cached.get('available', 0) > 0:
                     return {
                         'total': cached.get('total', 0),
@@ -304,7 +310,7 @@ class BybitAdapter(IExchangeAdapter):
                 available = float(balance.get('free', {}).get('USDT', 0))
 
             # 5. Update cache with fresh data
-            BybitAdapter._balance_cache = {
+            self._balance_cache = {
                 'total': total,
                 'available': available,
                 'currency': 'USDT',
@@ -317,8 +323,10 @@ class BybitAdapter(IExchangeAdapter):
                 'currency': 'USDT'
             }
         except Exception as e:
+            if strict:
+                raise
             # On error, return cached balance if available (never return 0 if we have valid cache)
-            cached = BybitAdapter._balance_cache
+            cached = self._balance_cache
             if cached.get('available', 0) > 0:
                 return {
                     'total': cached.get('total', 0),
@@ -329,18 +337,25 @@ class BybitAdapter(IExchangeAdapter):
             return {'total': 0, 'available': 0, 'currency': 'USDT'}
 
     async def get_market_price(self, symbol: str) -> float:
-        """Get current market price for a symbol."""
+        """Get current market price for a symbol (one shared ticker request per symbol, see single_flight)."""
         if not self._exchange:
             return 0.0
-            
+
         try:
-            formatted = self._format_symbol(symbol)
-            ticker = await self._exchange.fetch_ticker(formatted)
-            return float(ticker.get('last', 0))
+            return await get_single_flight().do(
+                ('ticker', self._markets_key, symbol),
+                lambda: self._fetch_last_price(symbol),
+                ttl=flight_ttl('ticker'),
+                keep=bool,
+            )
         except Exception as e:
             print(f"⚠️ BybitAdapter: get_market_price error ({symbol}): {e}")
             return 0.0
 
+    async def _fetch_last_price(self, symbol: str) -> float:
+        ticker = await self._exchange.fetch_ticker(self._format_symbol(symbol))
+        return float(ticker.get('last') or 0)
+
     async def get_leverage_limits(self, symbol: str) -> Dict[str, int]:
         """Get leverage limits for a symbol from Bybit."""
         if not self._exchange:
@@ -352,7 +367,7 @@ class BybitAdapter(IExchangeAdapter):
             # Use Bybit's leverage endpoint to get limits
             # This requires the markets to be loaded
             if not self._exchange.markets:
-                await self._exchange.load_markets()
+                await get_market_registry().ensure(self._markets_key, self._exchange)
 
             # Try to get leverage info from market data
             try:
@@ -381,12 +396,12 @@ class BybitAdapter(IExchangeAdapter):
                 if max_leverage <= 1:
                     try:
                         # Use ccxt's built-in leverage info if available
-                        if hasattr(self._exchange, 'fetch_leverage_tiers'):
-                            tiers = await self._exchange.fetch_leverage_tiers([formatted])
-                            if formatted in tiers:
-                                tier_info = tiers[formatted]
-                                if isinstance(tier_info, list) and len(tier_info) > 0:
-                                    max_leverage = int(tier_info[0].get('maxLeverage', 1))
+                        # Leverage brackets are cached in the shared registry
+                        tier_info = await get_market_registry().leverage_tiers(
+                            self._markets_key, formatted, self._exchange
+                        )
+                        if tier_info:
+                            max_leverage = int(tier_info[0].get('maxLeverage', 1))
                     except Exception:
                         pass
 
@@ -425,6 +440,7 @@ class BybitAdapter(IExchangeAdapter):
             print(f"⚠️ BybitAdapter: Error getting leverage limits for {symbol}: {e}")
             return {'min': 1, 'max': 5}  # Conservative fallback
 
+    @rate_lane('positions')
     async def set_leverage(self, symbol: str, leverage: int) -> bool:
         """Set leverage for a symbol with automatic limit validation."""
         if not self._exchange:
@@ -459,6 +475,7 @@ class BybitAdapter(IExchangeAdapter):
             return False
 
 
+    @rate_lane('orders')
     async def place_order(
         self, 
         symbol: str, 
@@ -610,6 +627,7 @@ class BybitAdapter(IExchangeAdapter):
             return {'error': str(e)}
 
 
+    @rate_lane('orders')
     async def cancel_order(self, symbol: str, order_id: str) -> bool:
         """Cancel a single order by ID."""
         if not self._exchange:
@@ -623,6 +641,7 @@ class BybitAdapter(IExchangeAdapter):
             print(f"⚠️ BybitAdapter: cancel_order error: {e}")
             return False
 
+    @rate_lane('orders')
     async def cancel_orders(self, symbol: str) -> bool:
         """Cancel all open orders for a symbol (required by IExchangeAdapter)."""
         result = await self.cancel_all_orders(symbol)
@@ -632,6 +651,7 @@ class BybitAdapter(IExchangeAdapter):
     # ENHANCED ORDER MANAGEMENT (Key Bybit Advantage)
     # =========================================================================
 
+    @rate_lane('orders')
     async def cancel_all_orders(self, symbol: str) -> Dict[str, Any]:
         """
         Cancel ALL orders for a symbol in a SINGLE API call.
@@ -676,6 +696,7 @@ class BybitAdapter(IExchangeAdapter):
                 }
         return {'take_profit': 0, 'stop_loss': 0}
 
+    @rate_lane('protection')
     async def set_trading_stop(
         self,
         symbol: str,
@@ -750,6 +771,7 @@ class BybitAdapter(IExchangeAdapter):
                 print(f"⚠️ BybitAdapter: set_trading_stop error: {e}")
                 return {'success': False, 'message': str(e)}
 
+    @rate_lane('orders')
     async def amend_order(
         self, 
         symbol: str, 
@@ -790,6 +812,7 @@ class BybitAdapter(IExchangeAdapter):
             print(f"⚠️ BybitAdapter: amend_order error: {e}")
             return {'success': False, 'message': str(e)}
 
+    @rate_lane('protection')
     async def place_trailing_stop(
         self,
         symbol: str,
@@ -838,9 +861,17 @@ class BybitAdapter(IExchangeAdapter):
             print(f"⚠️ BybitAdapter: place_trailing_stop error: {e}")
             return {'success': False, 'message': str(e)}
 
-    async def get_positions(self) -> List[Dict[str, Any]]:
-        """Get active positions."""
+    @rate_lane('positions')
+    async def get_positions(self, refresh: bool = False, strict: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get active positions (from the user-data stream while live, unless refresh).
+        strict: raise on errors instead of returning [].
+        """
+        if self._user_stream and self._user_stream.live and not refresh:
+            return self._user_stream.positions()
         if not self._exchange:
+            if strict:
+                raise ConnectionError("BybitAdapter not initialized")
             return []
             
         try:
@@ -885,6 +916,8 @@ class BybitAdapter(IExchangeAdapter):
 
             return active
         except Exception as e:
+            if strict:
+                raise
             # Parse error
             err_msg = str(e)
             import re, json
@@ -900,6 +933,7 @@ class BybitAdapter(IExchangeAdapter):
             print(f"⚠️ BybitAdapter: get_positions error: {err_msg}")
             return []
 
+    @rate_lane('positions')
     async def get_open_orders(self, symbol: str = None) -> List[Dict[str, Any]]:
         """Get open orders for a symbol."""
         if not self._exchange:
@@ -934,6 +968,7 @@ class BybitAdapter(IExchangeAdapter):
             print(f"⚠️ BybitAdapter: get_open_orders error: {e}")
             return []
 
+    @rate_lane('orders')
     async def close_position(self, symbol: str) -> bool:
         """Close specific position (Market)."""
         if not self._exchange:
@@ -988,25 +1023,33 @@ class BybitAdapter(IExchangeAdapter):
     # =========================================================================
 
     async def get_symbol_info(self, symbol: str) -> Dict[str, Any]:
-        """Get symbol precision, tick size, and limits."""
+        """Get symbol precision, tick size, and limits (coalesced per exchange and symbol)."""
         if not self._exchange:
             print(f"⚠️ BybitAdapter.get_symbol_info: No exchange instance for {symbol}")
             return {}
-
+        info = await get_single_flight().do(
+            ('symbol_info', self._markets_key, symbol),
+            lambda: self._get_symbol_info(symbol),
+            ttl=flight_ttl('symbol_info'),
+            keep=bool,
+        )
+        return dict(info)
+
+    async def _get_symbol_info(self, symbol: str) -> Dict[str, Any]:
         try:
             formatted = self._format_symbol(symbol)
 
             # Check if markets are loaded
             if not self._exchange.markets:
                 print(f"🔄 BybitAdapter: Loading markets for symbol info...")
-                await self._exchange.load_markets()
+                await get_market_registry().ensure(self._markets_key, self._exchange)
 
             # Try to get market info
             try:
                 market = self._exchange.market(formatted)
             except Exception as market_err:
                 print(f"⚠️ BybitAdapter: Market '{formatted}' not found, reloading markets...")
-                await self._exchange.load_markets()
+                await get_market_registry().reload(self._markets_key, self._exchange)
                 try:
                     market = self._exchange.market(formatted)
                 except Exception as reload_err:
@@ -9,7 +9,6 @@ import os
 from typing import Callable, Dict, List, Any, Optional
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from collections import defaultdict
 
 
 def is_us_market_open() -> bool:
@@ -30,6 +29,7 @@ def is_us_market_open() -> bool:
 
 
 from ..utils.logger import get_logger
+from .ws_codec import Candle
 
 class AlpacaWSManager:
     """
@@ -53,16 +53,21 @@ class AlpacaWSManager:
         self._reconnect_attempts = 0
         self._max_reconnect_attempts = 10
         
-        # Aggregation: store 1m bars and aggregate to 15m
-        self._minute_bars: Dict[str, List[dict]] = defaultdict(list)
+        self._closed_only = set()  # Callbacks that only want closed candles
+        
+        # Aggregation: running 15m candle per symbol, folded from 1m bars
+        self._partials: Dict[str, Candle] = {}
         self._current_15m_start: Dict[str, datetime] = {}
         
-    def add_callback(self, callback: Callable):
+    def add_callback(self, callback: Callable, closed_only: bool = False):
         """
         Register a callback for candle updates.
-        Callback signature: async def callback(symbol: str, candle: dict)
+        Callback signature: async def callback(symbol: str, candle: Candle)
+        With closed_only, in-progress candles are never delivered to it.
         """
         self.callbacks.append(callback)
+        if closed_only:
+            self._closed_only.add(callback)
     
     async def connect(self) -> bool:
         """Establish WebSocket connection to Alpaca."""
@@ -118,25 +123,19 @@ class AlpacaWSManager:
         try:
             symbol = bar.symbol
             
-            # Create candle dict from bar
-            candle_1m = {
-                'timestamp': int(bar.timestamp.timestamp() * 1000),
-                'open': float(bar.open),
-                'high': float(bar.high),
-                'low': float(bar.low),
-                'close': float(bar.close),
-                'volume': float(bar.volume),
-                'is_closed': True
-            }
-            
             # Aggregate to 15m
-            candle_15m = self._aggregate_to_15m(symbol, candle_1m, bar.timestamp)
+            candle_15m = self._aggregate_to_15m(
+                symbol, bar.timestamp,
+                float(bar.open), float(bar.high), float(bar.low), float(bar.close), float(bar.volume)
+            )
             
             if candle_15m:
                 self.last_update[symbol] = datetime.now()
                 
                 # Emit to all callbacks
                 for callback in self.callbacks:
+                    if not candle_15m.is_closed and callback in self._closed_only:
+                        continue
                     try:
                         await callback(symbol, candle_15m)
                     except Exception as e:
@@ -145,60 +144,43 @@ class AlpacaWSManager:
         except Exception as e:
             self.logger.warning_debounced(f"Bar processing error - {e}", interval=300)
     
-    def _aggregate_to_15m(self, symbol: str, candle_1m: dict, timestamp: datetime) -> Optional[dict]:
+    def _aggregate_to_15m(self, symbol: str, timestamp: datetime, open_: float, high: float,
+                          low: float, close: float, volume: float) -> Optional[Candle]:
         """
-        Aggregate 1-minute bars into 15-minute candles.
-        Returns the 15m candle when complete, or updates in-progress candle.
+        Aggregate 1-minute bars into 15-minute candles (running OHLCV, O(1) per bar).
+        Returns the 15m candle when complete, or the in-progress candle.
         """
         # Calculate 15m period start
         minute = timestamp.minute
         period_start_minute = (minute // 15) * 15
         period_start = timestamp.replace(minute=period_start_minute, second=0, microsecond=0)
-        period_start_ms = int(period_start.timestamp() * 1000)
         
         # Check if this is a new 15m period
         current_start = self._current_15m_start.get(symbol)
+        partial = self._partials.get(symbol)
         
         if current_start != period_start:
-            # New period - emit the previous complete candle if exists
-            if symbol in self._minute_bars and self._minute_bars[symbol]:
-                # Build complete 15m candle from accumulated 1m bars
-                bars = self._minute_bars[symbol]
-                complete_candle = {
-                    'timestamp': int(current_start.timestamp() * 1000) if current_start else period_start_ms,
-                    'open': bars[0]['open'],
-                    'high': max(b['high'] for b in bars),
-                    'low': min(b['low'] for b in bars),
-                    'close': bars[-1]['close'],
-                    'volume': sum(b['volume'] for b in bars),
-                    'is_closed': True
-                }
-                
-                # Reset for new period
-                self._minute_bars[symbol] = [candle_1m]
-                self._current_15m_start[symbol] = period_start
-                
-                return complete_candle
-            else:
-                # First bar of first period
-                self._minute_bars[symbol] = [candle_1m]
-                self._current_15m_start[symbol] = period_start
-                return None
-        else:
-            # Same period - accumulate
-            self._minute_bars[symbol].append(candle_1m)
+            # Reset for new period
+            self._partials[symbol] = Candle(int(period_start.timestamp() * 1000), open_, high, low, close, volume)
+            self._current_15m_start[symbol] = period_start
             
-            # Return in-progress candle (not closed)
-            bars = self._minute_bars[symbol]
-            return {
-                'timestamp': period_start_ms,
-                'open': bars[0]['open'],
-                'high': max(b['high'] for b in bars),
-                'low': min(b['low'] for b in bars),
-                'close': bars[-1]['close'],
-                'volume': sum(b['volume'] for b in bars),
-                'is_closed': False
-            }
+            # New period - emit the previous complete candle if exists
+            if partial is None:
+                return None  # First bar of first period
+            return Candle(partial.timestamp, partial.open, partial.high, partial.low,
+                          partial.close, partial.volume, is_closed=True, interval='15m')
+        
+        # Same period - accumulate
+        partial.high = max(partial.high, high)
+        partial.low = min(partial.low, low)
+        partial.close = close
+        partial.volume += volume
+        
+        # Return in-progress candle (not closed); skipped when every consumer wants closes only
+        if len(self._closed_only) == len(self.callbacks):
+            return None
+        return Candle(partial.timestamp, partial.open, partial.high, partial.low,
+                      partial.close, partial.volume, is_closed=False, interval='15m')
     
     async def listen(self):
         """Main listening loop - runs the Alpaca stream."""
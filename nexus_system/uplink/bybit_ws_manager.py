@@ -0,0 +1,104 @@
+"""
+Nexus System - Bybit WebSocket Manager
+Real-time kline streaming for Bybit V5 USDT linear perpetuals.
+
+Same sharding, queued fan-out, reconnection and callback contract as
+BinanceWSManager (see KlineWSManager). Differences handled here:
+- Topics ("kline.<interval>.<symbol>") are subscribed after connecting,
+  at most 10 per request; reconnects resubscribe the shard's topic list.
+- Keepalive is an application-level {"op": "ping"} every 20 seconds.
+- Bybit tickers that differ from ours (BYBIT_TICKER_MAPPING) are mapped
+  both ways, so callbacks see the configured symbol.
+"""
+
+import asyncio
+import os
+from typing import Dict, List, Sequence, Tuple, Union
+
+from .ws_codec import BYBIT_INTERVALS, Candle, decode_bybit_kline, dumps
+from .ws_manager import KlineWSManager, _Shard
+
+
+class BybitWSManager(KlineWSManager):
+    """
+    Manages WebSocket connections to Bybit public linear kline topics.
+    """
+
+    EXCHANGE = 'BYBIT'
+    BASE_URL = "wss://stream.bybit.com/v5/public/linear"
+    TESTNET_URL = "wss://stream-testnet.bybit.com/v5/public/linear"
+    MAX_STREAMS_PER_CONNECTION = 200
+    SUBSCRIBE_BATCH = 10  # Bybit accepts up to 10 args per subscribe request
+    SUBSCRIBE_PAUSE = 0.1
+    HEARTBEAT_INTERVAL = 20  # Bybit drops public connections idle for too long
+
+    def __init__(self, symbols: List[str], timeframe: Union[str, Sequence[str]] = '15m',
+                 streams_per_connection: int = None, queue_size: int = None,
+                 symbol_map: Dict[str, str] = None, testnet: bool = None):
+        """
+        Initialize WebSocket manager.
+
+        Args:
+            symbols: List of symbols to subscribe (e.g., ['BTCUSDT', '1000PEPEUSDT'])
+            timeframe: Kline interval(s) (e.g., '1m' or ['1m', '15m'])
+            streams_per_connection: Shard size (default from system_directive)
+            queue_size: Per-consumer queue bound (default from system_directive)
+            symbol_map: {symbol: Bybit ticker} (default: BYBIT_TICKER_MAPPING)
+            testnet: Use the testnet endpoint (default: BYBIT_TESTNET env)
+        """
+        if symbol_map is None:
+            try:
+                from system_directive import BYBIT_TICKER_MAPPING
+                symbol_map = BYBIT_TICKER_MAPPING
+            except ImportError:
+                symbol_map = {}
+        if testnet is None:
+            testnet = os.getenv('BYBIT_TESTNET', 'false').lower() == 'true'
+        self.url = self.TESTNET_URL if testnet else self.BASE_URL
+        super().__init__(symbols, timeframe, streams_per_connection, queue_size, symbol_map)
+
+    def _stream_name(self, ticker: str, timeframe: str) -> str:
+        if timeframe not in BYBIT_INTERVALS:
+            raise ValueError(f"Unsupported Bybit kline interval: {timeframe}")
+        return f"kline.{BYBIT_INTERVALS[timeframe]}.{ticker.upper()}"
+
+    def _url(self, shard: _Shard) -> str:
+        return self.url
+
+    def _subscription(self, shard: _Shard, subscribe: bool, streams: List[str]) -> dict:
+        return {'req_id': str(shard.next_id()), 'op': 'subscribe' if subscribe else 'unsubscribe', 'args': streams}
+
+    async def _on_open(self, shard: _Shard):
+        """Subscribe the shard's whole topic list (fresh connections start empty)."""
+        await self._send(shard, True, list(shard.streams))
+
+    async def _heartbeat(self, shard: _Shard):
+        await shard.ws.send(dumps({'op': 'ping'}))
+
+    def _decode(self, raw_msg, closed_only: bool) -> List[Tuple[str, Candle]]:
+        return decode_bybit_kline(raw_msg, closed_only=closed_only)
+
+
+async def test_ws():
+    """Quick test of WebSocket connection."""
+    manager = BybitWSManager(['BTCUSDT', '1000PEPEUSDT'], '1m')
+
+    received = []
+
+    async def on_candle(symbol, candle):
+        received.append((symbol, candle['close']))
+        print(f"📊 {symbol}: ${candle['close']:,.6f} (closed={candle['is_closed']})")
+        if len(received) >= 5:
+            await manager.close()
+
+    manager.add_callback(on_candle)
+
+    if await manager.connect():
+        await manager.listen()
+
+    await manager.close()
+    print(f"\n✅ Received {len(received)} updates")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_ws())
@@ -8,6 +8,7 @@ import asyncio
 import time
 from typing import Dict, Any, List, Optional
 from ..utils.logger import get_logger
+from .rate_limiter import get_rate_limiter
 import os
 
 class CoinGeckoClient:
@@ -23,7 +24,6 @@ class CoinGeckoClient:
         self.api_key = os.getenv("COINGECKO_API_KEY", "")
         self.session: Optional[aiohttp.ClientSession] = None
         self.last_request_time = 0
-        self.min_request_interval = 1.2  # Rate limiting: ~50 requests/minute
 
         # Cache for expensive operations
         self.cache = {}
@@ -48,10 +48,8 @@ class CoinGeckoClient:
             self.session = None
 
     async def _rate_limit_wait(self):
-        """Enforce rate limiting between requests."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            await asyncio.sleep(self.min_request_interval - elapsed)
+        """Wait for the shared CoinGecko budget (see rate_limiter)."""
+        await get_rate_limiter().acquire('COINGECKO')
         self.last_request_time = time.time()
 
     async def _make_request(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -74,8 +72,8 @@ class CoinGeckoClient:
                     return await response.json()
                 elif response.status == 429:
                     self.logger.warning("CoinGecko rate limit hit, waiting 60s...")
-                    await asyncio.sleep(60)
-                    return await self._make_request(endpoint, params)  # Retry
+                    get_rate_limiter().penalize('COINGECKO', 60)
+                    return await self._make_request(endpoint, params)  # Retry (waits out the pause)
                 else:
                     error_text = await response.text()
                     self.logger.error(f"CoinGecko API error {response.status}: {error_text}")
@@ -0,0 +1,152 @@
+"""
+Nexus System - Reconnect Gap Backfill
+Repairs the candle window after a WebSocket shard reconnects.
+
+For every symbol the shard carried, the cached timestamps are compared with
+the interval cadence to find the candles that closed while the feed was
+down. Only those ranges are requested over REST (one request per
+(symbol, timeframe), drawn from the exchange's shared rate-limit budget)
+and spliced into the cache in order. Derived timeframes are rebuilt from
+the repaired base candles wherever the base window covers them, so a short
+outage costs about one request per symbol instead of a full refetch of
+every window.
+
+While a symbol is being repaired it is flagged on the TimeframeCache, so
+cache reads and signal callbacks never see the window with holes.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..utils.logger import get_logger
+from .timeframe_cache import TimeframeCache, timeframe_to_ms
+
+
+# async fetch(symbol, timeframe, since_ms, limit) -> [[ts, open, high, low, close, volume], ...]
+FetchFn = Callable[[str, str, int, int], Awaitable[list]]
+
+
+class GapBackfiller:
+    """
+    Finds and fills reconnect gaps in a TimeframeCache.
+
+    - max_concurrency: REST requests in flight at once (pacing is left to
+      the shared RateLimiter the fetch clients are attached to)
+    - max_candles: cap per request; older missing candles would fall out of
+      the window anyway
+    - retries / retry_delay: failed fills are retried before the flag is
+      dropped
+    """
+
+    def __init__(self, cache: TimeframeCache, max_concurrency: int = 4, max_candles: int = 250,
+                 retries: int = 2, retry_delay: float = 5.0):
+        self.cache = cache
+        self.max_candles = max_candles
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.logger = get_logger("GapBackfill")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.stats = {'fills': 0, 'requests': 0, 'candles': 0, 'failures': 0}
+
+    async def _fetch_ranges(self, fetch: FetchFn, symbol: str, timeframe: str,
+                            ranges: List[Tuple[int, int]], now_ms: int) -> List[dict]:
+        """One request spanning every missing range of (symbol, timeframe); returns closed candles inside them."""
+        tf_ms = timeframe_to_ms(timeframe)
+        end = ranges[-1][1]
+        since = max(ranges[0][0], end - self.max_candles * tf_ms)
+        limit = (end - since) // tf_ms
+
+        async with self._semaphore:
+            self.stats['requests'] += 1
+            rows = await fetch(symbol, timeframe, since, limit)
+
+        candles = []
+        for row in rows or ():
+            ts = int(row[0])
+            if ts < since or ts + tf_ms > now_ms or not any(start <= ts < stop for start, stop in ranges):
+                continue  # Outside the holes (live rows stay as streamed) or still in progress
+            candles.append({
+                'timestamp': ts, 'open': float(row[1]), 'high': float(row[2]),
+                'low': float(row[3]), 'close': float(row[4]), 'volume': float(row[5]),
+                'is_closed': True,
+            })
+        return candles
+
+    async def fill_symbol(self, fetch: FetchFn, symbol: str, now_ms: Optional[int] = None) -> int:
+        """Detect and fill the gaps of one symbol across all cached timeframes. Returns candles added."""
+        self.cache.begin_fill(symbol)
+        return await self._fill_and_release(fetch, symbol, now_ms)
+
+    async def _fill_and_release(self, fetch: FetchFn, symbol: str, now_ms: Optional[int]) -> int:
+        """Run one fill already registered with begin_fill, then release it (even if cancelled)."""
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    added = await self._fill_symbol(fetch, symbol, now_ms or int(time.time() * 1000))
+                    break
+                except Exception as e:
+                    self.stats['failures'] += 1
+                    self.logger.warning_debounced(f"Gap fill failed for {symbol}: {e}", interval=300)
+                    if attempt < self.retries:
+                        await asyncio.sleep(self.retry_delay * (attempt + 1))
+                        now_ms = None  # Re-detect against the new time
+            else:
+                added = 0  # Give up: the window heals as new candles roll in
+        finally:
+            self.cache.end_fill(symbol)
+        self.stats['candles'] += added
+        return added
+
+    async def _fill_symbol(self, fetch: FetchFn, symbol: str, now_ms: int) -> int:
+        cache = self.cache
+        base = cache.base_timeframe
+        added = 0
+
+        base_gaps = cache.find_gaps(symbol, base, now_ms)
+        if base_gaps:
+            candles = await self._fetch_ranges(fetch, symbol, base, base_gaps, now_ms)
+            cache.backfill(symbol, candles, base, overwrite=True)
+            added += len(candles)
+
+        for timeframe in cache.derived_timeframes:
+            ranges = sorted(cache.find_gaps(symbol, timeframe, now_ms) + base_gaps)
+            if ranges:
+                # Rebuild from the repaired base window; fetch only what it cannot cover
+                missing = cache.resample_closed(symbol, timeframe, ranges, now_ms)
+                if missing:
+                    candles = await self._fetch_ranges(fetch, symbol, timeframe, missing, now_ms)
+                    cache.backfill(symbol, candles, timeframe, overwrite=True)
+                    added += len(candles)
+            if base_gaps:
+                cache.rebuild_partial(symbol, timeframe, now_ms)
+        return added
+
+    async def fill(self, fetch: FetchFn, symbols: List[str], now_ms: Optional[int] = None) -> Dict[str, int]:
+        """Fill gaps for many symbols concurrently (bounded by max_concurrency)."""
+        self.stats['fills'] += 1
+        for symbol in symbols:
+            self.cache.begin_fill(symbol)  # Before any await: no read sees a window still to be repaired
+        counts = await asyncio.gather(*(self._fill_and_release(fetch, s, now_ms) for s in symbols))
+        return dict(zip(symbols, counts))
+
+
+# Global singleton for shared access
+_gap_backfiller: Optional[GapBackfiller] = None
+
+
+def get_gap_backfiller(cache: TimeframeCache = None) -> GapBackfiller:
+    """Get global gap backfiller (settings from system_directive) for the shared TimeframeCache."""
+    global _gap_backfiller
+    if _gap_backfiller is None:
+        from .timeframe_cache import get_timeframe_cache
+        try:
+            from system_directive import STREAM_GAP_FILL_CONCURRENCY, PRICE_CACHE_MAX_CANDLES
+        except ImportError:
+            STREAM_GAP_FILL_CONCURRENCY, PRICE_CACHE_MAX_CANDLES = 4, 250
+        _gap_backfiller = GapBackfiller(
+            cache or get_timeframe_cache(),
+            max_concurrency=STREAM_GAP_FILL_CONCURRENCY,
+            max_candles=PRICE_CACHE_MAX_CANDLES,
+        )
+    return _gap_backfiller
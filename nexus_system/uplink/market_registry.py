@@ -0,0 +1,169 @@
+"""
+Nexus System - Market Metadata Registry
+One ccxt market catalogue per exchange, shared by every session's client.
+
+ccxt clients normally download and keep their own markets table (tick size,
+lot size, min notional, leverage limits for every instrument). Here the
+first client to need it loads the catalogue once; every other client gets
+the same (read-only) tables attached by reference, so the catalogue is held
+once per process instead of once per user. Refreshes run in the background
+and are re-attached to all live clients.
+"""
+
+import asyncio
+import time
+import weakref
+from typing import Any, Dict, List, Optional
+
+from ..utils.logger import get_logger
+
+
+# Attributes ccxt's set_markets() fills in; sharing them is equivalent to load_markets()
+_SHARED_ATTRS = (
+    'markets', 'markets_by_id', 'symbols', 'ids',
+    'currencies', 'currencies_by_id', 'codes',
+    'baseCurrencies', 'quoteCurrencies',
+)
+
+
+class MarketRegistry:
+    """
+    Process-wide market metadata per exchange key (e.g. 'BINANCE', 'BYBIT_TESTNET').
+
+    - ensure(key, client): attach the catalogue to a client, loading it once if needed.
+    - reload(key): refetch (e.g. on an unknown symbol); concurrent and repeated
+      reloads inside `min_reload_interval` collapse into one request.
+    - leverage_tiers(key, symbol, client): cached leverage brackets.
+    """
+
+    def __init__(self, refresh_interval: int = 3600, min_reload_interval: int = 60):
+        self.refresh_interval = refresh_interval
+        self.min_reload_interval = min_reload_interval
+        self.logger = get_logger("MarketRegistry")
+
+        self._tables: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._clients: Dict[str, weakref.WeakSet] = {}
+        self._tiers: Dict[str, Dict[str, List[dict]]] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        if key not in self._locks:
+            self._locks[key] = asyncio.Lock()
+        return self._locks[key]
+
+    def is_loaded(self, key: str) -> bool:
+        return key in self._tables
+
+    # --- Sharing ---
+
+    def _adopt(self, key: str, client) -> None:
+        self._tables[key] = {attr: getattr(client, attr, None) for attr in _SHARED_ATTRS}
+        self._loaded_at[key] = time.time()
+        self._tiers.pop(key, None)
+
+    def _attach(self, key: str, client) -> None:
+        for attr, value in self._tables[key].items():
+            setattr(client, attr, value)
+        self._clients.setdefault(key, weakref.WeakSet()).add(client)
+
+    async def ensure(self, key: str, client) -> bool:
+        """Give `client` the shared catalogue for `key` (loaded through it on first use)."""
+        if key not in self._tables:
+            async with self._lock(key):
+                if key not in self._tables:
+                    try:
+                        await client.load_markets()
+                    except Exception as e:
+                        self.logger.warning(f"Markets load failed for {key}: {e}")
+                        return False
+                    self._adopt(key, client)
+                    self.logger.info(f"📚 {key}: {len(client.markets or {})} markets cached (shared)")
+                    self._start_refresh()
+        self._attach(key, client)
+        return True
+
+    async def reload(self, key: str, client=None) -> bool:
+        """
+        Refetch the catalogue and re-attach it to every live client.
+
+        Uses `client` (or any live client attached to `key`) for the request.
+        Skipped if the catalogue was loaded less than `min_reload_interval` ago.
+        """
+        async with self._lock(key):
+            if time.time() - self._loaded_at.get(key, 0) < self.min_reload_interval:
+                if client is not None and key in self._tables:
+                    self._attach(key, client)
+                return key in self._tables
+
+            source = client or next(iter(self._clients.get(key, ())), None)
+            if source is None:
+                return False
+            try:
+                await source.load_markets(reload=True)
+            except Exception as e:
+                self.logger.warning(f"Markets reload failed for {key}: {e}")
+                return False
+            self._adopt(key, source)
+            for live in list(self._clients.get(key, ())):
+                self._attach(key, live)
+            if client is not None:
+                self._attach(key, client)
+            return True
+
+    # --- Leverage brackets ---
+
+    async def leverage_tiers(self, key: str, symbol: str, client) -> List[dict]:
+        """Leverage brackets for a ccxt symbol (cached until the next catalogue refresh)."""
+        cached = self._tiers.get(key, {}).get(symbol)
+        if cached is not None:
+            return cached
+        if not getattr(client, 'has', {}).get('fetchLeverageTiers'):
+            return []
+        try:
+            tiers = await client.fetch_leverage_tiers([symbol])
+        except Exception as e:
+            self.logger.debug(f"Leverage tiers unavailable for {key} {symbol}: {e}")
+            return []
+        result = tiers.get(symbol) or []
+        self._tiers.setdefault(key, {})[symbol] = result
+        return result
+
+    # --- Background refresh ---
+
+    def _start_refresh(self):
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        try:
+            self._refresh_task = asyncio.get_running_loop().create_task(self._refresh_loop())
+        except RuntimeError:
+            pass  # No running loop: catalogue stays as loaded
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            for key in list(self._tables):
+                if time.time() - self._loaded_at.get(key, 0) >= self.refresh_interval:
+                    await self.reload(key)
+
+    def stop(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+
+# Global singleton for shared access
+_market_registry: Optional[MarketRegistry] = None
+
+
+def get_market_registry() -> MarketRegistry:
+    """Get global market metadata registry (refresh interval from system_directive)."""
+    global _market_registry
+    if _market_registry is None:
+        try:
+            from system_directive import MARKET_REGISTRY_REFRESH_SECONDS
+        except ImportError:
+            MARKET_REGISTRY_REFRESH_SECONDS = 3600
+        _market_registry = MarketRegistry(refresh_interval=MARKET_REGISTRY_REFRESH_SECONDS)
+    return _market_registry
@@ -0,0 +1,270 @@
+"""
+Nexus System - Local OHLCV Store
+Partitioned columnar candle history on local disk.
+
+Layout: <root>/<exchange>/<symbol>/<timeframe>/<YYYY-MM>.arrow
+
+Each month is an uncompressed Arrow IPC file, so reads are memory-mapped and
+zero-copy: loading years of candles costs a few mmap calls instead of a
+paginated REST crawl. sync() asks the exchange only for the tail that is not
+on disk yet (the last stored candle is refetched in case it was still open).
+"""
+
+import asyncio
+import os
+import threading
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from ..utils.logger import get_logger
+
+
+OHLCV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+# fetch_page(since_ms, limit) -> [[ts_ms, open, high, low, close, volume], ...]
+FetchPage = Callable[[int, int], Awaitable[Sequence[Sequence[float]]]]
+
+
+def _to_ms(value: Any) -> Optional[int]:
+    """Convert ms ints, datetimes or pandas timestamps to epoch ms."""
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(pd.Timestamp(value).value // 1_000_000)
+
+
+class OHLCVStore:
+    """
+    Month-partitioned Arrow store keyed by (exchange, symbol, timeframe).
+
+    Partitions are rewritten atomically (tmp file + rename), so readers
+    holding a memory map of the previous version are never disturbed.
+    """
+
+    def __init__(self, root: str = None):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for OHLCVStore (pip install pyarrow)")
+        if root is None:
+            from system_directive import OHLCV_STORE_DIR
+            root = OHLCV_STORE_DIR
+        self.root = root
+        self.logger = get_logger("OHLCVStore")
+        self._schema = pa.schema(
+            [('timestamp', pa.int64())] + [(col, pa.float64()) for col in OHLCV_COLUMNS[1:]]
+        )
+        self._lock = threading.Lock()
+
+    # --- Layout ---
+
+    def _dir(self, exchange: str, symbol: str, timeframe: str) -> str:
+        # BTC/USDT:USDT and BTCUSDT share a directory
+        clean_symbol = symbol.replace('/', '').replace(':USDT', '').replace(':', '')
+        return os.path.join(self.root, exchange.lower(), clean_symbol.upper(), timeframe)
+
+    def partitions(self, exchange: str, symbol: str, timeframe: str) -> List[str]:
+        """Sorted month keys ('YYYY-MM') stored for a series."""
+        path = self._dir(exchange, symbol, timeframe)
+        if not os.path.isdir(path):
+            return []
+        return sorted(name[:-6] for name in os.listdir(path) if name.endswith('.arrow'))
+
+    @staticmethod
+    def _month_key(ts_ms: int) -> str:
+        return pd.Timestamp(ts_ms, unit='ms').strftime('%Y-%m')
+
+    # --- Reads ---
+
+    def _read_partition(self, exchange: str, symbol: str, timeframe: str, month: str) -> 'pa.Table':
+        path = os.path.join(self._dir(exchange, symbol, timeframe), f"{month}.arrow")
+        with pa.memory_map(path, 'r') as source:
+            return ipc.open_file(source).read_all()
+
+    def read_table(self, exchange: str, symbol: str, timeframe: str,
+                   start: Any = None, end: Any = None) -> 'pa.Table':
+        """
+        Memory-mapped Arrow table for [start, end] (inclusive, ms or datetime).
+
+        Only the month partitions overlapping the range are opened, and the
+        range cut is a zero-copy slice (partitions are kept sorted).
+        """
+        start_ms, end_ms = _to_ms(start), _to_ms(end)
+        months = self.partitions(exchange, symbol, timeframe)
+        if start_ms is not None:
+            months = [m for m in months if m >= self._month_key(start_ms)]
+        if end_ms is not None:
+            months = [m for m in months if m <= self._month_key(end_ms)]
+        if not months:
+            return self._schema.empty_table()
+
+        table = pa.concat_tables(
+            [self._read_partition(exchange, symbol, timeframe, m) for m in months]
+        )
+        # Only the timestamp column is materialized to locate the cut; the slice itself is zero-copy
+        ts = table.column('timestamp').to_numpy()
+        lo = 0 if start_ms is None else int(np.searchsorted(ts, start_ms, side='left'))
+        hi = len(ts) if end_ms is None else int(np.searchsorted(ts, end_ms, side='right'))
+        return table.slice(lo, hi - lo)
+
+    def read(self, exchange: str, symbol: str, timeframe: str,
+             start: Any = None, end: Any = None) -> pd.DataFrame:
+        """Candles for [start, end] as a DataFrame (timestamp as datetime, like fetch paths)."""
+        df = self.read_table(exchange, symbol, timeframe, start, end).to_pandas()
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return df
+
+    def first_timestamp(self, exchange: str, symbol: str, timeframe: str) -> Optional[int]:
+        """Oldest stored candle open time (ms), or None if empty."""
+        months = self.partitions(exchange, symbol, timeframe)
+        if not months:
+            return None
+        ts = self._read_partition(exchange, symbol, timeframe, months[0]).column('timestamp')
+        return int(ts[0].as_py()) if len(ts) else None
+
+    def last_timestamp(self, exchange: str, symbol: str, timeframe: str) -> Optional[int]:
+        """Newest stored candle open time (ms), or None if empty."""
+        months = self.partitions(exchange, symbol, timeframe)
+        if not months:
+            return None
+        ts = self._read_partition(exchange, symbol, timeframe, months[-1]).column('timestamp')
+        return int(ts[-1].as_py()) if len(ts) else None
+
+    # --- Writes ---
+
+    def _normalize(self, candles: Union[pd.DataFrame, Sequence[Sequence[float]]]) -> pd.DataFrame:
+        if isinstance(candles, pd.DataFrame):
+            df = candles[OHLCV_COLUMNS].copy()
+        else:
+            df = pd.DataFrame([row[:6] for row in candles], columns=OHLCV_COLUMNS)
+        ts = df['timestamp']
+        if pd.api.types.is_datetime64_any_dtype(ts):
+            df['timestamp'] = ts.astype('datetime64[ms]').astype('int64')
+        else:
+            df['timestamp'] = ts.astype('int64')
+        for col in OHLCV_COLUMNS[1:]:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+        return df
+
+    def write(self, exchange: str, symbol: str, timeframe: str,
+              candles: Union[pd.DataFrame, Sequence[Sequence[float]]]) -> int:
+        """
+        Merge candles into their month partitions.
+
+        Accepts a DataFrame with OHLCV columns or raw ccxt rows. Rows for an
+        existing timestamp replace the stored ones (fresher data wins).
+
+        Returns:
+            Number of candles written.
+        """
+        df = self._normalize(candles)
+        if df.empty:
+            return 0
+
+        path = self._dir(exchange, symbol, timeframe)
+        months = pd.to_datetime(df['timestamp'], unit='ms').dt.strftime('%Y-%m')
+
+        with self._lock:
+            # Listed under the lock: a concurrent write may just have created a month
+            stored = set(self.partitions(exchange, symbol, timeframe))
+            os.makedirs(path, exist_ok=True)
+            for month, chunk in df.groupby(months, sort=True):
+                if month in stored:
+                    existing = self._read_partition(exchange, symbol, timeframe, month).to_pandas()
+                    chunk = pd.concat([existing, chunk], ignore_index=True)
+                chunk = (chunk.drop_duplicates('timestamp', keep='last')
+                              .sort_values('timestamp')
+                              .reset_index(drop=True))
+                table = pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False)
+
+                target = os.path.join(path, f"{month}.arrow")
+                tmp = f"{target}.tmp"
+                with pa.OSFile(tmp, 'wb') as sink:
+                    with ipc.new_file(sink, self._schema) as writer:
+                        writer.write_table(table)
+                os.replace(tmp, target)
+        return len(df)
+
+    # --- Incremental sync ---
+
+    def resume_from(self, exchange: str, symbol: str, timeframe: str, since: Any) -> int:
+        """
+        Where a fetch for candles since `since` should start (ms).
+
+        The last stored candle if the store already covers `since` (it is
+        refetched in case it was still open), otherwise `since` itself.
+        """
+        since_ms = _to_ms(since)
+        first = self.first_timestamp(exchange, symbol, timeframe)
+        if first is None or first > since_ms:
+            return since_ms
+        return max(since_ms, self.last_timestamp(exchange, symbol, timeframe))
+
+    async def sync(self, exchange: str, symbol: str, timeframe: str, fetch_page: FetchPage,
+                   since: Any, limit: int = 1000, pause: float = 0.2, max_pages: int = 10) -> int:
+        """
+        Fetch only what is missing from `since` up to now and store it.
+
+        If the store already covers `since`, paging starts at the last stored
+        candle; otherwise it starts at `since` (overlaps are deduplicated).
+        Pages are buffered and merged with a single write, so each month
+        partition is rewritten once per call; disk work runs in a thread.
+        A capped call leaves the rest of the gap to the next sync, which
+        resumes where this one stopped.
+
+        Args:
+            fetch_page: async (since_ms, limit) -> ccxt-style OHLCV rows
+            since: Oldest candle wanted (ms or datetime)
+            limit: Page size requested from the exchange
+            pause: Delay between pages (rate limit protection)
+            max_pages: Cap on pages per call (None = until caught up)
+
+        Returns:
+            Number of candles fetched from the exchange.
+        """
+        cursor = await asyncio.to_thread(self.resume_from, exchange, symbol, timeframe, since)
+        buffered: List[Sequence[float]] = []
+        pages = 0
+        while max_pages is None or pages < max_pages:
+            rows = await fetch_page(cursor, limit)
+            pages += 1
+            if not rows:
+                break
+            buffered.extend(rows)
+            next_cursor = int(rows[-1][0]) + 1
+            if len(rows) < limit or next_cursor <= cursor:
+                break
+            cursor = next_cursor
+            await asyncio.sleep(pause)
+
+        fetched = 0
+        if buffered:
+            fetched = await asyncio.to_thread(self.write, exchange, symbol, timeframe, buffered)
+            self.logger.debug(f"Synced {fetched} candles for {exchange}/{symbol}/{timeframe} ({pages} pages)")
+        return fetched
+
+
+# Global singleton for shared access
+_ohlcv_store: Optional[OHLCVStore] = None
+
+
+def get_ohlcv_store() -> Optional[OHLCVStore]:
+    """Get global OHLCV store, or None if disabled or pyarrow is missing."""
+    global _ohlcv_store
+    if _ohlcv_store is None:
+        try:
+            from system_directive import OHLCV_STORE_ENABLED
+        except ImportError:
+            OHLCV_STORE_ENABLED = True
+        if not (OHLCV_STORE_ENABLED and PYARROW_AVAILABLE):
+            return None
+        _ohlcv_store = OHLCVStore()
+    return _ohlcv_store
@@ -2,8 +2,13 @@
 Nexus System - Price Cache
 In-memory storage for real-time candle data from WebSocket streams.
 Provides DataFrame interface compatible with existing MarketStream.
+
+Two engines share the same public API:
+- PriceCache: original list-of-dicts storage.
+- ColumnarPriceCache: preallocated NumPy ring buffers per symbol.
 """
 
+import numpy as np
 import pandas as pd
 from collections import defaultdict
 from datetime import datetime
@@ -11,6 +16,17 @@ from typing import Dict, List, Any, Optional
 import threading
 
 
+def _normalize_ts(ts) -> int:
+    """Normalize a candle timestamp (ms int, float, datetime or pd.Timestamp) to int ms."""
+    if ts is None:
+        return 0
+    if hasattr(ts, 'timestamp'):  # pandas Timestamp / datetime
+        return int(ts.timestamp() * 1000)
+    if isinstance(ts, (int, float, np.integer, np.floating)):
+        return int(ts)
+    return 0
+
+
 class PriceCache:
     """
     Thread-safe in-memory cache for candle data.
@@ -79,12 +95,13 @@ class PriceCache:
         with self._lock:
             return list(self._candles.get(symbol, []))
     
-    def get_dataframe(self, symbol: str) -> pd.DataFrame:
+    def get_dataframe(self, symbol: str, copy: bool = True) -> pd.DataFrame:
         """
         Get candles as DataFrame (compatible with MarketStream output).
         
         Args:
             symbol: Trading pair
+            copy: Ignored (a new DataFrame is always built from the dicts)
             
         Returns:
             DataFrame with columns: timestamp, open, high, low, close, volume
@@ -119,6 +136,12 @@ class PriceCache:
         """Get timestamp of last update for a symbol."""
         return self._last_update.get(symbol)
     
+    def is_last_closed(self, symbol: str) -> bool:
+        """True if the newest cached candle is final (False while it is in progress)."""
+        with self._lock:
+            candles = self._candles.get(symbol)
+            return bool(candles[-1].get('is_closed', True)) if candles else True
+    
     def is_stale(self, symbol: str, max_age_seconds: int = 120) -> bool:
         """
         Check if cached data is stale.
@@ -156,38 +179,31 @@ class PriceCache:
                 self._candles.clear()
                 self._last_update.clear()
     
-    def backfill(self, symbol: str, candles: List[dict]):
+    def backfill(self, symbol: str, candles: List[dict], overwrite: bool = False):
         """
         Backfill historical candles (e.g., from REST API on reconnect).
         
         Args:
             symbol: Trading pair
             candles: List of candle dicts (oldest first)
+            overwrite: Incoming candles replace cached ones on equal timestamps
         """
         with self._lock:
-            # Normalize timestamps to integers for comparison
-            def normalize_ts(ts):
-                if ts is None:
-                    return 0
-                if hasattr(ts, 'timestamp'):  # pandas Timestamp
-                    return int(ts.timestamp() * 1000)
-                if isinstance(ts, (int, float)):
-                    return int(ts)
-                return 0
-            
             # Merge with existing, avoiding duplicates
-            existing_timestamps = {normalize_ts(c.get('timestamp')) for c in self._candles[symbol]}
+            existing = {_normalize_ts(c.get('timestamp')): i for i, c in enumerate(self._candles[symbol])}
             
             for candle in candles:
-                ts = normalize_ts(candle.get('timestamp'))
-                if ts not in existing_timestamps:
+                ts = _normalize_ts(candle.get('timestamp'))
+                if ts not in existing:
+                    existing[ts] = len(self._candles[symbol])
                     self._candles[symbol].append(candle)
-                    existing_timestamps.add(ts)
+                elif overwrite:
+                    self._candles[symbol][existing[ts]] = candle
             
             # Sort by timestamp (normalized) and trim
             self._candles[symbol] = sorted(
                 self._candles[symbol], 
-                key=lambda x: normalize_ts(x.get('timestamp'))
+                key=lambda x: _normalize_ts(x.get('timestamp'))
             )[-self.max_candles:]
             
             self._last_update[symbol] = datetime.now()
@@ -207,24 +223,378 @@ class PriceCache:
                 }
             }
 
+_OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class _CandleRing:
+    """
+    Fixed-capacity ring buffer of candles for one symbol.
+    
+    Every row is written twice (at slot and slot + capacity) so the most
+    recent `count` rows are always one contiguous slice of the doubled
+    arrays. That keeps appends O(1) while still allowing zero-copy views.
+    """
+    
+    __slots__ = ('capacity', 'ts', 'ohlcv', 'trades', 'count', 'nxt', 'last_closed')
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.ts = np.zeros(2 * capacity, dtype=np.int64)
+        self.ohlcv = np.zeros((2 * capacity, len(_OHLCV_COLUMNS)), dtype=np.float64)
+        self.trades = np.zeros(2 * capacity, dtype=np.int64)
+        self.count = 0
+        self.nxt = 0
+        self.last_closed = True
+    
+    def _write(self, slot: int, ts: int, row: tuple, trades: int):
+        mirror = slot + self.capacity
+        self.ts[slot] = self.ts[mirror] = ts
+        self.ohlcv[slot] = self.ohlcv[mirror] = row
+        self.trades[slot] = self.trades[mirror] = trades
+    
+    def append(self, ts: int, row: tuple, trades: int, is_closed: bool):
+        self._write(self.nxt, ts, row, trades)
+        self.nxt = (self.nxt + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        self.last_closed = is_closed
+    
+    def replace_last(self, ts: int, row: tuple, trades: int, is_closed: bool):
+        self._write((self.nxt - 1) % self.capacity, ts, row, trades)
+        self.last_closed = is_closed
+    
+    def last_slot(self) -> int:
+        return (self.nxt - 1) % self.capacity
+    
+    def window(self) -> tuple:
+        """Return (start, end) of the contiguous slice holding the live rows."""
+        end = self.nxt + self.capacity
+        return end - self.count, end
+    
+    def load(self, ts: np.ndarray, ohlcv: np.ndarray, trades: np.ndarray, last_closed: bool):
+        """Replace contents with already ordered arrays (keeps the last `capacity` rows)."""
+        ts, ohlcv, trades = ts[-self.capacity:], ohlcv[-self.capacity:], trades[-self.capacity:]
+        n = len(ts)
+        cap = self.capacity
+        self.ts[:n] = self.ts[cap:cap + n] = ts
+        self.ohlcv[:n] = self.ohlcv[cap:cap + n] = ohlcv
+        self.trades[:n] = self.trades[cap:cap + n] = trades
+        self.count = n
+        self.nxt = n % cap
+        self.last_closed = last_closed
+
+
+class ColumnarPriceCache:
+    """
+    Thread-safe candle cache backed by preallocated NumPy ring buffers.
+    
+    Drop-in replacement for PriceCache: same public methods, but candles are
+    stored as int64/float64 columns (timestamp, OHLCV, trades) so updating the
+    open candle is O(1) and no per-tick dicts are allocated.
+    """
+    
+    def __init__(self, max_candles: int = 250):
+        """
+        Initialize columnar price cache.
+        
+        Args:
+            max_candles: Ring capacity per symbol (default 250 for EMA200)
+        """
+        self.max_candles = max_candles
+        self._rings: Dict[str, _CandleRing] = {}
+        self._last_update: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+    
+    def _ring(self, symbol: str) -> _CandleRing:
+        ring = self._rings.get(symbol)
+        if ring is None:
+            ring = self._rings[symbol] = _CandleRing(self.max_candles)
+        return ring
+    
+    @staticmethod
+    def _row(candle: dict) -> tuple:
+        return (
+            float(candle.get('open', 0) or 0),
+            float(candle.get('high', 0) or 0),
+            float(candle.get('low', 0) or 0),
+            float(candle.get('close', 0) or 0),
+            float(candle.get('volume', 0) or 0),
+        )
+    
+    def update_candle(self, symbol: str, candle: dict):
+        """
+        Update or append a candle in O(1).
+        
+        Args:
+            symbol: Trading pair (e.g., 'BTCUSDT')
+            candle: Candle dict with keys: timestamp, open, high, low, close, volume, is_closed
+        """
+        ts = _normalize_ts(candle.get('timestamp'))
+        row = self._row(candle)
+        trades = int(candle.get('trades', 0) or 0)
+        is_closed = bool(candle.get('is_closed', False))
+        
+        with self._lock:
+            ring = self._ring(symbol)
+            
+            if ring.count:
+                last_ts = int(ring.ts[ring.last_slot()])
+                if ts == last_ts:
+                    # Same candle (in-progress tick or final close)
+                    ring.replace_last(ts, row, trades, is_closed)
+                elif ts < last_ts:
+                    # Late tick for an older candle - keep buffer ordered
+                    pass
+                elif not is_closed and not ring.last_closed:
+                    # Replace previous open candle (same semantics as PriceCache)
+                    ring.replace_last(ts, row, trades, is_closed)
+                else:
+                    ring.append(ts, row, trades, is_closed)
+            else:
+                ring.append(ts, row, trades, is_closed)
+            
+            self._last_update[symbol] = datetime.now()
+    
+    def get_arrays(self, symbol: str) -> Dict[str, np.ndarray]:
+        """
+        Get read-only zero-copy column views for a symbol.
+        
+        Views share memory with the ring, so they reflect later updates;
+        copy them if they must outlive the current event-loop step.
+        
+        Returns:
+            Dict with 'timestamp' (int64 ms), open/high/low/close/volume (float64)
+            and 'trades' (int64). Empty dict if the symbol is not cached.
+        """
+        with self._lock:
+            ring = self._rings.get(symbol)
+            if ring is None or not ring.count:
+                return {}
+            start, end = ring.window()
+            ohlcv = ring.ohlcv[start:end]
+            arrays = {'timestamp': ring.ts[start:end], 'trades': ring.trades[start:end]}
+            for i, col in enumerate(_OHLCV_COLUMNS):
+                arrays[col] = ohlcv[:, i]
+        for view in arrays.values():
+            view.flags.writeable = False
+        return arrays
+    
+    def get_candles(self, symbol: str) -> List[dict]:
+        """Get raw candle list for a symbol (compatibility helper, allocates dicts)."""
+        with self._lock:
+            # Rows and the open/closed flag of the last one are read as one snapshot
+            ring = self._rings.get(symbol)
+            if ring is None or not ring.count:
+                return []
+            start, end = ring.window()
+            ts = ring.ts[start:end].tolist()
+            ohlcv = ring.ohlcv[start:end].tolist()
+            trades = ring.trades[start:end].tolist()
+            last_closed = ring.last_closed
+        n = len(ts)
+        candles = []
+        for i in range(n):
+            candle = {'timestamp': ts[i]}
+            for j, col in enumerate(_OHLCV_COLUMNS):
+                candle[col] = ohlcv[i][j]
+            candle['trades'] = trades[i]
+            candle['is_closed'] = last_closed if i == n - 1 else True
+            candles.append(candle)
+        return candles
+    
+    def get_dataframe(self, symbol: str, copy: bool = False) -> pd.DataFrame:
+        """
+        Get candles as DataFrame (compatible with MarketStream output).
+        
+        The OHLCV block is a read-only view on the ring unless `copy=True`.
+        Pass `copy=True` when the frame will be mutated (e.g. indicators added
+        in place) or held across awaits while the stream keeps updating.
+        
+        Args:
+            symbol: Trading pair
+            copy: Return an independent copy instead of a view
+            
+        Returns:
+            DataFrame with columns: timestamp, open, high, low, close, volume
+        """
+        with self._lock:
+            ring = self._rings.get(symbol)
+            if ring is None or not ring.count:
+                return pd.DataFrame()
+            start, end = ring.window()
+            ts = ring.ts[start:end]
+            block = ring.ohlcv[start:end]
+            if copy:
+                ts, block = ts.copy(), block.copy()
+            else:
+                block = block.view()
+                block.flags.writeable = False
+        
+        df = pd.DataFrame(block, columns=_OHLCV_COLUMNS, copy=False)
+        df.insert(0, 'timestamp', ts.view('datetime64[ms]'))
+        return df
+    
+    def get_last_price(self, symbol: str) -> Optional[float]:
+        """Get the most recent close price for a symbol."""
+        with self._lock:
+            ring = self._rings.get(symbol)
+            if ring is None or not ring.count:
+                return None
+            return float(ring.ohlcv[ring.last_slot(), 3])
+    
+    def get_last_update(self, symbol: str) -> Optional[datetime]:
+        """Get timestamp of last update for a symbol."""
+        return self._last_update.get(symbol)
+    
+    def is_last_closed(self, symbol: str) -> bool:
+        """True if the newest cached candle is final (False while it is in progress)."""
+        with self._lock:
+            ring = self._rings.get(symbol)
+            return ring.last_closed if ring is not None and ring.count else True
+    
+    def is_stale(self, symbol: str, max_age_seconds: int = 120) -> bool:
+        """Check if cached data is stale (True if stale or missing)."""
+        last_update = self._last_update.get(symbol)
+        if not last_update:
+            return True
+        age = (datetime.now() - last_update).total_seconds()
+        return age > max_age_seconds
+    
+    def get_symbols(self) -> List[str]:
+        """Get list of all cached symbols."""
+        with self._lock:
+            return list(self._rings.keys())
+    
+    def clear(self, symbol: str = None):
+        """
+        Clear cache for a symbol or all symbols.
+        
+        Args:
+            symbol: Symbol to clear, or None to clear all
+        """
+        with self._lock:
+            if symbol:
+                self._rings.pop(symbol, None)
+                self._last_update.pop(symbol, None)
+            else:
+                self._rings.clear()
+                self._last_update.clear()
+    
+    def backfill(self, symbol: str, candles: List[dict], overwrite: bool = False):
+        """
+        Backfill historical candles (e.g., from REST API on reconnect).
+        
+        Candles newer than the cached tail are appended directly; overlapping
+        batches (e.g. a reconnect gap inside the window) are spliced into
+        the ordered buffer by binary search, without re-sorting it. Live
+        (cached) values win on duplicate timestamps unless `overwrite`.
+        
+        Args:
+            symbol: Trading pair
+            candles: List of candle dicts (oldest first)
+            overwrite: Incoming candles replace cached ones on equal timestamps
+        """
+        if not candles:
+            return
+        
+        new_ts = np.fromiter((_normalize_ts(c.get('timestamp')) for c in candles), dtype=np.int64, count=len(candles))
+        new_ohlcv = np.array([self._row(c) for c in candles], dtype=np.float64)
+        new_trades = np.fromiter((int(c.get('trades', 0) or 0) for c in candles), dtype=np.int64, count=len(candles))
+        new_last_closed = bool(candles[-1].get('is_closed', True))
+        
+        if np.any(new_ts[1:] <= new_ts[:-1]):
+            # Unordered or duplicated batch: sort once, keep first occurrence
+            order = np.argsort(new_ts, kind='stable')
+            keep = np.ones(len(order), dtype=bool)
+            keep[1:] = new_ts[order][1:] != new_ts[order][:-1]
+            order = order[keep]
+            new_ts, new_ohlcv, new_trades = new_ts[order], new_ohlcv[order], new_trades[order]
+            new_last_closed = bool(candles[int(order[-1])].get('is_closed', True))
+        
+        with self._lock:
+            ring = self._ring(symbol)
+            
+            if not ring.count:
+                ring.load(new_ts, new_ohlcv, new_trades, new_last_closed)
+            elif new_ts[0] > ring.ts[ring.last_slot()]:
+                # Fast path: strictly newer tail, append in order
+                for i in range(len(new_ts)):
+                    ring.append(int(new_ts[i]), new_ohlcv[i], int(new_trades[i]), True)
+                ring.last_closed = new_last_closed
+            else:
+                start, end = ring.window()
+                old_ts = ring.ts[start:end]
+                old_ohlcv = ring.ohlcv[start:end]
+                old_trades = ring.trades[start:end]
+                
+                # Both sides are ordered: resolve duplicates, then splice by binary search
+                if overwrite:
+                    keep = ~np.isin(old_ts, new_ts, assume_unique=True)
+                    old_ts, old_ohlcv, old_trades = old_ts[keep], old_ohlcv[keep], old_trades[keep]
+                else:
+                    keep = ~np.isin(new_ts, old_ts, assume_unique=True)
+                    new_ts, new_ohlcv, new_trades = new_ts[keep], new_ohlcv[keep], new_trades[keep]
+                
+                if len(new_ts):
+                    if len(old_ts) and old_ts[-1] > new_ts[-1]:
+                        last_closed = ring.last_closed
+                    else:
+                        last_closed = new_last_closed
+                    pos = np.searchsorted(old_ts, new_ts)
+                    ring.load(
+                        np.insert(old_ts, pos, new_ts),
+                        np.insert(old_ohlcv, pos, new_ohlcv, axis=0),
+                        np.insert(old_trades, pos, new_trades),
+                        last_closed,
+                    )
+            
+            self._last_update[symbol] = datetime.now()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            return {
+                'symbols': len(self._rings),
+                'total_candles': sum(r.count for r in self._rings.values()),
+                'symbols_detail': {
+                    k: {
+                        'count': r.count,
+                        'last_update': self._last_update.get(k, 'N/A')
+                    }
+                    for k, r in self._rings.items()
+                }
+            }
+
+
+def _create_price_cache():
+    """Build a price cache using the engine selected in system_directive."""
+    try:
+        from system_directive import PRICE_CACHE_ENGINE, PRICE_CACHE_MAX_CANDLES
+    except ImportError:
+        PRICE_CACHE_ENGINE, PRICE_CACHE_MAX_CANDLES = 'columnar', 250
+    
+    if PRICE_CACHE_ENGINE == 'legacy':
+        return PriceCache(max_candles=PRICE_CACHE_MAX_CANDLES)
+    return ColumnarPriceCache(max_candles=PRICE_CACHE_MAX_CANDLES)
+
 
 # Global singleton for shared access
-_price_cache: Optional[PriceCache] = None
-_alpaca_price_cache: Optional[PriceCache] = None
+_price_cache = None
+_alpaca_price_cache = None
 
 
-def get_price_cache() -> PriceCache:
+def get_price_cache():
     """Get global price cache instance (Binance)."""
     global _price_cache
     if _price_cache is None:
-        _price_cache = PriceCache()
+        _price_cache = _create_price_cache()
     return _price_cache
 
 
-def get_alpaca_price_cache() -> PriceCache:
+def get_alpaca_price_cache():
     """Get global price cache instance (Alpaca stocks/ETFs)."""
     global _alpaca_price_cache
     if _alpaca_price_cache is None:
-        _alpaca_price_cache = PriceCache()
+        _alpaca_price_cache = _create_price_cache()
     return _alpaca_price_cache
 
@@ -0,0 +1,346 @@
+"""
+Nexus System - Shared REST Rate Limiter
+One weight-aware token bucket per exchange, shared by every REST client.
+
+Buckets refill at the exchange's published request-weight rate (configured
+in system_directive.EXCHANGE_RATE_LIMITS). ccxt clients are attached with
+`attach()`: their throttle hook then draws each request's weight (ccxt's
+per-endpoint cost) from the shared bucket instead of a private one, so all
+sessions, adapters and streams spend one budget per IP.
+
+Requests run in priority lanes (orders > protection > positions > candles /
+market data > scanner). Waiting requests are served in lane order, and lower lanes
+leave part of the burst untouched, so order placement never queues behind
+candle polling. Order lanes also draw from a per-account order-count
+bucket. A 429/418 reply pauses the whole exchange via `penalize()`.
+"""
+
+import asyncio
+import functools
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..utils.logger import get_logger
+
+
+# lane -> (priority, share of the burst kept back for higher lanes, max wait in seconds or None)
+LANES: Dict[str, Tuple[int, float, Optional[float]]] = {
+    'orders': (0, 0.0, None),
+    'protection': (1, 0.0, None),
+    'positions': (2, 0.1, None),
+    'candles': (3, 0.3, 10.0),
+    'market': (3, 0.3, None),
+    'scanner': (4, 0.5, 5.0),  # On-demand /scanner: never dips into the engine's half of the burst
+}
+ORDER_LANES = ('orders', 'protection')
+
+_current_lane: ContextVar[str] = ContextVar('rate_lane', default='market')
+_lane_pinned: ContextVar[bool] = ContextVar('rate_lane_pinned', default=False)
+_prepaid: ContextVar[Optional[list]] = ContextVar('rate_prepaid', default=None)
+
+
+def rate_lane(lane: str):
+    """
+    Decorator: run an async method's REST calls in `lane`.
+    Nested calls keep the caller's lane when it has higher priority, or
+    when the caller pinned it (see `prepaid_lane`).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            current = _current_lane.get()
+            if _lane_pinned.get() or LANES[current][0] < LANES[lane][0]:
+                return await func(*args, **kwargs)
+            token = _current_lane.set(lane)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _current_lane.reset(token)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def prepaid_lane(lane: str, weight: float, refund: Optional[Callable[[float], None]] = None):
+    """
+    Run the enclosed REST calls in `lane`, pinned (adapter `rate_lane`
+    decorators cannot escalate it), spending `weight` already taken with
+    RateLimiter.try_acquire before drawing anything more from the bucket.
+
+    Weight left unspent on exit (the call joined a single-flight fetch,
+    hit a cache, or never reached REST) is handed to `refund`. A fetch task
+    started inside shares the credit, so anything it spends later draws
+    from the bucket as usual.
+    """
+    credit = [weight]
+    tokens = (_current_lane.set(lane), _lane_pinned.set(True), _prepaid.set(credit))
+    try:
+        yield
+    finally:
+        _prepaid.reset(tokens[2])
+        _lane_pinned.reset(tokens[1])
+        _current_lane.reset(tokens[0])
+        unspent, credit[0] = credit[0], 0.0
+        if unspent > 0 and refund is not None:
+            refund(unspent)
+
+
+def prepaid_weight() -> float:
+    """Weight still prepaid in the current context (0 outside `prepaid_lane`)."""
+    credit = _prepaid.get()
+    return credit[0] if credit else 0.0
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a bounded-wait lane could not get budget in time."""
+
+
+class TokenBucket:
+    """
+    Token bucket with prioritized waiters.
+
+    Waiters are served strictly in (priority, arrival) order; a request only
+    jumps the queue when no waiter of the same or higher priority is queued.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters = []  # heap of (priority, seq, weight, floor, future)
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def _refill(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return now
+
+    def _admit(self, weight: float, floor: float, now: float) -> bool:
+        if now < self._paused_until or self.tokens - weight < floor:
+            return False
+        self.tokens -= weight
+        return True
+
+    def try_take(self, weight: float, priority: int = 0, floor: float = 0.0) -> bool:
+        """Take `weight` tokens now if the bucket (and queue) allows it."""
+        now = self._refill()
+        if self._waiters and self._waiters[0][0] <= priority:
+            return False
+        return self._admit(weight, floor, now)
+
+    def has_headroom(self, weight: float, priority: int = 0, floor: float = 0.0) -> bool:
+        """Like try_take, without consuming."""
+        now = self._refill()
+        if now < self._paused_until or (self._waiters and self._waiters[0][0] <= priority):
+            return False
+        return self.tokens - weight >= floor
+
+    async def take(self, weight: float, priority: int = 0, floor: float = 0.0, timeout: float = None):
+        """Wait for `weight` tokens (RateLimitTimeout after `timeout` seconds)."""
+        if self.try_take(weight, priority, floor):
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), weight, floor, future))
+        self._dispatch()
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise RateLimitTimeout(f"no budget within {timeout}s") from None
+        finally:
+            if future.cancelled():
+                self._dispatch()  # Let the next waiter take the head slot
+
+    def refund(self, weight: float):
+        """Return tokens taken but never spent, then serve waiters they unblock."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + weight)
+        if self._waiters:
+            self._dispatch()
+
+    def penalize(self, seconds: float):
+        """Pause the bucket (e.g. after a 429/418) and drain it."""
+        self._refill()
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = self._refill()
+        while self._waiters:
+            _, _, weight, floor, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._admit(weight, floor, now):
+                break
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+        if self._waiters:
+            _, _, weight, floor, _ = self._waiters[0]
+            delay = max(self._paused_until - now, (weight + floor - self.tokens) / self.rate, 0.001)
+            self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def queued(self) -> int:
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+
+class RateLimiter:
+    """
+    Process-wide REST budget per exchange key ('BINANCE', 'BYBIT', 'COINGECKO', ...).
+
+    - acquire(exchange, weight, lane): wait for budget (lane from the
+      current `rate_lane` context by default)
+    - try_acquire(exchange, weight, lane): take budget only if available now
+    - refund(exchange, weight, lane): return budget taken but never spent
+    - has_headroom(exchange, weight, lane): check without consuming
+    - penalize(exchange, seconds): back off after a rate-limit reply
+    - attach(client, exchange): route a ccxt client's throttle through here
+
+    Exchanges without configured limits are not throttled.
+    """
+
+    def __init__(self, limits: Dict[str, Dict[str, float]]):
+        self.limits = limits
+        self.logger = get_logger("RateLimiter")
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._order_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def _key(exchange: str) -> str:
+        # Testnets ('BINANCE_TESTNET') are separate hosts with their own limits:
+        # they get their own key and are only throttled if configured
+        return exchange.upper()
+
+    def _bucket(self, exchange: str) -> Optional[TokenBucket]:
+        key = self._key(exchange)
+        bucket = self._buckets.get(key)
+        if bucket is None and key in self.limits:
+            config = self.limits[key]
+            bucket = self._buckets[key] = TokenBucket(config['rate'], config['burst'])
+        return bucket
+
+    def _order_bucket(self, exchange: str, account: str) -> Optional[TokenBucket]:
+        key = (self._key(exchange), account)
+        bucket = self._order_buckets.get(key)
+        config = self.limits.get(key[0], {})
+        if bucket is None and 'order_rate' in config:
+            bucket = self._order_buckets[key] = TokenBucket(config['order_rate'], config['order_burst'])
+        return bucket
+
+    def _lane(self, lane: Optional[str]) -> Tuple[str, int, float, Optional[float]]:
+        lane = lane if lane in LANES else _current_lane.get()
+        priority, reserve, max_wait = LANES[lane]
+        return lane, priority, reserve, max_wait
+
+    async def acquire(self, exchange: str, weight: float = 1.0, lane: str = None, account: str = None):
+        """Wait until `weight` can be spent on `exchange` in `lane`."""
+        credit = _prepaid.get()
+        if credit and credit[0] >= weight:
+            credit[0] -= weight  # Already taken by try_acquire (prepaid_lane)
+            return
+        lane, priority, reserve, max_wait = self._lane(lane)
+        if account and lane in ORDER_LANES:
+            order_bucket = self._order_bucket(exchange, account)
+            if order_bucket is not None:
+                await order_bucket.take(1, priority, 0.0, max_wait)
+
+        bucket = self._bucket(exchange)
+        if bucket is None:
+            return
+        weight = min(weight, bucket.capacity)
+        floor = min(reserve * bucket.capacity, bucket.capacity - weight)
+        started = time.monotonic()
+        await bucket.take(weight, priority, floor, max_wait)
+
+        stats = self.stats.setdefault(f"{self._key(exchange)}:{lane}", {'requests': 0, 'weight': 0.0, 'waited': 0.0})
+        stats['requests'] += 1
+        stats['weight'] += weight
+        stats['waited'] += time.monotonic() - started
+
+    def try_acquire(self, exchange: str, weight: float = 1.0, lane: str = None) -> bool:
+        """Take `weight` in `lane` now if it would be admitted without waiting (no queueing)."""
+        lane, priority, reserve, _ = self._lane(lane)
+        bucket = self._bucket(exchange)
+        if bucket is None:
+            return True
+        weight = min(weight, bucket.capacity)
+        if not bucket.try_take(weight, priority, min(reserve * bucket.capacity, bucket.capacity - weight)):
+            return False
+        stats = self.stats.setdefault(f"{self._key(exchange)}:{lane}", {'requests': 0, 'weight': 0.0, 'waited': 0.0})
+        stats['requests'] += 1
+        stats['weight'] += weight
+        return True
+
+    def refund(self, exchange: str, weight: float, lane: str = None):
+        """Give back weight taken with try_acquire that no request spent."""
+        lane, *_ = self._lane(lane)
+        bucket = self._bucket(exchange)
+        if bucket is None:
+            return
+        bucket.refund(weight)
+        stats = self.stats.get(f"{self._key(exchange)}:{lane}")
+        if stats:
+            stats['weight'] = max(0.0, stats['weight'] - weight)
+
+    def has_headroom(self, exchange: str, weight: float = 1.0, lane: str = None) -> bool:
+        """True if a request of `weight` in `lane` would be admitted right now."""
+        _, priority, reserve, _ = self._lane(lane)
+        bucket = self._bucket(exchange)
+        if bucket is None:
+            return True
+        weight = min(weight, bucket.capacity)
+        return bucket.has_headroom(weight, priority, min(reserve * bucket.capacity, bucket.capacity - weight))
+
+    def penalize(self, exchange: str, seconds: float):
+        """Stop spending on `exchange` for `seconds` (after a 429 / 418 reply)."""
+        bucket = self._bucket(exchange)
+        if bucket is not None:
+            bucket.penalize(seconds)
+            self.logger.warning(f"⏳ {self._key(exchange)}: rate limited, pausing REST for {seconds:.0f}s")
+
+    def attach(self, client, exchange: str) -> None:
+        """Make a ccxt async client draw every request's cost from the shared budget."""
+        account = getattr(client, 'apiKey', None) or None
+        limiter = self
+
+        async def throttle(cost=None):
+            await limiter.acquire(exchange, cost if cost is not None else 1, account=account)
+
+        client.enableRateLimit = True  # ccxt only calls throttle() when enabled
+        client.throttle = throttle
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'buckets': {
+                key: {'tokens': round(b.tokens, 1), 'capacity': b.capacity, 'queued': b.queued()}
+                for key, b in self._buckets.items()
+            },
+            'lanes': self.stats,
+        }
+
+
+# Global singleton for shared access
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get global REST rate limiter (limits from system_directive)."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        try:
+            from system_directive import EXCHANGE_RATE_LIMITS
+        except ImportError:
+            EXCHANGE_RATE_LIMITS = {}
+        _rate_limiter = RateLimiter(EXCHANGE_RATE_LIMITS)
+    return _rate_limiter
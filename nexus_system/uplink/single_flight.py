@@ -0,0 +1,101 @@
+"""
+Nexus System - Single-Flight Request Coalescing
+One in-flight REST call per identical market-data question.
+
+When many symbols close at once, the engine, every trading session and the
+diagnostics ask the exchange the same thing in the same second (candles for
+one (exchange, symbol, timeframe), a ticker, symbol rules). `do(key, fetch)`
+runs `fetch` once per key: concurrent callers await the same task, and a
+successful result is served from memory for a short TTL afterwards. Failures
+reach every waiter but are never cached.
+
+The shared fetch runs as its own task, so one caller being cancelled does
+not cancel the request for the others.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from ..utils.logger import get_logger
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical async calls and briefly caches results.
+
+    - do(key, fetch, ttl, keep): shared call; `keep(result)` decides whether
+      the result may be cached (e.g. not an empty DataFrame after an error)
+    - forget(key): drop a cached result
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self.logger = get_logger("SingleFlight")
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+        self.stats = {'calls': 0, 'coalesced': 0, 'cached': 0}
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], ttl: float = 0.0,
+                 keep: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Return fetch()'s result, sharing one call among concurrent callers with the same key."""
+        cached = self._results.get(key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                self.stats['cached'] += 1
+                return cached[1]
+            del self._results[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats['calls'] += 1
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t, ttl, keep))
+        else:
+            self.stats['coalesced'] += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Task, ttl: float, keep: Optional[Callable[[Any], bool]]):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return  # Errors go to the waiters only (exception() also marks it retrieved)
+        result = task.result()
+        if ttl > 0 and (keep is None or keep(result)):
+            if len(self._results) >= self.max_entries:
+                self._prune()
+            self._results[key] = (time.monotonic() + ttl, result)
+
+    def _prune(self):
+        now = time.monotonic()
+        for key in [k for k, (expires, _) in self._results.items() if expires <= now]:
+            del self._results[key]
+        while len(self._results) >= self.max_entries:
+            del self._results[next(iter(self._results))]  # Oldest insert first
+
+    def forget(self, key: Hashable):
+        self._results.pop(key, None)
+
+    def get_status(self) -> Dict[str, int]:
+        return {**self.stats, 'inflight': len(self._inflight), 'entries': len(self._results)}
+
+
+# Global singleton for shared access
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """Get global single-flight coalescer shared by all adapters and streams."""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
+
+
+def flight_ttl(kind: str) -> float:
+    """Result TTL in seconds for a request kind ('candles', 'ticker', 'symbol_info')."""
+    try:
+        from system_directive import SINGLE_FLIGHT_TTL
+    except ImportError:
+        SINGLE_FLIGHT_TTL = {}
+    return SINGLE_FLIGHT_TTL.get(kind, 0.0)
@@ -10,6 +10,10 @@ import time
 from .adapters.base import IExchangeAdapter
 
 from ..utils.logger import get_logger
+from .ohlcv_store import get_ohlcv_store
+from .market_registry import get_market_registry
+from .rate_limiter import get_rate_limiter, prepaid_weight
+from .single_flight import flight_ttl, get_single_flight
 
 def is_us_market_open() -> bool:
     """Check if US stock market is currently open (9:30 AM - 4:00 PM ET, Mon-Fri)."""
@@ -37,6 +41,7 @@ class MarketStream:
         self.logger = get_logger("MarketStream")
         self.exchange_id = exchange_id
         self.exchange = getattr(ccxt, exchange_id)()
+        get_rate_limiter().attach(self.exchange, 'BINANCE' if exchange_id == 'binanceusdm' else exchange_id.upper())
         self.tf_map = {
             'BTC': '15m',  # Fast trend
             'ETH': '15m',
@@ -52,9 +57,12 @@ class MarketStream:
         
         # WebSocket Integration
         self.use_websocket = use_websocket
-        self.ws_manager = None
+        self.ws_manager = None  # Primary crypto feed (Binance if running, else Bybit)
+        self.ws_managers: Dict[str, Any] = {}  # 'BINANCE' / 'BYBIT' -> kline WebSocket manager
         self.price_cache = None
-        self._ws_task = None
+        self.tf_cache = None  # (symbol, timeframe) cache fed by the WebSocket
+        self._ws_tasks: Dict[str, asyncio.Task] = {}
+        self._on_ws_candle = None
         
         # Alpaca WebSocket
         self.alpaca_ws_manager = None
@@ -64,24 +72,20 @@ class MarketStream:
         # Unified Callbacks
         self._callbacks = []
 
-        # Rate Limiting for REST fallback
-        self._rest_rate_limiter = {}
-        self._rest_call_count = 0
-        self._last_rest_call_time = 0
-
         # WebSocket reconnection
         self._ws_retry_count = 0
         self._ws_last_retry = 0
         self._ws_max_retries = 5
 
-    def add_callback(self, callback):
-        """Register callback for price updates (async def callback(symbol, candle))."""
-        self._callbacks.append(callback)
-        # Add to existing managers if already running
-        if self.ws_manager:
-            self.ws_manager.add_callback(callback)
+    def add_callback(self, callback, closed_only: bool = False):
+        """
+        Register callback for price updates (async def callback(symbol, candle)).
+        With closed_only, in-progress candles are never delivered to it.
+        """
+        self._callbacks.append((callback, closed_only))
+        # Crypto (Binance / Bybit) candles are dispatched by _init_websocket (signal timeframe only)
         if self.alpaca_ws_manager:
-            self.alpaca_ws_manager.add_callback(callback)
+            self.alpaca_ws_manager.add_callback(callback, closed_only=closed_only)
 
     def register_adapter(self, name: str, adapter: IExchangeAdapter):
         """Register an exchange adapter at runtime."""
@@ -141,7 +145,9 @@ class MarketStream:
         """Load markets and optionally start WebSocket streams."""
         try:
             self.logger.info(f"Connecting to {self.exchange_id}...")
-            await self.exchange.load_markets()
+            # Same catalogue the Binance adapters use (downloaded once per process)
+            markets_key = 'BINANCE' if self.exchange_id == 'binanceusdm' else self.exchange_id.upper()
+            await get_market_registry().ensure(markets_key, self.exchange)
             self.logger.info(f"Connected to {self.exchange_id} (Async).")
             
             # Initialize Alpaca Stream (Single Instance)
@@ -176,11 +182,50 @@ class MarketStream:
         except Exception as e:
             self.logger.error(f"Connection Failed: {e}")
     
+    def _ws_routes(self, symbols: list) -> Dict[str, list]:
+        """Split crypto symbols between the Binance and Bybit kline feeds."""
+        from system_directive import STREAM_CRYPTO_WS_SOURCE, is_symbol_available_on_exchange
+
+        source = STREAM_CRYPTO_WS_SOURCE
+        if source not in ('BINANCE', 'BYBIT'):
+            # AUTO: follow _get_adapter, which prefers Bybit for crypto candles
+            source = 'BYBIT' if 'bybit' in self._adapters else 'BINANCE'
+        fallback = 'BINANCE' if source == 'BYBIT' else 'BYBIT'
+
+        routes: Dict[str, list] = {}
+        for symbol in symbols:
+            exchange = source if is_symbol_available_on_exchange(symbol, source) else fallback
+            routes.setdefault(exchange, []).append(symbol)
+        return routes
+
+    async def _start_ws_feed(self, exchange: str, symbols: list, on_candle) -> bool:
+        """Create, connect and start one exchange's kline WebSocket manager."""
+        if exchange == 'BYBIT':
+            from .bybit_ws_manager import BybitWSManager as manager_cls
+        else:
+            from .ws_manager import BinanceWSManager as manager_cls
+
+        manager = manager_cls(symbols, timeframe=self.tf_cache.base_timeframe)
+        manager.add_callback(on_candle)
+        # Symbols are flagged as soon as a shard drops; the flag clears once the gap is filled
+        manager.add_disconnect_callback(lambda dropped: [self.tf_cache.mark_gap(s) for s in dropped])
+        manager.add_reconnect_callback(
+            lambda missed, down_since: self._backfill_gap(exchange, missed, down_since)
+        )
+        if not await manager.connect():
+            self.logger.warning(f"WebSocket: {exchange.title()} feed failed to connect")
+            return False
+
+        self.ws_managers[exchange] = manager
+        self._ws_tasks[exchange] = asyncio.create_task(manager.listen())
+        self.logger.info(f"WebSocket: Streaming {len(symbols)} crypto symbols from {exchange.title()}")
+        return True
+
     async def _init_websocket(self, symbols: list):
-        """Initialize WebSocket connection for crypto symbols."""
+        """Initialize WebSocket connections for crypto symbols (Binance and/or Bybit feeds)."""
         try:
-            from .ws_manager import BinanceWSManager
-            from .price_cache import get_price_cache  # Use global singleton
+            from .timeframe_cache import get_timeframe_cache  # Use global singleton
+            from system_directive import STREAM_SIGNAL_TIMEFRAME
             
             # Filter crypto symbols only
             crypto_symbols = [s for s in symbols if 'USDT' in s]
@@ -189,23 +234,38 @@ class MarketStream:
                 self.logger.info("WebSocket: No crypto symbols to subscribe")
                 return
             
-            self.price_cache = get_price_cache()  # Use singleton for shared access
-            self.ws_manager = BinanceWSManager(crypto_symbols, timeframe='15m')
+            # One base-timeframe feed; higher timeframes are resampled locally
+            self.tf_cache = get_timeframe_cache()
+            signal_tf = STREAM_SIGNAL_TIMEFRAME
+            if signal_tf not in self.tf_cache.timeframes():
+                self.logger.warning(f"WebSocket: Signal timeframe {signal_tf} not streamed, using {self.tf_cache.base_timeframe}")
+                signal_tf = self.tf_cache.base_timeframe
+            self.price_cache = self.tf_cache.get_cache(signal_tf)  # Use singleton for shared access
             
-            # Register callback to update cache
+            # Update every timeframe, then emit signal-timeframe candles to user callbacks
+            # (both feeds share this handler, so consumers cannot tell the exchanges apart)
             async def on_candle(symbol: str, candle: dict):
-                self.price_cache.update_candle(symbol, candle)
-            
-            self.ws_manager.add_callback(on_candle)
-            
-            # Register user callbacks
-            for cb in self._callbacks:
-                self.ws_manager.add_callback(cb)
+                for timeframe, tf_candle in self.tf_cache.update_candle(symbol, candle):
+                    if timeframe != signal_tf or self.tf_cache.has_gap(symbol):
+                        continue  # Never hand strategies a window with holes
+                    is_closed = tf_candle.get('is_closed', False)
+                    for cb, closed_only in self._callbacks:
+                        if closed_only and not is_closed:
+                            continue
+                        try:
+                            await cb(symbol, tf_candle)
+                        except Exception as e:
+                            self.logger.error_debounced(f"Callback error for {symbol} - {e}", interval=300)
+            self._on_ws_candle = on_candle
             
             # Connect and start listening in background
-            if await self.ws_manager.connect():
-                self._ws_task = asyncio.create_task(self.ws_manager.listen())
-                self.logger.info(f"WebSocket: Streaming {len(crypto_symbols)} crypto symbols")
+            for exchange, routed in self._ws_routes(crypto_symbols).items():
+                if exchange not in self.ws_managers:
+                    await self._start_ws_feed(exchange, routed, on_candle)
+
+            if self.ws_managers:
+                # Primary manager (status / reconnection checks): Binance when present
+                self.ws_manager = self.ws_managers.get('BINANCE') or next(iter(self.ws_managers.values()))
                 self._ws_retry_count = 0  # Reset retry count on success
             else:
                 self._ws_retry_count += 1
@@ -224,7 +284,58 @@ class MarketStream:
         except Exception as e:
             self.logger.warning(f"WebSocket: Init failed ({e}), using REST fallback")
             self.use_websocket = False
-    
+
+    async def _backfill_gap(self, exchange: str, symbols: list, down_since: float):
+        """
+        Reconnect hook: fill only the candles that closed while a shard was
+        down (gap detection per (symbol, timeframe), paced REST requests).
+        Live candles keep flowing while the gap is filled.
+        """
+        if not self.tf_cache:
+            return
+        from .gap_backfill import get_gap_backfiller
+
+        if exchange == 'BYBIT':
+            adapter = self._adapters.get('bybit')
+            client = getattr(adapter, '_exchange', None)
+            if client is None:
+                # No Bybit REST client registered: the window refills from the live feed
+                for symbol in symbols:
+                    self.tf_cache.clear_gap(symbol)
+                return
+            format_symbol = adapter._format_symbol
+        else:
+            client = self.exchange
+            format_symbol = lambda s: s.replace('USDT', '/USDT:USDT') if ':' not in s else s
+
+        async def fetch(symbol: str, timeframe: str, since: int, limit: int) -> list:
+            # Ranged request on the raw client (fetch_candles only serves the latest window)
+            return await client.fetch_ohlcv(format_symbol(symbol), timeframe, since=since, limit=limit)
+
+        filled = await get_gap_backfiller(self.tf_cache).fill(fetch, symbols)
+        down = int(time.time() - down_since)
+        self.logger.info(
+            f"WebSocket: {exchange.title()} gap filled after {down}s outage "
+            f"({sum(filled.values())} candles, {len(symbols)} symbols)"
+        )
+
+    async def update_symbols(self, symbols: list) -> Dict[str, int]:
+        """Resubscribe the crypto WebSocket feeds to a new symbol list (live subscribe/unsubscribe)."""
+        total = {'added': 0, 'removed': 0}
+        if not self.ws_managers:
+            return total
+        routes = self._ws_routes([s for s in symbols if 'USDT' in s])
+        for exchange in set(routes) | set(self.ws_managers):
+            manager = self.ws_managers.get(exchange)
+            if manager is None:
+                if await self._start_ws_feed(exchange, routes[exchange], self._on_ws_candle):
+                    total['added'] += len(routes[exchange])
+                continue
+            result = await manager.set_symbols(routes.get(exchange, []))
+            total['added'] += result['added']
+            total['removed'] += result['removed']
+        return total
+
     async def _init_alpaca_websocket(self, symbols: list, api_key: str, api_secret: str):
         """Initialize WebSocket connection for Alpaca stocks/ETFs."""
         try:
@@ -245,8 +356,8 @@ class MarketStream:
             self.alpaca_ws_manager.add_callback(on_alpaca_candle)
             
             # Register user callbacks
-            for cb in self._callbacks:
-                self.alpaca_ws_manager.add_callback(cb)
+            for cb, closed_only in self._callbacks:
+                self.alpaca_ws_manager.add_callback(cb, closed_only=closed_only)
             
             # Connect and start listening in background
             if await self.alpaca_ws_manager.connect():
@@ -265,6 +376,14 @@ class MarketStream:
         from ..utils.indicators import TechnicalIndicators
         return TechnicalIndicators.add_all_indicators(df)
 
+    def _add_indicators_cached(self, symbol: str, timeframe: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Add indicators to WebSocket-cached candles, updating incremental state per (symbol, timeframe)."""
+        from system_directive import INCREMENTAL_INDICATORS_ENABLED
+        if not INCREMENTAL_INDICATORS_ENABLED:
+            return self._add_indicators(df)
+        from ..utils.incremental_indicators import get_indicator_engine
+        return get_indicator_engine().get_frame(symbol, timeframe, df)
+
     def _is_alpaca_symbol(self, symbol: str) -> bool:
         """Check if symbol should be routed to Alpaca (stocks/commodities)."""
         try:
@@ -288,9 +407,9 @@ class MarketStream:
                 
                 # Try Alpaca WebSocket cache first
                 if self.alpaca_price_cache and not self.alpaca_price_cache.is_stale(symbol, max_age_seconds=90):
-                    cached_df = self.alpaca_price_cache.get_dataframe(symbol)
+                    cached_df = self.alpaca_price_cache.get_dataframe(symbol, copy=True)
                     if not cached_df.empty and len(cached_df) >= 50:
-                        df = self._add_indicators(cached_df)
+                        df = self._add_indicators_cached(symbol, "15m", cached_df)
                         return {
                             "symbol": symbol,
                             "timeframe": "15m",
@@ -325,12 +444,12 @@ class MarketStream:
         if not timeframe:
             timeframe = self.tf_map.get(symbol.split('USDT')[0], self.tf_map['default'])
         
-        # 2. Try WebSocket cache first (if enabled and fresh)
-        if self.use_websocket and self.price_cache and not self.price_cache.is_stale(symbol, max_age_seconds=90):
-            cached_df = self.price_cache.get_dataframe(symbol)
+        # 2. Try WebSocket cache first (if enabled, fresh and without reconnect gaps), keyed by (symbol, timeframe)
+        if self.has_fresh_candles(symbol, timeframe):
+            cached_df = self.tf_cache.get_dataframe(symbol, timeframe, copy=True)
             if not cached_df.empty and len(cached_df) >= 50:  # Need enough for indicators
-                # Add indicators to cached data
-                df = self._add_indicators(cached_df)
+                # Add indicators to cached data (incremental, O(1) per new candle)
+                df = self._add_indicators_cached(symbol, timeframe, cached_df)
                 return {
                     "symbol": symbol,
                     "timeframe": timeframe,
@@ -361,11 +480,7 @@ class MarketStream:
                             df = await binance_adapter.fetch_candles(symbol, timeframe=timeframe, limit=limit)
                             if not df.empty:
                                 df = self._add_indicators(df)
-                                if self.price_cache:
-                                    candles = df.to_dict('records')
-                                    for c in candles:
-                                        c['is_closed'] = True
-                                    self.price_cache.backfill(symbol, candles)
+                                self._backfill_cache(symbol, timeframe, df)
                                 return {
                                     "symbol": symbol,
                                     "timeframe": timeframe,
@@ -379,11 +494,7 @@ class MarketStream:
                 # 3.b Adapter returned data
                 if not df.empty:
                     df = self._add_indicators(df)
-                    if self.price_cache:
-                        candles = df.to_dict('records')
-                        for c in candles:
-                            c['is_closed'] = True
-                        self.price_cache.backfill(symbol, candles)
+                    self._backfill_cache(symbol, timeframe, df)
                     return {
                         "symbol": symbol,
                         "timeframe": timeframe,
@@ -399,11 +510,7 @@ class MarketStream:
                         df = await binance_adapter.fetch_candles(symbol, timeframe=timeframe, limit=limit)
                         if not df.empty:
                             df = self._add_indicators(df)
-                            if self.price_cache:
-                                candles = df.to_dict('records')
-                                for c in candles:
-                                    c['is_closed'] = True
-                                self.price_cache.backfill(symbol, candles)
+                            self._backfill_cache(symbol, timeframe, df)
                             return {
                                 "symbol": symbol,
                                 "timeframe": timeframe,
@@ -416,17 +523,17 @@ class MarketStream:
 
             # 3.d No adapter found -> raw Binance REST fallback (uses proxy if configured)
             formatted_symbol = symbol.replace('USDT', '/USDT:USDT') if 'USDT' in symbol and ':' not in symbol else symbol
-            ohlcv = await self.exchange.fetch_ohlcv(formatted_symbol, timeframe, limit=limit)
+            ohlcv = await get_single_flight().do(
+                ('ohlcv', self.exchange_id, symbol, timeframe, limit),
+                lambda: self.exchange.fetch_ohlcv(formatted_symbol, timeframe, limit=limit),
+                ttl=flight_ttl('candles'),
+                keep=bool,
+            )
 
             df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
             df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
             df = self._add_indicators(df)
-
-            if self.price_cache:
-                candles = df.to_dict('records')
-                for c in candles:
-                    c['is_closed'] = True
-                self.price_cache.backfill(symbol, candles)
+            self._backfill_cache(symbol, timeframe, df)
 
             return {
                 "symbol": symbol,
@@ -439,6 +546,15 @@ class MarketStream:
             self.logger.warning_debounced(f"Data Fetch Error ({symbol}): {e}", interval=300)
             return {"dataframe": pd.DataFrame()}
 
+    def _backfill_cache(self, symbol: str, timeframe: str, df: pd.DataFrame):
+        """Seed the (symbol, timeframe) WebSocket cache with REST candles."""
+        if not self.tf_cache or df.empty:
+            return
+        candles = df[['timestamp', 'open', 'high', 'low', 'close', 'volume']].to_dict('records')
+        for c in candles:
+            c['is_closed'] = True
+        self.tf_cache.backfill(symbol, candles, timeframe)
+
     async def get_multiframe_candles(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
         """
         Fetches both Lower Timeframe (Strategy TF) and Higher Timeframe (4h) candles.
@@ -496,6 +612,7 @@ class MarketStream:
     async def get_historical_candles(self, symbol: str, days: int = 30) -> pd.DataFrame:
         """
         Fetches a large dataset for backtesting using pagination.
+        Served from the local OHLCV store when enabled (only the tail is fetched).
         """
         # SKIP NON-CRYPTO (Alpaca history not supported yet in this method)
         if self._is_alpaca_symbol(symbol):
@@ -510,6 +627,22 @@ class MarketStream:
         start_time = now - pd.Timedelta(days=days)
         start_ts = int(start_time.timestamp() * 1000)
         
+        # Local store: only the missing tail is requested from the exchange
+        store = get_ohlcv_store()
+        if store is not None:
+            async def fetch_page(since_ms, limit):
+                return await self.exchange.fetch_ohlcv(formatted_symbol, timeframe, since=since_ms, limit=limit)
+
+            try:
+                await store.sync(self.exchange_id, symbol, timeframe, fetch_page, since=start_ts)
+            except Exception as e:
+                self.logger.warning(f"History Sync Error: {e}")
+
+            df = await asyncio.to_thread(store.read, self.exchange_id, symbol, timeframe, start=start_ts)
+            if df.empty:
+                return df
+            return self._add_indicators(df)
+
         all_ohlcv = []
         current_since = start_ts
         
@@ -570,43 +703,54 @@ class MarketStream:
             self._ws_last_retry = current_time
             return False
 
-    def _can_make_rest_request(self, symbol: str) -> bool:
-        """Check if we can make a REST request based on rate limiting."""
-        current_time = time.time()
+    async def get_ticker(self, symbol: str) -> Dict[str, Any]:
+        """24h ticker for a crypto symbol (coalesced, briefly cached). Empty dict on error."""
+        formatted_symbol = symbol.replace('USDT', '/USDT:USDT') if 'USDT' in symbol and ':' not in symbol else symbol
+        try:
+            return await get_single_flight().do(
+                ('ticker24h', self.exchange_id, symbol),
+                lambda: self.exchange.fetch_ticker(formatted_symbol),
+                ttl=flight_ttl('ticker'),
+            )
+        except Exception as e:
+            self.logger.warning_debounced(f"Ticker Fetch Error ({symbol}): {e}", interval=300)
+            return {}
 
-        # Global rate limiting: max 10 requests per minute
-        if current_time - self._last_rest_call_time < 6:  # 6 seconds between calls
-            return False
+    def has_fresh_candles(self, symbol: str, timeframe: str) -> bool:
+        """True if get_candles can serve (symbol, timeframe) from the WebSocket cache (no REST)."""
+        return bool(self.use_websocket and self.tf_cache and not self.tf_cache.has_gap(symbol)
+                    and not self.tf_cache.is_stale(symbol, timeframe, max_age_seconds=90))
 
-        # Per-symbol rate limiting: max 1 request per 30 seconds
-        last_call = self._rest_rate_limiter.get(symbol, 0)
-        if current_time - last_call < 30:
-            return False
+    def _rest_exchange(self, symbol: str) -> str:
+        adapter = self._get_adapter(symbol)
+        return 'BYBIT' if adapter and adapter.name == 'bybit' else 'BINANCE'
 
-        # Total call count limiting: max 50 calls per hour
-        if self._rest_call_count > 50:
-            # Reset counter every hour
-            if current_time - self._last_rest_call_time > 3600:
-                self._rest_call_count = 0
-            else:
-                return False
+    def has_rest_headroom(self, symbol: str, weight: float = 1.0, lane: str = 'candles') -> bool:
+        """Check the shared rate limiter for headroom in `lane` on the exchange serving `symbol`."""
+        return get_rate_limiter().has_headroom(self._rest_exchange(symbol), weight, lane=lane)
 
-        return True
+    def reserve_rest(self, symbol: str, weight: float, lane: str) -> bool:
+        """Take `weight` in `lane` now on the exchange serving `symbol` (spend it inside `prepaid_lane`)."""
+        return get_rate_limiter().try_acquire(self._rest_exchange(symbol), weight, lane=lane)
 
-    def _update_rest_rate_limiter(self, symbol: str):
-        """Update rate limiter after successful REST call."""
-        current_time = time.time()
-        self._rest_rate_limiter[symbol] = current_time
-        self._last_rest_call_time = current_time
-        self._rest_call_count += 1
+    def refund_rest(self, symbol: str, weight: float, lane: str):
+        """Return weight taken with reserve_rest that no request spent."""
+        get_rate_limiter().refund(self._rest_exchange(symbol), weight, lane=lane)
+
+    def _can_make_rest_request(self, symbol: str) -> bool:
+        """Check the shared rate limiter for candle headroom on the exchange serving `symbol`."""
+        if prepaid_weight() > 0:
+            return True  # Budget already taken by the caller (e.g. the scanner's own lane)
+        # Skip (serve nothing this cycle) instead of queueing behind order traffic
+        return self.has_rest_headroom(symbol, lane='candles')
 
     async def close(self):
         """Close all connections (REST + WebSocket)."""
-        # Close Binance WebSocket
-        if self._ws_task:
-            self._ws_task.cancel()
-        if self.ws_manager:
-            await self.ws_manager.close()
+        # Close crypto WebSockets (Binance / Bybit)
+        for task in self._ws_tasks.values():
+            task.cancel()
+        for manager in self.ws_managers.values():
+            await manager.close()
         
         # Close Alpaca WebSocket
         if self._alpaca_ws_task:
@@ -617,3 +761,43 @@ class MarketStream:
         # Close REST
         await self.exchange.close()
 
+
+# Process-wide shared stream: the engine's warm instance once it is running
+_market_stream: Optional[MarketStream] = None
+_market_stream_owned = False  # True for the REST-only stand-in created below
+_market_stream_lock = asyncio.Lock()
+
+
+def set_market_stream(stream: MarketStream):
+    """Publish the engine's MarketStream (WebSocket caches + adapters) for ad hoc requests."""
+    global _market_stream, _market_stream_owned
+    previous, owned = _market_stream, _market_stream_owned
+    _market_stream, _market_stream_owned = stream, False
+    if owned and previous is not None and previous is not stream:
+        asyncio.ensure_future(previous.close())
+
+
+def clear_market_stream(stream: MarketStream):
+    """Withdraw `stream` if it is the shared one (engine shutdown)."""
+    global _market_stream
+    if _market_stream is stream:
+        _market_stream = None
+
+
+async def get_market_stream() -> MarketStream:
+    """
+    Get the process-wide MarketStream for handlers, servos and diagnostics.
+
+    Returns the engine's stream when registered. Otherwise creates one REST-only
+    stream on first use and keeps it open, so each ad hoc request costs a cached
+    lookup instead of a new client + markets download + TLS handshake.
+    """
+    global _market_stream, _market_stream_owned
+    if _market_stream is not None:
+        return _market_stream
+    async with _market_stream_lock:
+        if _market_stream is None:
+            stream = MarketStream(use_websocket=False)
+            await stream.initialize()
+            _market_stream, _market_stream_owned = stream, True
+    return _market_stream
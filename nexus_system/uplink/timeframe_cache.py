@@ -0,0 +1,392 @@
+"""
+Nexus System - Multi-Timeframe Candle Cache
+Candle cache keyed by (symbol, timeframe).
+
+A single WebSocket feed streams the base timeframe (e.g. 1m). Higher
+timeframes (5m, 15m, 1h, 4h) are built locally by resampling the base
+candles as they arrive, so MTF lookups are served from memory instead of
+rate-limited REST calls.
+
+Gaps (candles that closed while the feed was down) are found per
+(symbol, timeframe) from the cached timestamps and the interval cadence;
+see gap_backfill.GapBackfiller for the reconnect-time repair.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .price_cache import _create_price_cache, _normalize_ts, get_price_cache
+
+
+TIMEFRAME_MS = {
+    '1m': 60_000,
+    '3m': 3 * 60_000,
+    '5m': 5 * 60_000,
+    '15m': 15 * 60_000,
+    '30m': 30 * 60_000,
+    '1h': 60 * 60_000,
+    '2h': 2 * 60 * 60_000,
+    '4h': 4 * 60 * 60_000,
+    '1d': 24 * 60 * 60_000,
+}
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """Convert a ccxt/Binance timeframe string ('15m', '4h') to milliseconds."""
+    if timeframe not in TIMEFRAME_MS:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return TIMEFRAME_MS[timeframe]
+
+
+class TimeframeCache:
+    """
+    Candle cache keyed by (symbol, timeframe).
+
+    Holds one price cache per timeframe (same engine as get_price_cache) and
+    keeps an in-progress aggregate per (symbol, derived timeframe) so every
+    base tick updates each higher-timeframe candle in O(1).
+    """
+
+    def __init__(self, base_timeframe: str = '1m', derived_timeframes: List[str] = None,
+                 layers: Dict[str, Any] = None):
+        """
+        Initialize multi-timeframe cache.
+
+        Args:
+            base_timeframe: Timeframe received from the stream
+            derived_timeframes: Higher timeframes resampled from the base
+            layers: Optional pre-built caches per timeframe (e.g. the global 15m cache)
+        """
+        self.base_timeframe = base_timeframe
+        self._base_ms = timeframe_to_ms(base_timeframe)
+        self.derived_timeframes = [
+            tf for tf in (derived_timeframes or [])
+            if tf != base_timeframe and timeframe_to_ms(tf) % self._base_ms == 0
+        ]
+        self._caches: Dict[str, Any] = dict(layers or {})
+        # (symbol, timeframe) -> aggregate of the CLOSED base candles in the current bucket
+        self._partials: Dict[Tuple[str, str], dict] = {}
+        self._gaps: set = set()  # Symbols whose window has holes pending backfill
+        self._fills: Dict[str, int] = {}  # Symbol -> backfills in progress
+        self._lock = threading.Lock()
+
+    def get_cache(self, timeframe: str):
+        """Get (or lazily create) the underlying price cache for a timeframe."""
+        cache = self._caches.get(timeframe)
+        if cache is None:
+            with self._lock:
+                cache = self._caches.get(timeframe)
+                if cache is None:
+                    cache = self._caches[timeframe] = _create_price_cache()
+        return cache
+
+    def timeframes(self) -> List[str]:
+        """Timeframes served from the stream (base + derived)."""
+        return [self.base_timeframe] + self.derived_timeframes
+
+    def update_candle(self, symbol: str, candle: dict, timeframe: str = None) -> List[Tuple[str, dict]]:
+        """
+        Update a candle and resample it into every derived timeframe.
+
+        Args:
+            symbol: Trading pair
+            candle: Candle dict (timestamp, open, high, low, close, volume, is_closed)
+            timeframe: Timeframe of the candle (defaults to the base timeframe)
+
+        Returns:
+            List of (timeframe, candle) updates applied, base first.
+        """
+        timeframe = timeframe or self.base_timeframe
+        self.get_cache(timeframe).update_candle(symbol, candle)
+        updates = [(timeframe, candle)]
+
+        if timeframe == self.base_timeframe:
+            for derived in self.derived_timeframes:
+                updates.extend(self._resample(symbol, candle, derived))
+        return updates
+
+    def _resample(self, symbol: str, candle: dict, timeframe: str) -> List[Tuple[str, dict]]:
+        """Fold one base candle into the in-progress candle of a higher timeframe."""
+        tf_ms = timeframe_to_ms(timeframe)
+        ts = _normalize_ts(candle.get('timestamp'))
+        bucket = ts - ts % tf_ms
+        cache = self.get_cache(timeframe)
+        key = (symbol, timeframe)
+        updates = []
+
+        partial = self._partials.get(key)
+        if partial is not None and partial['timestamp'] != bucket:
+            if bucket < partial['timestamp']:
+                return updates  # Late tick from an older bucket
+            if not partial['closed'] and partial['open'] is not None:
+                # Last base close of the previous bucket was missed - finalize it now
+                final = self._to_candle(partial, None, is_closed=True)
+                cache.update_candle(symbol, final)
+                updates.append((timeframe, final))
+            partial = None
+
+        if partial is None:
+            partial = self._seed_partial(symbol, timeframe, bucket, first_ts=ts)
+            self._partials[key] = partial
+
+        is_closed = bool(candle.get('is_closed', False))
+        bucket_closed = is_closed and ts + self._base_ms >= bucket + tf_ms
+        aggregated = self._to_candle(partial, candle, is_closed=bucket_closed)
+
+        if is_closed:
+            # Base candle is final: fold it into the running aggregate
+            for field in ('open', 'high', 'low', 'close', 'volume', 'trades'):
+                partial[field] = aggregated[field]
+            partial['closed'] = bucket_closed
+
+        cache.update_candle(symbol, aggregated)
+        updates.append((timeframe, aggregated))
+        return updates
+
+    def _seed_partial(self, symbol: str, timeframe: str, bucket: int, first_ts: int) -> dict:
+        """
+        Start a new bucket aggregate.
+
+        If the stream joins mid-bucket and the cache already holds this bucket
+        (REST backfill), seed from it so open/high/low stay correct. Volume is
+        approximate until the next bucket boundary in that case.
+        """
+        partial = {'timestamp': bucket, 'open': None, 'high': None, 'low': None,
+                   'close': None, 'volume': 0.0, 'trades': 0, 'closed': False}
+        if first_ts == bucket:
+            return partial
+
+        candles = self.get_cache(timeframe).get_candles(symbol)[-1:]
+        if candles and _normalize_ts(candles[0].get('timestamp')) == bucket:
+            seed = candles[0]
+            partial.update({
+                'open': seed['open'], 'high': seed['high'], 'low': seed['low'],
+                'close': seed['close'], 'volume': seed.get('volume', 0.0),
+                'trades': seed.get('trades', 0),
+            })
+        return partial
+
+    @staticmethod
+    def _to_candle(partial: dict, candle: Optional[dict], is_closed: bool) -> dict:
+        """Combine the closed-candle aggregate with the current base candle."""
+        if candle is None:
+            return {
+                'timestamp': partial['timestamp'], 'open': partial['open'], 'high': partial['high'],
+                'low': partial['low'], 'close': partial['close'], 'volume': partial['volume'],
+                'trades': partial['trades'], 'is_closed': is_closed,
+            }
+        if partial['open'] is None:
+            high, low, open_ = candle['high'], candle['low'], candle['open']
+        else:
+            high = max(partial['high'], candle['high'])
+            low = min(partial['low'], candle['low'])
+            open_ = partial['open']
+        return {
+            'timestamp': partial['timestamp'],
+            'open': open_,
+            'high': high,
+            'low': low,
+            'close': candle['close'],
+            'volume': partial['volume'] + candle.get('volume', 0.0),
+            'trades': partial['trades'] + candle.get('trades', 0),
+            'is_closed': is_closed,
+        }
+
+    def backfill(self, symbol: str, candles: List[dict], timeframe: str, overwrite: bool = False):
+        """Backfill REST candles into the (symbol, timeframe) cache."""
+        self.get_cache(timeframe).backfill(symbol, candles, overwrite=overwrite)
+
+    # --- Gaps ---
+
+    def _columns(self, symbol: str, timeframe: str) -> Dict[str, np.ndarray]:
+        """Cached candles for (symbol, timeframe) as columns (empty dict if none)."""
+        cache = self._caches.get(timeframe)
+        if cache is None:
+            return {}
+        if hasattr(cache, 'get_arrays'):
+            return cache.get_arrays(symbol)
+        candles = cache.get_candles(symbol)  # Legacy engine
+        if not candles:
+            return {}
+        columns = {'timestamp': np.array([_normalize_ts(c.get('timestamp')) for c in candles], dtype=np.int64)}
+        for col in ('open', 'high', 'low', 'close', 'volume', 'trades'):
+            columns[col] = np.array([c.get(col, 0) or 0 for c in candles], dtype=np.float64)
+        return columns
+
+    def find_gaps(self, symbol: str, timeframe: str, now_ms: int) -> List[Tuple[int, int]]:
+        """
+        Missing closed candles for (symbol, timeframe) as [start, end) open-time ranges.
+
+        Compares consecutive cached timestamps (and the newest one against the
+        bucket in progress at `now_ms`) with the timeframe's cadence.
+        """
+        ts = self._columns(symbol, timeframe).get('timestamp')
+        if ts is None or not len(ts):
+            return []
+        tf_ms = timeframe_to_ms(timeframe)
+        current = now_ms - now_ms % tf_ms
+
+        holes = np.nonzero(np.diff(ts) > tf_ms)[0]
+        gaps = [(int(ts[i]) + tf_ms, int(ts[i + 1])) for i in holes]
+        if int(ts[-1]) + tf_ms < current:
+            gaps.append((int(ts[-1]) + tf_ms, current))
+        return gaps
+
+    def resample_closed(self, symbol: str, timeframe: str, ranges: List[Tuple[int, int]],
+                        now_ms: int) -> List[Tuple[int, int]]:
+        """
+        Rebuild the closed `timeframe` buckets overlapping `ranges` from base candles.
+
+        Rebuilt buckets replace cached ones (a bucket finalized during an
+        outage is incomplete). Returns the bucket ranges the base window
+        cannot cover, which must come from REST instead.
+        """
+        tf_ms = timeframe_to_ms(timeframe)
+        per_bucket = tf_ms // self._base_ms
+        current = now_ms - now_ms % tf_ms
+        base = self._columns(symbol, self.base_timeframe)
+        ts = base.get('timestamp', np.zeros(0, dtype=np.int64))
+        last_closed = self.get_cache(self.base_timeframe).is_last_closed(symbol)
+
+        buckets = sorted({
+            bucket
+            for start, end in ranges
+            for bucket in range(start - start % tf_ms, min(end, current), tf_ms)
+        })
+        rebuilt, missing = [], []
+        for bucket in buckets:
+            lo, hi = np.searchsorted(ts, [bucket, bucket + tf_ms])
+            complete = hi - lo == per_bucket and (hi < len(ts) or last_closed)
+            if not complete:
+                missing.append((bucket, bucket + tf_ms))
+                continue
+            rebuilt.append({
+                'timestamp': bucket,
+                'open': float(base['open'][lo]),
+                'high': float(base['high'][lo:hi].max()),
+                'low': float(base['low'][lo:hi].min()),
+                'close': float(base['close'][hi - 1]),
+                'volume': float(base['volume'][lo:hi].sum()),
+                'trades': int(base['trades'][lo:hi].sum()),
+                'is_closed': True,
+            })
+        if rebuilt:
+            self.backfill(symbol, rebuilt, timeframe, overwrite=True)
+        return missing
+
+    def rebuild_partial(self, symbol: str, timeframe: str, now_ms: int):
+        """
+        Recompute the in-progress aggregate for a derived timeframe from the
+        closed base candles of the current bucket (after a gap was filled).
+        """
+        tf_ms = timeframe_to_ms(timeframe)
+        bucket = now_ms - now_ms % tf_ms
+        key = (symbol, timeframe)
+        base = self._columns(symbol, self.base_timeframe)
+        ts = base.get('timestamp', np.zeros(0, dtype=np.int64))
+
+        lo = int(np.searchsorted(ts, bucket))
+        hi = len(ts) if self.get_cache(self.base_timeframe).is_last_closed(symbol) else len(ts) - 1
+        if hi <= lo or int(ts[lo]) != bucket or int(ts[hi - 1]) - bucket != (hi - lo - 1) * self._base_ms:
+            # Base window does not cover the bucket from its start: reseed from the cache on next tick
+            self._partials.pop(key, None)
+            return
+        self._partials[key] = {
+            'timestamp': bucket,
+            'open': float(base['open'][lo]),
+            'high': float(base['high'][lo:hi].max()),
+            'low': float(base['low'][lo:hi].min()),
+            'close': float(base['close'][hi - 1]),
+            'volume': float(base['volume'][lo:hi].sum()),
+            'trades': int(base['trades'][lo:hi].sum()),
+            'closed': False,
+        }
+
+    def mark_gap(self, symbol: str):
+        """Flag a symbol's window as incomplete (cache reads should not be served)."""
+        self._gaps.add(symbol)
+
+    def clear_gap(self, symbol: str):
+        """Unflag a symbol, unless a backfill is still splicing candles into it."""
+        if not self._fills.get(symbol):
+            self._gaps.discard(symbol)
+
+    def begin_fill(self, symbol: str):
+        """Flag a symbol for the duration of one backfill (fills may overlap)."""
+        self._fills[symbol] = self._fills.get(symbol, 0) + 1
+        self._gaps.add(symbol)
+
+    def end_fill(self, symbol: str):
+        """Finish one backfill; the flag clears when the last overlapping fill is done."""
+        pending = self._fills.get(symbol, 0) - 1
+        if pending > 0:
+            self._fills[symbol] = pending
+            return
+        self._fills.pop(symbol, None)
+        self._gaps.discard(symbol)
+
+    def has_gap(self, symbol: str) -> bool:
+        """True while a symbol's window is known to have holes."""
+        return symbol in self._gaps
+
+    def get_dataframe(self, symbol: str, timeframe: str, copy: bool = False) -> pd.DataFrame:
+        """Get candles for (symbol, timeframe) as a DataFrame."""
+        cache = self._caches.get(timeframe)
+        if cache is None:
+            return pd.DataFrame()
+        return cache.get_dataframe(symbol, copy=copy)
+
+    def is_stale(self, symbol: str, timeframe: str, max_age_seconds: int = 120) -> bool:
+        """Check if (symbol, timeframe) data is stale or missing."""
+        cache = self._caches.get(timeframe)
+        return cache is None or cache.is_stale(symbol, max_age_seconds)
+
+    def get_last_price(self, symbol: str) -> Optional[float]:
+        """Most recent close price (from the base timeframe)."""
+        return self.get_cache(self.base_timeframe).get_last_price(symbol)
+
+    def clear(self, symbol: str = None):
+        """Clear a symbol (or everything) across all timeframes."""
+        for cache in list(self._caches.values()):
+            cache.clear(symbol)
+        with self._lock:
+            if symbol:
+                for key in [k for k in self._partials if k[0] == symbol]:
+                    self._partials.pop(key, None)
+            else:
+                self._partials.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics per timeframe."""
+        return {tf: cache.get_stats() for tf, cache in list(self._caches.items())}
+
+
+# Global singleton for shared access
+_timeframe_cache: Optional[TimeframeCache] = None
+
+
+def get_timeframe_cache() -> TimeframeCache:
+    """
+    Get global (symbol, timeframe) cache instance (Binance).
+
+    The signal timeframe layer is the global get_price_cache() instance, so
+    existing consumers of that cache keep seeing the same candles.
+    """
+    global _timeframe_cache
+    if _timeframe_cache is None:
+        try:
+            from system_directive import (
+                STREAM_BASE_TIMEFRAME, STREAM_DERIVED_TIMEFRAMES, STREAM_SIGNAL_TIMEFRAME
+            )
+        except ImportError:
+            STREAM_BASE_TIMEFRAME, STREAM_DERIVED_TIMEFRAMES, STREAM_SIGNAL_TIMEFRAME = \
+                '1m', ['5m', '15m', '1h', '4h'], '15m'
+        _timeframe_cache = TimeframeCache(
+            base_timeframe=STREAM_BASE_TIMEFRAME,
+            derived_timeframes=STREAM_DERIVED_TIMEFRAMES,
+            layers={STREAM_SIGNAL_TIMEFRAME: get_price_cache()}
+        )
+    return _timeframe_cache
@@ -0,0 +1,373 @@
+"""
+Nexus System - Private User-Data Streams
+Per-account order, position and balance updates pushed into ShadowWallet.
+
+Without a stream, every dashboard refresh, risk check and position sync
+polls the exchange over REST. A UserDataStream keeps one private WebSocket
+per (session, exchange) and applies each event to the session's
+ShadowWallet as it arrives, so fills show up in real time. While the
+stream is live the adapters serve get_positions() / get_account_balance()
+from memory and spend no REST weight on them.
+
+After every (re)connect the stream takes one REST snapshot before going
+live; the snapshot reads raise on errors (retried with backoff), so a
+failed read never clears the wallet or goes live on empty state. Events
+that arrive during the snapshot wait in the socket buffer and are applied
+on top of it, so nothing between the snapshot and the subscription is
+lost. While disconnected, reads fall back to REST.
+
+- BinanceUserStream: futures user-data stream (listenKey, kept alive every 30 min)
+- BybitUserStream: v5 private topics (position, wallet, order), HMAC auth
+"""
+
+import asyncio
+import hashlib
+import hmac
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from ..utils.logger import get_logger
+from .ws_codec import dumps, loads
+
+
+class UserDataStream:
+    """
+    One account's private stream feeding a ShadowWallet.
+
+    Subclasses implement `_connect()` (open, authenticate, subscribe),
+    `_heartbeat()` and `_handle(msg)`.
+    """
+
+    EXCHANGE = ''
+    HEARTBEAT_INTERVAL = 20
+    SNAPSHOT_ATTEMPTS = 3
+
+    def __init__(self, adapter, wallet, chat_id: str):
+        self.adapter = adapter
+        self.wallet = wallet
+        self.chat_id = chat_id
+        self.logger = get_logger(f"UserStream.{self.EXCHANGE}")
+        self.running = False
+        self.live = False  # Snapshot taken and socket up: reads may be served from the wallet
+        self.last_event = 0.0
+        self.last_error: Optional[str] = None
+        self.stats = {'events': 0, 'reconnects': 0, 'snapshots': 0}
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_heartbeat = 0.0
+
+    # --- Exchange hooks ---
+
+    async def _connect(self):
+        raise NotImplementedError
+
+    async def _heartbeat(self):
+        pass
+
+    def _handle(self, msg: dict):
+        raise NotImplementedError
+
+    # --- Lifecycle ---
+
+    async def _open_socket(self, url: str):
+        import websockets
+        return await websockets.connect(url, ping_interval=20, ping_timeout=10, close_timeout=5)
+
+    async def start(self):
+        """Start the receive loop in the background (first snapshot included)."""
+        if self._task is None or self._task.done():
+            self.running = True
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        attempts = 0
+        while self.running:
+            try:
+                self._ws = await self._connect()
+                self._last_heartbeat = time.time()
+                await self._snapshot()
+                self.live = True
+                attempts = 0
+                await self._receive()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                self.logger.warning_debounced(f"{self.EXCHANGE} user stream ({self.chat_id}): {e}", interval=300)
+            finally:
+                self.live = False
+                await self._close_socket()
+
+            if self.running:
+                attempts += 1
+                self.stats['reconnects'] += 1
+                await asyncio.sleep(min(2 ** attempts, 60))
+
+    async def _receive(self):
+        while self.running:
+            try:
+                raw = await asyncio.wait_for(self._ws.recv(), timeout=self.HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                raw = None
+            if time.time() - self._last_heartbeat >= self.HEARTBEAT_INTERVAL:
+                self._last_heartbeat = time.time()
+                await self._heartbeat()
+            if raw is None:
+                continue
+
+            msg = loads(raw)
+            if not isinstance(msg, dict):
+                continue
+            self.stats['events'] += 1
+            self.last_event = time.time()
+            try:
+                self._handle(msg)
+            except ConnectionError:
+                raise  # Stream-level failure (e.g. expired listenKey): reconnect and resync
+            except Exception as e:
+                self.logger.warning_debounced(f"Bad {self.EXCHANGE} user event: {e}", interval=300)
+
+    async def _snapshot(self):
+        """
+        Resync positions and balance over REST (the socket is already subscribed).
+        Reads are strict: a failed read is retried with backoff and finally raises,
+        so an empty or zero answer from an error never replaces the wallet and
+        the stream never goes live on it.
+        """
+        for attempt in range(self.SNAPSHOT_ATTEMPTS):
+            try:
+                positions = await self.adapter.get_positions(refresh=True, strict=True)
+                balance = await self.adapter.get_account_balance(refresh=True, strict=True)
+                break
+            except Exception as e:
+                if attempt == self.SNAPSHOT_ATTEMPTS - 1:
+                    raise ConnectionError(f"snapshot failed: {e}") from e
+                await asyncio.sleep(2 ** attempt)
+        self.wallet.replace_positions(self.chat_id, self.EXCHANGE, {p['symbol']: p for p in positions})
+        self.wallet.update_balance(self.chat_id, self.EXCHANGE, balance)
+        self.stats['snapshots'] += 1
+
+    async def _refresh_balance(self):
+        balance = await self.adapter.get_account_balance(refresh=True, strict=True)
+        self.wallet.update_balance(self.chat_id, self.EXCHANGE, balance)
+
+    async def _close_socket(self):
+        if self._ws is not None:
+            try:
+                await self._ws.close()
+            except Exception:
+                pass
+            self._ws = None
+
+    async def close(self):
+        self.running = False
+        self.live = False
+        if self._task:
+            self._task.cancel()
+        await self._close_socket()
+
+    # --- Wallet writes ---
+
+    def _set_position(self, symbol: str, quantity: float, side: Optional[str], **fields):
+        """Write one position; a zero quantity closes it (only this exchange's, and only that side in hedge mode)."""
+        current = self.wallet.get_position(self.chat_id, symbol)
+        if quantity == 0:
+            if current.get('exchange') == self.EXCHANGE and side in (None, current.get('side')):
+                self.wallet.update_position(self.chat_id, symbol, {'quantity': 0})
+            return
+        position = {**(current if current.get('exchange') == self.EXCHANGE else {}), **fields}
+        position.update(symbol=symbol, side=side, quantity=abs(quantity), exchange=self.EXCHANGE)
+        self.wallet.update_position(self.chat_id, symbol, position)
+
+    # --- Reads (adapters call these while live) ---
+
+    def positions(self) -> List[Dict[str, Any]]:
+        """This exchange's positions, with unrealized PnL marked to the streamed price when cached."""
+        from .timeframe_cache import get_timeframe_cache
+        cache = get_timeframe_cache()
+        positions = []
+        for position in self.wallet.get_positions(self.chat_id, self.EXCHANGE):
+            position = dict(position)
+            symbol = position['symbol']
+            price = None if cache.is_stale(symbol, cache.base_timeframe, 90) else cache.get_last_price(symbol)
+            if price and position.get('entryPrice'):
+                direction = 1 if position.get('side') == 'LONG' else -1
+                position['unrealizedPnl'] = (price - position['entryPrice']) * position['quantity'] * direction
+            positions.append(position)
+        return positions
+
+    def balance(self) -> Dict[str, Any]:
+        balance = self.wallet.get_balance(self.chat_id, self.EXCHANGE)
+        return {'total': balance.get('total', 0.0), 'available': balance.get('available', 0.0), 'currency': 'USDT'}
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'live': self.live,
+            'last_event_age': round(time.time() - self.last_event, 1) if self.last_event else None,
+            'last_error': self.last_error,
+            **self.stats,
+        }
+
+
+class BinanceUserStream(UserDataStream):
+    """Binance USD-M futures user-data stream."""
+
+    EXCHANGE = 'BINANCE'
+    BASE_URL = "wss://fstream.binance.com/ws/"
+    TESTNET_URL = "wss://stream.binancefuture.com/ws/"
+    HEARTBEAT_INTERVAL = 60
+    KEEPALIVE_INTERVAL = 1800  # listenKeys expire after 60 min without a keepalive
+    BALANCE_DEBOUNCE = 1.0  # ACCOUNT_UPDATE has no available balance: one REST refresh per burst of updates
+    CLOSED_ORDER_STATES = ('FILLED', 'CANCELED', 'EXPIRED', 'REJECTED', 'EXPIRED_IN_MATCH')
+
+    def __init__(self, adapter, wallet, chat_id: str):
+        super().__init__(adapter, wallet, chat_id)
+        self._listen_key: Optional[str] = None
+        self._keepalive_at = 0.0
+        self._balance_task: Optional[asyncio.Task] = None
+
+    async def _connect(self):
+        client = self.adapter._exchange
+        response = await client.fapiPrivatePostListenKey()
+        self._listen_key = response['listenKey']
+        self._keepalive_at = time.time()
+        testnet = self.adapter._markets_key.endswith('_TESTNET')
+        return await self._open_socket((self.TESTNET_URL if testnet else self.BASE_URL) + self._listen_key)
+
+    async def _heartbeat(self):
+        if time.time() - self._keepalive_at >= self.KEEPALIVE_INTERVAL:
+            await self.adapter._exchange.fapiPrivatePutListenKey()
+            self._keepalive_at = time.time()
+
+    def _handle(self, msg: dict):
+        event = msg.get('e')
+        if event == 'ACCOUNT_UPDATE':
+            for p in msg['a'].get('P', ()):
+                amount = float(p['pa'])
+                side = p.get('ps') if p.get('ps') in ('LONG', 'SHORT') else ('LONG' if amount > 0 else 'SHORT' if amount < 0 else None)
+                self._set_position(p['s'], amount, side, entryPrice=float(p['ep']), unrealizedPnl=float(p['up']))
+            self._schedule_balance_refresh()
+        elif event == 'ORDER_TRADE_UPDATE':
+            o = msg['o']
+            self.wallet.update_order(self.chat_id, str(o['i']), {
+                'symbol': o['s'],
+                'side': o['S'],
+                'type': o.get('ot') or o['o'],
+                'status': o['X'],
+                'price': float(o['p']),
+                'stopPrice': float(o.get('sp') or 0),
+                'quantity': float(o['q']),
+                'filled': float(o['z']),
+                'reduceOnly': o.get('R', False),
+                'last_fill_price': float(o['L']) if o.get('x') == 'TRADE' else 0.0,
+                'exchange': self.EXCHANGE,
+            }, closed=o['X'] in self.CLOSED_ORDER_STATES)
+        elif event == 'ACCOUNT_CONFIG_UPDATE' and 'ac' in msg:
+            position = self.wallet.get_position(self.chat_id, msg['ac']['s'])
+            if position.get('exchange') == self.EXCHANGE:
+                self.wallet.update_position(self.chat_id, position['symbol'], {**position, 'leverage': int(msg['ac']['l'])})
+        elif event == 'listenKeyExpired':
+            raise ConnectionError("listenKey expired")
+
+    def _schedule_balance_refresh(self):
+        if self._balance_task is None or self._balance_task.done():
+            self._balance_task = asyncio.create_task(self._debounced_balance())
+
+    async def _debounced_balance(self):
+        await asyncio.sleep(self.BALANCE_DEBOUNCE)
+        try:
+            await self._refresh_balance()
+        except Exception as e:
+            self.logger.warning_debounced(f"Balance refresh failed ({self.chat_id}): {e}", interval=300)
+
+    async def close(self):
+        if self._balance_task:
+            self._balance_task.cancel()
+        await super().close()
+
+
+class BybitUserStream(UserDataStream):
+    """Bybit v5 private stream (linear position, wallet and order topics)."""
+
+    EXCHANGE = 'BYBIT'
+    BASE_URL = "wss://stream.bybit.com/v5/private"
+    TESTNET_URL = "wss://stream-testnet.bybit.com/v5/private"
+    HEARTBEAT_INTERVAL = 20
+    TOPICS = ['position', 'wallet', 'order']
+    CLOSED_ORDER_STATES = ('Filled', 'Cancelled', 'Rejected', 'Deactivated', 'PartiallyFilledCanceled')
+
+    async def _connect(self):
+        testnet = self.adapter._markets_key.endswith('_TESTNET')
+        ws = await self._open_socket(self.TESTNET_URL if testnet else self.BASE_URL)
+        expires = int((time.time() + 10) * 1000)
+        signature = hmac.new(self.adapter._api_secret.encode(), f"GET/realtime{expires}".encode(), hashlib.sha256).hexdigest()
+        await ws.send(dumps({'op': 'auth', 'args': [self.adapter._api_key, expires, signature]}))
+        reply = loads(await asyncio.wait_for(ws.recv(), timeout=10))
+        if not reply.get('success'):
+            await ws.close()
+            raise PermissionError(f"auth rejected: {reply.get('ret_msg')}")
+        await ws.send(dumps({'op': 'subscribe', 'args': self.TOPICS}))
+        return ws
+
+    async def _heartbeat(self):
+        await self._ws.send(dumps({'op': 'ping'}))
+
+    def _handle(self, msg: dict):
+        topic = msg.get('topic')
+        if topic == 'position':
+            for p in msg.get('data') or ():
+                if p.get('category', 'linear') != 'linear':
+                    continue
+                self._set_position(
+                    self.adapter._unformat_symbol(p['symbol']),
+                    float(p.get('size') or 0),
+                    {'Buy': 'LONG', 'Sell': 'SHORT'}.get(p.get('side')),
+                    entryPrice=float(p.get('entryPrice') or p.get('avgPrice') or 0),
+                    unrealizedPnl=float(p.get('unrealisedPnl') or 0),
+                    leverage=int(float(p.get('leverage') or 1)),
+                    takeProfit=float(p.get('takeProfit') or 0),
+                    stopLoss=float(p.get('stopLoss') or 0),
+                )
+        elif topic == 'wallet':
+            for account in msg.get('data') or ():
+                usdt = next((c for c in account.get('coin', ()) if c.get('coin') == 'USDT'), {})
+                total = account.get('totalEquity') or usdt.get('equity')
+                available = account.get('totalAvailableBalance') or usdt.get('availableToWithdraw')
+                if total not in (None, ''):
+                    self.wallet.update_balance(self.chat_id, self.EXCHANGE, {
+                        'total': float(total),
+                        'available': float(available or 0),
+                    })
+        elif topic == 'order':
+            for o in msg.get('data') or ():
+                if o.get('category', 'linear') != 'linear':
+                    continue
+                self.wallet.update_order(self.chat_id, o['orderId'], {
+                    'symbol': self.adapter._unformat_symbol(o['symbol']),
+                    'side': o['side'].upper(),
+                    'type': o.get('stopOrderType') or o.get('orderType'),
+                    'status': o['orderStatus'],
+                    'price': float(o.get('price') or 0),
+                    'stopPrice': float(o.get('triggerPrice') or 0),
+                    'quantity': float(o.get('qty') or 0),
+                    'filled': float(o.get('cumExecQty') or 0),
+                    'reduceOnly': o.get('reduceOnly', False),
+                    'last_fill_price': float(o.get('avgPrice') or 0) if o['orderStatus'] in ('Filled', 'PartiallyFilled') else 0.0,
+                    'exchange': self.EXCHANGE,
+                }, closed=o['orderStatus'] in self.CLOSED_ORDER_STATES)
+
+
+USER_STREAMS = {'BINANCE': BinanceUserStream, 'BYBIT': BybitUserStream}
+
+
+def create_user_stream(exchange: str, adapter, wallet, chat_id: str) -> Optional[UserDataStream]:
+    """Private stream for a connected adapter, or None (unsupported exchange / disabled in system_directive)."""
+    try:
+        from system_directive import USER_DATA_STREAMS_ENABLED
+    except ImportError:
+        USER_DATA_STREAMS_ENABLED = os.getenv('USER_DATA_STREAMS_ENABLED', 'true').lower() == 'true'
+    stream_cls = USER_STREAMS.get(exchange.upper())
+    if not USER_DATA_STREAMS_ENABLED or stream_cls is None or not getattr(adapter, '_exchange', None):
+        return None
+    return stream_cls(adapter, wallet, chat_id)
@@ -0,0 +1,180 @@
+"""
+Nexus System - WebSocket Frame Decoding
+Fast-path decoding for streamed klines.
+
+Frames are parsed with orjson when installed (stdlib json otherwise) into
+`Candle` records: fixed-slot objects that read like the candle dicts every
+consumer already uses (`candle['close']`, `candle.get('is_closed')`) without
+a per-tick dict allocation. When nobody wants in-progress ticks, open klines
+are recognised from the raw frame and skipped before any parsing.
+
+Binance (futures kline streams) and Bybit (v5 public linear kline topics)
+frames decode into the same record.
+"""
+
+import json
+from collections.abc import Mapping
+from typing import Any, List, Optional, Tuple, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def loads(raw: Union[str, bytes]) -> Any:
+    """Parse a JSON frame (orjson fast path)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize an outgoing JSON message (orjson fast path)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+class Candle(Mapping):
+    """
+    Kline record with dict-style access.
+
+    Keys: timestamp, open, high, low, close, volume, close_time, is_closed,
+    trades, interval. Supports `candle[key]`, `.get()`, `dict(candle)` and
+    item assignment for existing keys.
+    """
+
+    __slots__ = ('timestamp', 'open', 'high', 'low', 'close', 'volume',
+                 'close_time', 'is_closed', 'trades', 'interval')
+
+    def __init__(self, timestamp, open, high, low, close, volume,
+                 close_time=None, is_closed=False, trades=0, interval=None):
+        self.timestamp = timestamp
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.close_time = close_time
+        self.is_closed = is_closed
+        self.trades = trades
+        self.interval = interval
+
+    def __getitem__(self, key: str):
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key) -> bool:
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Candle({dict(self)})"
+
+
+# Binance sends compact JSON: an in-progress kline always contains this literal
+_OPEN_KLINE = '"x":false'
+_OPEN_KLINE_BYTES = _OPEN_KLINE.encode()
+
+
+def is_open_kline(raw: Union[str, bytes]) -> bool:
+    """True if a raw Binance kline frame is an in-progress (not closed) tick."""
+    return (_OPEN_KLINE_BYTES if isinstance(raw, bytes) else _OPEN_KLINE) in raw
+
+
+def decode_binance_kline(raw: Union[str, bytes], closed_only: bool = False) -> Optional[Tuple[str, Candle]]:
+    """
+    Decode a Binance (combined or raw) kline frame into (symbol, Candle).
+
+    Returns None for non-kline frames (e.g. SUBSCRIBE acks) and, with
+    closed_only, for in-progress ticks (checked before parsing).
+    """
+    if closed_only and is_open_kline(raw):
+        return None
+
+    data = loads(raw)
+    if not isinstance(data, dict):
+        return None
+    # Combined stream format: {"stream": "btcusdt@kline_15m", "data": {...}}
+    k = (data.get('data') or data).get('k')
+    if not k or (closed_only and not k.get('x')):
+        return None
+
+    return k['s'], Candle(
+        k['t'],                 # Kline start time (ms)
+        float(k['o']),
+        float(k['h']),
+        float(k['l']),
+        float(k['c']),
+        float(k['v']),
+        k.get('T'),             # Kline close time (ms)
+        k.get('x', False),      # True when candle finalized
+        k.get('n', 0),          # Number of trades
+        k.get('i'),
+    )
+
+
+# Bybit v5 kline intervals (topic "kline.<interval>.<symbol>")
+BYBIT_INTERVALS = {
+    '1m': '1', '3m': '3', '5m': '5', '15m': '15', '30m': '30',
+    '1h': '60', '2h': '120', '4h': '240', '6h': '360', '12h': '720',
+    '1d': 'D', '1w': 'W',
+}
+_BYBIT_TIMEFRAMES = {v: k for k, v in BYBIT_INTERVALS.items()}
+
+# Bybit frames are compact too: a batch holding a finalized kline contains this literal
+_CLOSED_BYBIT = '"confirm":true'
+_CLOSED_BYBIT_BYTES = _CLOSED_BYBIT.encode()
+
+
+def decode_bybit_kline(raw: Union[str, bytes], closed_only: bool = False) -> List[Tuple[str, Candle]]:
+    """
+    Decode a Bybit v5 kline topic frame into [(symbol, Candle), ...].
+
+    A frame may carry several klines. Returns [] for non-kline frames
+    (subscribe acks, pongs) and, with closed_only, for frames without a
+    confirmed kline (checked before parsing).
+    """
+    if closed_only and (_CLOSED_BYBIT_BYTES if isinstance(raw, bytes) else _CLOSED_BYBIT) not in raw:
+        return []
+
+    data = loads(raw)
+    if not isinstance(data, dict):
+        return []
+    topic = data.get('topic') or ''
+    if not topic.startswith('kline.'):
+        return []
+    _, interval, symbol = topic.split('.', 2)
+    interval = _BYBIT_TIMEFRAMES.get(interval, interval)
+
+    candles = []
+    for k in data.get('data') or ():
+        closed = bool(k.get('confirm', False))
+        if closed_only and not closed:
+            continue
+        candles.append((symbol, Candle(
+            int(k['start']),        # Kline start time (ms)
+            float(k['open']),
+            float(k['high']),
+            float(k['low']),
+            float(k['close']),
+            float(k['volume']),
+            k.get('end'),           # Kline close time (ms)
+            closed,                 # True when candle finalized
+            0,                      # Bybit does not report trade counts
+            interval,
+        )))
+    return candles
@@ -1,11 +1,24 @@
 """
 Nexus System - Binance WebSocket Manager
 Real-time kline streaming for Binance USD-M Futures.
+
+KlineWSManager is the exchange-agnostic core (also used by BybitWSManager):
+(symbol, interval) streams are partitioned across several combined-stream
+connections (shards), each with its own receive loop, reconnect backoff and
+health record. The subscribed set can change at runtime: streams are added
+or removed with live SUBSCRIBE / UNSUBSCRIBE requests on the owning shard.
+
+Receive loops never await consumer code: every parsed candle is put on a
+bounded queue per consumer, drained by that consumer's own task, so one
+slow callback cannot stall the sockets (or the other consumers). Frames are
+decoded by ws_codec; in-progress ticks are only decoded if some consumer
+wants them.
 """
 
 import asyncio
-import json
-from typing import Callable, Dict, List, Any, Optional
+import time
+from collections import deque
+from typing import Callable, Dict, List, Any, Optional, Sequence, Tuple, Union
 from datetime import datetime
 
 # WebSocket state constants (websockets v15+)
@@ -14,248 +27,592 @@ WS_STATE_OPEN = 1
 
 
 from ..utils.logger import get_logger
+from .ws_codec import Candle, decode_binance_kline, dumps
+
+
+class _Shard:
+    """One combined-stream connection and its health record."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.streams: List[str] = []
+        self.ws = None
+        self.task: Optional[asyncio.Task] = None
+        self.reconnect_attempts = 0
+        self._request_id = 0
+
+        # Health
+        self.connected_at: Optional[float] = None
+        self.down_since: Optional[float] = None  # Set while reconnecting
+        self.last_ping = 0.0
+        self.last_message: Optional[float] = None
+        self.messages = 0
+        self.reconnects = 0
+        self.last_error: Optional[str] = None
+
+    def next_id(self) -> int:
+        self._request_id += 1
+        return self._request_id
+
+    def is_connected(self) -> bool:
+        """Check if WebSocket is connected (compatible with websockets v15+)."""
+        if not self.ws:
+            return False
+        # websockets v15+ uses state property (1 = OPEN)
+        if hasattr(self.ws, 'state'):
+            return self.ws.state == WS_STATE_OPEN
+        # Fallback for older versions
+        return getattr(self.ws, 'open', False)
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            'shard': self.index,
+            'streams': len(self.streams),
+            'connected': self.is_connected(),
+            'connected_at': self.connected_at,
+            'last_message': self.last_message,
+            'messages': self.messages,
+            'reconnects': self.reconnects,
+            'reconnect_attempts': self.reconnect_attempts,
+            'last_error': self.last_error,
+        }
+
 
-class BinanceWSManager:
+class _CandleQueue(asyncio.Queue):
+    """FIFO queue that tracks in-progress ticks so overflow can evict one of them."""
+
+    def _init(self, maxsize):
+        self._queue = deque()
+        self._ticks = 0
+
+    def _put(self, item):
+        self._queue.append(item)
+        if not item[1].get('is_closed'):
+            self._ticks += 1
+
+    def _get(self):
+        item = self._queue.popleft()
+        if not item[1].get('is_closed'):
+            self._ticks -= 1
+        return item
+
+    def evict_tick(self) -> bool:
+        """Drop the oldest queued in-progress tick; False if only closed candles are queued."""
+        if not self._ticks:
+            return False
+        for i, item in enumerate(self._queue):
+            if not item[1].get('is_closed'):
+                del self._queue[i]
+                self._ticks -= 1
+                return True
+        return False
+
+
+class _Consumer:
+    """A registered callback with its own bounded queue and delivery task."""
+
+    def __init__(self, callback: Callable, maxsize: int, closed_only: bool = False):
+        self.callback = callback
+        self.closed_only = closed_only
+        self.maxsize = maxsize
+        self.queue = _CandleQueue()  # Unbounded: offer() enforces the bound on ticks only
+        self.task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+    def offer(self, item: Tuple[str, dict]):
+        """
+        Enqueue without blocking. On overflow a live tick is dropped, and a
+        closed candle takes the place of the oldest queued tick; closed
+        candles themselves are never dropped (with only closes queued, the
+        queue grows past its bound).
+        """
+        if self.queue.qsize() >= self.maxsize:
+            if not item[1].get('is_closed'):
+                self.dropped += 1
+                return
+            if self.queue.evict_tick():
+                self.dropped += 1
+        self.queue.put_nowait(item)
+
+
+class KlineWSManager:
     """
-    Manages WebSocket connections to Binance Futures for real-time kline updates.
-    Supports multi-stream subscriptions and automatic reconnection.
+    Sharded kline WebSocket client with queued fan-out.
+
+    Subclasses define the exchange specifics: stream names, connection URL,
+    subscription messages, heartbeat and frame decoding. Callbacks receive
+    (symbol, Candle) with the symbol as configured (not the exchange ticker).
     """
-    
-    BASE_URL = "wss://fstream.binance.com/stream"
-    MAX_STREAMS_PER_CONNECTION = 200  # Binance limit
-    PING_INTERVAL = 180  # 3 minutes (Binance disconnects after 5 min of silence)
-    
-    def __init__(self, symbols: List[str], timeframe: str = '15m'):
+
+    EXCHANGE = ''
+    MAX_STREAMS_PER_CONNECTION = 200  # Default shard size
+    SUBSCRIBE_BATCH = 100  # Streams per subscribe/unsubscribe request
+    SUBSCRIBE_PAUSE = 0.2  # Delay between subscription requests
+    HEARTBEAT_INTERVAL = 30  # Seconds between keepalives on a shard
+
+    def __init__(self, symbols: List[str], timeframe: Union[str, Sequence[str]] = '15m',
+                 streams_per_connection: int = None, queue_size: int = None,
+                 symbol_map: Dict[str, str] = None):
         """
         Initialize WebSocket manager.
-        
+
         Args:
             symbols: List of symbols to subscribe (e.g., ['BTCUSDT', 'ETHUSDT'])
-            timeframe: Kline interval (e.g., '1m', '5m', '15m', '1h')
+            timeframe: Kline interval(s) (e.g., '1m' or ['1m', '15m'])
+            streams_per_connection: Shard size (default from system_directive)
+            queue_size: Per-consumer queue bound (default from system_directive)
+            symbol_map: Optional {symbol: exchange ticker} where they differ
         """
-        self.logger = get_logger("BinanceWS")
-        self.symbols = [s.lower() for s in symbols]
-        self.timeframe = timeframe
-        self.ws = None
+        self.logger = get_logger(f"{self.EXCHANGE.title()}WS")
+        self.timeframes = [timeframe] if isinstance(timeframe, str) else list(timeframe)
+        self.timeframe = self.timeframes[0]
+        self.symbol_map = dict(symbol_map or {})
+
+        if streams_per_connection is None or queue_size is None:
+            try:
+                from system_directive import STREAM_WS_STREAMS_PER_CONNECTION, STREAM_WS_QUEUE_SIZE
+            except ImportError:
+                STREAM_WS_STREAMS_PER_CONNECTION, STREAM_WS_QUEUE_SIZE = self.MAX_STREAMS_PER_CONNECTION, 10000
+            streams_per_connection = streams_per_connection or STREAM_WS_STREAMS_PER_CONNECTION
+            queue_size = queue_size or STREAM_WS_QUEUE_SIZE
+        self.streams_per_connection = min(streams_per_connection, self.MAX_STREAMS_PER_CONNECTION)
+        self.queue_size = queue_size
+
         self.running = False
         self.callbacks: List[Callable] = []
         self.last_update: Dict[str, datetime] = {}
-        self._reconnect_attempts = 0
-        self._max_reconnect_attempts = 25  # Increased for stability
-        self._ping_task = None
-        
+        self._max_reconnect_attempts = 25  # Per shard
+
+        self._consumers: List[_Consumer] = []
+        self._closed_only = False  # True when no consumer wants in-progress ticks
+        self._reconnect_callbacks: List[Callable] = []
+        self._disconnect_callbacks: List[Callable] = []
+        self._shards: List[_Shard] = []
+        self._shard_of: Dict[str, _Shard] = {}  # stream name -> shard
+        self._stream_symbol: Dict[str, str] = {}  # stream name -> symbol
+        self._symbol_of: Dict[str, str] = {}  # exchange ticker -> symbol
+        self._sub_lock = asyncio.Lock()
+        self._closed = asyncio.Event()
+
+        self.symbols: List[str] = []
+        self._partition(self._streams_for(symbols))
+
         # Proxy support
         import os
         self.proxy = os.getenv('PROXY_URL') or os.getenv('HTTPS_PROXY') or os.getenv('HTTP_PROXY')
-        
-    def add_callback(self, callback: Callable):
+
+    def add_callback(self, callback: Callable, closed_only: bool = False):
         """
         Register a callback for kline updates.
-        Callback signature: async def callback(symbol: str, candle: dict)
+        Callback signature: async def callback(symbol: str, candle: Candle)
+        With closed_only, in-progress ticks are never queued for it.
         """
         self.callbacks.append(callback)
-        
-    def build_stream_url(self) -> str:
-        """Build combined stream URL for all symbols."""
-        streams = [f"{s}@kline_{self.timeframe}" for s in self.symbols]
-        
-        # Split into chunks if too many symbols
-        if len(streams) > self.MAX_STREAMS_PER_CONNECTION:
-            streams = streams[:self.MAX_STREAMS_PER_CONNECTION]
-            self.logger.warning(f"Truncated to {self.MAX_STREAMS_PER_CONNECTION} streams")
-            
-        return f"{self.BASE_URL}?streams={'/'.join(streams)}"
-    
-    async def connect(self) -> bool:
-        """Establish WebSocket connection with proxy support."""
+        consumer = _Consumer(callback, self.queue_size, closed_only)
+        self._consumers.append(consumer)
+        self._closed_only = all(c.closed_only for c in self._consumers)
+        if self.running:
+            consumer.task = asyncio.create_task(self._deliver(consumer))
+
+    def add_reconnect_callback(self, callback: Callable):
+        """
+        Register a hook run after a shard reconnects (e.g. to backfill the gap).
+        Callback signature: async def callback(symbols: List[str], down_since: float)
+        """
+        self._reconnect_callbacks.append(callback)
+
+    def add_disconnect_callback(self, callback: Callable):
+        """
+        Register a hook run (synchronously) when a shard drops.
+        Callback signature: def callback(symbols: List[str])
+        """
+        self._disconnect_callbacks.append(callback)
+
+    # --- Exchange specifics (overridden by subclasses) ---
+
+    def _stream_name(self, ticker: str, timeframe: str) -> str:
+        raise NotImplementedError
+
+    def _url(self, shard: _Shard) -> str:
+        raise NotImplementedError
+
+    def _subscription(self, shard: _Shard, subscribe: bool, streams: List[str]) -> dict:
+        raise NotImplementedError
+
+    async def _on_open(self, shard: _Shard):
+        """Called after a shard connects (streams not carried by the URL are subscribed here)."""
+
+    async def _heartbeat(self, shard: _Shard):
+        await shard.ws.ping()
+
+    def _decode(self, raw_msg, closed_only: bool) -> List[Tuple[str, Candle]]:
+        raise NotImplementedError
+
+    # --- Stream partitioning ---
+
+    def _streams_for(self, symbols: List[str]) -> List[str]:
+        self.symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        streams = []
+        for symbol in self.symbols:
+            ticker = self.symbol_map.get(symbol, symbol)
+            self._symbol_of[ticker.upper()] = symbol
+            for tf in self.timeframes:
+                stream = self._stream_name(ticker, tf)
+                self._stream_symbol[stream] = symbol
+                streams.append(stream)
+        return streams
+
+    def _partition(self, streams: List[str]):
+        """Initial layout: fill shards up to streams_per_connection."""
+        for stream in streams:
+            self._place(stream)
+
+    def _place(self, stream: str) -> _Shard:
+        shard = next((s for s in self._shards if len(s.streams) < self.streams_per_connection), None)
+        if shard is None:
+            shard = _Shard(len(self._shards))
+            self._shards.append(shard)
+        shard.streams.append(stream)
+        self._shard_of[stream] = shard
+        return shard
+
+    # --- Connection ---
+
+    async def _open_socket(self, url: str):
+        import websockets
+
+        # Use Proxy if configured
+        # websockets library doesn't support HTTP proxies natively in 'connect'
+        # without additional wrappers, but removing the bypass allows
+        # system-level/environment-level routing to take over if supported by the OS.
+        connect_kwargs = {
+            'ping_interval': 20,
+            'ping_timeout': 10,
+            'close_timeout': 5
+        }
+        return await websockets.connect(url, **connect_kwargs)
+
+    async def _connect_shard(self, shard: _Shard) -> bool:
+        """Establish one shard's WebSocket connection."""
         try:
-            import websockets
-            import os
-            
-            url = self.build_stream_url()
-            self.logger.info(f"Connecting to {len(self.symbols)} streams...")
-            
-            # Use Proxy if configured
-            # websockets library doesn't support HTTP proxies natively in 'connect' 
-            # without additional wrappers, but removing the bypass allows 
-            # system-level/environment-level routing to take over if supported by the OS.
-            # For robust proxying, normally a socks wrapper or aiohttp is needed.
-            
-            connect_kwargs = {
-                'ping_interval': 20,
-                'ping_timeout': 10,
-                'close_timeout': 5
-            }
-            
-            # If a SOCKS proxy is detected, we could use it here if PySocks is available
-            # However, for now, we simply STOP the explicit bypass which was causing the issue.
-            
-            self.ws = await websockets.connect(url, **connect_kwargs)
-            
-            self.running = True
-            self._reconnect_attempts = 0
-            self.logger.info(f"Connected ({len(self.symbols)} kline streams @ {self.timeframe})")
-            
-            # Start ping task to keep connection alive
-            if self._ping_task:
-                self._ping_task.cancel()
-            self._ping_task = asyncio.create_task(self._ping_loop())
-            
+            shard.ws = await self._open_socket(self._url(shard))
+            shard.connected_at = shard.last_ping = time.time()
+            shard.reconnect_attempts = 0
+            await self._on_open(shard)
             return True
-            
+
         except ImportError:
             self.logger.error("'websockets' package not installed. Run: pip install websockets")
-            return False
+            raise
         except Exception as e:
-            self.logger.error(f"Connection failed - {e}")
+            shard.last_error = str(e)
+            self.logger.error(f"Shard {shard.index}: Connection failed - {e}")
             return False
-    
-    async def _ping_loop(self):
-        """Send periodic pings to keep connection alive."""
-        while self.running:
-            try:
-                await asyncio.sleep(self.PING_INTERVAL)
-                if self.ws and self._is_connected():
-                    await self.ws.ping()
-            except Exception:
-                pass  # Connection will be handled by listen loop
-    
-    def _is_connected(self) -> bool:
-        """Check if WebSocket is connected (compatible with websockets v15+)."""
-        if not self.ws:
+
+    async def connect(self) -> bool:
+        """Connect every shard concurrently. True if at least one shard is up."""
+        streams = sum(len(s.streams) for s in self._shards)
+        self.logger.info(f"Connecting to {streams} streams over {len(self._shards)} connections...")
+        try:
+            results = await asyncio.gather(*(self._connect_shard(s) for s in self._shards))
+        except ImportError:
             return False
-        # websockets v15+ uses state property (1 = OPEN)
-        if hasattr(self.ws, 'state'):
-            return self.ws.state == WS_STATE_OPEN
-        # Fallback for older versions
-        return getattr(self.ws, 'open', False)
-    
+
+        if not any(results):
+            return False
+        self.running = True
+        self._closed.clear()
+        self.logger.info(
+            f"Connected ({streams} kline streams @ {','.join(self.timeframes)}, "
+            f"{sum(results)}/{len(self._shards)} shards)"
+        )
+        return True
+
     async def listen(self):
-        """Main listening loop with automatic reconnection."""
-        while self.running:
+        """Run every shard's receive loop and every consumer until closed."""
+        for consumer in self._consumers:
+            if consumer.task is None or consumer.task.done():
+                consumer.task = asyncio.create_task(self._deliver(consumer))
+        for shard in self._shards:
+            self._start_shard(shard)
+        await self._closed.wait()
+
+    def _start_shard(self, shard: _Shard):
+        if self.running and (shard.task is None or shard.task.done()):
+            shard.task = asyncio.create_task(self._run_shard(shard))
+
+    async def _run_shard(self, shard: _Shard):
+        """Receive loop for one shard with automatic reconnection."""
+        while self.running and shard.streams:
             try:
-                if not self._is_connected():
-                    if not await self._reconnect():
-                        self.logger.error("Max reconnection attempts reached")
+                if not shard.is_connected():
+                    if not await self._reconnect(shard):
+                        self.logger.error(f"Shard {shard.index}: Max reconnection attempts reached")
                         break
                     continue
-                
-                msg = await asyncio.wait_for(self.ws.recv(), timeout=30)
-                await self._process_message(msg)
-                
+
+                msg = await asyncio.wait_for(shard.ws.recv(), timeout=self.HEARTBEAT_INTERVAL)
+                self._process_message(msg, shard)
+                if shard.last_message - shard.last_ping >= self.HEARTBEAT_INTERVAL:
+                    shard.last_ping = shard.last_message
+                    await self._heartbeat(shard)
+
             except asyncio.TimeoutError:
-                # No message in 30s, send ping
+                # No message for a heartbeat interval, send keepalive
                 try:
-                    if self._is_connected():
-                        await self.ws.ping()
+                    if shard.is_connected():
+                        shard.last_ping = time.time()
+                        await self._heartbeat(shard)
                 except Exception:
                     pass
-                    
+
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
+                shard.last_error = str(e)
                 error_str = str(e).lower()
                 if "closed" in error_str or "connection" in error_str:
-                    self.logger.warning(f"Disconnected - {e}")
-                    await self._reconnect()
+                    self.logger.warning(f"Shard {shard.index}: Disconnected - {e}")
+                    await self._reconnect(shard)
                 else:
-                    self.logger.warning_debounced(f"Error - {e}", interval=60)
+                    self.logger.warning_debounced(f"Shard {shard.index}: Error - {e}", interval=60)
                     await asyncio.sleep(1)
-    
-    async def _reconnect(self) -> bool:
-        """Attempt to reconnect with exponential backoff."""
-        self._reconnect_attempts += 1
-        
-        if self._reconnect_attempts > self._max_reconnect_attempts:
+
+        if self.running and not any(s.task and not s.task.done() for s in self._shards if s is not shard):
+            self._closed.set()  # Last shard gave up
+
+    async def _reconnect(self, shard: _Shard) -> bool:
+        """Attempt to reconnect one shard with exponential backoff."""
+        if shard.down_since is None:
+            shard.down_since = shard.last_message or shard.connected_at or time.time()
+            for callback in self._disconnect_callbacks:
+                try:
+                    callback(self._shard_symbols(shard))
+                except Exception as e:
+                    self.logger.warning(f"Disconnect hook failed - {e}")
+        shard.reconnect_attempts += 1
+
+        if shard.reconnect_attempts > self._max_reconnect_attempts:
             return False
-            
-        wait_time = min(2 ** self._reconnect_attempts, 60)
-        self.logger.warning(f"Reconnecting in {wait_time}s (attempt {self._reconnect_attempts})")
+
+        wait_time = min(2 ** shard.reconnect_attempts, 60)
+        self.logger.warning(f"Shard {shard.index}: Reconnecting in {wait_time}s (attempt {shard.reconnect_attempts})")
         await asyncio.sleep(wait_time)
-        
-        return await self.connect()
-    
-    async def _process_message(self, raw_msg: str):
-        """Parse and emit kline updates."""
+
+        # Reconnects use the shard's current stream list, so (un)subscriptions survive
+        if await self._connect_shard(shard):
+            shard.reconnects += 1
+            down_since, shard.down_since = shard.down_since, None
+            self._notify_reconnect(shard, down_since)
+        return True  # Keep trying until attempts run out
+
+    def _shard_symbols(self, shard: _Shard) -> List[str]:
+        return list(dict.fromkeys(self._stream_symbol[s] for s in shard.streams if s in self._stream_symbol))
+
+    def _notify_reconnect(self, shard: _Shard, down_since: float):
+        symbols = self._shard_symbols(shard)
+        for callback in self._reconnect_callbacks:
+            # Runs beside the receive loop: live candles keep flowing while the gap is filled
+            asyncio.create_task(self._run_reconnect_callback(callback, symbols, down_since))
+
+    async def _run_reconnect_callback(self, callback: Callable, symbols: List[str], down_since: float):
         try:
-            data = json.loads(raw_msg)
-            
-            # Combined stream format: {"stream": "btcusdt@kline_15m", "data": {...}}
-            stream = data.get('stream', '')
-            kline_data = data.get('data', {}).get('k', {})
-            
-            if not kline_data:
+            await callback(symbols, down_since)
+        except Exception as e:
+            self.logger.warning(f"Reconnect hook failed - {e}")
+
+    # --- Live subscriptions ---
+
+    async def _send(self, shard: _Shard, subscribe: bool, streams: List[str]):
+        """Subscribe / unsubscribe on a live shard (no-op if it is down: reconnect uses its stream list)."""
+        if not shard.is_connected():
+            return
+        for i in range(0, len(streams), self.SUBSCRIBE_BATCH):
+            message = self._subscription(shard, subscribe, streams[i:i + self.SUBSCRIBE_BATCH])
+            try:
+                await shard.ws.send(dumps(message))
+            except Exception as e:
+                shard.last_error = str(e)
+                self.logger.warning(f"Shard {shard.index}: {'Subscribe' if subscribe else 'Unsubscribe'} failed - {e}")
                 return
-                
-            symbol = kline_data.get('s', '').upper()  # e.g., "BTCUSDT"
-            
-            candle = {
-                'timestamp': kline_data.get('t'),  # Kline start time (ms)
-                'open': float(kline_data.get('o', 0)),
-                'high': float(kline_data.get('h', 0)),
-                'low': float(kline_data.get('l', 0)),
-                'close': float(kline_data.get('c', 0)),
-                'volume': float(kline_data.get('v', 0)),
-                'close_time': kline_data.get('T'),  # Kline close time (ms)
-                'is_closed': kline_data.get('x', False),  # True when candle finalized
-                'trades': kline_data.get('n', 0)  # Number of trades
-            }
-            
-            self.last_update[symbol] = datetime.now()
-            
-            # Emit to all callbacks
-            for callback in self.callbacks:
-                try:
-                    await callback(symbol, candle)
-                except Exception as e:
-                    self.logger.error_debounced(f"Callback error for {symbol} - {e}", interval=300)
-                    
-        except json.JSONDecodeError:
-            pass
+            await asyncio.sleep(self.SUBSCRIBE_PAUSE)
+
+    async def set_symbols(self, symbols: List[str]) -> Dict[str, int]:
+        """
+        Change the streamed symbols at runtime.
+
+        Removed streams are unsubscribed on their shard; new streams fill
+        shards with free capacity (or open new shards) and are subscribed.
+
+        Returns:
+            {'added': n, 'removed': n} stream counts
+        """
+        async with self._sub_lock:
+            wanted = self._streams_for(symbols)
+            wanted_set = set(wanted)
+            removed = [s for s in self._shard_of if s not in wanted_set]
+            added = [s for s in wanted if s not in self._shard_of]
+
+            by_shard: Dict[_Shard, List[str]] = {}
+            for stream in removed:
+                shard = self._shard_of.pop(stream)
+                shard.streams.remove(stream)
+                self._stream_symbol.pop(stream, None)
+                by_shard.setdefault(shard, []).append(stream)
+            for shard, streams in by_shard.items():
+                if shard.streams:
+                    await self._send(shard, False, streams)
+                else:
+                    await self._stop_shard(shard)
+
+            existing = {s.index for s in self._shards if s.is_connected()}
+            by_shard = {}
+            for stream in added:
+                shard = self._place(stream)
+                by_shard.setdefault(shard, []).append(stream)
+            for shard, streams in by_shard.items():
+                if shard.index in existing:
+                    await self._send(shard, True, streams)
+                elif self.running and not shard.is_connected():
+                    # New (or dead) shard: connecting subscribes its whole stream list
+                    await self._connect_shard(shard)
+                    self._start_shard(shard)
+
+            if added or removed:
+                self.logger.info(f"Streams updated: +{len(added)} / -{len(removed)} ({len(self._shard_of)} total)")
+            return {'added': len(added), 'removed': len(removed)}
+
+    async def _stop_shard(self, shard: _Shard):
+        """Stop an emptied shard: its receive loop would otherwise reconnect with no streams."""
+        task, shard.task = shard.task, None
+        if task and task is not asyncio.current_task():
+            task.cancel()
+            await asyncio.wait([task])
+        ws, shard.ws = shard.ws, None
+        shard.down_since = None
+        if ws:
+            try:
+                await ws.close()
+            except Exception:
+                pass
+
+    # --- Parsing / fan-out ---
+
+    def _process_message(self, raw_msg, shard: _Shard = None):
+        """Decode a kline frame and queue it for every interested consumer (never awaits)."""
+        if shard is not None:
+            shard.messages += 1
+            shard.last_message = time.time()
+        try:
+            decoded = self._decode(raw_msg, self._closed_only)
+        except ValueError:
+            return  # Malformed JSON
         except Exception as e:
             self.logger.warning_debounced(f"Parse error - {e}", interval=300)
-    
+            return
+
+        for ticker, candle in decoded:
+            symbol = self._symbol_of.get(ticker, ticker)
+            self.last_update[symbol] = datetime.now()
+            item = (symbol, candle)
+            for consumer in self._consumers:
+                if consumer.closed_only and not candle.is_closed:
+                    continue
+                consumer.offer(item)
+
+    async def _deliver(self, consumer: _Consumer):
+        """Drain one consumer's queue in order."""
+        while True:
+            symbol, candle = await consumer.queue.get()
+            try:
+                await consumer.callback(symbol, candle)
+            except Exception as e:
+                self.logger.error_debounced(f"Callback error for {symbol} - {e}", interval=300)
+
     async def close(self):
-        """Close WebSocket connection."""
+        """Close every shard and consumer task."""
         self.running = False
-        
-        if self._ping_task:
-            self._ping_task.cancel()
-            
-        if self.ws:
-            try:
-                await self.ws.close()
-            except Exception:
-                pass
-                
+        self._closed.set()
+
+        for shard in self._shards:
+            if shard.task:
+                shard.task.cancel()
+            if shard.ws:
+                try:
+                    await shard.ws.close()
+                except Exception:
+                    pass
+        for consumer in self._consumers:
+            if consumer.task:
+                consumer.task.cancel()
+
         self.logger.info("Disconnected")
-    
+
     def get_status(self) -> Dict[str, Any]:
-        """Get current connection status."""
+        """Get current connection status (overall and per shard)."""
+        shards = [s.health() for s in self._shards]
         return {
-            'connected': self._is_connected(),
+            'exchange': self.EXCHANGE,
+            'connected': any(s['connected'] for s in shards),
             'symbols': len(self.symbols),
             'timeframe': self.timeframe,
             'last_updates': {k: v.isoformat() for k, v in self.last_update.items()},
-            'reconnect_attempts': self._reconnect_attempts
+            'reconnect_attempts': max((s['reconnect_attempts'] for s in shards), default=0),
+            'shards': shards,
+            'queued': sum(c.queue.qsize() for c in self._consumers),
+            'dropped': sum(c.dropped for c in self._consumers),
         }
 
 
+class BinanceWSManager(KlineWSManager):
+    """
+    Manages WebSocket connections to Binance Futures for real-time kline updates.
+    Streams are carried in each shard's combined-stream URL; runtime changes
+    use SUBSCRIBE / UNSUBSCRIBE.
+    """
+
+    EXCHANGE = 'BINANCE'
+    BASE_URL = "wss://fstream.binance.com/stream"
+    MAX_STREAMS_PER_CONNECTION = 1024  # Binance limit per connection
+    SUBSCRIBE_BATCH = 100
+    SUBSCRIBE_PAUSE = 0.2  # Binance accepts 10 incoming messages/s per connection
+    HEARTBEAT_INTERVAL = 30
+
+    def _stream_name(self, ticker: str, timeframe: str) -> str:
+        return f"{ticker.lower()}@kline_{timeframe}"
+
+    def _url(self, shard: _Shard) -> str:
+        return f"{self.BASE_URL}?streams={'/'.join(shard.streams)}"
+
+    def build_stream_url(self, shard: _Shard = None) -> str:
+        """Combined stream URL for one shard (the first shard by default)."""
+        return self._url(shard or (self._shards[0] if self._shards else _Shard(0)))
+
+    def _subscription(self, shard: _Shard, subscribe: bool, streams: List[str]) -> dict:
+        return {'method': 'SUBSCRIBE' if subscribe else 'UNSUBSCRIBE', 'params': streams, 'id': shard.next_id()}
+
+    def _decode(self, raw_msg, closed_only: bool) -> List[Tuple[str, Candle]]:
+        decoded = decode_binance_kline(raw_msg, closed_only=closed_only)
+        return [decoded] if decoded else []
+
+
 async def test_ws():
     """Quick test of WebSocket connection."""
     manager = BinanceWSManager(['BTCUSDT', 'ETHUSDT'], '1m')
-    
+
     received = []
-    
+
     async def on_candle(symbol, candle):
         received.append((symbol, candle['close']))
         print(f"📊 {symbol}: ${candle['close']:,.2f} (closed={candle['is_closed']})")
         if len(received) >= 5:
-            manager.running = False
-    
+            await manager.close()
+
     manager.add_callback(on_candle)
-    
+
     if await manager.connect():
         await manager.listen()
-        
+
     await manager.close()
     print(f"\n✅ Received {len(received)} updates")
 
@@ -0,0 +1,445 @@
+"""
+Nexus System - Incremental Indicator Engine
+Stateful per-(symbol, timeframe) version of TechnicalIndicators.add_all_indicators.
+
+Each closed candle updates every indicator in O(1) using the same recurrences
+pandas-ta uses (SMA-seeded EMA, RMA/Wilder smoothing, running-sum windows),
+so the values match a full add_all_indicators pass over the same history.
+Unlike the full pass over a sliding 250-candle window, recursive indicators
+(EMA200, RSI, ATR, ADX, MACD) keep their history instead of restarting at the
+window start on every call.
+"""
+
+import math
+import sys
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+NAN = float('nan')
+_EPS = sys.float_info.epsilon
+_DAY_MS = 86_400_000
+
+# Same column names (and order) as TechnicalIndicators.add_all_indicators
+INDICATOR_COLUMNS = [
+    'ema_20', 'ema_50', 'ema_200', 'rsi',
+    'upper_bb', 'lower_bb', 'bb_width', 'bb_pct',
+    'atr', 'adx', 'vol_sma', 'obv_change', 'macd_hist',
+    'stoch_k', 'stoch_d', 'vwap', 'supertrend', 'supertrend_dir',
+]
+
+
+class _Ewm:
+    """pandas ewm(alpha, adjust=False).mean() as a recurrence (NaN gaps handled like pandas)."""
+
+    __slots__ = ('alpha', 'value', 'gap')
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.value = NAN
+        self.gap = 0
+
+    def update(self, x: float) -> float:
+        if x != x:  # NaN input: carry last value, widen the gap
+            if self.value == self.value:
+                self.gap += 1
+            return self.value
+        if self.value != self.value:
+            self.value = x
+        else:
+            decay = (1.0 - self.alpha) ** (self.gap + 1)
+            self.value = (decay * self.value + self.alpha * x) / (decay + self.alpha)
+        self.gap = 0
+        return self.value
+
+
+class _PresmaEma:
+    """pandas-ta EMA/ATR seeding: SMA of the first `length` valid values, then ewm."""
+
+    __slots__ = ('length', 'seen', 'total', 'ewm')
+
+    def __init__(self, length: int, alpha: float):
+        self.length = length
+        self.seen = 0
+        self.total = 0.0
+        self.ewm = _Ewm(alpha)
+
+    def update(self, x: float) -> float:
+        if x != x:
+            return NAN if self.seen < self.length else self.ewm.update(x)
+        if self.seen < self.length:
+            self.seen += 1
+            self.total += x
+            if self.seen < self.length:
+                return NAN
+            return self.ewm.update(self.total / self.length)
+        return self.ewm.update(x)
+
+
+class _RollingMean:
+    """Rolling mean/std over a fixed window using running sums (values shifted by a reference)."""
+
+    __slots__ = ('window', 'values', 'ref', 'total', 'total_sq')
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.ref = None
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def update(self, x: float):
+        if self.ref is None:
+            self.ref = x
+        if len(self.values) == self.window:
+            old = self.values[0] - self.ref
+            self.total -= old
+            self.total_sq -= old * old
+        self.values.append(x)
+        shifted = x - self.ref
+        self.total += shifted
+        self.total_sq += shifted * shifted
+
+    def ready(self) -> bool:
+        return len(self.values) == self.window
+
+    def mean(self) -> float:
+        return self.ref + self.total / self.window if self.ready() else NAN
+
+    def std(self) -> float:
+        if not self.ready():
+            return NAN
+        mean = self.total / self.window
+        return math.sqrt(max(self.total_sq / self.window - mean * mean, 0.0))
+
+
+class IncrementalIndicators:
+    """
+    Indicator state for one (symbol, timeframe) series.
+
+    update() consumes one candle and returns the indicator row for it.
+    clone() is cheap (bounded windows only), which lets callers evaluate the
+    still-open candle without committing it.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.prev_close = NAN
+        self.prev_high = NAN
+        self.prev_low = NAN
+
+        self.ema_20 = _PresmaEma(20, 2.0 / 21)
+        self.ema_50 = _PresmaEma(50, 2.0 / 51)
+        self.ema_200 = _PresmaEma(200, 2.0 / 201)
+
+        self.rsi_pos = _Ewm(1.0 / 14)
+        self.rsi_neg = _Ewm(1.0 / 14)
+
+        self.bb = _RollingMean(20)
+        self.atr = _PresmaEma(14, 1.0 / 14)
+
+        self.dm_pos = _Ewm(1.0 / 14)
+        self.dm_neg = _Ewm(1.0 / 14)
+        self.adx = _Ewm(1.0 / 14)
+
+        self.vol = _RollingMean(20)
+
+        self.macd_fast = _PresmaEma(12, 2.0 / 13)
+        self.macd_slow = _PresmaEma(26, 2.0 / 27)
+        self.macd_signal = _PresmaEma(9, 2.0 / 10)
+
+        self.stoch_highs = deque(maxlen=14)
+        self.stoch_lows = deque(maxlen=14)
+        self.stoch_raw = deque(maxlen=3)
+        self.stoch_k = deque(maxlen=3)
+
+        self.vwap_day = None
+        self.vwap_pv = 0.0
+        self.vwap_vol = 0.0
+
+        self.st_atr = _PresmaEma(10, 1.0 / 10)
+        self.st_lb = NAN
+        self.st_ub = NAN
+        self.st_dir = 1
+
+    def clone(self) -> 'IncrementalIndicators':
+        """Copy the state (windows are bounded, so this is O(1))."""
+        twin = IncrementalIndicators.__new__(IncrementalIndicators)
+        for name, value in self.__dict__.items():
+            if isinstance(value, deque):
+                value = deque(value, maxlen=value.maxlen)
+            elif isinstance(value, (_Ewm, _PresmaEma, _RollingMean)):
+                value = _copy_slots(value)
+            twin.__dict__[name] = value
+        return twin
+
+    def update(self, timestamp_ms: int, open_: float, high: float, low: float,
+               close: float, volume: float) -> Tuple[float, ...]:
+        """Consume one candle and return its indicator values (INDICATOR_COLUMNS order)."""
+        first = self.count == 0
+        prev_close = self.prev_close
+
+        # Trend
+        ema_20 = self.ema_20.update(close)
+        ema_50 = self.ema_50.update(close)
+        ema_200 = self.ema_200.update(close)
+
+        # Momentum (RSI, RMA of gains/losses)
+        if first:
+            rsi = 50.0
+        else:
+            diff = close - prev_close
+            pos_avg = self.rsi_pos.update(diff if diff > 0 else 0.0)
+            neg_avg = self.rsi_neg.update(diff if diff < 0 else 0.0)
+            denom = pos_avg + abs(neg_avg)
+            rsi = 100.0 * pos_avg / denom if denom else 50.0
+
+        # Volatility: Bollinger (20, 2, ddof=0)
+        self.bb.update(close)
+        mid = self.bb.mean()
+        dev = 2.0 * self.bb.std()
+        upper_bb, lower_bb = mid + dev, mid - dev
+        bb_width = (upper_bb - lower_bb) / (mid + 1e-10) * 100
+        bb_pct = (close - lower_bb) / (upper_bb - lower_bb + 1e-10)
+
+        # True range (first candle has no previous close)
+        if first:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - prev_close), abs(prev_close - low))
+        atr = self.atr.update(tr)
+
+        # Strength: ADX (DX is independent of the ATR scale, valid once ATR is)
+        adx = NAN
+        if not first:
+            up = high - self.prev_high
+            dn = self.prev_low - low
+            p_avg = self.dm_pos.update(up if (up > dn and up > 0) else 0.0)
+            n_avg = self.dm_neg.update(dn if (dn > up and dn > 0) else 0.0)
+            if self.count >= 13:
+                total = p_avg + n_avg
+                dx = 100.0 * abs(p_avg - n_avg) / total if total else NAN
+                adx = self.adx.update(dx)
+
+        # Volume
+        self.vol.update(volume)
+        vol_sma = self.vol.mean()
+        if self.count < 2:
+            obv_change = NAN  # pandas-ta OBV has no diff until the third candle
+        else:
+            obv_change = volume if close > prev_close else (-volume if close < prev_close else 0.0)
+
+        # MACD (12, 26, 9)
+        fast = self.macd_fast.update(close)
+        slow = self.macd_slow.update(close)
+        macd = fast - slow
+        signal = self.macd_signal.update(macd)
+        macd_hist = macd - signal
+
+        # Stochastic (14, 3, 3)
+        self.stoch_highs.append(high)
+        self.stoch_lows.append(low)
+        stoch_k = stoch_d = NAN
+        if len(self.stoch_highs) == 14:
+            hh, ll = max(self.stoch_highs), min(self.stoch_lows)
+            self.stoch_raw.append(100.0 * (close - ll) / ((hh - ll) or _EPS))
+            if len(self.stoch_raw) == 3:
+                stoch_k = sum(self.stoch_raw) / 3
+                self.stoch_k.append(stoch_k)
+                if len(self.stoch_k) == 3:
+                    stoch_d = sum(self.stoch_k) / 3
+
+        # VWAP (daily anchor, like pandas-ta)
+        day = timestamp_ms // _DAY_MS
+        if day != self.vwap_day:
+            self.vwap_day = day
+            self.vwap_pv = self.vwap_vol = 0.0
+        self.vwap_pv += (high + low + close) / 3.0 * volume
+        self.vwap_vol += volume
+        vwap = self.vwap_pv / self.vwap_vol if self.vwap_vol else NAN
+
+        # Supertrend (10, 3)
+        st_atr = self.st_atr.update(tr)
+        hl2 = (high + low) / 2.0
+        lb, ub = hl2 - 3.0 * st_atr, hl2 + 3.0 * st_atr
+        if first:
+            direction = 1
+        else:
+            if close > self.st_ub:
+                direction = 1
+            elif close < self.st_lb:
+                direction = -1
+            else:
+                direction = self.st_dir
+                if direction > 0 and lb < self.st_lb:
+                    lb = self.st_lb
+                if direction < 0 and ub > self.st_ub:
+                    ub = self.st_ub
+        supertrend = NAN if first else (lb if direction > 0 else ub)
+        supertrend_dir = float(direction) if self.count >= 10 else NAN
+        self.st_lb, self.st_ub, self.st_dir = lb, ub, direction
+
+        self.prev_close, self.prev_high, self.prev_low = close, high, low
+        self.count += 1
+
+        return (ema_20, ema_50, ema_200, rsi, upper_bb, lower_bb, bb_width, bb_pct,
+                atr, adx, vol_sma, obv_change, macd_hist, stoch_k, stoch_d, vwap,
+                supertrend, supertrend_dir)
+
+
+def _copy_slots(obj):
+    twin = obj.__class__.__new__(obj.__class__)
+    for slot in obj.__slots__:
+        value = getattr(obj, slot)
+        if isinstance(value, deque):
+            value = deque(value, maxlen=value.maxlen)
+        elif isinstance(value, _Ewm):
+            value = _copy_slots(value)
+        setattr(twin, slot, value)
+    return twin
+
+
+class _IndicatorSeries:
+    """Committed indicator state plus a ring of the recent indicator rows."""
+
+    __slots__ = ('state', 'capacity', 'ts', 'rows', 'count', 'nxt')
+
+    def __init__(self, capacity: int):
+        self.state = IncrementalIndicators()
+        self.capacity = capacity
+        self.ts = np.zeros(2 * capacity, dtype=np.int64)
+        self.rows = np.full((2 * capacity, len(INDICATOR_COLUMNS)), np.nan)
+        self.count = 0
+        self.nxt = 0
+
+    def commit(self, ts: int, candle: tuple):
+        row = self.state.update(ts, *candle)
+        mirror = self.nxt + self.capacity
+        self.ts[self.nxt] = self.ts[mirror] = ts
+        self.rows[self.nxt] = self.rows[mirror] = row
+        self.nxt = (self.nxt + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def peek(self, ts: int, candle: tuple) -> tuple:
+        return self.state.clone().update(ts, *candle)
+
+    def last_ts(self) -> Optional[int]:
+        return int(self.ts[self.nxt - 1 + self.capacity]) if self.count else None
+
+    def tail(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        end = self.nxt + self.capacity
+        return self.ts[end - n:end], self.rows[end - n:end]
+
+
+class IndicatorEngine:
+    """
+    Registry of incremental indicator series keyed by (symbol, timeframe).
+
+    get_frame() takes the candle frame served by the price cache and returns
+    it with the add_all_indicators columns attached. Only candles the engine
+    has not seen yet are processed (normally one commit and one open-candle
+    evaluation per call); the series is rebuilt from the frame if its history
+    no longer lines up (cache cleared, gap backfilled, etc.).
+    """
+
+    def __init__(self, capacity: int = 250):
+        self.capacity = capacity
+        self._series: Dict[Tuple[str, str], _IndicatorSeries] = {}
+        self._lock = threading.Lock()
+
+    def get_frame(self, symbol: str, timeframe: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Attach indicator columns to a candle frame (oldest first).
+
+        The last row is treated as possibly still open: it is evaluated on a
+        copy of the state and only committed once a newer candle exists.
+        """
+        if df.empty:
+            return df
+
+        ts = _timestamps_ms(df['timestamp'])
+        candles = np.column_stack([df[c].to_numpy(dtype=np.float64)
+                                   for c in ('open', 'high', 'low', 'close', 'volume')])
+        n = len(ts)
+        key = (symbol, timeframe)
+
+        with self._lock:
+            series = self._series.get(key)
+            start = self._resume_index(series, ts)
+            if start is None:
+                series = self._series[key] = _IndicatorSeries(max(self.capacity, n))
+                start = 0
+
+            for i in range(start, n - 1):
+                series.commit(int(ts[i]), tuple(candles[i]))
+
+            if series.last_ts() == int(ts[-1]):
+                _, block = series.tail(n)
+                block = block.copy()
+            else:
+                _, block = series.tail(n - 1)
+                last = series.peek(int(ts[-1]), tuple(candles[-1]))
+                block = np.vstack((block, np.asarray(last, dtype=np.float64)))
+
+        indicators = pd.DataFrame(block, columns=INDICATOR_COLUMNS, index=df.index)
+        if np.isnan(block).any():
+            # Same warmup handling as add_all_indicators
+            indicators = indicators.bfill().fillna(0)
+        return pd.concat([df, indicators], axis=1)
+
+    def _resume_index(self, series: Optional[_IndicatorSeries], ts: np.ndarray) -> Optional[int]:
+        """Index of the first row the series has not committed, or None to rebuild."""
+        if series is None or not series.count:
+            return None
+        last = series.last_ts()
+        pos = int(np.searchsorted(ts, last))
+        if pos >= len(ts) or ts[pos] != last:
+            return None
+        covered = pos + 1
+        if covered > series.count or len(ts) > series.capacity:
+            return None
+        committed_ts, _ = series.tail(covered)
+        if not np.array_equal(committed_ts, ts[:covered]):
+            return None
+        return covered
+
+    def clear(self, symbol: str = None):
+        """Drop indicator state for a symbol (all timeframes) or everything."""
+        with self._lock:
+            if symbol:
+                for key in [k for k in self._series if k[0] == symbol]:
+                    self._series.pop(key, None)
+            else:
+                self._series.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Number of warm (symbol, timeframe) series."""
+        with self._lock:
+            return {'series': len(self._series)}
+
+
+def _timestamps_ms(values: pd.Series) -> np.ndarray:
+    """Convert a timestamp column (datetime64 of any unit, or int ms) to int64 ms."""
+    arr = values.to_numpy()
+    if np.issubdtype(arr.dtype, np.datetime64):
+        return arr.astype('datetime64[ms]').astype(np.int64)
+    return arr.astype(np.int64)
+
+
+# Global singleton for shared access
+_indicator_engine: Optional[IndicatorEngine] = None
+
+
+def get_indicator_engine() -> IndicatorEngine:
+    """Get global incremental indicator engine."""
+    global _indicator_engine
+    if _indicator_engine is None:
+        try:
+            from system_directive import PRICE_CACHE_MAX_CANDLES
+        except ImportError:
+            PRICE_CACHE_MAX_CANDLES = 250
+        _indicator_engine = IndicatorEngine(capacity=PRICE_CACHE_MAX_CANDLES)
+    return _indicator_engine
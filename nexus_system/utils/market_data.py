@@ -14,7 +14,7 @@ obtener datos de mercado de forma eficiente.
 """
 import pandas as pd
 from typing import Optional
-from ..uplink.stream import MarketStream
+from ..uplink.stream import MarketStream, get_market_stream
 
 
 async def get_market_data_async(
@@ -31,22 +31,16 @@ async def get_market_data_async(
         symbol: Par de trading (ej: 'BTCUSDT', 'TSLA')
         timeframe: Intervalo de velas ('1m', '5m', '15m', '1h', '4h', '1d')
         limit: Número de velas a obtener
-        market_stream: Instancia opcional de MarketStream (crea una nueva si no se proporciona)
+        market_stream: Instancia opcional de MarketStream (por defecto, la compartida del proceso)
     
     Returns:
         DataFrame con columnas: timestamp, open, high, low, close, volume
     """
-    # Usar instancia proporcionada o crear una temporal
+    # Usar instancia proporcionada o el stream compartido del proceso (caliente si el engine corre)
     stream = market_stream
-    should_close = False
-    
     if stream is None:
-        # Crear instancia temporal si no se proporciona
-        # Sin WebSocket para requests únicos (más eficiente para llamadas puntuales)
-        stream = MarketStream(use_websocket=False)
-        should_close = True
         try:
-            await stream.initialize()
+            stream = await get_market_stream()
         except Exception as e:
             print(f"[market_data] Error inicializando MarketStream: {e}")
             return pd.DataFrame()
@@ -75,13 +69,6 @@ async def get_market_data_async(
     except Exception as e:
         print(f"[market_data] Error obteniendo datos para {symbol}: {e}")
         return pd.DataFrame()
-    finally:
-        # Cerrar instancia temporal si la creamos
-        if should_close and stream:
-            try:
-                await stream.close()
-            except:
-                pass
 
 
 async def calculate_atr_async(df: pd.DataFrame, period: int = 14) -> float:
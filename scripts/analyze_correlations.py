@@ -9,6 +9,8 @@ This script analyzes correlations between crypto assets to identify:
 Uses yfinance for historical data (6 months) to calculate correlation matrix.
 """
 
+import os
+import sys
 import pandas as pd
 import numpy as np
 import yfinance as yf
@@ -16,6 +18,12 @@ from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from nexus_system.uplink.ohlcv_store import get_ohlcv_store
+except ImportError:
+    get_ohlcv_store = None
+
 # Current CRYPTO_SUBGROUPS from system_directive.py
 CRYPTO_SUBGROUPS = {
     'MAJOR_CAPS': [
@@ -94,12 +102,38 @@ YF_MAPPING = {
 }
 
 
+PERIOD_DAYS = {'1mo': 30, '3mo': 90, '6mo': 182, '1y': 365, '2y': 730}
+
+
+def load_store_closes(symbol: str, period: str = "6mo") -> pd.Series:
+    """Daily closes from the local OHLCV store (backtest/training history), if it covers the period."""
+    store = get_ohlcv_store() if get_ohlcv_store else None
+    if store is None:
+        return None
+
+    start = pd.Timestamp.utcnow().tz_localize(None) - pd.Timedelta(days=PERIOD_DAYS.get(period, 182))
+    for exchange in ('binanceusdm', 'binance'):
+        for timeframe in ('1d', '4h', '1h', '15m'):
+            first = store.first_timestamp(exchange, symbol, timeframe)
+            if first is None or pd.Timestamp(first, unit='ms') > start:
+                continue
+            df = store.read(exchange, symbol, timeframe, start=start)
+            return df.set_index('timestamp')['close'].resample('1D').last().dropna()
+    return None
+
+
 def fetch_historical_data(symbols: list, period: str = "6mo") -> pd.DataFrame:
-    """Fetch historical closing prices for all symbols."""
+    """Fetch historical closing prices for all symbols (local store first, then yfinance)."""
     print(f"📥 Downloading historical data for {len(symbols)} assets...")
     
     all_data = {}
     for symbol in symbols:
+        closes = load_store_closes(symbol, period)
+        if closes is not None and len(closes) > 30:
+            all_data[symbol] = closes
+            print(f"   ✓ {symbol}: {len(closes)} days (local store)")
+            continue
+
         yf_symbol = YF_MAPPING.get(symbol)
         if not yf_symbol:
             continue
@@ -118,6 +152,13 @@ def fetch_historical_data(symbols: list, period: str = "6mo") -> pd.DataFrame:
     if not all_data:
         return pd.DataFrame()
     
+    # Align store (naive UTC) and yfinance (tz-aware) series on calendar days
+    for symbol, closes in all_data.items():
+        index = pd.DatetimeIndex(closes.index)
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        all_data[symbol] = pd.Series(closes.values, index=index.normalize())
+    
     return pd.DataFrame(all_data)
 
 
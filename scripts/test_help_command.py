@@ -43,7 +43,10 @@ async def test_help_command():
 
     # Mock dependencies
     import handlers.commands as cmd_module
-    cmd_module.is_authorized_admin = lambda x: False  # Mock as non-admin
+    async def mock_is_admin(chat_id):
+        return False  # Mock as non-admin
+
+    cmd_module.is_authorized_admin = mock_is_admin
 
     try:
         # Execute the help command
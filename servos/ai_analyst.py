@@ -1,9 +1,11 @@
 
 import os
-import openai
+import asyncio
 from datetime import datetime
 from dotenv import load_dotenv
 
+from servos.llm_gateway import get_llm_gateway
+
 load_dotenv()
 
 class NexusAnalyst:
@@ -11,8 +13,7 @@ class NexusAnalyst:
     _connection_message_shown = False
 
     def __init__(self):
-        """Initializes the Nexus Analyst with OpenAI API."""
-        self.api_key = os.getenv("OPENAI_API_KEY", "").strip("'\" ")
+        """Initializes the Nexus Analyst on the shared LLM gateway."""
         # Load model configuration from system_directive
         try:
             from system_directive import OPENAI_MODEL
@@ -20,18 +21,37 @@ class NexusAnalyst:
         except ImportError:
             self.model = os.getenv("OPENAI_MODEL", "gpt-4o")  # Fallback to gpt-4o
 
-        self.client = None
+        # One pooled async client for the whole process (no per-session OpenAI client)
+        self.gateway = get_llm_gateway()
 
-        if self.api_key:
-            try:
-                self.client = openai.OpenAI(api_key=self.api_key)
-                # Connection message moved to Phase 4 initialization
-            except Exception as e:
-                print(f"❌ Nexus Analyst Error: {e}")
-        elif not NexusAnalyst._connection_message_shown:
+        if not self.available and not NexusAnalyst._connection_message_shown:
             print("⚠️ Nexus Analyst: No OPENAI_API_KEY found.")
             NexusAnalyst._connection_message_shown = True
 
+    @property
+    def available(self) -> bool:
+        return self.gateway.is_available('openai')
+
+    @staticmethod
+    def _fetch_headlines(tickers, per_ticker: int, labelled: bool = False) -> list:
+        """yfinance headlines for tickers (blocking; run in a thread)."""
+        import yfinance as yf
+        headlines = []
+        for t in tickers:
+            try:
+                news = yf.Ticker(t).news or []
+            except Exception:
+                continue
+            for n in news[:per_ticker]:
+                # Handle nested structure from some yfinance versions
+                if 'content' in n and isinstance(n['content'], dict):
+                    title = n['content'].get('title', '')
+                else:
+                    title = n.get('title', '')
+                if title:
+                    headlines.append(f"- [{t}] {title}" if labelled else title)
+        return headlines
+
     # Character descriptions for personality-aware analysis
     PERSONALITY_PROMPTS = {
         # STANDARD PROFILES
@@ -65,13 +85,13 @@ class NexusAnalyst:
         'SPANISH': "El Chaval Español: usa 'hostia', 'tío', 'flipar', 'madre mía'. Energético, bromista, jerga española castiza. Mete caña con humor."
     }
     
-    def analyze_signal(self, symbol, timeframe, indicators, personality="STANDARD_ES"):
+    async def analyze_signal(self, symbol, timeframe, indicators, personality="STANDARD_ES"):
         """
         Generates a narrative analysis of the market situation 
         ROLEPLAYING as the specified personality character.
         Returns ~100 words in a single paragraph with the character's voice.
         """
-        if not self.client:
+        if not self.available:
             return "⚠️ IA Desconectada. Configura OPENAI_API_KEY."
 
         # Get character description
@@ -126,19 +146,19 @@ class NexusAnalyst:
         """
 
         try:
-            response = self.client.chat.completions.create(
+            return await self.gateway.chat(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": f"Eres el personaje: {char_desc}. Mantén su personalidad al 100% durante toda la respuesta. Responde SOLO en español con texto plano."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=200
+                max_tokens=200,
+                ttl=300
             )
-            return response.choices[0].message.content.strip()
         except Exception as e:
             return f"❌ Error de Análisis: {str(e)}"
 
-    def check_market_sentiment(self, symbol):
+    async def check_market_sentiment(self, symbol):
         """
         Fetches recent news via yfinance and analyzes sentiment (-1 to 1).
         *Includes 'The Trump Factor': Checks DJT news and specific keywords.*
@@ -147,12 +167,9 @@ class NexusAnalyst:
         :param symbol: Ticker (e.g. 'BTCUSDT' or 'TSLA')
         :return: dict {'score': float, 'reason': str, 'volatility_risk': str}
         """
-        if not self.client:
+        if not self.available:
             return {'score': 0, 'reason': "AI Disconnected", 'volatility_risk': "LOW"}
 
-        import yfinance as yf
-        import json
-
         # 1. Normalize Symbol for News Check
         search_ticker = symbol
         if "USDT" in symbol:
@@ -160,29 +177,15 @@ class NexusAnalyst:
             search_ticker = f"{coin}-USD"
         
         try:
-            # 2. Fetch News (Asset + Proxies)
-            yf_ticker = yf.Ticker(search_ticker)
-            asset_news = yf_ticker.news or []
-            
-            def get_title(n):
-                # Handle nested structure from some yfinance versions
-                if 'content' in n and isinstance(n['content'], dict):
-                    return n['content'].get('title', '')
-                return n.get('title', '')
-
-            asset_headlines = [get_title(n) for n in asset_news[:5]]
-            
+            # 2. Fetch News (Asset + Proxies) - yfinance is blocking, fetched in parallel threads
             # 3. TRUMP FACTOR & MACRO SHIELD
             # DJT: Political Proxy
             # ^GSPC (S&P 500): Macro Economic Proxy (FED, Rates, CPI)
-            trump_ticker = yf.Ticker("DJT")
-            sp500_ticker = yf.Ticker("^GSPC")
-            
-            trump_news = trump_ticker.news or []
-            macro_news = sp500_ticker.news or []
-            
-            trump_headlines = [get_title(n) for n in trump_news[:2]]
-            macro_headlines = [get_title(n) for n in macro_news[:3]]
+            asset_headlines, trump_headlines, macro_headlines = await asyncio.gather(
+                asyncio.to_thread(self._fetch_headlines, [search_ticker], 5),
+                asyncio.to_thread(self._fetch_headlines, ["DJT"], 2),
+                asyncio.to_thread(self._fetch_headlines, ["^GSPC"], 3),
+            )
             
             # Combine Context
             now_str = datetime.now().strftime("%Y-%m-%d")
@@ -224,53 +227,34 @@ class NexusAnalyst:
             Use your expert judgment. If news is old or irrelevant, Neural Score should be 0.
             """
 
-            response = self.client.chat.completions.create(
+            return await self.gateway.chat_json(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a Senior Financial Analyst. Use Chain-of-Thought reasoning. Output valid JSON only."},
                     {"role": "user", "content": prompt}
                 ],
-                response_format={"type": "json_object"},
-                max_tokens=200
+                max_tokens=200,
+                ttl=900
             )
             
-            content = response.choices[0].message.content.strip()
-            result = json.loads(content)
-            return result
-            
         except Exception as e:
             print(f"Sentiment Error: {e}")
             return {'score': 0, 'reason': "Error analysis", 'volatility_risk': "LOW"}
 
-    def analyze_fomc(self, personality="Standard"):
+    async def analyze_fomc(self, personality="Standard"):
         """
         Analyzes Fed/FOMC sentiment using key macro tickers.
         """
-        if not self.client:
+        if not self.available:
             return "⚠️ IA Desconectada. Configura OPENAI_API_KEY."
 
-        import yfinance as yf
-        
         try:
             # Macro Tickers for Fed Sentiment
             # ^GSPC: S&P 500 (General Market)
             # ^TNX: 10-Year Treasury Yield (Rates expectation)
             # DX-Y.NYB: Dollar Index (Strength vs Rates)
             tickers = ["^GSPC", "^TNX", "DX-Y.NYB"]
-            news_context = []
-            
-            for t in tickers:
-                obj = yf.Ticker(t)
-                news = obj.news or []
-                headlines = []
-                for n in news[:3]:
-                    # Helper logic inline or reused
-                    if 'content' in n and isinstance(n['content'], dict):
-                        headlines.append(n['content'].get('title', ''))
-                    else:
-                        headlines.append(n.get('title', ''))
-                
-                news_context.extend(headlines)
+            news_context = await asyncio.to_thread(self._fetch_headlines, tickers, 3)
                 
             full_text = "\n".join(news_context)
 
@@ -293,46 +277,29 @@ class NexusAnalyst:
             Limit: Approx 100 words.
             """
             
-            response = self.client.chat.completions.create(
+            return await self.gateway.chat(
                 model=self.model,
                 messages=[
                      {"role": "system", "content": "You are an expert financial analyst AI."},
                      {"role": "user", "content": prompt}
                 ],
-                max_tokens=250
+                max_tokens=250,
+                ttl=1800
             )
-            return response.choices[0].message.content.strip()
             
         except Exception as e:
             return f"❌ Error analizando FOMC: {e}"
 
-    def generate_market_briefing(self):
+    async def generate_market_briefing(self):
         """
         Fetches headlines for major tickers (Crypto, Macro, Politics)
         and generates a concise newsletter-style briefing.
         """
-        if not self.client:
+        if not self.available:
             return "⚠️ IA Desconectada. No puedo generar noticias."
 
-        import yfinance as yf
-        
         tickers = ['BTC-USD', 'ETH-USD', '^GSPC', 'DJT']
-        all_headlines = []
-        
-        for t in tickers:
-            try:
-                tick = yf.Ticker(t)
-                news = tick.news or []
-                for n in news[:2]: # Top 2 per asset
-                    title = ''
-                    if 'content' in n and isinstance(n['content'], dict):
-                        title = n['content'].get('title', '')
-                    else:
-                        title = n.get('title', '')
-                        
-                    if title: all_headlines.append(f"- [{t}] {title}")
-            except:
-                continue
+        all_headlines = await asyncio.to_thread(self._fetch_headlines, tickers, 2, True)  # Top 2 per asset
                 
         if not all_headlines:
             return "❌ No pude obtener noticias recientes."
@@ -356,12 +323,23 @@ class NexusAnalyst:
         """
         
         try:
-            response = self.client.chat.completions.create(
+            return await self.gateway.chat(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
-                max_tokens=250
+                max_tokens=250,
+                ttl=900
             )
-            return response.choices[0].message.content.strip()
         except Exception as e:
             return f"❌ Error generando briefing: {e}"
 
+
+# Global singleton for shared access
+_nexus_analyst = None
+
+
+def get_nexus_analyst() -> NexusAnalyst:
+    """Get global Nexus Analyst instance (shared by all sessions and handlers)."""
+    global _nexus_analyst
+    if _nexus_analyst is None:
+        _nexus_analyst = NexusAnalyst()
+    return _nexus_analyst
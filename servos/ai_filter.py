@@ -22,6 +22,16 @@ except ImportError:
     VALUATION_SYSTEM_AVAILABLE = False
     logger.warning("⚠️ Sistema de valoración no disponible")
 
+from nexus_system.uplink.single_flight import SingleFlight, flight_ttl
+from nexus_system.uplink.timeframe_cache import timeframe_to_ms
+
+try:
+    from system_directive import STREAM_SIGNAL_TIMEFRAME
+except ImportError:
+    STREAM_SIGNAL_TIMEFRAME = '15m'
+
+_SIGNAL_CANDLE_SECONDS = timeframe_to_ms(STREAM_SIGNAL_TIMEFRAME) // 1000
+
 class AIFilterEngine:
     """
     Motor de filtrado inteligente de señales usando IA híbrida.
@@ -41,6 +51,7 @@ class AIFilterEngine:
         self.valuation_system = None
         self.valuation_cache = {}  # Cache para valoraciones por cripto
         self.valuation_cache_timeout = 600  # 10 minutos para valoraciones
+        self._signal_flight = SingleFlight(max_entries=512)  # Análisis por (symbol, side, vela)
 
     async def initialize(self):
         """Inicializar el motor de filtrado simplificado."""
@@ -60,10 +71,10 @@ class AIFilterEngine:
     async def should_filter_signal(self, signal_data: Dict[str, Any],
                                  session_config: Dict[str, Any]) -> Tuple[bool, str, Dict[str, Any]]:
         """
-        Determina si una señal debe ser filtrada.
+        Determina si una señal debe ser filtrada para una sesión.
 
         Args:
-            signal_data: Datos de la señal (symbol, side, entry_price, etc.)
+            signal_data: Datos de la señal (symbol, side, entry_price, candle_time, etc.)
             session_config: Configuración de la sesión del usuario
 
         Returns:
@@ -72,6 +83,49 @@ class AIFilterEngine:
         if not session_config.get('sentiment_filter', True):
             return False, "AI Filter desactivado", {}
 
+        analysis = await self.analyze_signal(signal_data)
+        return self.apply_policy(analysis, session_config)
+
+    async def analyze_signal(self, signal_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Análisis compartido de la señal (sentimiento, valoración, score): no depende
+        de la sesión, así que se calcula una vez por (symbol, side, vela) y todas
+        las sesiones suscritas reutilizan el resultado.
+        """
+        key = (signal_data['symbol'], signal_data.get('side', 'LONG'), self._candle_key(signal_data))
+        return await self._signal_flight.do(
+            key,
+            lambda: self._analyze_signal(signal_data),
+            ttl=flight_ttl('ai_filter_signal'),
+            keep=lambda analysis: not analysis.get('error'),
+        )
+
+    def apply_policy(self, analysis: Dict[str, Any],
+                     session_config: Dict[str, Any]) -> Tuple[bool, str, Dict[str, Any]]:
+        """
+        Política por sesión sobre el análisis compartido (sin I/O): on/off y umbral
+        (`ai_filter_threshold` de la sesión, o el del modo según el estado de APIs).
+        """
+        if not session_config.get('sentiment_filter', True):
+            return False, "AI Filter desactivado", {}
+        if analysis.get('error'):
+            # En caso de error, permitir la señal (fail-safe)
+            return False, f"Error en AI Filter: {analysis['error']}", {}
+
+        threshold = session_config.get('ai_filter_threshold')
+        if threshold is None:
+            threshold = analysis['threshold']
+        should_filter = analysis['filter_score'] > threshold
+        return should_filter, self._filter_reason(analysis, should_filter), analysis
+
+    @staticmethod
+    def _candle_key(signal_data: Dict[str, Any]) -> str:
+        """Vela de la señal; sin ella, el intervalo de STREAM_SIGNAL_TIMEFRAME en curso."""
+        if signal_data.get('candle_time'):
+            return str(signal_data['candle_time'])
+        return f"bucket:{int(time.time() // _SIGNAL_CANDLE_SECONDS)}"
+
+    async def _analyze_signal(self, signal_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
             # 1. Obtener datos de sentimiento múltiples
             sentiment_data = await self._gather_sentiment_data(signal_data['symbol'])
@@ -80,28 +134,26 @@ class AIFilterEngine:
             ai_analysis = await self._analyze_with_hybrid_ai(signal_data, sentiment_data)
 
             # 3. Calcular score de filtrado
-            filter_score, should_filter, reason = self._calculate_filter_decision(
-                signal_data, sentiment_data, ai_analysis
-            )
+            filter_score, scores, threshold = self._score_signal(signal_data, sentiment_data, ai_analysis)
+
+            logger.info(f"🤖 AI Filter | {signal_data['symbol']} {signal_data.get('side', 'LONG')} | "
+                        f"Score: {filter_score:.2f} | Umbral: {threshold:.2f}")
 
-            # 4. Preparar datos de análisis para logging
-            analysis_data = {
+            # 4. Datos de análisis (compartidos por todas las sesiones)
+            return {
                 'sentiment_data': sentiment_data,
                 'ai_analysis': ai_analysis,
                 'filter_score': filter_score,
+                'scores': scores,
+                'threshold': threshold,
                 'timestamp': datetime.now().isoformat(),
-                'symbol': signal_data['symbol']
+                'symbol': signal_data['symbol'],
+                'side': signal_data.get('side', 'LONG')
             }
 
-            logger.info(f"🤖 AI Filter | {signal_data['symbol']} | Score: {filter_score:.2f} | "
-                       f"Decision: {'FILTER' if should_filter else 'ALLOW'} | Reason: {reason}")
-
-            return should_filter, reason, analysis_data
-
         except Exception as e:
             logger.error(f"❌ AI Filter error: {e}")
-            # En caso de error, permitir la señal (fail-safe)
-            return False, f"Error en AI Filter: {e}", {}
+            return {'error': str(e), 'symbol': signal_data['symbol']}
 
     async def _gather_sentiment_data(self, symbol: str) -> Dict[str, Any]:
         """Reunir datos de sentimiento de múltiples fuentes con verificación robusta de APIs."""
@@ -470,12 +522,8 @@ class AIFilterEngine:
                 return cached_data
 
         try:
-            # Ejecutar valoración en thread separado (ya que es síncrona)
             # ⏰ Timeout de 10 segundos para evitar bloqueos
-            valuation_result = await asyncio.wait_for(
-                asyncio.to_thread(self._run_valuation_sync, symbol),
-                timeout=10.0
-            )
+            valuation_result = await asyncio.wait_for(self._run_valuation(symbol), timeout=10.0)
 
             if valuation_result.get('success'):
                 # Extraer datos relevantes para el filtro
@@ -522,34 +570,31 @@ class AIFilterEngine:
                 'fallback': True
             }
 
-    def _run_valuation_sync(self, symbol: str) -> Dict[str, Any]:
-        """Ejecutar valoración de forma síncrona (para usar en thread)."""
+    async def _run_valuation(self, symbol: str) -> Dict[str, Any]:
+        """
+        Valoración completa: yfinance (síncrono, en un thread) y las fuentes HTTP
+        (aiohttp, cache TTL compartida) se reúnen en paralelo; la llamada LLM va
+        por el gateway async compartido.
+        """
         try:
-            # Crear payload para valoración individual
             crypto_info = self._get_crypto_info(symbol)
-
-            # Obtener datos básicos - versión síncrona simplificada
-            market_data = {symbol: self._get_smart_crypto_data_sync(symbol)}
-            coingecko_data = {symbol: self.valuation_system.get_coingecko_metrics(crypto_info['coingecko_id'])}
-            global_crypto = self.valuation_system.get_global_crypto_data()
-            fear_greed = self.valuation_system.get_fear_greed_index()
-            trending_coins = self.valuation_system.get_trending_coins()
-            cryptopanic_news = self.valuation_system.get_cryptopanic_news(limit=5)
+            crypto_data, context = await asyncio.gather(
+                asyncio.to_thread(self._get_smart_crypto_data_sync, symbol),
+                self.valuation_system.gather_market_context_async(crypto_info['coingecko_id'], news_limit=5),
+            )
 
             # Crear payload
             payload = self.valuation_system.create_valuation_payload(
-                crypto_info, market_data[symbol], coingecko_data[symbol],
-                [], cryptopanic_news, {"contexto": "AI Filter analysis"},
-                fear_greed, global_crypto, trending_coins
+                crypto_info, crypto_data, context['coingecko_metrics'],
+                [], context['cryptopanic_news'], {"contexto": "AI Filter analysis"},
+                context['fear_greed'], context['global_crypto'], context['trending_coins']
             )
 
-            # Obtener valoración principal
-            primary_valuation = self.valuation_system.get_primary_valuation(crypto_info, payload)
-
+            primary_valuation = await self.valuation_system.get_primary_valuation_async(crypto_info, payload)
             return {
                 'success': True,
-                'crypto_data': market_data[symbol],
-                'coingecko_data': coingecko_data[symbol],
+                'crypto_data': crypto_data,
+                'coingecko_data': context['coingecko_metrics'],
                 'primary_valuation': primary_valuation
             }
 
@@ -588,190 +633,175 @@ class AIFilterEngine:
         # xAI removed - simplified analysis
         return {'available': False, 'reason': 'Hybrid AI analysis disabled (xAI removed)'}
 
-    def _calculate_filter_decision(self, signal_data: Dict[str, Any],
-                                 sentiment_data: Dict[str, Any],
-                                 ai_analysis: Dict[str, Any]) -> Tuple[float, bool, str]:
+    def _score_signal(self, signal_data: Dict[str, Any],
+                      sentiment_data: Dict[str, Any],
+                      ai_analysis: Dict[str, Any]) -> Tuple[float, List[Tuple[str, float]], float]:
         """
-        Calcular la decisión final de filtrado basada en múltiples factores.
+        Score de filtrado a partir de múltiples factores (no depende de la sesión).
 
         Returns:
-            Tuple: (filter_score, should_filter, reason)
+            Tuple: (filter_score, scores por factor, umbral por defecto según estado de APIs)
         """
-        try:
-            scores = []
-
-            # 1. Fear & Greed Index (0-100, ideal: 40-60 para señales)
-            fng = sentiment_data.get('fear_greed', {}).get('value', 50)
-            if fng < 30:  # Extreme Fear - Favorable para LONG
-                fng_score = 0.2 if signal_data.get('side') == 'LONG' else 0.8
-            elif fng > 70:  # Extreme Greed - Favorable para SHORT
-                fng_score = 0.8 if signal_data.get('side') == 'LONG' else 0.2
-            else:  # Neutral - Permitir
-                fng_score = 0.3
-            scores.append(('Fear & Greed', fng_score))
-
-            # 2. Volatilidad (menor volatilidad = más seguro)
-            vol_level = sentiment_data.get('volatility', {}).get('level', 0.5)
-            vol_score = min(vol_level * 1.5, 1.0)  # Alta volatilidad = mayor score de filtro
-            scores.append(('Volatilidad', vol_score))
-
-            # 3. Momentum técnico
-            momentum_score = sentiment_data.get('momentum', {}).get('score', 0.5)
-            side = signal_data.get('side', 'LONG')
-            if side == 'LONG':
-                momentum_filter = 1.0 - momentum_score  # Mayor momentum = menor filtro
-            else:
-                momentum_filter = momentum_score  # Mayor momentum bajista = menor filtro
-            scores.append(('Momentum', momentum_filter))
+        scores = []
+
+        # 1. Fear & Greed Index (0-100, ideal: 40-60 para señales)
+        fng = sentiment_data.get('fear_greed', {}).get('value', 50)
+        if fng < 30:  # Extreme Fear - Favorable para LONG
+            fng_score = 0.2 if signal_data.get('side') == 'LONG' else 0.8
+        elif fng > 70:  # Extreme Greed - Favorable para SHORT
+            fng_score = 0.8 if signal_data.get('side') == 'LONG' else 0.2
+        else:  # Neutral - Permitir
+            fng_score = 0.3
+        scores.append(('Fear & Greed', fng_score))
+
+        # 2. Volatilidad (menor volatilidad = más seguro)
+        vol_level = sentiment_data.get('volatility', {}).get('level', 0.5)
+        vol_score = min(vol_level * 1.5, 1.0)  # Alta volatilidad = mayor score de filtro
+        scores.append(('Volatilidad', vol_score))
+
+        # 3. Momentum técnico
+        momentum_score = sentiment_data.get('momentum', {}).get('score', 0.5)
+        side = signal_data.get('side', 'LONG')
+        if side == 'LONG':
+            momentum_filter = 1.0 - momentum_score  # Mayor momentum = menor filtro
+        else:
+            momentum_filter = momentum_score  # Mayor momentum bajista = menor filtro
+        scores.append(('Momentum', momentum_filter))
 
-            # 4. Análisis de IA híbrida (peso alto)
-            ai_score = 0.5  # Default neutral
-            if ai_analysis.get('available'):
-                ai_score = 0.8 if ai_analysis.get('should_filter') else 0.2
-            scores.append(('IA Híbrida', ai_score))
+        # 4. Análisis de IA híbrida (peso alto)
+        ai_score = 0.5  # Default neutral
+        if ai_analysis.get('available'):
+            ai_score = 0.8 if ai_analysis.get('should_filter') else 0.2
+        scores.append(('IA Híbrida', ai_score))
 
-            # 5. 🎯 VALORACIÓN GPT-4o MINI (FACTOR IMPORTANTE - ROBUSTO)
-            gpt_valuation_score = 0.3  # Default permisivo cuando APIs fallan
-            ai_valuation_available = sentiment_data.get('ai_valuation', {}).get('available', False)
+        # 5. 🎯 VALORACIÓN GPT-4o MINI (FACTOR IMPORTANTE - ROBUSTO)
+        gpt_valuation_score = 0.3  # Default permisivo cuando APIs fallan
+        ai_valuation_available = sentiment_data.get('ai_valuation', {}).get('available', False)
 
-            if ai_valuation_available:
-                # Valoración disponible - usar normalmente
-                ai_val = sentiment_data['ai_valuation']
-                side = signal_data.get('side', 'LONG')
-
-                if side == 'LONG':
-                    # Para señales LONG: usar short_signal como score de filtro
-                    # Si short_signal > 0.6, hay riesgo de movimiento bajista
-                    gpt_valuation_score = ai_val['short_signal']
-                else:  # SHORT
-                    # Para señales SHORT: usar long_signal como score de filtro
-                    # Si long_signal > 0.6, hay riesgo de movimiento alcista
-                    gpt_valuation_score = ai_val['long_signal']
-
-                # Ajustar score: valores > 0.6 indican filtro, valores < 0.4 permiten
-                if gpt_valuation_score > 0.6:
-                    gpt_valuation_score = 0.8  # Fuerte filtro
-                elif gpt_valuation_score > 0.5:
-                    gpt_valuation_score = 0.6  # Filtro moderado
-                elif gpt_valuation_score < 0.4:
-                    gpt_valuation_score = 0.2  # Permitir
-                else:
-                    gpt_valuation_score = 0.4  # Neutral
-            else:
-                # 🎯 CRÍTICO: Cuando GPT-4o Mini NO está disponible, ser más permisivo
-                # Esto evita que el fallo de APIs bloquee señales válidas
-                logger.warning(f"⚠️ GPT-4o Mini no disponible para {signal_data['symbol']} - usando score permisivo")
-                gpt_valuation_score = 0.3  # Más permisivo que el neutral 0.5
-
-            scores.append(('GPT-4o Mini', gpt_valuation_score))
+        if ai_valuation_available:
+            # Valoración disponible - usar normalmente
+            ai_val = sentiment_data['ai_valuation']
 
-            # Calcular score final (promedio ponderado - ROBUSTO CON APIs)
-            api_status = sentiment_data.get('api_status', {})
-            working_apis = api_status.get('working_apis', 5)
-            all_apis_failed = api_status.get('all_apis_failed', False)
+            if side == 'LONG':
+                # Para señales LONG: usar short_signal como score de filtro
+                # Si short_signal > 0.6, hay riesgo de movimiento bajista
+                gpt_valuation_score = ai_val['short_signal']
+            else:  # SHORT
+                # Para señales SHORT: usar long_signal como score de filtro
+                # Si long_signal > 0.6, hay riesgo de movimiento alcista
+                gpt_valuation_score = ai_val['long_signal']
+
+            # Ajustar score: valores > 0.6 indican filtro, valores < 0.4 permiten
+            if gpt_valuation_score > 0.6:
+                gpt_valuation_score = 0.8  # Fuerte filtro
+            elif gpt_valuation_score > 0.5:
+                gpt_valuation_score = 0.6  # Filtro moderado
+            elif gpt_valuation_score < 0.4:
+                gpt_valuation_score = 0.2  # Permitir
+            else:
+                gpt_valuation_score = 0.4  # Neutral
+        else:
+            # 🎯 CRÍTICO: Cuando GPT-4o Mini NO está disponible, ser más permisivo
+            # Esto evita que el fallo de APIs bloquee señales válidas
+            logger.warning(f"⚠️ GPT-4o Mini no disponible para {signal_data['symbol']} - usando score permisivo")
+            gpt_valuation_score = 0.3  # Más permisivo que el neutral 0.5
+
+        scores.append(('GPT-4o Mini', gpt_valuation_score))
+
+        # Calcular score final (promedio ponderado - ROBUSTO CON APIs)
+        api_status = sentiment_data.get('api_status', {})
+        working_apis = api_status.get('working_apis', 5)
+        all_apis_failed = api_status.get('all_apis_failed', False)
+
+        # 🎯 SISTEMA SIMPLIFICADO: Solo GPT-4o Mini (xAI eliminado)
+        if all_apis_failed:
+            # 🚨 ANÁLISIS TÉCNICO PURO - MUY PERMISIVO
+            weights = {
+                'Fear & Greed': 0.25,  # Fallback neutral
+                'Volatilidad': 0.35,   # Análisis técnico - mayor peso
+                'Momentum': 0.35,      # Análisis técnico - mayor peso
+                'IA Híbrida': 0.05,    # ❌ REMOVED: xAI eliminado
+                'GPT-4o Mini': 0.00   # No disponible
+            }
+            threshold = 0.9  # Solo filtrar señales muy problemáticas
+
+        elif working_apis <= 2:
+            # ⚠️ APIs LIMITADAS - MODERADAMENTE PERMISIVO
+            weights = {
+                'Fear & Greed': 0.20,
+                'Volatilidad': 0.30,   # Mayor peso técnico
+                'Momentum': 0.30,      # Mayor peso técnico
+                'IA Híbrida': 0.10,    # ❌ REMOVED: xAI eliminado
+                'GPT-4o Mini': 0.10   # GPT limitado
+            }
+            threshold = 0.8  # Menos restrictivo
 
-            # 🎯 SISTEMA SIMPLIFICADO: Solo GPT-4o Mini (xAI eliminado)
-            if all_apis_failed:
-                # 🚨 ANÁLISIS TÉCNICO PURO - MUY PERMISIVO
+        else:
+            # ✅ APIs COMPLETAS - GPT-4o Mini como factor principal
+            if ai_valuation_available:
+                # GPT-4o Mini funcionando - alto peso (sin xAI)
                 weights = {
-                    'Fear & Greed': 0.25,  # Fallback neutral
-                    'Volatilidad': 0.35,   # Análisis técnico - mayor peso
-                    'Momentum': 0.35,      # Análisis técnico - mayor peso
-                    'IA Híbrida': 0.05,    # ❌ REMOVED: xAI eliminado
-                    'GPT-4o Mini': 0.00   # No disponible
+                    'Fear & Greed': 0.15,
+                    'Volatilidad': 0.15,
+                    'Momentum': 0.15,
+                    'IA Híbrida': 0.10,  # ❌ REMOVED: xAI eliminado
+                    'GPT-4o Mini': 0.45  # Mayor peso sin competencia de xAI
                 }
-                logger.info(f"🎯 MODO TÉCNICO PURO (sin xAI): Umbral 0.9, Score {final_score:.2f}")
-
-            elif working_apis <= 2:
-                # ⚠️ APIs LIMITADAS - MODERADAMENTE PERMISIVO
+            else:
+                # Solo indicadores técnicos + Fear & Greed
                 weights = {
-                    'Fear & Greed': 0.20,
-                    'Volatilidad': 0.30,   # Mayor peso técnico
-                    'Momentum': 0.30,      # Mayor peso técnico
-                    'IA Híbrida': 0.10,    # ❌ REMOVED: xAI eliminado
-                    'GPT-4o Mini': 0.10   # GPT limitado
+                    'Fear & Greed': 0.30,
+                    'Volatilidad': 0.25,
+                    'Momentum': 0.25,
+                    'IA Híbrida': 0.10,  # ❌ REMOVED: xAI eliminado
+                    'GPT-4o Mini': 0.10  # Fallback
                 }
-                logger.info(f"⚠️ MODO HÍBRIDO LIMITADO (sin xAI): Umbral 0.8, Score {final_score:.2f}")
-
-            else:
-                # ✅ APIs COMPLETAS - GPT-4o Mini como factor principal
-                gpt_available = sentiment_data.get('ai_valuation', {}).get('available', False)
-
-                if gpt_available:
-                    # GPT-4o Mini funcionando - alto peso (sin xAI)
-                    weights = {
-                        'Fear & Greed': 0.15,
-                        'Volatilidad': 0.15,
-                        'Momentum': 0.15,
-                        'IA Híbrida': 0.10,  # ❌ REMOVED: xAI eliminado
-                        'GPT-4o Mini': 0.45  # Mayor peso sin competencia de xAI
-                    }
-                else:
-                    # Solo indicadores técnicos + Fear & Greed
-                    weights = {
-                        'Fear & Greed': 0.30,
-                        'Volatilidad': 0.25,
-                        'Momentum': 0.25,
-                        'IA Híbrida': 0.10,  # ❌ REMOVED: xAI eliminado
-                        'GPT-4o Mini': 0.10  # Fallback
-                    }
-            total_score = 0
-            total_weight = 0
-
-            for factor_name, score in scores:
-                weight = weights.get(factor_name, 0.25)
-                total_score += score * weight
-                total_weight += weight
-
-            final_score = total_score / total_weight if total_weight > 0 else 0.5
-
-            # Decisión: adaptable según estado de APIs
-            api_status = sentiment_data.get('api_status', {})
-            all_apis_failed = api_status.get('all_apis_failed', False)
-
-            if all_apis_failed:
-                # 🚨 ANÁLISIS TÉCNICO PURO - MUY PERMISIVO
-                should_filter = final_score > 0.9  # Solo filtrar señales muy problemáticas
-                logger.info(f"🎯 MODO TÉCNICO PURO: Umbral 0.9, Score {final_score:.2f}")
-            elif api_status.get('working_apis', 5) <= 2:
-                # ⚠️ APIs LIMITADAS - MODERADAMENTE PERMISIVO
-                should_filter = final_score > 0.8  # Menos restrictivo
-                logger.info(f"⚠️ MODO HÍBRIDO LIMITADO: Umbral 0.8, Score {final_score:.2f}")
-            else:
-                # ✅ APIs COMPLETAS - NORMAL
-                should_filter = final_score > 0.75  # Umbral normal
-
-            # Crear razón detallada
-            if should_filter:
-                reasons = []
-                for factor_name, score in scores:
-                    if score > 0.7:
-                        if factor_name == 'GPT-4o Mini':
-                            ai_val = sentiment_data.get('ai_valuation', {})
-                            side = signal_data.get('side', 'LONG')
-                            if side == 'LONG':
-                                reasons.append(f"GPT-4o Mini indica riesgo bajista ({ai_val.get('short_signal', 0):.3f})")
-                            else:
-                                reasons.append(f"GPT-4o Mini indica riesgo alcista ({ai_val.get('long_signal', 0):.3f})")
+            threshold = 0.75  # Umbral normal
+
+        total_score = 0
+        total_weight = 0
+
+        for factor_name, score in scores:
+            weight = weights.get(factor_name, 0.25)
+            total_score += score * weight
+            total_weight += weight
+
+        final_score = total_score / total_weight if total_weight > 0 else 0.5
+
+        if all_apis_failed:
+            logger.info(f"🎯 MODO TÉCNICO PURO (sin xAI): Umbral 0.9, Score {final_score:.2f}")
+        elif working_apis <= 2:
+            logger.info(f"⚠️ MODO HÍBRIDO LIMITADO (sin xAI): Umbral 0.8, Score {final_score:.2f}")
+
+        return final_score, scores, threshold
+
+    def _filter_reason(self, analysis: Dict[str, Any], should_filter: bool) -> str:
+        """Razón detallada de la decisión."""
+        sentiment_data = analysis['sentiment_data']
+        ai_val = sentiment_data.get('ai_valuation', {})
+        side = analysis.get('side', 'LONG')
+
+        if should_filter:
+            reasons = []
+            for factor_name, score in analysis['scores']:
+                if score > 0.7:
+                    if factor_name == 'GPT-4o Mini':
+                        if side == 'LONG':
+                            reasons.append(f"GPT-4o Mini indica riesgo bajista ({ai_val.get('short_signal', 0):.3f})")
                         else:
-                            reasons.append(f"{factor_name} adverso ({score:.1f})")
-                reason = f"Señal filtrada: {', '.join(reasons[:2])}"
-            else:
-                reason = f"Señal permitida (score: {final_score:.2f})"
-                # Agregar información positiva de GPT-4o Mini si está disponible
-                if sentiment_data.get('ai_valuation', {}).get('available'):
-                    ai_val = sentiment_data['ai_valuation']
-                    side = signal_data.get('side', 'LONG')
-                    if side == 'LONG' and ai_val.get('long_signal', 0) > 0.6:
-                        reason += f" | GPT-4o Mini favorable: LONG {ai_val['long_signal']:.3f}"
-                    elif side == 'SHORT' and ai_val.get('short_signal', 0) > 0.6:
-                        reason += f" | GPT-4o Mini favorable: SHORT {ai_val['short_signal']:.3f}"
-
-            return final_score, should_filter, reason
-
-        except Exception as e:
-            logger.error(f"❌ Error calculando decisión de filtro: {e}")
-            return 0.5, False, f"Error en cálculo: {e}"
+                            reasons.append(f"GPT-4o Mini indica riesgo alcista ({ai_val.get('long_signal', 0):.3f})")
+                    else:
+                        reasons.append(f"{factor_name} adverso ({score:.1f})")
+            return f"Señal filtrada: {', '.join(reasons[:2])}"
+
+        reason = f"Señal permitida (score: {analysis['filter_score']:.2f})"
+        # Agregar información positiva de GPT-4o Mini si está disponible
+        if ai_val.get('available'):
+            if side == 'LONG' and ai_val.get('long_signal', 0) > 0.6:
+                reason += f" | GPT-4o Mini favorable: LONG {ai_val['long_signal']:.3f}"
+            elif side == 'SHORT' and ai_val.get('short_signal', 0) > 0.6:
+                reason += f" | GPT-4o Mini favorable: SHORT {ai_val['short_signal']:.3f}"
+        return reason
 
     def get_filter_stats(self) -> Dict[str, Any]:
         """Obtener estadísticas del filtro."""
@@ -780,6 +810,7 @@ class AIFilterEngine:
             'cache_timeout': self.cache_timeout,
             'valuation_cache_size': len(self.valuation_cache),
             'valuation_cache_timeout': self.valuation_cache_timeout,
+            'signal_analysis': self._signal_flight.get_status(),
             'xai_available': False,  # xAI removed
             'gpt_valuation_available': self.valuation_system is not None,
             'primary_model': self.valuation_system.primary_model['name'] if self.valuation_system else None,
@@ -795,6 +826,7 @@ class AIFilterEngine:
         """Limpiar cache de datos."""
         self.cache.clear()
         self.valuation_cache.clear()
+        self._signal_flight = SingleFlight(max_entries=512)
         logger.info("🧹 AI Filter cache completo limpiado (incluyendo valoraciones GPT-4o Mini)")
 
 # Instancia global
@@ -809,6 +841,14 @@ async def should_filter_signal(signal_data: Dict[str, Any], session_config: Dict
     """Verificar si una señal debe ser filtrada."""
     return await ai_filter_engine.should_filter_signal(signal_data, session_config)
 
+async def analyze_signal(signal_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Análisis compartido de una señal (una vez por symbol, side y vela)."""
+    return await ai_filter_engine.analyze_signal(signal_data)
+
+def apply_filter_policy(analysis: Dict[str, Any], session_config: Dict[str, Any]) -> Tuple[bool, str, Dict[str, Any]]:
+    """Aplicar la política de una sesión a un análisis compartido."""
+    return ai_filter_engine.apply_policy(analysis, session_config)
+
 def get_filter_stats() -> Dict[str, Any]:
     """Obtener estadísticas del filtro."""
     return ai_filter_engine.get_filter_stats()
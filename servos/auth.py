@@ -5,23 +5,23 @@ Centralized Role-Based Access Control (RBAC) Module
 import os
 from functools import wraps
 from aiogram.types import Message, CallbackQuery
-from servos.db import get_user_role
+from servos.db_async import nexus_db
 
 # --- HELPERS ---
 
-def is_authorized_admin(chat_id: str) -> bool:
+async def is_authorized_admin(chat_id: str) -> bool:
     """Check if user has ADMIN or OWNER role."""
-    allowed, role = get_user_role(str(chat_id))
+    allowed, role = await nexus_db.get_user_role(str(chat_id))
     return allowed and role in ['owner', 'admin']
 
-def is_authorized_owner(chat_id: str) -> bool:
+async def is_authorized_owner(chat_id: str) -> bool:
     """Check if user is OWNER (SuperAdmin)."""
-    allowed, role = get_user_role(str(chat_id))
+    allowed, role = await nexus_db.get_user_role(str(chat_id))
     return allowed and role == 'owner'
 
-def is_authorized_user(chat_id: str) -> bool:
+async def is_authorized_user(chat_id: str) -> bool:
     """Check if user has any valid access (USER, ADMIN, OWNER)."""
-    allowed, _ = get_user_role(str(chat_id))
+    allowed, _ = await nexus_db.get_user_role(str(chat_id))
     return allowed
 
 # --- DECORATORS ---
@@ -41,7 +41,7 @@ def admin_only(func):
             user = event.from_user
             chat_id = str(event.message.chat.id)
             
-        if not chat_id or not is_authorized_admin(chat_id):
+        if not chat_id or not await is_authorized_admin(chat_id):
             # Block Access
             if isinstance(event, Message):
                 await event.answer("⛔ **Acceso Denegado**\nComando reservado para administradores.", parse_mode="Markdown")
@@ -66,7 +66,7 @@ def owner_only(func):
             user = event.from_user
             chat_id = str(event.message.chat.id)
             
-        if not chat_id or not is_authorized_owner(chat_id):
+        if not chat_id or not await is_authorized_owner(chat_id):
             if isinstance(event, Message):
                 await event.answer("⛔ **Acceso Denegado**\nComando reservado para el DUEÑO.", parse_mode="Markdown")
             elif isinstance(event, CallbackQuery):
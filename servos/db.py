@@ -1,6 +1,9 @@
 """
 Database module for PostgreSQL persistence.
 Falls back to JSON files if DATABASE_URL is not set.
+
+Synchronous (one psycopg2 connection per call): kept for standalone scripts.
+The bot itself goes through the pooled servos.db_async.nexus_db.
 """
 import os
 import json
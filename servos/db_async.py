@@ -4,13 +4,19 @@ Optimized with connection pooling and async operations.
 
 MIGRATION FROM: servos/db.py (psycopg2 synchronous)
 TO: servos/db_async.py (asyncpg asynchronous)
+
+All trade-journal, calibration, session, bot-state, user and scheduler
+operations run on one asyncpg pool, so no call ever opens a TLS connection
+or blocks the event loop. Every query has fixed SQL text, which lets each
+pooled connection reuse its prepared statement (statement_cache_size).
+Multi-row writes go through executemany in a single transaction.
 """
 
 import os
 import json
 import logging
 import asyncpg
-from typing import Optional, Dict, List, Any, Tuple
+from typing import Optional, Dict, List, Any, Iterable, Tuple
 from datetime import datetime, timedelta
 
 from servos.security import encrypt_value, decrypt_value
@@ -18,10 +24,133 @@ from servos.security import encrypt_value, decrypt_value
 # Configure logging
 logger = logging.getLogger(__name__)
 
+DEFAULT_ENABLED_GROUPS = {"CRYPTO": True, "STOCKS": True, "ETFS": True}
+
+
+def _as_datetime(value) -> Optional[datetime]:
+    """asyncpg needs datetime params for TIMESTAMP columns (ISO strings are accepted here)."""
+    if value is None or isinstance(value, datetime):
+        return value
+    parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    # Columns are TIMESTAMP (naive UTC)
+    return parsed.replace(tzinfo=None) - (parsed.utcoffset() or timedelta(0))
+
+
+def _role_from_row(row) -> Tuple[bool, str]:
+    if not row:
+        return False, 'none'
+    if row['role'] == 'admin':
+        return True, 'admin'
+    # Check expiration for regular users
+    if row['expires_at'] and row['expires_at'] < datetime.now():
+        return False, 'expired'
+    return True, 'user'
+
+
+def _owner_ids() -> List[str]:
+    return os.getenv('TELEGRAM_CHAT_ID', '').split(',')
+
+
+def calibration_from_metrics(metrics: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Calibration settings derived from recent performance (Fase 4).
+    Adjusts leverage and size multipliers based on expectancy and win rate.
+    Returns None below the minimum sample size.
+    """
+    if not metrics or metrics['total_trades'] < 10:
+        return None
+
+    expectancy = metrics['expectancy']
+    win_rate = metrics['win_rate']
+    base_multiplier = 1.0
+
+    if expectancy > 0.5:  # Good expectancy
+        size_multiplier = min(1.5, base_multiplier + (expectancy * 0.5))
+        leverage_multiplier = min(1.3, base_multiplier + (expectancy * 0.3))
+    elif expectancy > 0:  # Slightly positive
+        size_multiplier = base_multiplier + (expectancy * 0.3)
+        leverage_multiplier = base_multiplier + (expectancy * 0.2)
+    elif expectancy > -0.2:  # Slightly negative
+        size_multiplier = max(0.7, base_multiplier + (expectancy * 0.5))
+        leverage_multiplier = max(0.8, base_multiplier + (expectancy * 0.3))
+    else:  # Poor performance
+        size_multiplier = max(0.5, base_multiplier + (expectancy * 0.7))
+        leverage_multiplier = max(0.7, base_multiplier + (expectancy * 0.4))
+
+    # Additional adjustment based on win rate
+    if win_rate > 0.6:
+        size_multiplier *= 1.1
+        leverage_multiplier *= 1.05
+    elif win_rate < 0.4:
+        size_multiplier *= 0.9
+        leverage_multiplier *= 0.95
+
+    return {
+        'confidence_threshold': 0.7,  # Keep default
+        'leverage_multiplier': leverage_multiplier,
+        'size_multiplier': size_multiplier,
+        'kelly_fraction': 0.5,  # Keep conservative
+        'win_rate_estimate': win_rate,
+        'risk_reward_estimate': 1.5  # Default assumption
+    }
+
+
+def performance_from_trades(trades: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Performance metrics over closed trades (rows with pnl, entry_time, exit_time)."""
+    if not trades:
+        return {
+            'total_trades': 0,
+            'win_rate': 0.0,
+            'expectancy': 0.0,
+            'profit_factor': 0.0,
+            'total_pnl': 0.0,
+            'avg_holding_time': 0
+        }
+
+    total_trades = len(trades)
+    winning_pnls = [t['pnl'] for t in trades if t['pnl'] > 0]
+    losing_pnls = [t['pnl'] for t in trades if t['pnl'] < 0]
+    winning_trades = len(winning_pnls)
+    win_rate = winning_trades / total_trades
+
+    avg_win = sum(winning_pnls) / len(winning_pnls) if winning_pnls else 0
+    avg_loss = sum(losing_pnls) / len(losing_pnls) if losing_pnls else 0
+
+    # Expectancy (R multiple)
+    expectancy = (win_rate * avg_win) + ((1 - win_rate) * avg_loss)
+    expectancy_r = expectancy / abs(avg_loss) if avg_loss != 0 else 0
+
+    total_losses = abs(sum(losing_pnls))
+    profit_factor = sum(winning_pnls) / total_losses if total_losses > 0 else float('inf')
+
+    # Average holding time (in hours)
+    holding_times = [
+        (t['exit_time'] - t['entry_time']).total_seconds() / 3600
+        for t in trades if t['exit_time'] and t['entry_time']
+    ]
+
+    return {
+        'total_trades': total_trades,
+        'winning_trades': winning_trades,
+        'losing_trades': total_trades - winning_trades,
+        'win_rate': win_rate,
+        'avg_win': avg_win,
+        'avg_loss': avg_loss,
+        'expectancy': expectancy_r,
+        'profit_factor': profit_factor,
+        'total_pnl': sum(t['pnl'] for t in trades),
+        'avg_holding_time': sum(holding_times) / len(holding_times) if holding_times else 0
+    }
+
+
 class NexusDB:
     """
     Asynchronous PostgreSQL database handler with connection pooling.
     Optimized for high-throughput trading operations.
+
+    Without a pool (DATABASE_URL unset or init failed) every method returns
+    the same fallback value as its servos.db counterpart, so callers keep
+    their JSON fallback paths.
     """
 
     def __init__(self):
@@ -31,6 +160,9 @@ class NexusDB:
 
     async def init_pool(self, min_size: int = 5, max_size: int = 20):
         """Initialize connection pool with optimized settings."""
+        if self.pool:
+            return True
+
         if not self.database_url:
             logger.warning("⚠️ DATABASE_URL not set. Using JSON fallback.")
             return False
@@ -45,8 +177,10 @@ class NexusDB:
                 max_size=max_size,
                 command_timeout=30,  # 30 seconds timeout
                 ssl='require',
-                # Connection validation
-                check=asyncpg.pool.check_connection,
+                # Recycle idle connections instead of holding them forever
+                max_inactive_connection_lifetime=300,
+                # JSONB <-> dict codec on every connection
+                init=self._init_connection,
                 # Prepared statements cache
                 statement_cache_size=100,
                 # Max cached query plans
@@ -61,22 +195,34 @@ class NexusDB:
 
         except Exception as e:
             logger.error(f"❌ Pool initialization error: {e}")
+            if self.pool:
+                await self.pool.close()
+            self.pool = None
             return False
 
+    @staticmethod
+    async def _init_connection(conn: asyncpg.Connection):
+        """Decode JSONB to Python objects (and encode them back) like psycopg2 does."""
+        await conn.set_type_codec('jsonb', encoder=json.dumps, decoder=json.loads, schema='pg_catalog')
+
     async def close_pool(self):
         """Gracefully close connection pool."""
         if self.pool:
             await self.pool.close()
+            self.pool = None
             logger.info("🔌 PostgreSQL pool closed")
 
     async def _init_schema(self):
-        """Initialize database schema with optimized tables and indexes."""
+        """
+        Initialize database schema (same tables as servos.db.init_db, so
+        both modules work against an existing deployment).
+        """
         if not self.pool:
             return
 
         async with self.pool.acquire() as conn:
             async with conn.transaction():
-                # Sessions table with optimized indexes
+                # Sessions table
                 await conn.execute("""
                     CREATE TABLE IF NOT EXISTS sessions (
                         chat_id VARCHAR(50) PRIMARY KEY,
@@ -93,13 +239,17 @@ class NexusDB:
                         id INTEGER PRIMARY KEY DEFAULT 1,
                         enabled_strategies JSONB DEFAULT '{}'::jsonb,
                         group_config JSONB DEFAULT '{}'::jsonb,
-                        disabled_assets TEXT[] DEFAULT ARRAY[]::TEXT[],
-                        ai_filter_enabled BOOLEAN DEFAULT true,
-                        last_updated TIMESTAMP DEFAULT NOW(),
-                        version INTEGER DEFAULT 1
+                        disabled_assets JSONB DEFAULT '[]'::jsonb,
+                        updated_at TIMESTAMP DEFAULT NOW()
                     )
                 """)
 
+                # Ensure bot_state has at least one row
+                await conn.execute("""
+                    INSERT INTO bot_state (id) VALUES (1)
+                    ON CONFLICT (id) DO NOTHING
+                """)
+
                 # Users table for subscription system
                 await conn.execute("""
                     CREATE TABLE IF NOT EXISTS users (
@@ -108,44 +258,349 @@ class NexusDB:
                         name VARCHAR(100),
                         role VARCHAR(20) DEFAULT 'user',
                         expires_at TIMESTAMP,
-                        timezone VARCHAR(50) DEFAULT 'UTC',
                         created_at TIMESTAMP DEFAULT NOW()
                     )
                 """)
 
-                # Ensure bot_state has at least one row
+                # Ensure sequence starts at 1000 (only while the table is empty)
+                if await conn.fetchval("SELECT count(*) FROM users") == 0:
+                    await conn.execute("ALTER SEQUENCE users_id_seq RESTART WITH 1000")
+
+                # Column migrations
                 await conn.execute("""
-                    INSERT INTO bot_state (id) VALUES (1)
-                    ON CONFLICT (id) DO NOTHING
+                    ALTER TABLE users ADD COLUMN IF NOT EXISTS timezone VARCHAR(50) DEFAULT 'UTC'
+                """)
+                await conn.execute("""
+                    ALTER TABLE users ADD COLUMN IF NOT EXISTS telegram_id BIGINT
+                """)
+                await conn.execute("""
+                    UPDATE users SET telegram_id = chat_id::BIGINT WHERE telegram_id IS NULL AND chat_id ~ '^[0-9]+$'
+                """)
+                await conn.execute("""
+                    ALTER TABLE users ADD COLUMN IF NOT EXISTS enabled_groups JSONB DEFAULT '{"CRYPTO": true, "STOCKS": true, "ETFS": true}'::jsonb
                 """)
 
-                # Ensure sequence starts at 1000
-                await conn.execute("SELECT setval('users_id_seq', 1000, false)")
+                # Scheduled tasks table
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS scheduled_tasks (
+                        id SERIAL PRIMARY KEY,
+                        user_id BIGINT NOT NULL,
+                        job_id VARCHAR(100),
+                        action VARCHAR(50) NOT NULL,
+                        params JSONB DEFAULT '{}'::jsonb,
+                        schedule_type VARCHAR(20),
+                        schedule_value TEXT,
+                        description TEXT,
+                        next_run TIMESTAMP,
+                        is_active BOOLEAN DEFAULT TRUE,
+                        created_at TIMESTAMP DEFAULT NOW()
+                    )
+                """)
 
-                # Add timezone column if not exists (migration)
+                # Trade Journal table (Fase 4)
                 await conn.execute("""
-                    ALTER TABLE users ADD COLUMN IF NOT EXISTS timezone VARCHAR(50) DEFAULT 'UTC'
+                    CREATE TABLE IF NOT EXISTS trade_journal (
+                        id SERIAL PRIMARY KEY,
+                        chat_id VARCHAR(50) NOT NULL,
+                        symbol VARCHAR(20) NOT NULL,
+                        side VARCHAR(10) NOT NULL,
+                        strategy VARCHAR(50),
+                        exchange VARCHAR(20) NOT NULL,
+                        entry_price DECIMAL(20,8) NOT NULL,
+                        exit_price DECIMAL(20,8),
+                        quantity DECIMAL(20,8) NOT NULL,
+                        leverage INTEGER DEFAULT 1,
+                        entry_time TIMESTAMP NOT NULL,
+                        exit_time TIMESTAMP,
+                        pnl DECIMAL(20,8),
+                        pnl_pct DECIMAL(10,4),
+                        fees DECIMAL(20,8) DEFAULT 0,
+                        slippage DECIMAL(20,8) DEFAULT 0,
+                        status VARCHAR(20) DEFAULT 'OPEN',
+                        exit_reason VARCHAR(100),
+                        metadata JSONB DEFAULT '{}'::jsonb,
+                        created_at TIMESTAMP DEFAULT NOW(),
+                        updated_at TIMESTAMP DEFAULT NOW()
+                    )
                 """)
 
-                # Create optimized indexes (concurrent for production)
+                # Performance Metrics table (Fase 4)
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS performance_metrics (
+                        id SERIAL PRIMARY KEY,
+                        chat_id VARCHAR(50) NOT NULL,
+                        symbol VARCHAR(20),
+                        strategy VARCHAR(50),
+                        exchange VARCHAR(20),
+                        period_start TIMESTAMP NOT NULL,
+                        period_end TIMESTAMP NOT NULL,
+                        total_trades INTEGER DEFAULT 0,
+                        winning_trades INTEGER DEFAULT 0,
+                        losing_trades INTEGER DEFAULT 0,
+                        win_rate DECIMAL(5,4),
+                        avg_win DECIMAL(20,8),
+                        avg_loss DECIMAL(20,8),
+                        expectancy DECIMAL(10,4),
+                        profit_factor DECIMAL(10,4),
+                        max_drawdown DECIMAL(10,4),
+                        sharpe_ratio DECIMAL(10,4),
+                        total_pnl DECIMAL(20,8),
+                        total_fees DECIMAL(20,8),
+                        avg_holding_time INTERVAL,
+                        mae DECIMAL(10,4),
+                        mfe DECIMAL(10,4),
+                        created_at TIMESTAMP DEFAULT NOW(),
+                        UNIQUE(chat_id, symbol, strategy, exchange, period_start, period_end)
+                    )
+                """)
+
+                # Strategy Calibration table (Fase 4)
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS strategy_calibration (
+                        id SERIAL PRIMARY KEY,
+                        chat_id VARCHAR(50) NOT NULL,
+                        strategy VARCHAR(50) NOT NULL,
+                        symbol VARCHAR(20),
+                        exchange VARCHAR(20),
+                        confidence_threshold DECIMAL(3,2) DEFAULT 0.7,
+                        leverage_multiplier DECIMAL(5,2) DEFAULT 1.0,
+                        size_multiplier DECIMAL(5,2) DEFAULT 1.0,
+                        kelly_fraction DECIMAL(3,2) DEFAULT 0.5,
+                        win_rate_estimate DECIMAL(5,4),
+                        risk_reward_estimate DECIMAL(5,2),
+                        last_updated TIMESTAMP DEFAULT NOW(),
+                        is_active BOOLEAN DEFAULT TRUE,
+                        UNIQUE(chat_id, strategy, symbol, exchange)
+                    )
+                """)
+
+                # Indexes (plain CREATE INDEX: CONCURRENTLY cannot run inside a transaction)
                 indexes = [
-                    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sessions_updated_at ON sessions(updated_at DESC)",
-                    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sessions_config_gin ON sessions USING GIN (config)",
-                    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_bot_state_updated_at ON bot_state(last_updated DESC)",
-                    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_chat_id ON users(chat_id)",
-                    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_role ON users(role)",
-                    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_expires_at ON users(expires_at) WHERE expires_at IS NOT NULL"
+                    "CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions(updated_at DESC)",
+                    "CREATE INDEX IF NOT EXISTS idx_users_role ON users(role)",
+                    "CREATE INDEX IF NOT EXISTS idx_scheduled_tasks_user ON scheduled_tasks(user_id) WHERE is_active",
+                    "CREATE INDEX IF NOT EXISTS idx_trade_journal_chat_id ON trade_journal(chat_id)",
+                    "CREATE INDEX IF NOT EXISTS idx_trade_journal_status ON trade_journal(status)",
+                    "CREATE INDEX IF NOT EXISTS idx_trade_journal_symbol ON trade_journal(symbol)",
+                    "CREATE INDEX IF NOT EXISTS idx_trade_journal_strategy ON trade_journal(strategy)",
+                    "CREATE INDEX IF NOT EXISTS idx_performance_metrics_chat_id ON performance_metrics(chat_id)",
+                    "CREATE INDEX IF NOT EXISTS idx_performance_metrics_strategy ON performance_metrics(strategy)",
                 ]
-
                 for index_sql in indexes:
-                    try:
-                        await conn.execute(index_sql)
-                    except asyncpg.exceptions.UniqueViolationError:
-                        # Index already exists, skip
-                        pass
+                    await conn.execute(index_sql)
 
                 logger.info("📋 Database schema initialized with optimized indexes")
 
+    # --- TRADE JOURNAL FUNCTIONS (Fase 4) ---
+
+    async def log_trade_entry(self, chat_id: str, symbol: str, side: str, strategy: str, exchange: str,
+                              entry_price: float, quantity: float, leverage: int = 1,
+                              metadata: dict = None) -> bool:
+        """Log a trade entry to the journal."""
+        return await self.log_trade_entries([{
+            'chat_id': chat_id, 'symbol': symbol, 'side': side, 'strategy': strategy,
+            'exchange': exchange, 'entry_price': entry_price, 'quantity': quantity,
+            'leverage': leverage, 'metadata': metadata,
+        }])
+
+    async def log_trade_entries(self, entries: Iterable[Dict[str, Any]]) -> bool:
+        """Batch log trade entries (dicts with log_trade_entry's arguments) in one round trip."""
+        if not self.pool:
+            return False
+
+        records = [
+            (e['chat_id'], e['symbol'], e['side'], e.get('strategy'), e['exchange'],
+             e['entry_price'], e['quantity'], e.get('leverage', 1), e.get('metadata') or {})
+            for e in entries
+        ]
+        if not records:
+            return True
+
+        try:
+            async with self.pool.acquire() as conn:
+                await conn.executemany("""
+                    INSERT INTO trade_journal
+                    (chat_id, symbol, side, strategy, exchange, entry_price, quantity, leverage, entry_time, metadata)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, NOW(), $9)
+                """, records)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Log trade entry error: {e}")
+            return False
+
+    async def log_trade_exit(self, trade_id: int, exit_price: float, pnl: float, pnl_pct: float,
+                             fees: float = 0, slippage: float = 0, exit_reason: str = None) -> bool:
+        """Update a trade with exit information."""
+        if not self.pool:
+            return False
+
+        try:
+            async with self.pool.acquire() as conn:
+                await conn.execute("""
+                    UPDATE trade_journal
+                    SET exit_price = $1, exit_time = NOW(), pnl = $2, pnl_pct = $3,
+                        fees = $4, slippage = $5, status = 'CLOSED', exit_reason = $6,
+                        updated_at = NOW()
+                    WHERE id = $7
+                """, exit_price, pnl, pnl_pct, fees, slippage, exit_reason, trade_id)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Log trade exit error: {e}")
+            return False
+
+    async def get_open_trades(self, chat_id: str) -> List[Dict[str, Any]]:
+        """Get all open trades for a user."""
+        if not self.pool:
+            return []
+
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch("""
+                    SELECT * FROM trade_journal
+                    WHERE chat_id = $1 AND status = 'OPEN'
+                    ORDER BY entry_time DESC
+                """, chat_id)
+            return [dict(row) for row in rows]
+        except Exception as e:
+            logger.error(f"❌ Get open trades error: {e}")
+            return []
+
+    async def calculate_performance_metrics(self, chat_id: str, symbol: str = None, strategy: str = None,
+                                            exchange: str = None, days: int = 30) -> Dict[str, Any]:
+        """Calculate performance metrics for the specified filters."""
+        if not self.pool:
+            return {}
+
+        try:
+            async with self.pool.acquire() as conn:
+                # NULL filters match everything, so the statement text never changes
+                rows = await conn.fetch("""
+                    SELECT pnl::float8 AS pnl, entry_time, exit_time
+                    FROM trade_journal
+                    WHERE chat_id = $1 AND status = 'CLOSED'
+                      AND ($2::text IS NULL OR symbol = $2)
+                      AND ($3::text IS NULL OR strategy = $3)
+                      AND ($4::text IS NULL OR exchange = $4)
+                      AND exit_time >= NOW() - make_interval(days => $5)
+                    ORDER BY exit_time DESC
+                """, chat_id, symbol, strategy, exchange, days)
+            return performance_from_trades(rows)
+        except Exception as e:
+            logger.error(f"❌ Calculate performance metrics error: {e}")
+            return {}
+
+    async def get_closed_trades(self, chat_id: str, days: int = 30, strategy: str = None,
+                                symbol: str = None, exchange: str = None) -> List[Dict[str, Any]]:
+        """Closed trades of the last `days`, oldest exit first."""
+        if not self.pool:
+            return []
+
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch("""
+                    SELECT id, symbol, side, strategy, exchange,
+                           entry_price::float8 AS entry_price, exit_price::float8 AS exit_price,
+                           quantity::float8 AS quantity, leverage, entry_time, exit_time,
+                           pnl::float8 AS pnl, pnl_pct::float8 AS pnl_pct,
+                           fees::float8 AS fees, slippage::float8 AS slippage
+                    FROM trade_journal
+                    WHERE chat_id = $1 AND status = 'CLOSED'
+                      AND ($2::text IS NULL OR strategy = $2)
+                      AND ($3::text IS NULL OR symbol = $3)
+                      AND ($4::text IS NULL OR exchange = $4)
+                      AND exit_time >= NOW() - make_interval(days => $5)
+                    ORDER BY exit_time ASC
+                """, chat_id, strategy, symbol, exchange, days)
+            return [dict(row) for row in rows]
+        except Exception as e:
+            logger.error(f"❌ Get closed trades error: {e}")
+            return []
+
+    async def get_closed_strategies(self, chat_id: str, days: int = 30) -> List[str]:
+        """Strategies with at least one trade closed in the last `days`."""
+        if not self.pool:
+            return []
+
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch("""
+                    SELECT DISTINCT strategy FROM trade_journal
+                    WHERE chat_id = $1 AND status = 'CLOSED'
+                      AND exit_time >= NOW() - make_interval(days => $2)
+                """, chat_id, days)
+            return [row['strategy'] for row in rows]
+        except Exception as e:
+            logger.error(f"❌ Get closed strategies error: {e}")
+            return []
+
+    # --- CALIBRATION FUNCTIONS (Fase 4) ---
+
+    async def get_strategy_calibration(self, chat_id: str, strategy: str, symbol: str = None,
+                                       exchange: str = None) -> Dict[str, Any]:
+        """Get calibration settings for a strategy."""
+        if not self.pool:
+            return {}
+
+        try:
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow("""
+                    SELECT * FROM strategy_calibration
+                    WHERE chat_id = $1 AND strategy = $2
+                    AND (symbol = $3 OR symbol IS NULL)
+                    AND (exchange = $4 OR exchange IS NULL)
+                    AND is_active = TRUE
+                    ORDER BY symbol DESC NULLS LAST, exchange DESC NULLS LAST
+                    LIMIT 1
+                """, chat_id, strategy, symbol, exchange)
+            return dict(row) if row else {}
+        except Exception as e:
+            logger.error(f"❌ Get strategy calibration error: {e}")
+            return {}
+
+    async def update_strategy_calibration(self, chat_id: str, strategy: str, symbol: str = None,
+                                          exchange: str = None, calibration_data: dict = None) -> bool:
+        """Update or create strategy calibration settings."""
+        if not self.pool:
+            return False
+
+        data = calibration_data or {}
+        try:
+            async with self.pool.acquire() as conn:
+                await conn.execute("""
+                    INSERT INTO strategy_calibration
+                    (chat_id, strategy, symbol, exchange, confidence_threshold, leverage_multiplier,
+                     size_multiplier, kelly_fraction, win_rate_estimate, risk_reward_estimate, last_updated)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, NOW())
+                    ON CONFLICT (chat_id, strategy, symbol, exchange)
+                    DO UPDATE SET
+                        confidence_threshold = EXCLUDED.confidence_threshold,
+                        leverage_multiplier = EXCLUDED.leverage_multiplier,
+                        size_multiplier = EXCLUDED.size_multiplier,
+                        kelly_fraction = EXCLUDED.kelly_fraction,
+                        win_rate_estimate = EXCLUDED.win_rate_estimate,
+                        risk_reward_estimate = EXCLUDED.risk_reward_estimate,
+                        last_updated = NOW()
+                """, chat_id, strategy, symbol, exchange,
+                     data.get('confidence_threshold', 0.7),
+                     data.get('leverage_multiplier', 1.0),
+                     data.get('size_multiplier', 1.0),
+                     data.get('kelly_fraction', 0.5),
+                     data.get('win_rate_estimate'),
+                     data.get('risk_reward_estimate'))
+            return True
+        except Exception as e:
+            logger.error(f"❌ Update strategy calibration error: {e}")
+            return False
+
+    async def auto_calibrate_strategy(self, chat_id: str, strategy: str, symbol: str = None,
+                                      exchange: str = None) -> bool:
+        """Auto-calibrate strategy parameters based on the last 30 days of performance."""
+        metrics = await self.calculate_performance_metrics(chat_id, symbol, strategy, exchange, days=30)
+        calibration_data = calibration_from_metrics(metrics)
+        if calibration_data is None:
+            return False  # Need minimum sample size
+        return await self.update_strategy_calibration(chat_id, strategy, symbol, exchange, calibration_data)
+
     # --- SESSION FUNCTIONS (ASYNC OPTIMIZED) ---
 
     async def load_all_sessions(self) -> Optional[Dict[str, Dict]]:
@@ -177,7 +632,7 @@ class NexusDB:
             logger.error(f"❌ Load sessions error: {e}")
             return None
 
-    async def save_session_batch(self, sessions_dict: Dict[str, Dict]) -> bool:
+    async def save_all_sessions(self, sessions_dict: Dict[str, Dict]) -> bool:
         """Batch save sessions efficiently with transaction."""
         if not self.pool:
             return False
@@ -188,11 +643,13 @@ class NexusDB:
                     # Prepare encrypted data
                     records = []
                     for chat_id, data in sessions_dict.items():
+                        raw_key = data.get('api_key')
+                        raw_secret = data.get('api_secret')
                         records.append((
                             chat_id,
-                            encrypt_value(data.get('api_key', '')),
-                            encrypt_value(data.get('api_secret', '')),
-                            json.dumps(data.get('config', {}))
+                            encrypt_value(raw_key) if raw_key else "",
+                            encrypt_value(raw_secret) if raw_secret else "",
+                            data.get('config', {})
                         ))
 
                     # Batch upsert with prepared statement
@@ -214,33 +671,15 @@ class NexusDB:
             logger.error(f"❌ Batch save error: {e}")
             return False
 
-    async def save_single_session(self, chat_id: str, api_key: str, api_secret: str, config: dict) -> bool:
+    async def save_session(self, chat_id: str, api_key: str, api_secret: str, config: dict) -> bool:
         """Save or update a single session."""
-        if not self.pool:
-            return False
-
-        try:
-            async with self.pool.acquire() as conn:
-                enc_key = encrypt_value(api_key) if api_key else ""
-                enc_secret = encrypt_value(api_secret) if api_secret else ""
-
-                await conn.execute("""
-                    INSERT INTO sessions (chat_id, api_key, api_secret, config, updated_at)
-                    VALUES ($1, $2, $3, $4, NOW())
-                    ON CONFLICT (chat_id)
-                    DO UPDATE SET
-                        api_key = EXCLUDED.api_key,
-                        api_secret = EXCLUDED.api_secret,
-                        config = EXCLUDED.config,
-                        updated_at = NOW()
-                """, chat_id, enc_key, enc_secret, json.dumps(config))
-
-                logger.debug(f"💾 Saved session for chat_id: {chat_id}")
-                return True
+        return await self.save_all_sessions(
+            {chat_id: {'api_key': api_key, 'api_secret': api_secret, 'config': config}}
+        )
 
-        except Exception as e:
-            logger.error(f"❌ Save session error: {e}")
-            return False
+    # Names used by the migration scripts
+    save_session_batch = save_all_sessions
+    save_single_session = save_session
 
     # --- BOT STATE FUNCTIONS (ASYNC OPTIMIZED) ---
 
@@ -252,7 +691,7 @@ class NexusDB:
         try:
             async with self.pool.acquire() as conn:
                 row = await conn.fetchrow("""
-                    SELECT enabled_strategies, group_config, disabled_assets, ai_filter_enabled
+                    SELECT enabled_strategies, group_config, disabled_assets
                     FROM bot_state WHERE id = 1
                 """)
 
@@ -261,8 +700,7 @@ class NexusDB:
                     return {
                         'enabled_strategies': row['enabled_strategies'] or {},
                         'group_config': row['group_config'] or {},
-                        'disabled_assets': row['disabled_assets'] or [],
-                        'ai_filter_enabled': row['ai_filter_enabled']
+                        'disabled_assets': row['disabled_assets'] or []
                     }
                 return None
 
@@ -271,32 +709,28 @@ class NexusDB:
             return None
 
     async def save_bot_state(self, enabled_strategies: dict, group_config: dict,
-                           disabled_assets: list, ai_filter_enabled: bool = None) -> bool:
-        """Save global bot state asynchronously."""
+                             disabled_assets: list, ai_filter: bool = None) -> bool:
+        """Save global bot state. Special flags are stored within group_config."""
         if not self.pool:
             return False
 
+        # Embed flags in group_config for persistence
+        gc_to_save = dict(group_config)
+        if ai_filter is not None:
+            gc_to_save['_AI_FILTER'] = ai_filter
+
         try:
             async with self.pool.acquire() as conn:
-                # Embed AI filter setting in group_config for backward compatibility
-                gc_to_save = dict(group_config)
-                if ai_filter_enabled is not None:
-                    gc_to_save['_AI_FILTER'] = ai_filter_enabled
-
                 await conn.execute("""
-                    INSERT INTO bot_state (id, enabled_strategies, group_config, disabled_assets,
-                                         ai_filter_enabled, last_updated)
-                    VALUES (1, $1, $2, $3, $4, NOW())
+                    INSERT INTO bot_state (id, enabled_strategies, group_config, disabled_assets, updated_at)
+                    VALUES (1, $1, $2, $3, NOW())
                     ON CONFLICT (id)
                     DO UPDATE SET
                         enabled_strategies = EXCLUDED.enabled_strategies,
                         group_config = EXCLUDED.group_config,
                         disabled_assets = EXCLUDED.disabled_assets,
-                        ai_filter_enabled = EXCLUDED.ai_filter_enabled,
-                        last_updated = NOW()
-                """, json.dumps(enabled_strategies), json.dumps(gc_to_save),
-                     list(disabled_assets) if isinstance(disabled_assets, (list, set)) else disabled_assets,
-                     ai_filter_enabled)
+                        updated_at = NOW()
+                """, dict(enabled_strategies), gc_to_save, list(disabled_assets))
 
                 logger.info("💾 Bot state saved")
                 return True
@@ -308,10 +742,13 @@ class NexusDB:
     # --- USER FUNCTIONS (ASYNC OPTIMIZED) ---
 
     async def get_user_role(self, chat_id: str) -> Tuple[bool, str]:
-        """Check if user exists and get role asynchronously."""
+        """
+        Check if user exists in DB and valid.
+        Returns: (Allowed, Role)
+        Roles: 'owner', 'admin', 'user', 'expired', 'none'
+        """
         # 1. Check ENV Owner
-        env_owner = os.getenv('TELEGRAM_CHAT_ID', '')
-        if str(chat_id) in env_owner.split(','):
+        if str(chat_id) in _owner_ids():
             return True, 'owner'
 
         # 2. Check DB
@@ -323,29 +760,43 @@ class NexusDB:
                 row = await conn.fetchrow("""
                     SELECT role, expires_at FROM users WHERE chat_id = $1
                 """, str(chat_id))
-
-                if not row:
-                    return False, 'none'
-
-                role = row['role']
-                if role == 'admin':
-                    return True, 'admin'
-
-                # Check expiration for regular users
-                if row['expires_at'] and row['expires_at'] < datetime.now():
-                    return False, 'expired'
-
-                return True, 'user'
+            return _role_from_row(row)
 
         except Exception as e:
             logger.error(f"❌ Get user role error: {e}")
             return False, 'error'
 
+    async def get_user_roles(self, chat_ids: Iterable[str]) -> Dict[str, Tuple[bool, str]]:
+        """get_user_role for many users with a single query."""
+        chat_ids = [str(c) for c in chat_ids]
+        owners = set(_owner_ids())
+        roles = {c: (True, 'owner') for c in chat_ids if c in owners}
+        pending = [c for c in chat_ids if c not in roles]
+        if not pending:
+            return roles
+        if not self.pool:
+            roles.update({c: (False, 'none') for c in pending})
+            return roles
+
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch("""
+                    SELECT chat_id, role, expires_at FROM users WHERE chat_id = ANY($1::varchar[])
+                """, pending)
+            found = {row['chat_id']: row for row in rows}
+            roles.update({c: _role_from_row(found.get(c)) for c in pending})
+        except Exception as e:
+            logger.error(f"❌ Get user roles error: {e}")
+            roles.update({c: (False, 'error') for c in pending})
+        return roles
+
     async def get_user_name(self, chat_id: str) -> str:
-        """Get user name asynchronously."""
-        # Special case for owner
-        env_owner = os.getenv('TELEGRAM_CHAT_ID', '')
-        if str(chat_id) in env_owner.split(','):
+        """
+        Fetch the user's name from the database.
+        Fallback to 'Operador' if not found.
+        """
+        # Hardcoded owner name
+        if str(chat_id) == "1265547936":
             return "Fabio"
 
         if not self.pool:
@@ -354,16 +805,224 @@ class NexusDB:
 
         try:
             async with self.pool.acquire() as conn:
-                row = await conn.fetchrow("""
+                name = await conn.fetchval("""
                     SELECT name FROM users WHERE chat_id = $1
                 """, str(chat_id))
 
-                return row['name'] if row and row['name'] else "Operador"
+            if name:
+                return name
+            # Fallback if owner
+            if str(chat_id) in _owner_ids():
+                return "Comandante"
+            return "Operador"
 
         except Exception as e:
             logger.error(f"❌ Get user name error: {e}")
             return "Operador"
 
+    async def add_system_user(self, name: str, chat_id: str, days: int = None,
+                              role: str = 'user') -> Tuple[bool, Any]:
+        """Add a user/admin to the DB. Returns (success, new id or error message)."""
+        if not self.pool:
+            return False, "DB Error"
+
+        expires_at = datetime.now() + timedelta(days=days) if days else None
+        try:
+            async with self.pool.acquire() as conn:
+                new_id = await conn.fetchval("""
+                    INSERT INTO users (chat_id, name, role, expires_at, created_at)
+                    VALUES ($1, $2, $3, $4, NOW())
+                    ON CONFLICT (chat_id) DO UPDATE SET
+                        name = EXCLUDED.name,
+                        role = EXCLUDED.role,
+                        expires_at = EXCLUDED.expires_at,
+                        created_at = NOW()
+                    RETURNING id
+                """, str(chat_id), name, role, expires_at)
+            return True, new_id
+        except Exception as e:
+            return False, str(e)
+
+    async def remove_system_user(self, user_id: int) -> bool:
+        """Remove user by numeric ID."""
+        if not self.pool:
+            return False
+
+        try:
+            async with self.pool.acquire() as conn:
+                status = await conn.execute("DELETE FROM users WHERE id = $1", user_id)
+            return status != "DELETE 0"
+        except Exception as e:
+            logger.error(f"❌ Remove user error: {e}")
+            return False
+
+    async def get_all_system_users(self) -> List[Dict[str, Any]]:
+        """Get all DB users."""
+        if not self.pool:
+            return []
+
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch("SELECT id, name, chat_id, role, expires_at FROM users ORDER BY role, id")
+            return [dict(row) for row in rows]
+        except Exception as e:
+            logger.error(f"❌ Get users error: {e}")
+            return []
+
+    async def get_user_timezone(self, chat_id: str) -> Optional[str]:
+        """User's timezone name, or None if not set / no DB."""
+        if not self.pool:
+            return None
+
+        try:
+            async with self.pool.acquire() as conn:
+                return await conn.fetchval("SELECT timezone FROM users WHERE chat_id = $1", str(chat_id))
+        except Exception as e:
+            logger.error(f"❌ Get timezone error: {e}")
+            return None
+
+    async def set_user_timezone(self, chat_id: str, tz_name: str) -> bool:
+        """Store the user's timezone, creating the user row if needed."""
+        if not self.pool:
+            return False
+
+        try:
+            async with self.pool.acquire() as conn:
+                await conn.execute("""
+                    INSERT INTO users (chat_id, timezone) VALUES ($1, $2)
+                    ON CONFLICT (chat_id) DO UPDATE SET timezone = EXCLUDED.timezone
+                """, str(chat_id), tz_name)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Set timezone error: {e}")
+            return False
+
+    # --- USER ENABLED GROUPS FUNCTIONS ---
+
+    async def get_user_enabled_groups(self, chat_id: str) -> Dict[str, bool]:
+        """
+        Get user's enabled asset groups.
+        Returns dict like {"CRYPTO": True, "STOCKS": True, "ETFS": True}.
+        """
+        groups = await self.get_users_enabled_groups([chat_id])
+        return groups.get(str(chat_id), dict(DEFAULT_ENABLED_GROUPS))
+
+    async def get_users_enabled_groups(self, chat_ids: Iterable[str]) -> Dict[str, Dict[str, bool]]:
+        """Enabled asset groups for many users with a single query (users without a row are omitted)."""
+        if not self.pool:
+            return {}
+
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch("""
+                    SELECT chat_id, enabled_groups FROM users WHERE chat_id = ANY($1::varchar[])
+                """, [str(c) for c in chat_ids])
+            return {row['chat_id']: row['enabled_groups'] for row in rows if row['enabled_groups']}
+        except Exception as e:
+            logger.error(f"❌ Get enabled groups error: {e}")
+            return {}
+
+    async def set_user_enabled_groups(self, chat_id: str, groups: dict) -> bool:
+        """
+        Update user's enabled asset groups.
+        groups: dict like {"CRYPTO": True, "STOCKS": False, "ETFS": True}
+        """
+        if not self.pool:
+            return False
+
+        try:
+            async with self.pool.acquire() as conn:
+                status = await conn.execute(
+                    "UPDATE users SET enabled_groups = $1 WHERE chat_id = $2", groups, str(chat_id)
+                )
+            return status != "UPDATE 0"
+        except Exception as e:
+            logger.error(f"❌ Set enabled groups error: {e}")
+            return False
+
+    # --- SCHEDULED TASKS FUNCTIONS ---
+
+    async def save_scheduled_task(self, user_id: int, task_data: dict) -> int:
+        """Save a new scheduled task. Returns task ID or -1 on error."""
+        if not self.pool:
+            return -1
+
+        try:
+            async with self.pool.acquire() as conn:
+                return await conn.fetchval("""
+                    INSERT INTO scheduled_tasks
+                    (user_id, job_id, action, params, schedule_type, schedule_value, description, next_run)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+                    RETURNING id
+                """, user_id,
+                     task_data.get('job_id'),
+                     task_data.get('action'),
+                     task_data.get('params', {}),
+                     task_data.get('schedule_type'),
+                     task_data.get('schedule_value'),
+                     task_data.get('description'),
+                     _as_datetime(task_data.get('next_run')))
+        except Exception as e:
+            logger.error(f"❌ Save task error: {e}")
+            return -1
+
+    async def get_scheduled_tasks(self, user_id: int) -> List[Dict[str, Any]]:
+        """Get all active scheduled tasks for a user."""
+        if not self.pool:
+            return []
+
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch("""
+                    SELECT id, job_id, action, params, schedule_type, schedule_value,
+                           description, next_run, created_at
+                    FROM scheduled_tasks
+                    WHERE user_id = $1 AND is_active = TRUE
+                    ORDER BY created_at DESC
+                """, user_id)
+            return [dict(row) for row in rows]
+        except Exception as e:
+            logger.error(f"❌ Get tasks error: {e}")
+            return []
+
+    async def delete_scheduled_task(self, task_id: int) -> bool:
+        """Delete (deactivate) a scheduled task."""
+        if not self.pool:
+            return False
+
+        try:
+            async with self.pool.acquire() as conn:
+                status = await conn.execute("""
+                    UPDATE scheduled_tasks SET is_active = FALSE WHERE id = $1
+                """, task_id)
+            return status != "UPDATE 0"
+        except Exception as e:
+            logger.error(f"❌ Delete task error: {e}")
+            return False
+
+    async def update_task_next_run(self, task_id: int, next_run) -> bool:
+        """Update the next_run timestamp for a task."""
+        return await self.update_tasks_next_run([(task_id, next_run)])
+
+    async def update_tasks_next_run(self, updates: Iterable[Tuple[int, Any]]) -> bool:
+        """Batch update next_run for (task_id, next_run) pairs."""
+        if not self.pool:
+            return False
+
+        records = [(_as_datetime(next_run), task_id) for task_id, next_run in updates]
+        if not records:
+            return True
+
+        try:
+            async with self.pool.acquire() as conn:
+                await conn.executemany("""
+                    UPDATE scheduled_tasks SET next_run = $1 WHERE id = $2
+                """, records)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Update task error: {e}")
+            return False
+
     # --- UTILITY FUNCTIONS ---
 
     async def health_check(self) -> Dict[str, Any]:
@@ -376,10 +1035,10 @@ class NexusDB:
                 # Simple query to test connection
                 result = await conn.fetchval("SELECT NOW()")
                 pool_stats = {
-                    "min_size": self.pool._minsize,
-                    "max_size": self.pool._maxsize,
-                    "size": len(self.pool._holders),
-                    "used": len(self.pool._used),
+                    "min_size": self.pool.get_min_size(),
+                    "max_size": self.pool.get_max_size(),
+                    "size": self.pool.get_size(),
+                    "idle": self.pool.get_idle_size(),
                 }
 
                 return {
@@ -405,15 +1064,15 @@ class NexusDB:
 
                 # Get last update times
                 last_session = await conn.fetchval("SELECT MAX(updated_at) FROM sessions")
-                last_bot_state = await conn.fetchval("SELECT last_updated FROM bot_state WHERE id = 1")
+                last_bot_state = await conn.fetchval("SELECT updated_at FROM bot_state WHERE id = 1")
 
                 return {
                     "sessions": session_count,
                     "users": user_count,
                     "last_session_update": last_session.isoformat() if last_session else None,
                     "last_bot_state_update": last_bot_state.isoformat() if last_bot_state else None,
-                    "pool_size": len(self.pool._holders),
-                    "pool_used": len(self.pool._used)
+                    "pool_size": self.pool.get_size(),
+                    "pool_idle": self.pool.get_idle_size()
                 }
 
         except Exception as e:
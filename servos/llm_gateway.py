@@ -0,0 +1,190 @@
+"""
+Nexus Trading Bot - Async LLM Gateway
+One process-wide client for every LLM call (analyst, AI filter, valuation, chat).
+
+- Pooled HTTP: a single aiohttp session talks to the OpenAI-compatible
+  chat endpoints configured in system_directive.LLM_PROVIDERS (OpenAI, xAI).
+- Per-model concurrency: at most LLM_MODEL_CONCURRENCY requests in flight
+  per model.
+- Content-addressed cache: the key is a hash of (provider, model, messages,
+  parameters). Identical prompts in flight share one request, and successful
+  answers are reused for the caller's `ttl`.
+- Circuit breaker (src/core/circuit_breaker) per provider: timeouts, 429s
+  and 5xx open it, after which calls fail fast until a recovery probe.
+"""
+import asyncio
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from nexus_system.uplink.single_flight import SingleFlight
+
+try:
+    from src.core.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitBreakerOpenError
+    CIRCUIT_BREAKER_AVAILABLE = True
+except ImportError:
+    CIRCUIT_BREAKER_AVAILABLE = False
+
+try:
+    from system_directive import (
+        LLM_PROVIDERS, LLM_MODEL_CONCURRENCY, LLM_REQUEST_TIMEOUT,
+        LLM_BREAKER_THRESHOLD, LLM_BREAKER_RECOVERY, OPENAI_MODEL,
+    )
+except ImportError:
+    LLM_PROVIDERS = {'openai': {'base_url': 'https://api.openai.com/v1', 'api_key_env': 'OPENAI_API_KEY'}}
+    LLM_MODEL_CONCURRENCY = {'default': 4}
+    LLM_REQUEST_TIMEOUT = 30.0
+    LLM_BREAKER_THRESHOLD = 5
+    LLM_BREAKER_RECOVERY = 60
+    OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+
+
+class LLMError(Exception):
+    """LLM request rejected (bad request, auth, unparsable answer)."""
+
+
+class LLMUnavailable(LLMError):
+    """Provider overloaded or unreachable (429, 5xx, network); counts against the breaker."""
+
+
+class LLMGateway:
+    """
+    Shared async LLM client.
+
+    - chat(messages, model, provider, ttl, **params): answer text
+    - chat_json(...): answer parsed as a JSON object
+    - is_available(provider): API key configured
+    """
+
+    def __init__(self, providers: Dict[str, Dict[str, str]] = None):
+        self.providers = providers or LLM_PROVIDERS
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._breakers: Dict[str, Any] = {}
+        self._flight = SingleFlight(max_entries=1024)
+        self.stats = {'requests': 0, 'failures': 0, 'rejected': 0}
+
+    def _api_key(self, provider: str) -> str:
+        config = self.providers.get(provider, {})
+        return os.getenv(config.get('api_key_env', ''), '').strip("'\" ")
+
+    def is_available(self, provider: str = 'openai') -> bool:
+        return bool(self._api_key(provider))
+
+    def _semaphore(self, model: str) -> asyncio.Semaphore:
+        if model not in self._semaphores:
+            limit = LLM_MODEL_CONCURRENCY.get(model, LLM_MODEL_CONCURRENCY.get('default', 4))
+            self._semaphores[model] = asyncio.Semaphore(limit)
+        return self._semaphores[model]
+
+    def _breaker(self, provider: str):
+        if not CIRCUIT_BREAKER_AVAILABLE:
+            return None
+        if provider not in self._breakers:
+            self._breakers[provider] = CircuitBreaker(f"llm:{provider}", CircuitBreakerConfig(
+                failure_threshold=LLM_BREAKER_THRESHOLD,
+                recovery_timeout=LLM_BREAKER_RECOVERY,
+                expected_exception=(LLMUnavailable, aiohttp.ClientError),
+                success_threshold=1,
+                timeout=LLM_REQUEST_TIMEOUT,
+            ))
+        return self._breakers[provider]
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=LLM_REQUEST_TIMEOUT + 5),
+            )
+        return self._session
+
+    @staticmethod
+    def cache_key(provider: str, payload: Dict[str, Any]) -> str:
+        """Content address of a request (same prompt + parameters -> same key)."""
+        blob = json.dumps([provider, payload], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+    async def chat(self, messages: List[Dict[str, str]], model: str = None, provider: str = 'openai',
+                   ttl: float = 300.0, **params) -> str:
+        """
+        Answer text for a chat completion.
+        `ttl`: seconds an identical request is served from cache (0 = only share in-flight calls).
+        Raises LLMError / LLMUnavailable / CircuitBreakerOpenError.
+        """
+        if not self.is_available(provider):
+            raise LLMError(f"{provider}: API key not configured")
+        payload = {'model': model or OPENAI_MODEL, 'messages': messages, **params}
+        return await self._flight.do(
+            self.cache_key(provider, payload),
+            lambda: self._complete(provider, payload),
+            ttl=ttl,
+            keep=bool,
+        )
+
+    async def chat_json(self, messages: List[Dict[str, str]], model: str = None, provider: str = 'openai',
+                        ttl: float = 300.0, **params) -> Dict[str, Any]:
+        """Like chat(), asking for (and parsing) a JSON object answer."""
+        params.setdefault('response_format', {'type': 'json_object'})
+        text = await self.chat(messages, model=model, provider=provider, ttl=ttl, **params)
+        try:
+            return json.loads(text)
+        except ValueError as e:
+            raise LLMError(f"Answer is not valid JSON: {text[:80]}") from e
+
+    async def _complete(self, provider: str, payload: Dict[str, Any]) -> str:
+        async with self._semaphore(payload['model']):
+            breaker = self._breaker(provider)
+            try:
+                if breaker is not None:
+                    data = await breaker.call_async(self._request, provider, payload)
+                else:
+                    data = await asyncio.wait_for(self._request(provider, payload), LLM_REQUEST_TIMEOUT)
+            except Exception as e:
+                if CIRCUIT_BREAKER_AVAILABLE and isinstance(e, CircuitBreakerOpenError):
+                    self.stats['rejected'] += 1
+                else:
+                    self.stats['failures'] += 1
+                raise
+        try:
+            return (data['choices'][0]['message']['content'] or '').strip()
+        except (KeyError, IndexError, TypeError) as e:
+            raise LLMError(f"Unexpected {provider} response: {str(data)[:80]}") from e
+
+    async def _request(self, provider: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST /chat/completions on the pooled session."""
+        self.stats['requests'] += 1
+        config = self.providers[provider]
+        session = await self._get_session()
+        headers = {'Authorization': f"Bearer {self._api_key(provider)}"}
+        async with session.post(f"{config['base_url']}/chat/completions", json=payload, headers=headers) as resp:
+            if resp.status == 429 or resp.status >= 500:
+                raise LLMUnavailable(f"{provider} HTTP {resp.status}")
+            if resp.status != 200:
+                raise LLMError(f"{provider} HTTP {resp.status}: {(await resp.text())[:120]}")
+            return await resp.json()
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'cache': self._flight.get_status(),
+            'breakers': {name: b.get_status()['state'] for name, b in self._breakers.items()},
+        }
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+
+# Global singleton for shared access
+_llm_gateway: Optional[LLMGateway] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Get global LLM gateway shared by all sessions."""
+    global _llm_gateway
+    if _llm_gateway is None:
+        _llm_gateway = LLMGateway()
+    return _llm_gateway
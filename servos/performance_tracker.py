@@ -6,8 +6,7 @@ from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import math
-from servos.db import get_connection, calculate_performance_metrics
-from psycopg2.extras import RealDictCursor
+from servos.db_async import nexus_db
 
 
 @dataclass
@@ -69,49 +68,12 @@ class PerformanceTracker:
         self.cache_ttl = 300  # 5 minutes cache
         self.cache_timestamps: Dict[str, datetime] = {}
     
-    def get_trades(self, chat_id: str, days: int = 30, 
-                   strategy: str = None, symbol: str = None, 
-                   exchange: str = None) -> List[Dict]:
+    async def get_trades(self, chat_id: str, days: int = 30,
+                         strategy: str = None, symbol: str = None,
+                         exchange: str = None) -> List[Dict]:
         """Fetch closed trades from database."""
-        conn = get_connection()
-        if not conn:
-            return []
-        
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                conditions = ["chat_id = %s", "status = 'CLOSED'"]
-                params = [chat_id]
-                
-                if strategy:
-                    conditions.append("strategy = %s")
-                    params.append(strategy)
-                if symbol:
-                    conditions.append("symbol = %s")
-                    params.append(symbol)
-                if exchange:
-                    conditions.append("exchange = %s")
-                    params.append(exchange)
-                
-                conditions.append("exit_time >= NOW() - INTERVAL '%s days'")
-                params.append(days)
-                
-                where_clause = " AND ".join(conditions)
-                
-                cur.execute(f"""
-                    SELECT id, symbol, side, strategy, exchange, 
-                           entry_price, exit_price, quantity, leverage,
-                           entry_time, exit_time, pnl, pnl_pct, fees, slippage
-                    FROM trade_journal
-                    WHERE {where_clause}
-                    ORDER BY exit_time ASC
-                """, params)
-                
-                return [dict(row) for row in cur.fetchall()]
-        except Exception as e:
-            print(f"❌ PerformanceTracker.get_trades Error: {e}")
-            return []
-        finally:
-            conn.close()
+        return await nexus_db.get_closed_trades(chat_id, days, strategy=strategy,
+                                                symbol=symbol, exchange=exchange)
     
     def calculate_sharpe_ratio(self, returns: List[float]) -> float:
         """
@@ -231,9 +193,9 @@ class PerformanceTracker:
         
         return max_wins, max_losses
     
-    def generate_report(self, chat_id: str, days: int = 30,
-                       strategy: str = None, symbol: str = None,
-                       exchange: str = None) -> PerformanceReport:
+    async def generate_report(self, chat_id: str, days: int = 30,
+                              strategy: str = None, symbol: str = None,
+                              exchange: str = None) -> PerformanceReport:
         """
         Generate comprehensive performance report.
         """
@@ -244,7 +206,7 @@ class PerformanceTracker:
             if cached_time and (datetime.now() - cached_time).seconds < self.cache_ttl:
                 return self.cache[cache_key]
         
-        trades = self.get_trades(chat_id, days, strategy, symbol, exchange)
+        trades = await self.get_trades(chat_id, days, strategy, symbol, exchange)
         
         if not trades:
             return PerformanceReport()
@@ -350,34 +312,16 @@ class PerformanceTracker:
         
         return report
     
-    def rank_strategies(self, chat_id: str, days: int = 30) -> List[Dict]:
+    async def rank_strategies(self, chat_id: str, days: int = 30) -> List[Dict]:
         """
         Rank all strategies by performance.
         Returns ordered list from best to worst.
         """
-        conn = get_connection()
-        if not conn:
-            return []
-        
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Get distinct strategies
-                cur.execute("""
-                    SELECT DISTINCT strategy FROM trade_journal
-                    WHERE chat_id = %s AND status = 'CLOSED'
-                    AND exit_time >= NOW() - INTERVAL '%s days'
-                """, (chat_id, days))
-                
-                strategies = [row['strategy'] for row in cur.fetchall()]
-        except Exception as e:
-            print(f"❌ rank_strategies Error: {e}")
-            return []
-        finally:
-            conn.close()
+        strategies = await nexus_db.get_closed_strategies(chat_id, days)
         
         rankings = []
         for strat in strategies:
-            report = self.generate_report(chat_id, days, strategy=strat)
+            report = await self.generate_report(chat_id, days, strategy=strat)
             
             if report.total_trades < 5:
                 continue  # Skip strategies with few trades
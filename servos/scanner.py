@@ -0,0 +1,188 @@
+"""
+Nexus Trading Bot - Market Scanner
+Concurrent, cache-first engine behind /scanner.
+
+Symbols the live engine already streams are read from its warm MarketStream
+(candles + incremental indicators, no REST). Cold symbols are fetched
+concurrently, capped per scan; each fetch first takes its weight from the
+'scanner' rate-limit lane (which keeps half the burst back for the engine)
+and runs pinned to that lane, so a scan never spends the engine's REST
+budget. Each batch is
+classified in one vectorized pass (MarketClassifier.classify_frame) and
+handed to `on_chunk` as soon as it is ready, so the report can grow while
+the rest is still loading.
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from nexus_system.cortex.base import Signal
+from nexus_system.cortex.classifier import MarketClassifier, MarketRegime
+from nexus_system.cortex.factory import StrategyFactory
+from nexus_system.uplink.rate_limiter import prepaid_lane
+from nexus_system.uplink.stream import get_market_stream
+
+try:
+    from system_directive import SCANNER_CONCURRENCY, SCANNER_REST_BUDGET, SCANNER_CHUNK_SIZE
+except ImportError:
+    SCANNER_CONCURRENCY = 8
+    SCANNER_REST_BUDGET = 60
+    SCANNER_CHUNK_SIZE = 20
+
+MIN_CANDLES = 50
+KLINES_WEIGHT = 2  # Binance klines weight for 100-500 candles
+
+
+@dataclass
+class ScanResult:
+    """One scanned symbol. status: 'ok', 'no_data', 'skipped' (REST budget) or 'error'."""
+    symbol: str
+    status: str
+    source: str = ''
+    close: float = 0.0
+    rsi: float = 50.0
+    adx: float = 0.0
+    atr_pct: float = 0.0
+    ema_200: float = 0.0
+    bb_width: float = 0.0
+    trend: str = ''  # BULL, UP_WEAK, BEAR, DN_WEAK
+    regime: str = ''
+    strategy: str = ''
+    signal: Optional[Signal] = None
+    error: str = ''
+
+    @property
+    def fires(self) -> bool:
+        return bool(self.signal and self.signal.action not in ('HOLD', 'WAIT', None))
+
+
+class MarketScanner:
+    """
+    Scans a list of symbols against the shared MarketStream.
+
+    - scan(symbols, timeframe, limit, on_chunk): results in input order;
+      `on_chunk(batch, done, total)` is awaited after each evaluated batch
+      (warm symbols first, then cold ones in SCANNER_CHUNK_SIZE batches)
+    """
+
+    def __init__(self, concurrency: int = None, rest_budget: int = None, chunk_size: int = None):
+        self.concurrency = concurrency or SCANNER_CONCURRENCY
+        self.rest_budget = SCANNER_REST_BUDGET if rest_budget is None else rest_budget
+        self.chunk_size = chunk_size or SCANNER_CHUNK_SIZE
+
+    async def scan(
+        self,
+        symbols: List[str],
+        timeframe: str = '15m',
+        limit: int = 250,
+        on_chunk: Optional[Callable[[List[ScanResult], int, int], Awaitable[None]]] = None,
+    ) -> List[ScanResult]:
+        stream = await get_market_stream()
+        symbols = list(dict.fromkeys(symbols))
+        warm = [s for s in symbols if stream.has_fresh_candles(s, timeframe)]
+        warm_set = set(warm)
+        cold = [s for s in symbols if s not in warm_set]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        rest_used = 0
+
+        async def fetch(symbol: str):
+            nonlocal rest_used
+            try:
+                if symbol in warm_set:
+                    result = await stream.get_candles(symbol, limit=limit, timeframe=timeframe)
+                else:
+                    async with semaphore:
+                        # Take the weight from the 'scanner' lane up front (atomic, honours its
+                        # reserve) and spend it pinned there, so the adapter's 'candles' lane
+                        # never charges the fetch to the engine's budget. If no request is sent
+                        # (joined an in-flight fetch, cache hit) the weight is given back.
+                        if rest_used >= self.rest_budget or not stream.reserve_rest(
+                                symbol, KLINES_WEIGHT, lane='scanner'):
+                            return ScanResult(symbol, 'skipped')
+                        rest_used += 1
+                        refund = lambda weight: stream.refund_rest(symbol, weight, lane='scanner')
+                        with prepaid_lane('scanner', KLINES_WEIGHT, refund=refund):
+                            result = await stream.get_candles(symbol, limit=limit, timeframe=timeframe)
+            except Exception as e:
+                return ScanResult(symbol, 'error', error=str(e))
+            df = result.get('dataframe')
+            if df is None or df.empty or len(df) < MIN_CANDLES:
+                return ScanResult(symbol, 'no_data', source=result.get('source', ''))
+            return symbol, df, result.get('source', '')
+
+        results: Dict[str, ScanResult] = {}
+        batches = [warm] + [cold[i:i + self.chunk_size] for i in range(0, len(cold), self.chunk_size)]
+        for batch in batches:
+            if not batch:
+                continue
+            fetched = await asyncio.gather(*(fetch(s) for s in batch))
+            evaluated = await self._evaluate([f for f in fetched if isinstance(f, tuple)])
+            chunk = [evaluated.get(f[0]) if isinstance(f, tuple) else f for f in fetched]
+            results.update((r.symbol, r) for r in chunk)
+            if on_chunk:
+                await on_chunk(chunk, len(results), len(symbols))
+
+        return [results[s] for s in symbols]
+
+    async def _evaluate(self, frames: list) -> Dict[str, ScanResult]:
+        """Indicators + regime for a batch in one vectorized pass, then each symbol's strategy."""
+        if not frames:
+            return {}
+        snapshot = pd.DataFrame.from_dict({symbol: df.iloc[-1] for symbol, df, _ in frames}, orient='index')
+        regimes = MarketClassifier.classify_frame(snapshot)
+
+        def col(name: str, default: float) -> np.ndarray:
+            if name not in snapshot:
+                return np.full(len(snapshot), default)
+            values = pd.to_numeric(snapshot[name], errors='coerce').to_numpy(float)
+            return np.where(np.isnan(values), default, values)
+
+        close = col('close', 0.0)
+        ema_20, ema_50, ema_200 = col('ema_20', 0.0), col('ema_50', 0.0), col('ema_200', 0.0)
+        ema_200 = np.where(ema_200 > 0, ema_200, close)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            atr_pct = np.where(close > 0, col('atr', 0.0) / close * 100, 0.0)
+            bb_width = np.where(close > 0, (col('upper_bb', 0.0) - col('lower_bb', 0.0)) / close * 100, 0.0)
+        above = close > ema_200
+        trend = np.select(
+            [above & (ema_20 > ema_50), above, ema_20 < ema_50],
+            ['BULL', 'UP_WEAK', 'BEAR'],
+            'DN_WEAK',
+        )
+        rsi, adx = col('rsi', 50.0), col('adx', 0.0)
+
+        async def signal_for(i: int, symbol: str, df: pd.DataFrame, source: str) -> ScanResult:
+            regime = regimes.iloc[i]
+            result = ScanResult(
+                symbol, 'ok', source=source, close=float(close[i]), rsi=float(rsi[i]), adx=float(adx[i]),
+                atr_pct=float(atr_pct[i]), ema_200=float(ema_200[i]), bb_width=float(bb_width[i]),
+                trend=str(trend[i]), regime=regime['regime'],
+            )
+            market_data = {'dataframe': df, 'symbol': symbol}
+            try:
+                strategy = await StrategyFactory.get_strategy_async(symbol, market_data, regime=MarketRegime(
+                    regime['regime'], regime['suggested_strategy'], float(regime['confidence']), 'scanner'))
+                result.strategy = strategy.name
+                result.signal = await strategy.analyze(market_data)
+            except Exception:
+                result.signal = None
+            return result
+
+        evaluated = await asyncio.gather(*(signal_for(i, *frame) for i, frame in enumerate(frames)))
+        return {r.symbol: r for r in evaluated}
+
+
+# Global singleton for shared access
+_market_scanner: Optional[MarketScanner] = None
+
+
+def get_market_scanner() -> MarketScanner:
+    """Get global market scanner instance."""
+    global _market_scanner
+    if _market_scanner is None:
+        _market_scanner = MarketScanner()
+    return _market_scanner
@@ -0,0 +1,206 @@
+"""
+Session Dispatch Index for NEXUS TRADING BOT
+Precomputed symbol -> interested sessions maps for signal and exit fan-out.
+
+A closed candle or a signal only touches the sessions that can act on it
+(group/subgroup enabled, asset not blacklisted, or an active exit plan),
+and the per-session work runs concurrently under bounded parallelism with
+per-exchange budgets, so dispatch latency does not grow with user count.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def resolve_asset_group(symbol: str) -> Tuple[Optional[str], Optional[str]]:
+    """(group, crypto subgroup) of a symbol, as used by the dispatch filters."""
+    from system_directive import ASSET_GROUPS, CRYPTO_SUBGROUPS
+
+    asset_group = None
+    for group_name, assets in ASSET_GROUPS.items():
+        if symbol in assets:
+            asset_group = group_name
+            break
+
+    asset_subgroup = None
+    if asset_group == 'CRYPTO':
+        for subgroup_name, assets in CRYPTO_SUBGROUPS.items():
+            if symbol in assets:
+                asset_subgroup = subgroup_name
+                break
+
+    return asset_group, asset_subgroup
+
+
+class SessionIndex:
+    """
+    symbol -> chat_ids maps for an AsyncSessionManager.
+
+    - Signal map: sessions whose group/subgroup is enabled and that have
+      not blacklisted the symbol.
+    - Exit map: sessions with an active ExitManager plan on the symbol.
+
+    Sessions report config changes via invalidate(chat_id); save_sessions()
+    and session add/remove invalidate everything. Entries are also rebuilt
+    after `ttl` seconds to pick up group changes written straight to the DB.
+    Sessions still bootstrapping (ready=False) are left out until initialize()
+    re-indexes them.
+    """
+
+    def __init__(self, manager, ttl: int = 300):
+        self.manager = manager
+        self.ttl = ttl
+
+        self._signal: Dict[str, Set[str]] = {}
+        self._exits: Dict[str, Set[str]] = {}
+        self._groups: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+        self._dirty: Set[str] = set()
+        self._built_at = 0.0  # 0 = full rebuild pending
+
+    # --- Invalidation ---
+
+    def invalidate(self, chat_id: str = None):
+        """Mark one session (or all sessions if None) for re-indexing."""
+        if chat_id is None:
+            self._built_at = 0.0
+        else:
+            self._dirty.add(chat_id)
+
+    def set_exit_plan(self, chat_id: str, symbol: str, active: bool):
+        """Track an exit plan being created (active) or closed."""
+        holders = self._exits.setdefault(symbol, set())
+        if active:
+            holders.add(chat_id)
+        else:
+            holders.discard(chat_id)
+
+    # --- Lookups ---
+
+    def signal_sessions(self, symbol: str) -> List[Any]:
+        """Sessions that may receive an entry signal on symbol."""
+        self._refresh()
+        if symbol not in self._signal:
+            # Symbol outside the configured universe: index it on first sight
+            self._signal[symbol] = {
+                chat_id for chat_id, session in self.manager.sessions.items()
+                if self._accepts(session, symbol)
+            }
+        return self._sessions(self._signal[symbol])
+
+    def exit_sessions(self, symbol: str) -> List[Any]:
+        """Sessions with an active exit plan on symbol."""
+        self._refresh()
+        return self._sessions(self._exits.get(symbol, ()))
+
+    def _sessions(self, chat_ids: Iterable[str]) -> List[Any]:
+        sessions = self.manager.sessions
+        return [sessions[chat_id] for chat_id in chat_ids if chat_id in sessions]
+
+    # --- Build ---
+
+    def _group_of(self, symbol: str) -> Tuple[Optional[str], Optional[str]]:
+        if symbol not in self._groups:
+            self._groups[symbol] = resolve_asset_group(symbol)
+        return self._groups[symbol]
+
+    def _accepts(self, session, symbol: str) -> bool:
+        if not getattr(session, 'ready', True):
+            return False  # Still connecting at start-up
+        if session.is_asset_disabled(symbol):
+            return False
+        asset_group, asset_subgroup = self._group_of(symbol)
+        if asset_group and not session.is_group_enabled(asset_group):
+            return False
+        if asset_subgroup and not session.is_group_enabled(asset_subgroup):
+            return False
+        return True
+
+    def _index_session(self, chat_id: str, session):
+        for symbol, chat_ids in self._signal.items():
+            if self._accepts(session, symbol):
+                chat_ids.add(chat_id)
+            else:
+                chat_ids.discard(chat_id)
+
+        exit_manager = getattr(session, 'exit_manager', None)
+        plans = exit_manager.active_exit_plans if exit_manager else {}
+        for symbol, chat_ids in self._exits.items():
+            if symbol not in plans:
+                chat_ids.discard(chat_id)
+        for symbol in plans:
+            self._exits.setdefault(symbol, set()).add(chat_id)
+
+    def _drop_session(self, chat_id: str):
+        for chat_ids in self._signal.values():
+            chat_ids.discard(chat_id)
+        for chat_ids in self._exits.values():
+            chat_ids.discard(chat_id)
+
+    def _refresh(self):
+        sessions = self.manager.sessions
+        now = time.time()
+
+        if not self._built_at or now - self._built_at > self.ttl:
+            from system_directive import get_all_assets
+            symbols = set(get_all_assets()) | set(self._signal)
+            self._signal = {symbol: set() for symbol in symbols}
+            self._exits = {}
+            for chat_id, session in sessions.items():
+                self._index_session(chat_id, session)
+            self._dirty.clear()
+            self._built_at = now
+            return
+
+        while self._dirty:
+            chat_id = self._dirty.pop()
+            if chat_id in sessions:
+                self._index_session(chat_id, sessions[chat_id])
+            else:
+                self._drop_session(chat_id)
+
+
+class DispatchBudget:
+    """
+    Bounded fan-out for per-session work.
+
+    A global semaphore caps how many sessions are processed at once, and
+    per-exchange semaphores cap concurrent calls against each exchange.
+    """
+
+    def __init__(self, max_concurrency: int = 16, exchange_limits: Dict[str, int] = None,
+                 default_exchange_limit: int = 4):
+        self._sessions = asyncio.Semaphore(max_concurrency)
+        self._exchange_limits = dict(exchange_limits or {})
+        self._default_exchange_limit = default_exchange_limit
+        self._exchanges: Dict[str, asyncio.Semaphore] = {}
+
+    def exchange(self, name: str) -> asyncio.Semaphore:
+        """Semaphore guarding calls against one exchange (use with `async with`)."""
+        key = (name or 'UNKNOWN').upper()
+        if key not in self._exchanges:
+            limit = self._exchange_limits.get(key, self._default_exchange_limit)
+            self._exchanges[key] = asyncio.Semaphore(limit)
+        return self._exchanges[key]
+
+    async def gather(self, coros: Iterable[Awaitable]) -> List[Any]:
+        """Run coroutines concurrently, at most max_concurrency at a time. Exceptions are returned."""
+        async def bounded(coro):
+            async with self._sessions:
+                return await coro
+
+        return await asyncio.gather(*(bounded(c) for c in coros), return_exceptions=True)
+
+
+# Global singleton for shared access
+_dispatch_budget: Optional[DispatchBudget] = None
+
+
+def get_dispatch_budget() -> DispatchBudget:
+    """Get global dispatch budget (limits from system_directive)."""
+    global _dispatch_budget
+    if _dispatch_budget is None:
+        from system_directive import DISPATCH_MAX_CONCURRENCY, DISPATCH_EXCHANGE_CONCURRENCY
+        _dispatch_budget = DispatchBudget(DISPATCH_MAX_CONCURRENCY, DISPATCH_EXCHANGE_CONCURRENCY)
+    return _dispatch_budget
@@ -23,12 +23,12 @@ class SystemStateManager:
             "session_config": dict(DEFAULT_SESSION_CONFIG)
         }
 
-    def load_state(self) -> Dict[str, Any]:
-        """Loads state from PostgreSQL first, then JSON fallback."""
+    async def load_state(self) -> Dict[str, Any]:
+        """Loads state from PostgreSQL (async pool) first, then JSON fallback."""
         # Try PostgreSQL first
         try:
-            from servos.db import load_bot_state
-            db_state = load_bot_state()
+            from servos.db_async import nexus_db
+            db_state = await nexus_db.load_bot_state()
             if db_state is not None:
                 merged = self.default_state.copy()
                 for key, val in db_state.items():
@@ -96,8 +96,8 @@ class SystemStateManager:
         except Exception as e:
             print(f"⚠️ Failed to apply module assets: {e}")
 
-    def save_state(self, enabled_strategies: Dict, group_config: Dict, disabled_assets: set, session: Any = None):
-        """Saves current runtime state to PostgreSQL first, then JSON fallback."""
+    async def save_state(self, enabled_strategies: Dict, group_config: Dict, disabled_assets: set, session: Any = None):
+        """Saves current runtime state to PostgreSQL (async pool) first, then JSON fallback."""
         
         session_cfg = self.default_state["session_config"]
         if session and session.config:
@@ -107,8 +107,8 @@ class SystemStateManager:
 
         # Try PostgreSQL first
         try:
-            from servos.db import save_bot_state
-            if save_bot_state(enabled_strategies, group_config, disabled_assets):
+            from servos.db_async import nexus_db
+            if await nexus_db.save_bot_state(enabled_strategies, group_config, disabled_assets):
                 return  # Success
         except Exception as e:
             print(f"⚠️ PostgreSQL state save failed: {e}")
@@ -10,9 +10,10 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Any, Callable
 from zoneinfo import ZoneInfo
 
-import openai
 from dotenv import load_dotenv
 
+from servos.llm_gateway import get_llm_gateway
+
 load_dotenv()
 
 # Maximum tasks per user
@@ -33,17 +34,13 @@ class TaskScheduler:
             self.model = OPENAI_MODEL
         except ImportError:
             self.model = os.getenv("OPENAI_MODEL", "gpt-4o")  # Fallback to gpt-4o
-        self.client = None
+        self.llm = get_llm_gateway()  # Shared pooled async client
         self.scheduler = None
         self.action_handlers: Dict[str, Callable] = {}
         self._initialized = False
         
         if self.api_key:
-            try:
-                self.client = openai.OpenAI(api_key=self.api_key)
-                print(f"✅ TaskScheduler: OpenAI client initialized (Model: {self.model})")
-            except Exception as e:
-                print(f"⚠️ TaskScheduler: OpenAI init failed: {e}")
+            print(f"✅ TaskScheduler: LLM gateway ready (Model: {self.model})")
         else:
             print("⚠️ TaskScheduler: No OPENAI_API_KEY found")
     
@@ -103,12 +100,12 @@ class TaskScheduler:
                 "error": None or "Error message"
             }
         """
-        if not self.client:
+        if not self.llm.is_available('openai'):
             return {"error": "IA no disponible. Configura OPENAI_API_KEY."}
         
         try:
             from servos.timezone_manager import get_current_time_str
-            current_time = get_current_time_str(user_id)
+            current_time = get_current_time_str(user_timezone)
         except:
             current_time = datetime.now().isoformat()
         
@@ -152,18 +149,17 @@ Respond with JSON:
 }}"""
 
         try:
-            response = self.client.chat.completions.create(
+            content = await self.llm.chat(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 max_tokens=500,
-                temperature=0.3
+                temperature=0.3,
+                ttl=0
             )
             
-            content = response.choices[0].message.content.strip()
-            
             # Clean up potential markdown wrapping
             if content.startswith("```"):
                 content = content.split("```")[1]
@@ -200,8 +196,8 @@ Respond with JSON:
             return False, f"❌ Acción desconocida: `{action}`", None
         
         # Check task limit
-        from servos.db import get_scheduled_tasks
-        existing = get_scheduled_tasks(user_id)
+        from servos.db_async import nexus_db
+        existing = await nexus_db.get_scheduled_tasks(user_id)
         if len(existing) >= MAX_TASKS_PER_USER:
             return False, f"❌ Límite alcanzado ({MAX_TASKS_PER_USER} tareas máximo)", None
         
@@ -262,7 +258,6 @@ Respond with JSON:
             job = self.scheduler.add_job(**job_kwargs)
             
             # Save to database
-            from servos.db import save_scheduled_task
             task_data = {
                 "job_id": job.id,
                 "action": action,
@@ -272,7 +267,7 @@ Respond with JSON:
                 "description": description,
                 "next_run": job.next_run_time.isoformat() if job.next_run_time else None
             }
-            db_id = save_scheduled_task(user_id, task_data)
+            db_id = await nexus_db.save_scheduled_task(user_id, task_data)
             
             next_run_str = job.next_run_time.strftime("%Y-%m-%d %H:%M UTC") if job.next_run_time else "N/A"
             
@@ -293,15 +288,15 @@ Respond with JSON:
         except Exception as e:
             print(f"❌ Task execution error: {e}")
     
-    def cancel_task(self, user_id: int, task_id: str) -> tuple[bool, str]:
+    async def cancel_task(self, user_id: int, task_id: str) -> tuple[bool, str]:
         """Cancel a scheduled task."""
         if not self.scheduler:
             return False, "❌ Scheduler no inicializado"
         
         try:
             # Get task from DB to verify ownership
-            from servos.db import get_scheduled_tasks, delete_scheduled_task
-            tasks = get_scheduled_tasks(user_id)
+            from servos.db_async import nexus_db
+            tasks = await nexus_db.get_scheduled_tasks(user_id)
             
             task = None
             for t in tasks:
@@ -321,18 +316,18 @@ Respond with JSON:
                     pass  # Job may already be gone
             
             # Remove from DB
-            delete_scheduled_task(task.get('id'))
+            await nexus_db.delete_scheduled_task(task.get('id'))
             
             return True, f"✅ Tarea cancelada: {task.get('description', task_id)}"
             
         except Exception as e:
             return False, f"❌ Error al cancelar: {e}"
     
-    def list_tasks(self, user_id: int) -> List[Dict[str, Any]]:
+    async def list_tasks(self, user_id: int) -> List[Dict[str, Any]]:
         """List all scheduled tasks for a user."""
         try:
-            from servos.db import get_scheduled_tasks
-            return get_scheduled_tasks(user_id)
+            from servos.db_async import nexus_db
+            return await nexus_db.get_scheduled_tasks(user_id)
         except Exception as e:
             print(f"⚠️ Error listing tasks: {e}")
             return []
@@ -19,10 +19,11 @@ from nexus_system.core.nexus_bridge import NexusBridge
 from nexus_system.core.shadow_wallet import ShadowWallet
 
 # AI Analyst
-from servos.ai_analyst import NexusAnalyst
+from servos.ai_analyst import get_nexus_analyst
 
 # Shield 2.0
 from nexus_system.shield.correlation import CorrelationManager
+from nexus_system.shield.correlation_matrix import get_correlation_matrix
 from nexus_system.shield.risk_policy import RiskPolicy, StrategyIntent, build_portfolio_state
 from nexus_system.core.exit_manager import ExitManager
 from nexus_system.core.slippage import get_slippage_model, estimate_slippage
@@ -30,6 +31,10 @@ from nexus_system.core.slippage import get_slippage_model, estimate_slippage
 # Personalities
 from servos.personalities import PersonalityManager
 
+# Signal / exit fan-out index
+from servos.session_index import SessionIndex, DispatchBudget
+from servos.db_async import nexus_db, DEFAULT_ENABLED_GROUPS
+
 # Input validation utilities
 def validate_symbol(symbol: str) -> bool:
     """Validate cryptocurrency trading pair symbol."""
@@ -372,16 +377,17 @@ class AsyncTradingSession:
         self.cb_ignore_until = 0  
         
         # AI Analyst
-        self.ai_analyst = NexusAnalyst()
+        self.ai_analyst = get_nexus_analyst()  # Shared: one pooled LLM client per process
 
         # Shield 2.0: Portfolio Correlation Guard
-        self.correlation_manager = CorrelationManager()
+        self.correlation_manager = CorrelationManager(matrix=get_correlation_matrix())
 
         # Risk Policy Engine (Fase 2)
         self.risk_policy = RiskPolicy(self.config)
 
         # Exit Manager (Fase 3)
         self.exit_manager = ExitManager(self.config)
+        self.exit_manager.on_change = self._on_exit_plan_change
         
         # Operation Lock: Prevent concurrent/spam operations per symbol
         self._operation_locks = {}  # {symbol: timestamp}
@@ -394,10 +400,14 @@ class AsyncTradingSession:
         self._enabled_groups_cache = None  # {group: bool}
         self._groups_cache_timestamp = 0  # timestamp del último refresh
         self._groups_cache_ttl = 300  # 5 minutos TTL para el cache
+        self._groups_refresh_task: Optional[asyncio.Task] = None
         
         # Proxy Setup
         self._proxy = os.getenv('PROXY_URL') or os.getenv('HTTPS_PROXY') or os.getenv('HTTP_PROXY')
 
+        # Set by initialize(); signal dispatch skips sessions still connecting
+        self.ready = False
+
     
     @property
     def client(self):
@@ -428,8 +438,13 @@ class AsyncTradingSession:
     
 
 
-    async def initialize(self, verbose: bool = True) -> bool:
-        """Async initialization via Nexus Bridge."""
+    async def initialize(self, verbose: bool = True, budget=None) -> bool:
+        """
+        Async initialization via Nexus Bridge.
+
+        Exchanges connect concurrently, each under `budget.exchange(name)` when a
+        DispatchBudget is given (bulk bootstrap). Marks the session ready when done.
+        """
         # Removed duplicate Nexus Analyst message - now handled in ai_analyst.py
         
         # Proxy Settings (Config > Env > self._proxy)
@@ -452,6 +467,8 @@ class AsyncTradingSession:
             if https_proxy:
                  exchange_kwargs['https_proxy'] = https_proxy
 
+        connections = []  # (exchange, credentials)
+
         # 1. Binance Futures
         # Use Railway env vars if available, otherwise use session config
         binance_key = os.getenv('BINANCE_API_KEY') or self.config_api_key
@@ -459,13 +476,11 @@ class AsyncTradingSession:
                          os.getenv('BINANCE_SECRET') or
                          self.config_api_secret)
         if binance_key and binance_secret:
-            await self.bridge.connect_exchange(
-                'BINANCE',
+            connections.append(('BINANCE', dict(
                 api_key=binance_key,
                 api_secret=binance_secret,
                 **exchange_kwargs
-            )
-            if verbose: print(f"✅ Bridge: Connected to Binance")
+            )))
 
         # 2. Bybit
         # Railway env vars take priority
@@ -474,13 +489,11 @@ class AsyncTradingSession:
                        os.getenv('BYBIT_SECRET') or
                        self.config.get('bybit_api_secret'))
         if bybit_key and bybit_secret:
-            await self.bridge.connect_exchange(
-                'BYBIT',
+            connections.append(('BYBIT', dict(
                 api_key=bybit_key,
                 api_secret=bybit_secret,
                 **exchange_kwargs
-            )
-            if verbose: print(f"✅ Bridge: Connected to Bybit")
+            )))
             
         # 3. Alpaca
         # Railway env vars take priority
@@ -511,15 +524,26 @@ class AsyncTradingSession:
              if base_url and 'paper' not in base_url and 'api.alpaca' in base_url:
                  paper_mode = False
                  
-             await self.bridge.connect_exchange(
-                'ALPACA',
+             connections.append(('ALPACA', dict(
                 api_key=alp_key.strip(),
                 api_secret=alp_sec.strip(),
                 paper=paper_mode,
                 url_override=os.getenv('APCA_API_BASE_URL'),
                 **exchange_kwargs
-            )
-             if verbose: print(f"✅ Bridge: Connected to Alpaca")
+            )))
+
+        async def connect(name, credentials):
+            if budget is None:
+                return await self.bridge.connect_exchange(name, **credentials)
+            async with budget.exchange(name):
+                return await self.bridge.connect_exchange(name, **credentials)
+
+        # Start-up costs the slowest exchange, not the sum of all three
+        results = await asyncio.gather(*(connect(name, creds) for name, creds in connections))
+        if verbose:
+            for (name, _), connected in zip(connections, results):
+                if connected:
+                    print(f"✅ Bridge: Connected to {name.title()}")
         
         # Sync primary exchange preference from user config (BINANCE/BYBIT)
         # Check both 'primary_exchange' (from UI) and 'crypto_exchange' (legacy) for compatibility
@@ -528,7 +552,9 @@ class AsyncTradingSession:
             self.bridge.primary_exchange = user_primary.upper()
             if verbose:
                 print(f"🎯 Bridge: Primary exchange set to {self.bridge.primary_exchange}")
-        
+
+        self.ready = True
+        self._config_changed()  # Now eligible for signal dispatch
         return True
     
 
@@ -666,6 +692,18 @@ class AsyncTradingSession:
             print(f"⚠️ Error closing bridge for session {self.chat_id}: {e}")
     
     # --- CONFIG METHODS ---
+
+    def _config_changed(self):
+        """Re-index this session for signal dispatch after a config change."""
+        index = getattr(self.manager, 'index', None)
+        if index is not None:
+            index.invalidate(self.chat_id)
+
+    def _on_exit_plan_change(self, symbol: str, active: bool):
+        """ExitManager hook: keep the exit fan-out index in sync."""
+        index = getattr(self.manager, 'index', None)
+        if index is not None:
+            index.set_exit_plan(self.chat_id, symbol, active)
     
     def set_mode(self, mode: str) -> bool:
         """Set operation mode."""
@@ -678,6 +716,7 @@ class AsyncTradingSession:
     async def update_config(self, key: str, value: Any) -> bool:
         """Update a config value."""
         self.config[key] = value
+        self._config_changed()
         return True
     
     def get_configuration(self) -> Dict:
@@ -699,6 +738,7 @@ class AsyncTradingSession:
         current = strategies.get(strategy, False)
         strategies[strategy] = not current
         self.config['strategies'] = strategies
+        self._config_changed()
         return strategies[strategy]
 
     def is_strategy_enabled(self, strategy: str) -> bool:
@@ -714,31 +754,50 @@ class AsyncTradingSession:
         groups[group] = not current
         self.config['groups'] = groups
 
-        # Invalidar el cache para forzar refresh en la próxima consulta
-        self._enabled_groups_cache = None
+        # Marcar el cache como expirado para forzar refresh en la próxima consulta
+        self._groups_cache_timestamp = 0
+        self._config_changed()
 
         return groups[group]
 
+    def set_enabled_groups(self, groups: Optional[Dict[str, bool]]):
+        """Install the per-user enabled groups (None falls back to session config)."""
+        if self._apply_groups(groups):
+            self._config_changed()
+
+    async def refresh_groups(self):
+        """Reload the per-user enabled groups from the database."""
+        self.set_enabled_groups(await nexus_db.get_user_enabled_groups(self.chat_id))
+
+    def _apply_groups(self, groups: Optional[Dict[str, bool]]) -> bool:
+        if not groups:
+            # Fallback to session config (legacy)
+            legacy = self.config.get('groups', {})
+            groups = {
+                'CRYPTO': legacy.get('CRYPTO', True),
+                'STOCKS': legacy.get('STOCKS', True),
+                'ETFS': legacy.get('ETFS', True)
+            }
+        changed = groups != self._enabled_groups_cache
+        self._enabled_groups_cache = groups
+        self._groups_cache_timestamp = time.time()
+        return changed
+
     def _refresh_groups_cache(self):
-        """Refresh the enabled groups cache from database."""
-        import time
-        from servos.db import get_user_enabled_groups
-
-        current_time = time.time()
-        # Solo refrescar si el cache está vacío o expiró
-        if self._enabled_groups_cache is None or (current_time - self._groups_cache_timestamp) > self._groups_cache_ttl:
-            user_groups = get_user_enabled_groups(self.chat_id)
-            if user_groups:
-                self._enabled_groups_cache = user_groups
-            else:
-                # Fallback to session config (legacy)
-                groups = self.config.get('groups', {})
-                self._enabled_groups_cache = {
-                    'CRYPTO': groups.get('CRYPTO', True),
-                    'STOCKS': groups.get('STOCKS', True),
-                    'ETFS': groups.get('ETFS', True)
-                }
-            self._groups_cache_timestamp = current_time
+        """
+        Keep the enabled groups cache usable without touching the database.
+        An expired cache keeps serving while refresh_groups() runs in the background.
+        """
+        if self._enabled_groups_cache is None:
+            self._apply_groups(None)
+            self._groups_cache_timestamp = 0
+
+        if time.time() - self._groups_cache_timestamp > self._groups_cache_ttl:
+            if self._groups_refresh_task is None or self._groups_refresh_task.done():
+                try:
+                    self._groups_refresh_task = asyncio.get_running_loop().create_task(self.refresh_groups())
+                except RuntimeError:
+                    pass  # No running loop: keep serving the cached groups
 
     def is_group_enabled(self, group: str) -> bool:
         """
@@ -901,6 +960,7 @@ class AsyncTradingSession:
             disabled.append(symbol)
             result = True
         self.config['disabled_assets'] = disabled
+        self._config_changed()
         return result
 
     def is_asset_disabled(self, symbol: str) -> bool:
@@ -946,20 +1006,16 @@ class AsyncTradingSession:
         return default_q, default_p, default_n, default_tick, 0.001
     
     async def _fetch_ohlcv_for_chart(self, symbol: str, limit: int = 100) -> Optional[pd.DataFrame]:
-        """Fetch historical klines for chart generation."""
+        """Fetch historical klines for chart generation (shared with concurrent identical fetches)."""
+        adapter = self.bridge.adapters.get(self.bridge._route_symbol(symbol)) if self.bridge else None
+        if not adapter:
+            return None
         try:
-            klines = await self.client.futures_klines(symbol=symbol, interval='15m', limit=limit)
-            data = []
-            for k in klines:
-                data.append({
-                    'timestamp': int(k[0]),
-                    'open': float(k[1]),
-                    'high': float(k[2]),
-                    'low': float(k[3]),
-                    'close': float(k[4]),
-                    'volume': float(k[5])
-                })
-            return pd.DataFrame(data)
+            df = await adapter.fetch_candles(symbol, timeframe='15m', limit=limit)
+            if df.empty:
+                return None
+            df['timestamp'] = (df['timestamp'] - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)  # Epoch ms, as before
+            return df
         except Exception as e:
             self.logger.debug(f"Chart data fetch failed: {e}")
             return None
@@ -985,6 +1041,12 @@ class AsyncTradingSession:
             
             if not active_symbols:
                 return True, ""
+
+            # Rolling matrix covers every pair: O(1) lookups, no candle fetches
+            if self.correlation_manager.covers([candidate_symbol] + active_symbols):
+                if not self.correlation_manager.check_correlation(candidate_symbol, None, active_symbols):
+                    return False, f"🚫 **Shield Protocol**: Alta correlación detectada."
+                return True, ""
             
             # 2. Update History for Active Positions
             # Fetch from Engine's MarketStream (Memory Cache)
@@ -2234,8 +2296,6 @@ class AsyncTradingSession:
             entry_price = float(res.get('price', current_price) or current_price)
 
             # Log Trade Entry (Fase 4) with slippage tracking
-            from servos.db import log_trade_entry
-            
             # Calculate actual slippage from execution
             actual_slippage = 0.0
             if current_price > 0 and entry_price > 0:
@@ -2251,7 +2311,7 @@ class AsyncTradingSession:
                 'expected_cost': expected_total_cost,
                 'expected_fill_price': slippage_result.get('expected_fill', current_price)
             }
-            log_trade_entry(
+            await nexus_db.log_trade_entry(
                 chat_id=self.chat_id,
                 symbol=symbol,
                 side='LONG',
@@ -2634,8 +2694,6 @@ class AsyncTradingSession:
             entry_price = float(res.get('price', current_price) or current_price)
 
             # Log Trade Entry (Fase 4) with slippage tracking
-            from servos.db import log_trade_entry
-            
             # Calculate actual slippage from execution
             actual_slippage = 0.0
             if current_price > 0 and entry_price > 0:
@@ -2651,7 +2709,7 @@ class AsyncTradingSession:
                 'expected_cost': expected_total_cost,
                 'expected_fill_price': slippage_result.get('expected_fill', current_price)
             }
-            log_trade_entry(
+            await nexus_db.log_trade_entry(
                 chat_id=self.chat_id,
                 symbol=symbol,
                 side='SHORT',
@@ -2895,10 +2953,8 @@ class AsyncTradingSession:
     async def _log_trade_exit(self, symbol: str, exit_reason: str = "MANUAL"):
         """Log trade exit to journal (Fase 4)."""
         try:
-            from servos.db import get_open_trades, log_trade_exit
-
             # Find the open trade for this symbol
-            open_trades = get_open_trades(self.chat_id)
+            open_trades = await nexus_db.get_open_trades(self.chat_id)
             symbol_trades = [t for t in open_trades if t['symbol'] == symbol]
 
             if not symbol_trades:
@@ -2913,8 +2969,8 @@ class AsyncTradingSession:
                 return
 
             # Calculate P&L
-            entry_price = trade['entry_price']
-            quantity = trade['quantity']
+            entry_price = float(trade['entry_price'])
+            quantity = float(trade['quantity'])
             side = trade['side']
 
             if side == 'LONG':
@@ -2929,7 +2985,7 @@ class AsyncTradingSession:
             fees = notional * 0.001  # 0.1% estimated fee
 
             # Log the exit
-            log_trade_exit(
+            await nexus_db.log_trade_exit(
                 trade_id=trade['id'],
                 exit_price=current_price,
                 pnl=pnl,
@@ -3751,8 +3807,11 @@ class AsyncTradingSession:
                 
                 # If no original_tp stored, store current one as baseline
                 if 'original_tp' not in pos_data:
-                    pos_data['original_tp'] = current_tp
-                    pos_data['tp_progression_level'] = 0
+                    if pos_data:
+                        # Wallet snapshots are read-only: write back through the wallet
+                        self.shadow_wallet.update_position(self.chat_id, symbol, {
+                            **pos_data, 'original_tp': current_tp, 'tp_progression_level': 0
+                        })
                     original_tp = current_tp
                 
                 # Calculate original TP distance from entry
@@ -3809,7 +3868,11 @@ class AsyncTradingSession:
                             if success:
                                 modified += 1
                                 # Update progression level in shadow wallet
-                                pos_data['tp_progression_level'] = new_level
+                                pos_data = self.shadow_wallet.get_position(self.chat_id, symbol)
+                                if pos_data:
+                                    self.shadow_wallet.update_position(self.chat_id, symbol, {
+                                        **pos_data, 'original_tp': original_tp, 'tp_progression_level': new_level
+                                    })
                                 boost_pct = int(tp_boost * 100)
                                 report.append(
                                     f"✅ **{symbol}** - Progress: {progress_pct*100:.0f}% → "
@@ -3925,10 +3988,11 @@ class AsyncTradingSession:
             user_wallet = self.shadow_wallet._get_user_wallet(self.chat_id)
             stale_symbols = [s for s in user_wallet['positions'].keys() if s not in exchange_symbols]
             for stale in stale_symbols:
-                del user_wallet['positions'][stale]
+                self.shadow_wallet.update_position(self.chat_id, stale, {'quantity': 0})
                 print(f"🧹 ShadowWallet: Removed stale position {stale}")
 
-        # 2. Read from Shadow Wallet
+        # 2. Read from Shadow Wallet (one consistent snapshot)
+        user_wallet = self.shadow_wallet.snapshot(self.chat_id)
         for symbol, p in user_wallet['positions'].items():
             try:
                 raw_qty = float(p.get('quantity', 0))
@@ -4549,6 +4613,9 @@ class AsyncSessionManager:
         self.sessions: Dict[str, AsyncTradingSession] = {}
         self._lock = asyncio.Lock()
         self.engine = None
+        # symbol -> interested sessions (signal dispatch / exit checks)
+        self.index = SessionIndex(self)
+        self._bootstrap_task: Optional[asyncio.Task] = None
         
     def set_nexus_engine(self, engine):
         """Inject NexusCore engine reference."""
@@ -4566,22 +4633,30 @@ class AsyncSessionManager:
         return {"btc_dominance": 0.0, "global_state": "N/A", "total_cap": 0.0}
     
 
-    async def load_sessions(self):
-        """Load sessions from PostgreSQL (with JSON fallback)."""
+    async def load_sessions(self, wait: bool = True):
+        """
+        Load sessions from PostgreSQL (with JSON fallback) and connect them.
+
+        All sessions are registered first (not ready), then bootstrapped
+        concurrently; each one joins signal dispatch as soon as its own
+        exchanges are connected. With wait=False the bootstrap keeps running
+        in the background (see wait_ready()).
+        """
+        self.index.invalidate()
         async with self._lock:
             loaded_source = "NONE"
             
             # Try PostgreSQL first
             postgresql_success = False
             try:
-                from servos.db import load_all_sessions
-                db_sessions = load_all_sessions()
+                db_sessions = await nexus_db.load_all_sessions()
                 
                 if db_sessions is not None:
+                    # One query for every session's role
+                    roles = await nexus_db.get_user_roles(db_sessions.keys())
                     for chat_id, info in db_sessions.items():
                         # SANITIZE: Check authorization
-                        from servos.db import get_user_role
-                        allowed, role = get_user_role(str(chat_id))
+                        allowed, role = roles[str(chat_id)]
                         
                         config = info.get('config', {})
                         
@@ -4609,7 +4684,6 @@ class AsyncSessionManager:
                             config=config,
                             manager=self
                         )
-                        await session.initialize(verbose=False)
                         self.sessions[chat_id] = session
                     
                     print(f"🐘 Loaded {len(self.sessions)} sessions from PostgreSQL")
@@ -4627,10 +4701,10 @@ class AsyncSessionManager:
                         with open(self.data_file, 'r') as f:
                             data = json.load(f)
                         
+                        roles = await nexus_db.get_user_roles(data.keys())
                         for chat_id, info in data.items():
                             # SANITIZE: Check authorization
-                            from servos.db import get_user_role
-                            allowed, role = get_user_role(str(chat_id))
+                            allowed, role = roles[str(chat_id)]
                             
                             config = info.get('config', {})
                             
@@ -4654,7 +4728,6 @@ class AsyncSessionManager:
                                 config=config,
                                 manager=self
                             )
-                            await session.initialize(verbose=False)
                             self.sessions[chat_id] = session
                         
                         print(f"📁 Loaded {len(self.sessions)} sessions from {self.data_file}")
@@ -4663,8 +4736,34 @@ class AsyncSessionManager:
                     except Exception as e:
                         print(f"❌ Session Load Error: {e}")
         
-        # Ensure Admin Session (Silent)
-        await self._ensure_admin_session(verbose=False)
+        # Ensure Admin Session (Silent, connected by the bootstrap below)
+        await self._ensure_admin_session(verbose=False, initialize=False)
+        
+        # Prime every session's enabled groups with a single query
+        user_groups = await nexus_db.get_users_enabled_groups(self.sessions.keys())
+        for chat_id, session in self.sessions.items():
+            session.set_enabled_groups(user_groups.get(chat_id, dict(DEFAULT_ENABLED_GROUPS)))
+        
+        pending = [s for s in self.sessions.values() if not s.ready]
+        self._bootstrap_task = asyncio.create_task(self._bootstrap(pending))
+        if wait:
+            await self._bootstrap_task
+
+    async def _bootstrap(self, sessions: List[AsyncTradingSession]):
+        """Connect sessions concurrently under the bootstrap concurrency budget."""
+        from system_directive import BOOTSTRAP_MAX_CONCURRENCY, BOOTSTRAP_EXCHANGE_CONCURRENCY
+        budget = DispatchBudget(BOOTSTRAP_MAX_CONCURRENCY, BOOTSTRAP_EXCHANGE_CONCURRENCY)
+        
+        started = time.time()
+        results = await budget.gather(s.initialize(verbose=False, budget=budget) for s in sessions)
+        for session, result in zip(sessions, results):
+            if isinstance(result, Exception):
+                print(f"⚠️ Session {session.chat_id} bootstrap failed: {result}")
+                # Dispatch it like a session whose exchanges failed to connect
+                session.ready = True
+                self.index.invalidate(session.chat_id)
+        if sessions:
+            print(f"⚡ Bootstrapped {len(sessions)} sessions in {time.time() - started:.1f}s")
         
         # --- AGGREGATED STARTUP LOG ---
         # Nexus Analyst connection message removed - now handled in ai_analyst.py
@@ -4697,6 +4796,12 @@ class AsyncSessionManager:
             'bybit_users': len([s.chat_id for s in self.sessions.values() if 'BYBIT' in s.bridge.adapters]) if self.sessions else 0
         }
 
+    async def wait_ready(self):
+        """Wait for a bootstrap started with load_sessions(wait=False)."""
+        task = self._bootstrap_task
+        if task is not None:
+            await asyncio.shield(task)
+
     def display_exchange_status(self):
         """Display exchange connectivity status for Phase 5."""
         if not hasattr(self, '_exchange_status'):
@@ -4717,11 +4822,12 @@ class AsyncSessionManager:
             print(f"✅ Alpaca Client Initialized (Paper: Mixed): [{status['alpaca_users']:02d} Users]")
     
 
-    async def _ensure_admin_session(self, verbose: bool = True):
+    async def _ensure_admin_session(self, verbose: bool = True, initialize: bool = True):
         """Create or REPLACE admin sessions from env vars (supports comma-separated IDs).
         
         IMPORTANT: Admin sessions ALWAYS use ENV credentials, overriding any DB values.
         This ensures the admin can always connect even if DB has stale/different keys.
+        With initialize=False new sessions are left for the caller to connect.
         """
         # Sanitize inputs
         raw_admin_ids = os.getenv('TELEGRAM_ADMIN_ID', '').strip().strip("'\"")
@@ -4780,13 +4886,17 @@ class AsyncSessionManager:
                 new_config.update({'alpaca_key': alp_key, 'alpaca_secret': alp_sec})
                 
                 session = AsyncTradingSession(admin_id, bin_key, bin_sec, config=new_config, manager=self)
-                await session.initialize(verbose=verbose)
+                if initialize:
+                    await session.initialize(verbose=verbose)
                 self.sessions[admin_id] = session
+                self.index.invalidate(admin_id)
                 if verbose:
                     print(f"🔑 Admin session {'updated' if existing else 'created'} for {admin_id} (Env Vars)")
     
     async def save_sessions(self):
         """Persist sessions to PostgreSQL and JSON (redundancy)."""
+        # Handlers edit session.config directly and then save: re-index everything
+        self.index.invalidate()
         async with self._lock:
             data = {}
             for chat_id, session in self.sessions.items():
@@ -4798,8 +4908,7 @@ class AsyncSessionManager:
             
             # 1. Save to PostgreSQL
             try:
-                from servos.db import save_all_sessions
-                if save_all_sessions(data):
+                if await nexus_db.save_all_sessions(data):
                     print(f"🐘 Saved {len(data)} sessions to PostgreSQL")
             except Exception as e:
                 print(f"⚠️ PostgreSQL save failed: {e}")
@@ -4823,8 +4932,10 @@ class AsyncSessionManager:
         
         session = AsyncTradingSession(chat_id, api_key, api_secret, config, manager=self)
         await session.initialize()
+        await session.refresh_groups()
         
         self.sessions[chat_id] = session
+        self.index.invalidate(chat_id)
         await self.save_sessions()
         
         return session
@@ -4833,6 +4944,7 @@ class AsyncSessionManager:
         """Delete a session."""
         if chat_id in self.sessions:
             session = self.sessions.pop(chat_id)
+            self.index.invalidate(chat_id)
             await session.close()
             await self.save_sessions()
             return True
@@ -4844,6 +4956,9 @@ class AsyncSessionManager:
     
     async def close_all(self):
         """Cleanup all sessions."""
+        task = self._bootstrap_task
+        if task is not None and not task.done():
+            task.cancel()
         for session_id, session in self.sessions.items():
             try:
                 await session.close()
@@ -4851,4 +4966,5 @@ class AsyncSessionManager:
             except Exception as e:
                 print(f"⚠️ Error closing session {session_id}: {e}")
         self.sessions.clear()
+        self.index.invalidate()
 
@@ -8,10 +8,14 @@ import asyncio
 from enum import Enum
 from typing import Any, Callable, Optional, Dict, Awaitable
 from dataclasses import dataclass
-from config.settings import get_config
-from .logging_config import get_logger
 
-logger = get_logger('circuit_breaker')
+try:
+    from .logging_config import get_logger
+    logger = get_logger('circuit_breaker')
+except Exception:
+    # ML trainer config/logging not set up (e.g. breakers used inside the bot process)
+    import logging
+    logger = logging.getLogger('circuit_breaker')
 
 
 class CircuitBreakerState(Enum):
@@ -164,6 +168,7 @@ class CircuitBreakerRegistry:
 
     def _load_default_breakers(self):
         """Load default circuit breakers for common services"""
+        from config.settings import get_config
         config = get_config()
 
         # Binance API circuit breaker
@@ -196,8 +201,7 @@ class CircuitBreakerRegistry:
             )
         )
 
-        logger.info("Circuit breaker registry initialized",
-                   breaker_count=len(self.breakers))
+        logger.info(f"Circuit breaker registry initialized ({len(self.breakers)} breakers)")
 
     def get(self, name: str) -> CircuitBreaker:
         """Get circuit breaker by name"""
@@ -216,15 +220,22 @@ class CircuitBreakerRegistry:
         }
 
 
-# Global registry instance
-registry = CircuitBreakerRegistry()
+# Global registry instance (created on first use: its defaults need the ML trainer config)
+registry: Optional[CircuitBreakerRegistry] = None
+
+
+def _get_registry() -> CircuitBreakerRegistry:
+    global registry
+    if registry is None:
+        registry = CircuitBreakerRegistry()
+    return registry
 
 
 def get_circuit_breaker(name: str) -> CircuitBreaker:
     """Get circuit breaker from global registry"""
-    return registry.get(name)
+    return _get_registry().get(name)
 
 
 def get_circuit_breaker_status() -> Dict[str, Dict[str, Any]]:
     """Get status of all circuit breakers"""
-    return registry.get_all_status()
+    return _get_registry().get_all_status()
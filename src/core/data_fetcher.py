@@ -16,6 +16,11 @@ from .exceptions import DataFetchError
 from .circuit_breaker import get_circuit_breaker
 from .validators import validate_symbol
 
+try:
+    from nexus_system.uplink.ohlcv_store import get_ohlcv_store
+except ImportError:
+    get_ohlcv_store = None
+
 logger = get_logger('data_fetcher')
 config = get_config()
 
@@ -103,6 +108,10 @@ class DataFetcher:
             start_time = datetime.utcnow() - timedelta(minutes=total_minutes)
             start_str = start_time.strftime('%d %b %Y %H:%M:%S')
 
+            store = get_ohlcv_store() if get_ohlcv_store else None
+            if store is not None:
+                return _sync_from_store(store, start_time)
+
             # Fetch klines
             klines = self.binance_client.get_historical_klines(
                 symbol=symbol,
@@ -131,6 +140,23 @@ class DataFetcher:
 
             return df
 
+        def _sync_from_store(store, start_time: datetime) -> pd.DataFrame:
+            # Only the tail missing from the local store is requested from Binance
+            start_ms = int(pd.Timestamp(start_time).value // 1_000_000)
+            since_ms = store.resume_from('binance', symbol, interval, start_ms)
+            klines = self.binance_client.get_historical_klines(
+                symbol=symbol,
+                interval=interval,
+                start_str=since_ms
+            )
+            if klines:
+                store.write('binance', symbol, interval, klines)
+
+            df = store.read('binance', symbol, interval, start=start_ms)
+            if df.empty:
+                raise DataFetchError(f"No data received from Binance for {symbol}")
+            return df
+
         try:
             return await self.binance_breaker.call_async(
                 lambda: asyncio.get_event_loop().run_in_executor(None, _binance_call)
@@ -218,6 +218,8 @@ SHARK_TARGETS = [
 # Defaults - DB persisted values will override on startup
 AI_FILTER_ENABLED = True
 ML_CLASSIFIER_ENABLED = True
+ML_BATCH_WINDOW_MS = 25   # Candle-close requests within this window share one model call
+ML_BATCH_MAX_SIZE = 64    # Flush early once this many symbols are queued
 # PREMIUM_SIGNALS_ENABLED = False  # REMOVED: Redundant with AI Filter
 
 # --- MTF (Multi-Timeframe) Confluence Filter ---
@@ -233,6 +235,9 @@ RISK_PER_TRADE_PCT = 0.01
 ALLOW_SLTP_UPDATE = True
 SLTP_UPDATE_COOLDOWN = 1800  # 30 minutes
 COOLDOWN_SECONDS = 180  # Default signal cooldown (3 minutes)
+CORRELATION_WINDOW = 50  # Bars of log returns in the rolling correlation matrix (signal timeframe)
+CORRELATION_MIN_PERIODS = 40  # Real returns a symbol needs in the window before it is reported
+CORRELATION_BENCHMARK = 'BTCUSDT'  # Benchmark for corr_to_bench / beta
 PREMIUM_SIGNALS_ENABLED = True  # Enable multi-timeframe analysis
 
 
@@ -264,6 +269,81 @@ SHARK_INDEPENDENT_MODE = True  # Allow Shark to activate without Black Swan
 SHARK_MOMENTUM_THRESHOLD = 2.0  # 2% drop for independent Shark activation
 SHARK_MIN_VOLUME_MULTIPLIER = 1.2  # Minimum volume spike for activation
 
+# --- SIGNAL DISPATCH CONFIG ---
+DISPATCH_MAX_CONCURRENCY = 16  # Sessions processed in parallel per signal / candle close
+DISPATCH_EXCHANGE_CONCURRENCY = {  # Concurrent session calls per exchange (liquidity checks, orders)
+    'BINANCE': 8,
+    'BYBIT': 5,
+    'ALPACA': 3,
+}
+
+# --- SESSION BOOTSTRAP CONFIG ---
+BOOTSTRAP_MAX_CONCURRENCY = 8  # Sessions connecting in parallel at start-up
+BOOTSTRAP_EXCHANGE_CONCURRENCY = {  # Concurrent connects (markets, balance, positions) per exchange
+    'BINANCE': 4,
+    'BYBIT': 3,
+    'ALPACA': 2,
+}
+
+# --- MARKET DATA ENGINE CONFIG ---
+# 'columnar' = NumPy ring buffers (O(1) updates, zero-copy views)
+# 'legacy'   = list-of-dicts cache (original implementation)
+PRICE_CACHE_ENGINE = os.getenv("PRICE_CACHE_ENGINE", "columnar").lower()
+PRICE_CACHE_MAX_CANDLES = 250  # Per symbol window (EMA200 + warmup)
+STREAM_BASE_TIMEFRAME = '1m'     # Kline interval streamed over WebSocket
+STREAM_DERIVED_TIMEFRAMES = ['5m', '15m', '1h', '4h']  # Resampled locally from the base stream
+STREAM_SIGNAL_TIMEFRAME = '15m'  # Candle closes on this timeframe trigger strategy analysis
+INCREMENTAL_INDICATORS_ENABLED = True  # O(1) per-candle indicator updates for cached (WebSocket) data
+OHLCV_STORE_ENABLED = True  # Local Arrow store for history fetches (only the missing tail hits the exchange)
+OHLCV_STORE_DIR = os.getenv("OHLCV_STORE_DIR", os.path.join("data", "ohlcv"))  # <exchange>/<symbol>/<timeframe>/<YYYY-MM>.arrow
+MARKET_REGISTRY_REFRESH_SECONDS = 3600  # Background refresh of the shared exchange market catalogue (tick/lot size, min notional, leverage)
+STREAM_WS_STREAMS_PER_CONNECTION = 200  # Kline streams per WebSocket connection (extra symbols open more connections)
+STREAM_WS_QUEUE_SIZE = 10000  # Parsed candles buffered per consumer; live ticks are dropped first when a consumer falls behind
+# 'AUTO' = Bybit kline topics when the Bybit adapter is registered, else Binance; 'BINANCE' / 'BYBIT' force one feed
+# (symbols excluded on the chosen exchange are streamed from the other one)
+STREAM_CRYPTO_WS_SOURCE = os.getenv("STREAM_CRYPTO_WS_SOURCE", "AUTO").upper()
+STREAM_GAP_FILL_CONCURRENCY = 4  # REST requests in flight while filling candles missed during a WebSocket outage
+# Private user-data streams (Binance listenKey / Bybit private topics) keep each session's ShadowWallet current;
+# while live, positions and balances are read from memory instead of polled over REST
+USER_DATA_STREAMS_ENABLED = os.getenv("USER_DATA_STREAMS_ENABLED", "true").lower() == "true"
+
+# --- REST RATE LIMITS (shared token buckets per exchange, see nexus_system/uplink/rate_limiter.py) ---
+# rate / burst are in ccxt request-cost units (Binance: request weight; Bybit: 1 = 20ms of ccxt's IP budget)
+# order_rate / order_burst: orders per second per account (order + protection lanes)
+EXCHANGE_RATE_LIMITS = {
+    'BINANCE': {'rate': 36.0, 'burst': 240, 'order_rate': 25.0, 'order_burst': 50},  # Published: 2400 weight/min, 300 orders/10s
+    'BYBIT': {'rate': 45.0, 'burst': 50, 'order_rate': 9.0, 'order_burst': 10},      # Published: 600 req/5s per IP, 10 orders/s per account
+    'COINGECKO': {'rate': 0.8, 'burst': 1},                                            # ~50 requests/minute
+    # Testnets ('BINANCE_TESTNET', 'BYBIT_TESTNET') have their own budget: unthrottled unless listed here
+}
+
+# --- REQUEST COALESCING (see nexus_system/uplink/single_flight.py) ---
+# Identical concurrent market-data requests share one REST call; successful results are reused for these seconds
+SINGLE_FLIGHT_TTL = {
+    'candles': 2.0,       # (exchange, symbol, timeframe, limit)
+    'ticker': 1.0,        # (exchange, symbol) last price
+    'symbol_info': 60.0,  # (exchange, symbol) precision / tick size / min notional
+    'market_context': 300.0,  # AI valuation global feeds: fear/greed, global metrics, trending, news
+    'coin_metrics': 900.0,    # AI valuation per-coin CoinGecko metrics
+    'ai_filter_signal': 900.0,  # AI filter analysis per (symbol, side, candle), shared by all sessions
+}
+
+# --- LLM GATEWAY (see servos/llm_gateway.py) ---
+# OpenAI-compatible chat endpoints shared by every session (one pooled HTTP client)
+LLM_PROVIDERS = {
+    'openai': {'base_url': 'https://api.openai.com/v1', 'api_key_env': 'OPENAI_API_KEY'},
+    'xai': {'base_url': 'https://api.x.ai/v1', 'api_key_env': 'XAI_API_KEY'},
+}
+LLM_MODEL_CONCURRENCY = {'default': 4}  # In-flight requests per model
+LLM_REQUEST_TIMEOUT = 30.0              # Seconds per request (counts as a breaker failure)
+LLM_BREAKER_THRESHOLD = 5               # Consecutive failures before a provider's breaker opens
+LLM_BREAKER_RECOVERY = 60               # Seconds before a half-open probe
+
+# --- SCANNER (see servos/scanner.py) ---
+SCANNER_CONCURRENCY = 8    # Cold symbols fetched in parallel
+SCANNER_REST_BUDGET = 60   # Max REST candle fetches per /scanner run (warm symbols are free)
+SCANNER_CHUNK_SIZE = 20    # Cold symbols per progressive report update
+
 # --- DIAGNOSTICS CONFIG ---
 DIAG_SYMBOL_CRYPTO = "BTCUSDT"
 DIAG_SYMBOL_STOCK = "TSLA"
@@ -282,6 +362,7 @@ DEFAULT_SESSION_CONFIG = {
     "spot_allocation_pct": 0.20,
     "personality": "STANDARD_ES",
     "sentiment_filter": True,
+    "ai_filter_threshold": None,  # AI Filter score (0-1) above which signals are filtered; None = per API mode (0.75 / 0.8 / 0.9)
     "atr_multiplier": 2.2,
     "circuit_breaker_enabled": True,
     "alpaca_key": None,
@@ -0,0 +1,64 @@
+import asyncio
+
+from servos.ai_filter import AIFilterEngine
+
+
+SENTIMENT = {
+    'fear_greed': {'value': 80},         # Greed: adverse for LONG
+    'volatility': {'level': 0.6},
+    'momentum': {'score': 0.2},
+    'ai_valuation': {'available': False},
+    'api_status': {'working_apis': 3, 'all_apis_failed': False},
+}
+
+
+def test_analysis_shared_across_sessions_per_candle():
+    async def scenario():
+        engine = AIFilterEngine()
+        gathered = []
+
+        async def fake_gather(symbol):
+            gathered.append(symbol)
+            await asyncio.sleep(0.01)
+            return SENTIMENT
+
+        engine._gather_sentiment_data = fake_gather
+        signal = {'symbol': 'BTCUSDT', 'side': 'LONG', 'candle_time': '2026-01-01 10:15:00'}
+        configs = [{}] * 8 + [{'ai_filter_threshold': 0.7}, {'sentiment_filter': False}]
+
+        decisions = await asyncio.gather(*(engine.should_filter_signal(signal, c) for c in configs))
+        assert gathered == ['BTCUSDT']  # One analysis for ten sessions
+
+        assert [d[0] for d in decisions] == [False] * 8 + [True, False]
+        assert decisions[0][1].startswith('Señal permitida')
+        assert decisions[8][1].startswith('Señal filtrada')
+        assert decisions[9][1] == 'AI Filter desactivado'
+
+        # The other side and the next candle are new questions
+        await engine.should_filter_signal({**signal, 'side': 'SHORT'}, {})
+        await engine.should_filter_signal({**signal, 'candle_time': '2026-01-01 10:30:00'}, {})
+        await engine.should_filter_signal(signal, {})
+        assert len(gathered) == 3
+
+    asyncio.run(scenario())
+
+
+def test_analysis_errors_fail_open_and_are_not_cached():
+    async def scenario():
+        engine = AIFilterEngine()
+        calls = []
+
+        async def broken(symbol):
+            calls.append(symbol)
+            return {'api_status': {}}  # No side-specific data: scoring raises
+
+        engine._gather_sentiment_data = broken
+        engine._score_signal = lambda *args: 1 / 0
+        signal = {'symbol': 'ETHUSDT', 'side': 'SHORT', 'candle_time': 't1'}
+
+        should_filter, reason, _ = await engine.should_filter_signal(signal, {})
+        assert not should_filter and reason.startswith('Error en AI Filter')
+        await engine.should_filter_signal(signal, {})
+        assert len(calls) == 2
+
+    asyncio.run(scenario())
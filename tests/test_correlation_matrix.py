@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nexus_system.shield.correlation import CorrelationManager
+from nexus_system.shield.correlation_matrix import RollingCorrelationMatrix
+from nexus_system.shield.risk_policy import PortfolioState, RiskPolicy, StrategyIntent
+
+SYMBOLS = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'DOGEUSDT', 'XRPUSDT']
+
+
+def make_closes(n=200, seed=3):
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, n)
+    returns = {s: market * rng.uniform(0.2, 1.5) + rng.normal(0, 0.01, n) for s in SYMBOLS}
+    index = pd.date_range('2024-01-01', periods=n, freq='15min')
+    return pd.DataFrame({s: 100 * np.exp(np.cumsum(r)) for s, r in returns.items()}, index=index)
+
+
+def test_incremental_matches_pandas():
+    closes = make_closes()
+    matrix = RollingCorrelationMatrix(SYMBOLS, window=50, min_periods=40)
+    rng = np.random.default_rng(0)
+
+    for ts, row in closes.iterrows():
+        for symbol in rng.permutation(SYMBOLS):  # Closes arrive in any order
+            matrix.on_close(symbol, row[symbol], ts)
+
+    returns = np.log(closes).diff().iloc[-50:]
+    expected = returns.corr()
+    np.testing.assert_allclose(matrix.matrix().to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-12)
+    assert matrix.get('ETHUSDT', 'SOLUSDT') == pytest.approx(expected.loc['ETHUSDT', 'SOLUSDT'])
+
+    cov = returns.cov()
+    beta = cov.loc['DOGEUSDT', 'BTCUSDT'] / cov.loc['BTCUSDT', 'BTCUSDT']
+    assert matrix.beta('DOGEUSDT') == pytest.approx(beta)
+
+    views = matrix.pairs(), matrix.to_benchmark('corr')
+    assert views[0][('ETHUSDT', 'SOLUSDT')] == pytest.approx(expected.loc['ETHUSDT', 'SOLUSDT'])
+    assert 'BTCUSDT' not in views[1] and len(views[1]) == len(SYMBOLS) - 1
+
+
+def test_seed_matches_live_feed_and_ignores_late_closes():
+    closes = make_closes(120)
+    live = RollingCorrelationMatrix(SYMBOLS, window=50, min_periods=40)
+    for ts, row in closes.iterrows():
+        for symbol in SYMBOLS:
+            live.on_close(symbol, row[symbol], ts)
+
+    seeded = RollingCorrelationMatrix(SYMBOLS, window=50, min_periods=40)
+    seeded.seed({s: closes[s] for s in SYMBOLS})
+    np.testing.assert_allclose(seeded.matrix().to_numpy(), live.matrix().to_numpy(), rtol=1e-9)
+
+    before = live.get('BTCUSDT', 'ETHUSDT')
+    assert live.on_close('BTCUSDT', 1.0, closes.index[-2]) is False
+    assert live.get('BTCUSDT', 'ETHUSDT') == before
+
+
+def test_not_ready_until_min_periods():
+    closes = make_closes(30)
+    matrix = RollingCorrelationMatrix(SYMBOLS, window=50, min_periods=40)
+    matrix.seed({s: closes[s] for s in SYMBOLS})
+    assert matrix.get('BTCUSDT', 'ETHUSDT') is None
+    assert len(matrix.pairs()) == 0
+
+
+def test_correlation_manager_uses_matrix():
+    closes = make_closes(80)
+    closes['WBTCUSDT'] = closes['BTCUSDT'] * 1.001
+    matrix = RollingCorrelationMatrix(list(closes.columns), window=50, min_periods=40)
+    matrix.seed({s: closes[s] for s in closes.columns})
+
+    manager = CorrelationManager(max_correlation=0.85, window_size=50, matrix=matrix)
+    assert manager.covers(['WBTCUSDT', 'BTCUSDT'])
+    assert manager.check_correlation('WBTCUSDT', None, ['BTCUSDT']) is False
+    assert manager.check_correlation('XRPUSDT', None, ['DOGEUSDT']) is True
+
+
+def test_high_beta_symbols_are_sized_to_benchmark_equivalent_exposure():
+    policy = RiskPolicy({})
+    portfolio = PortfolioState(
+        positions=[], exposure_notional_by_exchange={}, exposure_by_cluster={},
+        net_direction_exposure={}, drawdown=0.0, corr_matrix={}, corr_to_bench={},
+        beta_to_bench={'SOLUSDT': 2.0, 'BNBUSDT': 0.6},
+    )
+
+    def size(symbol):
+        intent = StrategyIntent(symbol, 'OPEN_LONG', 'TREND', 0.8, 100.0, None, {})
+        return policy._apply_dynamic_adjustments(0.10, intent, portfolio)
+
+    assert size('SOLUSDT') == 0.05  # Beta 2: half the size, same exposure to the benchmark
+    assert size('BNBUSDT') == 0.10  # Low beta never grows the position
+    assert size('XRPUSDT') == 0.10  # No beta estimate yet
@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime
+
+from servos.db_async import NexusDB, _as_datetime, calibration_from_metrics, performance_from_trades
+
+
+def test_performance_and_calibration():
+    t0 = datetime(2024, 1, 1)
+    trades = [
+        {'pnl': pnl, 'entry_time': t0, 'exit_time': datetime(2024, 1, 1, 2)}
+        for pnl in [10.0] * 7 + [-5.0] * 4
+    ]
+    metrics = performance_from_trades(trades)
+    assert metrics['total_trades'] == 11
+    assert metrics['winning_trades'] == 7
+    assert metrics['profit_factor'] == 70 / 20
+    assert metrics['avg_holding_time'] == 2.0
+
+    calibration = calibration_from_metrics(metrics)
+    assert calibration['size_multiplier'] > 1.0
+    assert calibration_from_metrics(performance_from_trades(trades[:5])) is None
+
+
+def test_as_datetime_converts_to_naive_utc():
+    assert _as_datetime('2024-01-01T12:00:00+02:00') == datetime(2024, 1, 1, 10, 0)
+    assert _as_datetime(None) is None
+
+
+def test_without_pool_matches_sync_fallbacks(monkeypatch):
+    monkeypatch.setenv('TELEGRAM_CHAT_ID', '42')
+    db = NexusDB()
+
+    async def run():
+        assert await db.get_user_role('42') == (True, 'owner')
+        assert await db.get_user_roles(['42', '7']) == {'42': (True, 'owner'), '7': (False, 'none')}
+        assert await db.get_user_enabled_groups('7') == {"CRYPTO": True, "STOCKS": True, "ETFS": True}
+        assert await db.load_all_sessions() is None
+        assert await db.log_trade_entry('7', 'BTCUSDT', 'LONG', 'TREND', 'BINANCE', 1.0, 1.0) is False
+        assert await db.save_scheduled_task(7, {}) == -1
+        assert await db.get_closed_trades('7') == []
+        assert await db.get_closed_strategies('7') == []
+        assert await db.get_user_timezone('7') is None
+        assert await db.set_user_timezone('7', 'UTC') is False
+
+    asyncio.run(run())
+
+
+def test_timezone_manager_uses_async_pool(monkeypatch):
+    from servos import timezone_manager
+    from servos.db_async import nexus_db
+
+    stored = {}
+
+    async def get_tz(chat_id):
+        return stored.get(chat_id)
+
+    async def set_tz(chat_id, tz_name):
+        stored[chat_id] = tz_name
+        return True
+
+    monkeypatch.setattr(nexus_db, 'pool', object())
+    monkeypatch.setattr(nexus_db, 'get_user_timezone', get_tz)
+    monkeypatch.setattr(nexus_db, 'set_user_timezone', set_tz)
+
+    async def run():
+        assert await timezone_manager.get_user_timezone(7) == timezone_manager.DEFAULT_TIMEZONE
+        assert (await timezone_manager.set_user_timezone(7, 'Nowhere/Else'))[0] is False
+        assert (await timezone_manager.set_user_timezone(7, 'Europe/Madrid'))[0] is True
+        return await timezone_manager.get_user_timezone(7)
+
+    assert asyncio.run(run()) == 'Europe/Madrid'
+    # Aliases such as the GMT-4 default resolve to a real zone
+    local = timezone_manager.convert_from_utc(datetime(2024, 1, 1, 12), 'GMT-4')
+    assert local.hour == 8
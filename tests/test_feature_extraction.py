@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nexus_system.cortex.feature_engineering import FEATURE_COLUMNS, add_indicators, extract_last_features
+
+
+def make_candles(n, seed=7, timed=True):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    df = pd.DataFrame({
+        'open': close + rng.normal(0, 0.3, n),
+        'high': close + rng.random(n) + 0.3,
+        'low': close - rng.random(n) - 0.3,
+        'close': close,
+        'volume': rng.random(n) * 100,
+    })
+    if timed:
+        df.index = pd.date_range('2024-01-01 03:00', periods=n, freq='15min')
+    return df
+
+
+@pytest.mark.parametrize("n,seed,timed", [(64, 1, True), (250, 2, True), (250, 3, False), (1000, 4, True)])
+def test_last_row_matches_full_pipeline(n, seed, timed):
+    """Last-row mode yields exactly the final FEATURE_COLUMNS row of the full frame."""
+    df = make_candles(n, seed, timed)
+    expected = add_indicators(df.copy())[FEATURE_COLUMNS].iloc[-1].astype(float)
+
+    result = add_indicators(df, last_row_only=True)
+
+    assert list(result.columns) == FEATURE_COLUMNS
+    assert len(result) == 1 and result.index[0] == df.index[-1]
+    np.testing.assert_allclose(result.iloc[0].to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+def test_last_row_degenerate_candles():
+    """Flat prices and zero volume hit the same NaN/inf fallbacks as the full pipeline."""
+    df = make_candles(120)
+    df[['open', 'high', 'low', 'close']] = 100.0
+    df.loc[df.index[-30:], 'volume'] = 0.0
+    expected = add_indicators(df.copy())[FEATURE_COLUMNS].iloc[-1].astype(float)
+
+    result = extract_last_features(df).iloc[0]
+
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+def test_last_row_does_not_mutate_input():
+    df = make_candles(200)
+    before = df.copy()
+    extract_last_features(df)
+    pd.testing.assert_frame_equal(df, before)
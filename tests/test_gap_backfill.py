@@ -0,0 +1,83 @@
+import asyncio
+
+from nexus_system.uplink.gap_backfill import GapBackfiller
+from nexus_system.uplink.timeframe_cache import TimeframeCache
+
+MINUTE = 60_000
+
+
+def minute_candle(i, is_closed=True):
+    return {
+        'timestamp': i * MINUTE,
+        'open': 100.0 + i,
+        'high': 101.0 + i,
+        'low': 99.0 + i,
+        'close': 100.5 + i,
+        'volume': 1.0,
+        'is_closed': is_closed,
+    }
+
+
+def test_reconnect_gap_is_filled_with_one_request():
+    cache = TimeframeCache(base_timeframe='1m', derived_timeframes=['5m'])
+    # Minutes 7-11 closed while the socket was down; live stream resumed at 12
+    for i in list(range(7)) + [12]:
+        cache.update_candle('BTCUSDT', minute_candle(i))
+    cache.update_candle('BTCUSDT', minute_candle(13, is_closed=False))
+    now = 13 * MINUTE + 30_000
+    assert cache.find_gaps('BTCUSDT', '1m', now) == [(7 * MINUTE, 12 * MINUTE)]
+
+    requests = []
+
+    async def fetch(symbol, timeframe, since, limit):
+        requests.append((symbol, timeframe, since, limit))
+        rows = [minute_candle(i) for i in range(since // MINUTE, since // MINUTE + limit)]
+        return [[c['timestamp'], c['open'], c['high'], c['low'], c['close'], c['volume']] for c in rows]
+
+    filler = GapBackfiller(cache)
+    filled = asyncio.run(filler.fill(fetch, ['BTCUSDT'], now_ms=now))
+
+    # Only the missing range was requested; the 5m bucket was rebuilt locally
+    assert requests == [('BTCUSDT', '1m', 7 * MINUTE, 5)]
+    assert filled == {'BTCUSDT': 5}
+    assert not cache.has_gap('BTCUSDT')
+    base = cache.get_dataframe('BTCUSDT', '1m')
+    assert len(base) == 14 and base['close'].iloc[-1] == 113.5
+    assert not cache.find_gaps('BTCUSDT', '1m', now)
+
+    five = cache.get_dataframe('BTCUSDT', '5m')
+    bucket = five[five['timestamp'] == '1970-01-01 00:05:00'].iloc[0]
+    assert bucket['open'] == 105.0 and bucket['close'] == 109.5 and bucket['volume'] == 5.0
+
+    # The in-progress 5m aggregate now includes the backfilled minutes 10-11
+    updates = cache.update_candle('BTCUSDT', minute_candle(14))
+    assert dict(updates)['5m']['open'] == 110.0 and dict(updates)['5m']['is_closed']
+
+
+def test_overlapping_fills_keep_the_gap_flag_until_the_last_one():
+    cache = TimeframeCache(base_timeframe='1m')
+    for i in list(range(5)) + [8]:
+        cache.update_candle('BTCUSDT', minute_candle(i))
+    now = 8 * MINUTE + 30_000
+    release = asyncio.Event()
+
+    async def slow_fetch(symbol, timeframe, since, limit):
+        await release.wait()
+        return [[i * MINUTE, 1.0, 1.0, 1.0, 1.0, 1.0] for i in range(since // MINUTE, since // MINUTE + limit)]
+
+    async def no_rows(symbol, timeframe, since, limit):
+        return []
+
+    async def scenario():
+        filler = GapBackfiller(cache)
+        slow = asyncio.create_task(filler.fill_symbol(slow_fetch, 'BTCUSDT', now_ms=now))
+        await asyncio.sleep(0)
+        await filler.fill_symbol(no_rows, 'BTCUSDT', now_ms=now)  # Finishes first
+        assert cache.has_gap('BTCUSDT')  # The other fill is still splicing
+        cache.clear_gap('BTCUSDT')  # Nor can an unrelated clear drop it
+        assert cache.has_gap('BTCUSDT')
+        release.set()
+        await slow
+        assert not cache.has_gap('BTCUSDT')
+
+    asyncio.run(scenario())
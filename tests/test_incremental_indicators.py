@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nexus_system.utils.indicators import TechnicalIndicators
+from nexus_system.utils.incremental_indicators import IndicatorEngine, INDICATOR_COLUMNS
+
+
+def make_candles(n, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n, freq='15min'),
+        'open': close + rng.normal(0, 0.3, n),
+        'high': close + rng.random(n),
+        'low': close - rng.random(n),
+        'close': close,
+        'volume': rng.random(n) * 100,
+    })
+
+
+def test_parity_with_full_recompute():
+    """Streaming one candle at a time matches add_all_indicators over the same history."""
+    history = make_candles(400)
+    expected = TechnicalIndicators.add_all_indicators(history.copy())
+
+    engine = IndicatorEngine(capacity=400)
+    for end in range(300, 401):
+        result = engine.get_frame('BTCUSDT', '15m', history.iloc[:end].reset_index(drop=True))
+
+    assert list(result.columns) == list(expected.columns)
+    for col in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(result[col].to_numpy(), expected[col].to_numpy(),
+                                   rtol=1e-9, atol=1e-9, err_msg=col)
+
+
+def test_open_candle_is_not_committed():
+    history = make_candles(120)
+    engine = IndicatorEngine(capacity=250)
+
+    first = engine.get_frame('ETHUSDT', '15m', history)
+    # Same candle re-read with a different close (still open) must not drift the state
+    updated = history.copy()
+    updated.loc[updated.index[-1], 'close'] += 5.0
+    second = engine.get_frame('ETHUSDT', '15m', updated)
+    again = engine.get_frame('ETHUSDT', '15m', history)
+
+    assert second['ema_20'].iloc[-1] > first['ema_20'].iloc[-1]
+    assert again['ema_20'].iloc[-1] == pytest.approx(first['ema_20'].iloc[-1])
+
+
+def test_sliding_window_keeps_history():
+    """Once warm, a sliding cache window only feeds the new candle."""
+    history = make_candles(300)
+    engine = IndicatorEngine(capacity=250)
+
+    engine.get_frame('SOLUSDT', '15m', history.iloc[:250].reset_index(drop=True))
+    window = history.iloc[1:251].reset_index(drop=True)
+    result = engine.get_frame('SOLUSDT', '15m', window)
+
+    expected = TechnicalIndicators.add_all_indicators(history.iloc[:251].copy())
+    assert len(result) == 250
+    assert result['ema_200'].iloc[-1] == pytest.approx(expected['ema_200'].iloc[-1], rel=1e-12)
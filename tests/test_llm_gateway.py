@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from servos import llm_gateway
+from servos.llm_gateway import LLMGateway, LLMUnavailable
+from src.core.circuit_breaker import CircuitBreakerOpenError
+
+
+def answer(text):
+    return {'choices': [{'message': {'content': text}}]}
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+
+
+def test_identical_prompts_share_one_request_and_cache(monkeypatch):
+    monkeypatch.setattr(llm_gateway, 'LLM_MODEL_CONCURRENCY', {'default': 2})
+
+    async def scenario():
+        gateway = LLMGateway()
+        requests = []
+        in_flight = peak = 0
+
+        async def fake_request(provider, payload):
+            nonlocal in_flight, peak
+            requests.append(payload['messages'][-1]['content'])
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return answer(f"re: {payload['messages'][-1]['content']}")
+
+        gateway._request = fake_request
+        same = [{'role': 'user', 'content': 'BTC?'}]
+        results = await asyncio.gather(*(gateway.chat(same, model='m', ttl=60) for _ in range(10)))
+        assert results == ['re: BTC?'] * 10
+        assert await gateway.chat(same, model='m', ttl=60) == 're: BTC?'
+        assert requests == ['BTC?']
+
+        # Distinct prompts each pay once, at most 2 in flight for the model
+        await asyncio.gather(*(gateway.chat([{'role': 'user', 'content': f'q{i}'}], model='m') for i in range(6)))
+        assert len(requests) == 7 and peak == 2
+
+        # Different parameters are a different request
+        await gateway.chat(same, model='m', ttl=60, temperature=0.9)
+        assert len(requests) == 8
+
+    asyncio.run(scenario())
+
+
+def test_breaker_opens_on_overload_and_fails_fast(monkeypatch):
+    monkeypatch.setattr(llm_gateway, 'LLM_BREAKER_THRESHOLD', 2)
+
+    async def scenario():
+        gateway = LLMGateway()
+        calls = []
+
+        async def overloaded(provider, payload):
+            calls.append(1)
+            raise LLMUnavailable("openai HTTP 429")
+
+        gateway._request = overloaded
+        for i in range(2):
+            with pytest.raises(LLMUnavailable):
+                await gateway.chat([{'role': 'user', 'content': f'q{i}'}], model='m')
+        with pytest.raises(CircuitBreakerOpenError):
+            await gateway.chat([{'role': 'user', 'content': 'q3'}], model='m')
+        assert len(calls) == 2
+        assert gateway.get_status()['breakers'] == {'openai': 'open'}
+
+    asyncio.run(scenario())
@@ -0,0 +1,63 @@
+import asyncio
+
+from nexus_system.uplink.market_registry import MarketRegistry
+
+
+class FakeClient:
+    has = {'fetchLeverageTiers': True}
+
+    def __init__(self, catalogue):
+        self.catalogue = catalogue
+        self.markets = None
+        self.loads = 0
+        self.tier_calls = 0
+
+    async def load_markets(self, reload=False):
+        if self.markets and not reload:
+            return self.markets
+        self.loads += 1
+        self.markets = dict(self.catalogue)
+        self.markets_by_id = {m['id']: [m] for m in self.markets.values()}
+        self.symbols = sorted(self.markets)
+        return self.markets
+
+    async def fetch_leverage_tiers(self, symbols):
+        self.tier_calls += 1
+        return {s: [{'tier': 1, 'maxLeverage': 50}] for s in symbols}
+
+
+CATALOGUE = {'BTC/USDT:USDT': {'id': 'BTCUSDT', 'limits': {'cost': {'min': 5.0}}}}
+
+
+def test_catalogue_loaded_once_and_shared():
+    registry = MarketRegistry(min_reload_interval=0)
+    clients = [FakeClient(CATALOGUE) for _ in range(5)]
+
+    async def run():
+        await asyncio.gather(*(registry.ensure('BINANCE', c) for c in clients))
+        assert sum(c.loads for c in clients) == 1
+        assert all(c.markets is clients[0].markets for c in clients)
+
+        # A reload through any client is re-attached to all of them
+        clients[2].catalogue = {**CATALOGUE, 'ETH/USDT:USDT': {'id': 'ETHUSDT'}}
+        assert await registry.reload('BINANCE', clients[2])
+        assert all('ETH/USDT:USDT' in c.markets for c in clients)
+
+    asyncio.run(run())
+
+
+def test_reload_is_throttled_and_tiers_cached():
+    registry = MarketRegistry(min_reload_interval=60)
+    client = FakeClient(CATALOGUE)
+
+    async def run():
+        await registry.ensure('BYBIT', client)
+        await registry.reload('BYBIT', client)  # Just loaded: skipped
+        assert client.loads == 1
+
+        for _ in range(3):
+            tiers = await registry.leverage_tiers('BYBIT', 'BTC/USDT:USDT', client)
+        assert tiers[0]['maxLeverage'] == 50
+        assert client.tier_calls == 1
+
+    asyncio.run(run())
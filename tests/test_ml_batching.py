@@ -0,0 +1,111 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nexus_system.cortex.ml_classifier import MLClassifier, MLInferenceBatcher
+
+
+class FakeModel:
+    """Class = row index mod 2; confidence from the 'conf' feature."""
+    classes_ = np.array(['trend', 'grid'])
+
+    def __init__(self):
+        self.calls = []
+
+    def predict_proba(self, X):
+        self.calls.append(len(X))
+        conf = X[:, 1]
+        first = np.where(X[:, 0] % 2 == 0, conf, 1 - conf)
+        return np.column_stack([first, 1 - first])
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    model = FakeModel()
+    monkeypatch.setattr(MLClassifier, '_model', model)
+    monkeypatch.setattr(MLClassifier, '_model_loaded', True)
+    monkeypatch.setattr(MLClassifier, '_scaler', None)
+    monkeypatch.setattr(MLClassifier, '_label_encoder', None)
+    monkeypatch.setattr(MLClassifier, '_model_metadata', None, raising=False)
+    monkeypatch.setattr(MLClassifier, '_feature_names', None)
+    monkeypatch.setattr(MLClassifier, '_extract_features', staticmethod(
+        lambda df: (df[['idx', 'conf']].iloc[-1:].copy(), False)
+    ))
+    return model
+
+
+def market_data(i, conf=0.9):
+    return {'symbol': f'S{i}USDT', 'dataframe': pd.DataFrame({'idx': [i], 'conf': [conf]})}
+
+
+def test_batch_matches_single_calls(fake_model):
+    batch = [market_data(i, conf=0.9 if i != 3 else 0.6) for i in range(6)]
+    batched = MLClassifier.classify_batch(batch)
+
+    assert fake_model.calls == [6]
+    single = [MLClassifier.classify(md) for md in batch]
+    assert [r and r.suggested_strategy for r in batched] == [r and r.suggested_strategy for r in single]
+    assert batched[0].suggested_strategy == 'TrendFollowing'
+    assert batched[1].suggested_strategy == 'Grid'
+    assert batched[3] is None  # Below confidence threshold -> rule-based fallback
+
+
+def test_batcher_coalesces_concurrent_requests(fake_model):
+    async def run():
+        batcher = MLInferenceBatcher(window_ms=20, max_batch=64)
+        return await asyncio.gather(*(batcher.classify(market_data(i)) for i in range(10)))
+
+    results = asyncio.run(run())
+
+    assert fake_model.calls == [10]
+    assert [r.suggested_strategy for r in results[:2]] == ['TrendFollowing', 'Grid']
+
+
+def test_engine_selects_strategies_for_whole_bar_together(monkeypatch):
+    from nexus_system.core.engine import NexusCore
+    from nexus_system.cortex.factory import StrategyFactory
+    from nexus_system.utils.logger import get_logger
+
+    symbols = [f'S{i}USDT' for i in range(30)]  # Three times the analysis semaphore
+
+    class FakeStream:
+        async def get_multiframe_candles(self, asset):
+            return {'main': market_data(0)}
+
+    class FakeRisk:
+        async def get_override_action(self, asset, data):
+            return None
+
+    class HoldStrategy:
+        name = 'Hold'
+
+        async def analyze(self, data):
+            return None
+
+    async def run():
+        arrived, batched = [], []
+        all_in = asyncio.Event()
+
+        async def get_strategy_async(asset, data):
+            arrived.append(asset)
+            if len(arrived) == len(symbols):
+                all_in.set()
+            await asyncio.wait_for(all_in.wait(), timeout=1)  # Like one batcher window
+            batched.append(asset)
+            return HoldStrategy()
+
+        monkeypatch.setattr(StrategyFactory, 'get_strategy_async', staticmethod(get_strategy_async))
+        core = NexusCore.__new__(NexusCore)
+        core.logger = get_logger("NexusCore")
+        core.market_stream = FakeStream()
+        core.risk_guardian = FakeRisk()
+        core.signal_callback = None
+        core._semaphore = asyncio.Semaphore(10)
+        await asyncio.gather(*(core._process_symbol_event(s) for s in symbols))
+        return batched
+
+    batched = asyncio.run(run())
+
+    assert sorted(batched) == sorted(symbols)
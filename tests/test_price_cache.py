@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nexus_system.uplink.price_cache import PriceCache, ColumnarPriceCache
+
+INTERVAL_MS = 15 * 60 * 1000
+
+
+def make_candle(i, close=None, is_closed=True):
+    close = close if close is not None else 100.0 + i
+    return {
+        'timestamp': i * INTERVAL_MS,
+        'open': close - 0.5,
+        'high': close + 1.0,
+        'low': close - 1.0,
+        'close': close,
+        'volume': 10.0 + i,
+        'is_closed': is_closed,
+        'trades': i,
+    }
+
+
+def test_matches_legacy_cache():
+    """Columnar engine returns the same frame as the list-of-dicts engine."""
+    legacy = PriceCache(max_candles=20)
+    columnar = ColumnarPriceCache(max_candles=20)
+
+    for i in range(35):
+        for cache in (legacy, columnar):
+            cache.update_candle('BTCUSDT', make_candle(i, is_closed=False))
+            cache.update_candle('BTCUSDT', make_candle(i, close=200.0 + i, is_closed=True))
+
+    expected = legacy.get_dataframe('BTCUSDT')
+    result = columnar.get_dataframe('BTCUSDT')
+
+    assert len(result) == 20
+    np.testing.assert_allclose(result[['open', 'high', 'low', 'close', 'volume']].values,
+                               expected[['open', 'high', 'low', 'close', 'volume']].values)
+    assert list(result['timestamp'].astype('datetime64[ms]')) == list(expected['timestamp'].astype('datetime64[ms]'))
+    assert columnar.get_last_price('BTCUSDT') == 234.0
+
+
+def test_open_candle_updates_in_place():
+    cache = ColumnarPriceCache(max_candles=5)
+    cache.update_candle('ETHUSDT', make_candle(0))
+    cache.update_candle('ETHUSDT', make_candle(1, close=50.0, is_closed=False))
+    cache.update_candle('ETHUSDT', make_candle(1, close=51.0, is_closed=False))
+
+    candles = cache.get_candles('ETHUSDT')
+    assert len(candles) == 2
+    assert candles[-1]['close'] == 51.0
+    assert candles[-1]['is_closed'] is False
+
+
+def test_views_are_zero_copy_and_read_only():
+    cache = ColumnarPriceCache(max_candles=5)
+    for i in range(8):
+        cache.update_candle('SOLUSDT', make_candle(i))
+
+    arrays = cache.get_arrays('SOLUSDT')
+    ring = cache._rings['SOLUSDT']
+    assert np.shares_memory(arrays['close'], ring.ohlcv)
+    assert list(arrays['close']) == [103.0, 104.0, 105.0, 106.0, 107.0]
+    with pytest.raises(ValueError):
+        arrays['close'][0] = 0.0
+
+    df = cache.get_dataframe('SOLUSDT', copy=True)
+    assert not np.shares_memory(df['close'].to_numpy(), ring.ohlcv)
+
+
+def test_backfill_merges_without_duplicates():
+    cache = ColumnarPriceCache(max_candles=10)
+    for i in (5, 6, 7):
+        cache.update_candle('BTCUSDT', make_candle(i, close=500.0 + i))
+
+    # Overlapping REST batch with pandas timestamps (as produced by MarketStream)
+    history = []
+    for i in range(3, 8):
+        candle = make_candle(i)
+        candle['timestamp'] = pd.Timestamp(i * INTERVAL_MS, unit='ms')
+        history.append(candle)
+    cache.backfill('BTCUSDT', history)
+
+    arrays = cache.get_arrays('BTCUSDT')
+    assert list(arrays['timestamp'] // INTERVAL_MS) == [3, 4, 5, 6, 7]
+    # Live (cached) values win over REST on duplicate timestamps
+    assert list(arrays['close']) == [103.0, 104.0, 505.0, 506.0, 507.0]
+
+    # Strictly newer batch takes the append fast path
+    cache.backfill('BTCUSDT', [make_candle(8), make_candle(9)])
+    assert cache.get_stats()['total_candles'] == 7
+    assert cache.get_last_price('BTCUSDT') == 109.0
+
+
+def test_backfill_splices_gap_in_order():
+    cache = ColumnarPriceCache(max_candles=10)
+    for i in (1, 2, 6, 7):
+        cache.update_candle('BTCUSDT', make_candle(i, close=500.0 + i))
+
+    # Missing range plus one overlapping row that REST is authoritative for
+    cache.backfill('BTCUSDT', [make_candle(i) for i in (3, 4, 5, 6)], overwrite=True)
+    arrays = cache.get_arrays('BTCUSDT')
+    assert list(arrays['timestamp'] // INTERVAL_MS) == [1, 2, 3, 4, 5, 6, 7]
+    assert list(arrays['close']) == [501.0, 502.0, 103.0, 104.0, 105.0, 106.0, 507.0]
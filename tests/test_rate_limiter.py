@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+from nexus_system.uplink.rate_limiter import RateLimiter, RateLimitTimeout, prepaid_lane, rate_lane
+
+
+def make_limiter(**config):
+    return RateLimiter({'BINANCE': {'rate': 10.0, 'burst': 10, 'order_rate': 100.0, 'order_burst': 100, **config}})
+
+
+def test_orders_are_served_before_queued_candles():
+    async def scenario():
+        limiter = make_limiter()
+        served = []
+
+        @rate_lane('candles')
+        async def candles(i):
+            await limiter.acquire('BINANCE', 5)
+            served.append(f'candles{i}')
+
+        @rate_lane('orders')
+        async def order():
+            await limiter.acquire('BINANCE', 1, account='key')
+            served.append('order')
+
+        # Candles may only spend down to the 30% reserve: the second one has to queue
+        await candles(0)
+        queued = asyncio.create_task(candles(1))
+        await asyncio.sleep(0)
+        assert served == ['candles0']
+
+        # An order skips the queued candle request and uses the reserve immediately
+        await asyncio.wait_for(order(), 0.05)
+        assert served == ['candles0', 'order']
+        await asyncio.wait_for(queued, 2)
+        assert served[-1] == 'candles1'
+
+    asyncio.run(scenario())
+
+
+def test_penalty_and_bounded_candle_wait(monkeypatch):
+    from nexus_system.uplink import rate_limiter
+    monkeypatch.setitem(rate_limiter.LANES, 'candles', (3, 0.3, 0.05))
+
+    async def scenario():
+        limiter = make_limiter()
+        assert limiter.has_headroom('BINANCE', lane='candles')
+        # A testnet 429 never pauses the production budget
+        limiter.penalize('BINANCE_TESTNET', 30)
+        assert limiter.has_headroom('BINANCE', lane='candles')
+        limiter.penalize('BINANCE', 30)
+        assert not limiter.has_headroom('BINANCE', lane='candles')
+        with pytest.raises(RateLimitTimeout):
+            await limiter.acquire('BINANCE', 1, lane='candles')
+
+        # Unconfigured exchanges (testnets included) are not throttled
+        await asyncio.wait_for(limiter.acquire('KRAKEN', 1000), 0.05)
+        await asyncio.wait_for(limiter.acquire('BINANCE_TESTNET', 1000, account='key'), 0.05)
+
+    asyncio.run(scenario())
+
+
+def test_attached_client_draws_ccxt_cost():
+    async def scenario():
+        limiter = make_limiter()
+
+        class Client:
+            apiKey = 'key'
+            enableRateLimit = False
+
+        client = Client()
+        limiter.attach(client, 'BINANCE')
+        assert client.enableRateLimit
+        await client.throttle(5)
+        await client.throttle(2)
+        assert limiter.stats['BINANCE:market'] == {'requests': 2, 'weight': 7, 'waited': pytest.approx(0, abs=0.05)}
+
+    asyncio.run(scenario())
+
+
+def test_prepaid_lane_is_not_escalated_by_adapters():
+    async def scenario():
+        limiter = make_limiter()
+
+        class Client:
+            apiKey = None
+
+        client = Client()
+        limiter.attach(client, 'BINANCE')
+
+        @rate_lane('candles')
+        async def fetch_candles(cost):
+            await client.throttle(cost)
+
+        # The scanner lane keeps half the burst (5 tokens) back for other lanes
+        assert limiter.try_acquire('BINANCE', 2, lane='scanner')
+        with prepaid_lane('scanner', 2):
+            await fetch_candles(2)  # Spends the prepaid weight, nothing more
+            await fetch_candles(2)  # Over the prepayment: charged to 'scanner', not 'candles'
+        assert limiter.try_acquire('BINANCE', 2, lane='scanner') is False  # Would dip into the reserve
+        assert limiter.stats['BINANCE:scanner']['weight'] == 4
+        assert 'BINANCE:candles' not in limiter.stats
+
+        # Outside the pinned block the adapter lane applies again
+        await fetch_candles(1)
+        assert limiter.stats['BINANCE:candles']['weight'] == 1
+
+    asyncio.run(scenario())
+
+
+def test_prepaid_weight_is_refunded_when_joining_a_single_flight():
+    from nexus_system.uplink.single_flight import SingleFlight
+
+    async def scenario():
+        limiter = make_limiter()
+        flight = SingleFlight()
+        sent = []
+
+        async def request():
+            await limiter.acquire('BINANCE', 2)  # ccxt throttle of the one real request
+            sent.append(1)
+            await asyncio.sleep(0.01)
+            return 'candles'
+
+        async def scan():
+            assert limiter.try_acquire('BINANCE', 2, lane='scanner')
+            refund = lambda weight: limiter.refund('BINANCE', weight, lane='scanner')
+            with prepaid_lane('scanner', 2, refund=refund):
+                return await flight.do(('BINANCE', 'BTCUSDT'), request)
+
+        assert await asyncio.gather(scan(), scan()) == ['candles', 'candles']
+        assert sent == [1]
+        # Only the leader's weight stays spent; the joiner's reservation went back to the bucket
+        assert limiter.stats['BINANCE:scanner']['weight'] == 2
+        assert limiter._bucket('BINANCE').tokens == pytest.approx(8, abs=0.5)
+
+    asyncio.run(scenario())
@@ -0,0 +1,94 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from nexus_system.cortex.classifier import MarketClassifier
+from nexus_system.uplink.rate_limiter import prepaid_weight
+from nexus_system.uplink.stream import clear_market_stream, set_market_stream
+from nexus_system.utils.indicators import TechnicalIndicators
+from servos.scanner import MarketScanner
+
+
+def candles(seed, n=250):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    df = pd.DataFrame({
+        'timestamp': pd.date_range('2026-01-01', periods=n, freq='15min'),
+        'open': close, 'high': close * 1.005, 'low': close * 0.995, 'close': close,
+        'volume': rng.uniform(100, 200, n),
+    })
+    return TechnicalIndicators.add_all_indicators(df)
+
+
+class FakeStream:
+    def __init__(self, warm):
+        self.warm = set(warm)
+        self.rest_calls = []
+        self.refunds = []
+
+    def has_fresh_candles(self, symbol, timeframe):
+        return symbol in self.warm
+
+    def reserve_rest(self, symbol, weight, lane):
+        assert lane == 'scanner'
+        return True
+
+    def refund_rest(self, symbol, weight, lane):
+        assert lane == 'scanner'
+        self.refunds.append(symbol)  # The fake never spends the weight it was given
+
+    async def get_candles(self, symbol, limit=100, timeframe=None):
+        if symbol not in self.warm:
+            assert prepaid_weight() > 0  # Fetch runs on the weight taken from the scanner lane
+            self.rest_calls.append(symbol)
+            await asyncio.sleep(0.01)
+        if symbol == 'DEADUSDT':
+            return {'dataframe': pd.DataFrame()}
+        return {'dataframe': candles(sum(map(ord, symbol))), 'source': 'websocket' if symbol in self.warm else 'rest'}
+
+
+def test_scan_serves_warm_symbols_first_and_caps_rest():
+    async def scenario():
+        stream = FakeStream(warm=['BTCUSDT', 'ETHUSDT'])
+        set_market_stream(stream)
+        chunks = []
+
+        async def on_chunk(batch, done, total):
+            chunks.append(([r.symbol for r in batch], done, total))
+
+        symbols = ['SOLUSDT', 'BTCUSDT', 'DEADUSDT', 'ETHUSDT', 'XRPUSDT', 'ADAUSDT']
+        try:
+            results = await MarketScanner(concurrency=2, rest_budget=3, chunk_size=2).scan(symbols, on_chunk=on_chunk)
+        finally:
+            clear_market_stream(stream)
+
+        assert [r.symbol for r in results] == symbols
+        assert chunks[0] == (['BTCUSDT', 'ETHUSDT'], 2, 6)
+        assert [c[1] for c in chunks] == [2, 4, 6]
+        assert stream.rest_calls == ['SOLUSDT', 'DEADUSDT', 'XRPUSDT']
+        assert stream.refunds == stream.rest_calls  # Unspent reservations are handed back
+        by_symbol = {r.symbol: r for r in results}
+        assert by_symbol['DEADUSDT'].status == 'no_data'
+        assert by_symbol['ADAUSDT'].status == 'skipped'
+        btc = by_symbol['BTCUSDT']
+        assert btc.status == 'ok' and btc.source == 'websocket' and btc.strategy
+        assert btc.regime == MarketClassifier.classify({'dataframe': candles(sum(map(ord, "BTCUSDT")))}).regime
+
+    asyncio.run(scenario())
+
+
+def test_classify_frame_matches_classify():
+    rng = np.random.default_rng(3)
+    n = 400
+    snapshot = pd.DataFrame({
+        'close': rng.uniform(50, 150, n), 'atr': rng.uniform(0, 3, n), 'adx': rng.uniform(0, 50, n),
+        'ema_20': rng.uniform(95, 105, n), 'ema_50': rng.uniform(95, 105, n), 'ema_200': rng.uniform(80, 120, n),
+        'upper_bb': rng.uniform(100, 104, n), 'lower_bb': rng.uniform(96, 100, n),
+    })
+    frame = MarketClassifier.classify_frame(snapshot)
+    for i in range(n):
+        single = MarketClassifier.classify({'dataframe': pd.concat([snapshot.iloc[[i]]] * 50)})
+        row = frame.iloc[i]
+        assert (row['regime'], row['suggested_strategy']) == (single.regime, single.suggested_strategy)
+        assert abs(row['confidence'] - single.confidence) < 1e-9
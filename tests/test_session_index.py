@@ -0,0 +1,135 @@
+import asyncio
+
+from servos.session_index import DispatchBudget, SessionIndex
+from nexus_system.core.exit_manager import ExitManager
+
+
+class FakeSession:
+    def __init__(self, chat_id, disabled=(), groups=None):
+        self.chat_id = chat_id
+        self.config = {'disabled_assets': list(disabled)}
+        self.groups = groups or {}
+        self.exit_manager = ExitManager({})
+
+    def is_asset_disabled(self, symbol):
+        return symbol in self.config['disabled_assets']
+
+    def is_group_enabled(self, group):
+        return self.groups.get(group, True)
+
+
+class FakeManager:
+    def __init__(self, *sessions):
+        self.sessions = {s.chat_id: s for s in sessions}
+        self.index = SessionIndex(self)
+
+
+def chat_ids(sessions):
+    return sorted(s.chat_id for s in sessions)
+
+
+def test_signal_index_filters_and_invalidates():
+    a = FakeSession('a')
+    b = FakeSession('b', disabled=['BTCUSDT'])
+    c = FakeSession('c', groups={'MEME_COINS': False})
+    manager = FakeManager(a, b, c)
+
+    assert chat_ids(manager.index.signal_sessions('BTCUSDT')) == ['a', 'c']
+    assert chat_ids(manager.index.signal_sessions('DOGEUSDT')) == ['a', 'b']
+    # Unknown symbols (no group) go to everyone who has not blacklisted them
+    assert chat_ids(manager.index.signal_sessions('FOOUSDT')) == ['a', 'b', 'c']
+
+    # Config change is only picked up once the session is invalidated
+    a.config['disabled_assets'].append('BTCUSDT')
+    assert chat_ids(manager.index.signal_sessions('BTCUSDT')) == ['a', 'c']
+    manager.index.invalidate('a')
+    assert chat_ids(manager.index.signal_sessions('BTCUSDT')) == ['c']
+
+    # Removed sessions disappear after invalidation
+    del manager.sessions['c']
+    manager.index.invalidate('c')
+    assert manager.index.signal_sessions('BTCUSDT') == []
+
+
+def test_exit_index_follows_exit_plans():
+    a, b = FakeSession('a'), FakeSession('b')
+    manager = FakeManager(a, b)
+    for session in (a, b):
+        session.exit_manager.on_change = (
+            lambda symbol, active, chat_id=session.chat_id: manager.index.set_exit_plan(chat_id, symbol, active)
+        )
+
+    assert manager.index.exit_sessions('ETHUSDT') == []
+    plan = b.exit_manager.create_exit_plan('ETHUSDT', 'LONG', 2000.0, 1.0)
+    assert chat_ids(manager.index.exit_sessions('ETHUSDT')) == ['b']
+
+    b.exit_manager.execute_partial_exit('ETHUSDT', plan.exit_rules[0], 1.0)
+    assert manager.index.exit_sessions('ETHUSDT') == []
+
+
+def test_dispatch_budget_bounds_concurrency():
+    budget = DispatchBudget(max_concurrency=3, exchange_limits={'BINANCE': 2})
+    state = {'sessions': 0, 'max_sessions': 0, 'binance': 0, 'max_binance': 0}
+
+    async def work(i):
+        state['sessions'] += 1
+        state['max_sessions'] = max(state['max_sessions'], state['sessions'])
+        async with budget.exchange('binance'):
+            state['binance'] += 1
+            state['max_binance'] = max(state['max_binance'], state['binance'])
+            await asyncio.sleep(0.01)
+            state['binance'] -= 1
+        state['sessions'] -= 1
+        if i == 4:
+            raise RuntimeError("boom")
+        return i
+
+    results = asyncio.run(budget.gather(work(i) for i in range(10)))
+
+    assert state['max_sessions'] == 3
+    assert state['max_binance'] == 2
+    assert isinstance(results[4], RuntimeError)
+    assert [r for r in results if not isinstance(r, Exception)] == [0, 1, 2, 3, 5, 6, 7, 8, 9]
+
+
+class BootSession(FakeSession):
+    def __init__(self, chat_id, manager, delay):
+        super().__init__(chat_id)
+        self.manager = manager
+        self.delay = delay
+        self.ready = False
+        self._proxy = None
+        self.bridge = type('Bridge', (), {'adapters': {}})()
+
+    async def initialize(self, verbose=True, budget=None):
+        async with budget.exchange('BINANCE'):
+            await asyncio.sleep(self.delay)
+        self.ready = True
+        self.manager.index.invalidate(self.chat_id)
+        return True
+
+
+def test_bootstrap_marks_sessions_ready_progressively():
+    from servos.trading_manager import AsyncSessionManager
+
+    async def scenario():
+        manager = AsyncSessionManager()
+        sessions = [BootSession('fast', manager, 0.01)] + [
+            BootSession(f'slow{i}', manager, 0.2) for i in range(3)
+        ]
+        manager.sessions = {s.chat_id: s for s in sessions}
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        task = asyncio.create_task(manager._bootstrap(sessions))
+        assert manager.index.signal_sessions('BTCUSDT') == []
+
+        await asyncio.sleep(0.1)
+        assert chat_ids(manager.index.signal_sessions('BTCUSDT')) == ['fast']
+
+        await task
+        assert len(manager.index.signal_sessions('BTCUSDT')) == 4
+        return loop.time() - started
+
+    # Sessions connect side by side: total time tracks the slowest one, not the sum
+    assert asyncio.run(scenario()) < 0.4
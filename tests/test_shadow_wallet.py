@@ -0,0 +1,68 @@
+from nexus_system.core.shadow_wallet import ShadowWallet
+from nexus_system.shield.risk_policy import portfolio_from_snapshot
+
+
+def position(symbol, side, qty, entry, exchange='BINANCE', pnl=0.0):
+    return {'symbol': symbol, 'side': side, 'quantity': qty, 'entryPrice': entry,
+            'unrealizedPnl': pnl, 'exchange': exchange}
+
+
+def test_aggregates_follow_open_update_close():
+    wallet = ShadowWallet()
+    wallet.update_balance('1', 'BINANCE', {'total': 1000.0, 'available': 800.0})
+    wallet.update_balance('1', 'BYBIT', {'total': 500.0, 'available': 500.0})
+    wallet.update_position('1', 'BTCUSDT', position('BTCUSDT', 'LONG', 0.001, 60000, pnl=-3.0))
+    wallet.update_position('1', 'SOLUSDT', position('SOLUSDT', 'SHORT', 1, 150, exchange='BYBIT', pnl=1.0))
+    before = wallet.snapshot('1')
+
+    wallet.update_position('1', 'BTCUSDT', position('BTCUSDT', 'LONG', 0.002, 60000, pnl=-5.0))
+    wallet.update_position('1', 'SOLUSDT', {'quantity': 0})
+    snap = wallet.snapshot('1')
+
+    assert snap.equity == wallet.get_unified_equity('1') == 1500.0
+    assert dict(snap.notional_by_exchange) == {'BINANCE': 120.0}
+    assert dict(snap.notional_by_symbol) == {'BTCUSDT': 120.0}
+    assert (snap.long_notional, snap.short_notional, snap.unrealized_pnl) == (120.0, 0.0, -5.0)
+    assert snap.version == before.version + 2
+
+    # Readers holding the earlier snapshot keep a consistent view
+    assert set(before.positions) == {'BTCUSDT', 'SOLUSDT'}
+    assert dict(before.notional_by_exchange) == {'BINANCE': 60.0, 'BYBIT': 150.0}
+    assert (before.long_notional, before.short_notional, before['positions']['BTCUSDT']['quantity']) == (60.0, 150.0, 0.001)
+
+
+def test_portfolio_state_is_built_once_per_snapshot():
+    wallet = ShadowWallet()
+    wallet.update_balance('1', 'BINANCE', {'total': 1000.0, 'available': 1000.0})
+    wallet.update_position('1', 'ETHUSDT', position('ETHUSDT', 'SHORT', 0.05, 3000, pnl=-20.0))
+
+    portfolio = portfolio_from_snapshot(wallet.snapshot('1'))
+    assert portfolio is portfolio_from_snapshot(wallet.snapshot('1'))
+    assert portfolio.exposure_by_symbol == {'ETHUSDT': 0.15}
+    assert portfolio.net_direction_exposure == {'long': 0.0, 'short': 150.0}
+    assert portfolio.exposure_notional_by_exchange['BINANCE'] == 150.0
+    assert portfolio.drawdown == 0.02
+    assert portfolio.symbols == {'ETHUSDT'}
+
+    wallet.update_position('1', 'ETHUSDT', {'quantity': 0})
+    assert portfolio_from_snapshot(wallet.snapshot('1')).exposure_by_symbol == {}
+
+
+def test_replace_positions_publishes_one_snapshot():
+    wallet = ShadowWallet()
+    wallet.update_position('1', 'BTCUSDT', position('BTCUSDT', 'LONG', 0.001, 60000))
+    wallet.update_position('1', 'ETHUSDT', position('ETHUSDT', 'LONG', 0.1, 3000))
+    wallet.update_position('1', 'SOLUSDT', position('SOLUSDT', 'SHORT', 1, 150, exchange='BYBIT'))
+    before = wallet.snapshot('1')
+    seen = []
+    wallet.add_listener(lambda kind, key: seen.append(set(wallet.snapshot('1').positions)))
+
+    wallet.replace_positions('1', 'BINANCE', {'XRPUSDT': position('XRPUSDT', 'SHORT', 100, 0.5)})
+
+    snap = wallet.snapshot('1')
+    assert snap.version == before.version + 1
+    assert set(snap.positions) == {'XRPUSDT', 'SOLUSDT'}
+    assert dict(snap.notional_by_exchange) == {'BINANCE': 50.0, 'BYBIT': 150.0}
+    # Listeners only ever observe the fully replaced wallet
+    assert seen == [{'XRPUSDT', 'SOLUSDT'}] * 3
+
@@ -0,0 +1,47 @@
+import asyncio
+
+import pandas as pd
+
+from nexus_system.uplink import stream as stream_module
+from nexus_system.uplink.stream import clear_market_stream, get_market_stream, set_market_stream
+from nexus_system.utils.market_data import get_market_data_async
+
+
+class FakeStream:
+    def __init__(self):
+        self.calls = []
+        self.closed = False
+
+    async def get_candles(self, symbol, limit=100, timeframe=None):
+        self.calls.append((symbol, timeframe, limit))
+        df = pd.DataFrame({'timestamp': range(60), 'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5,
+                           'volume': 10.0, 'rsi': 50.0})
+        return {'dataframe': df, 'source': 'websocket'}
+
+    async def close(self):
+        self.closed = True
+
+
+def test_ad_hoc_requests_reuse_the_registered_stream(monkeypatch):
+    def no_new_streams(*args, **kwargs):
+        raise AssertionError("ad hoc request built its own MarketStream")
+
+    monkeypatch.setattr(stream_module, 'MarketStream', no_new_streams)
+
+    async def scenario():
+        engine_stream = FakeStream()
+        set_market_stream(engine_stream)
+        try:
+            assert await get_market_stream() is engine_stream
+            df = await get_market_data_async('BTCUSDT', timeframe='15m', limit=50)
+            await get_market_data_async('ETHUSDT', timeframe='1h', limit=50)
+        finally:
+            clear_market_stream(engine_stream)
+
+        assert list(df.columns) == ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+        assert len(df) == 50
+        assert engine_stream.calls == [('BTCUSDT', '15m', 50), ('ETHUSDT', '1h', 50)]
+        assert not engine_stream.closed  # Callers never close the shared stream
+        assert stream_module._market_stream is None
+
+    asyncio.run(scenario())
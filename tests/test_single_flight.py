@@ -0,0 +1,74 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from nexus_system.uplink.single_flight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_fetch():
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 42.0
+
+        results = await asyncio.gather(*(flight.do(('ticker', 'BINANCE', 'BTCUSDT'), fetch, ttl=1.0) for _ in range(20)))
+        assert results == [42.0] * 20
+        assert len(calls) == 1
+
+        # Served from the TTL cache afterwards; other keys still fetch
+        assert await flight.do(('ticker', 'BINANCE', 'BTCUSDT'), fetch, ttl=1.0) == 42.0
+        assert len(calls) == 1
+        await flight.do(('ticker', 'BINANCE', 'ETHUSDT'), fetch, ttl=1.0)
+        assert len(calls) == 2
+        assert flight.stats['coalesced'] == 19
+
+    asyncio.run(scenario())
+
+
+def test_errors_and_rejected_results_are_not_cached():
+    async def scenario():
+        flight = SingleFlight()
+        attempts = []
+
+        async def failing():
+            attempts.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("429 Too Many Requests")
+
+        results = await asyncio.gather(*(flight.do('k', failing, ttl=5.0) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert len(attempts) == 1
+
+        async def empty():
+            attempts.append(1)
+            return pd.DataFrame()
+
+        await flight.do('k', empty, ttl=5.0, keep=lambda df: not df.empty)
+        await flight.do('k', empty, ttl=5.0, keep=lambda df: not df.empty)
+        assert len(attempts) == 3
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_shared_fetch():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return 'candles'
+
+        first = asyncio.create_task(flight.do('k', fetch))
+        second = asyncio.create_task(flight.do('k', fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await second == 'candles'
+
+    asyncio.run(scenario())
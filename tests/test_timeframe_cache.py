@@ -0,0 +1,73 @@
+from nexus_system.uplink.timeframe_cache import TimeframeCache, timeframe_to_ms
+
+MINUTE = 60_000
+
+
+def minute_candle(i, is_closed=True):
+    return {
+        'timestamp': i * MINUTE,
+        'open': 100.0 + i,
+        'high': 101.0 + i,
+        'low': 99.0 + i,
+        'close': 100.5 + i,
+        'volume': 1.0,
+        'is_closed': is_closed,
+    }
+
+
+def test_resamples_base_into_higher_timeframes():
+    cache = TimeframeCache(base_timeframe='1m', derived_timeframes=['5m', '15m'])
+
+    closes_15m = []
+    for i in range(30):
+        cache.update_candle('BTCUSDT', minute_candle(i, is_closed=False))
+        for tf, candle in cache.update_candle('BTCUSDT', minute_candle(i)):
+            if tf == '15m' and candle['is_closed']:
+                closes_15m.append(candle)
+
+    assert len(closes_15m) == 2
+    first = closes_15m[0]
+    assert first['timestamp'] == 0
+    assert first['open'] == 100.0
+    assert first['high'] == 115.0
+    assert first['low'] == 99.0
+    assert first['close'] == 114.5
+    assert first['volume'] == 15.0
+
+    df_5m = cache.get_dataframe('BTCUSDT', '5m')
+    assert len(df_5m) == 6
+    assert list(df_5m['volume']) == [5.0] * 6
+
+
+def test_open_tick_updates_derived_candle():
+    cache = TimeframeCache(base_timeframe='1m', derived_timeframes=['15m'])
+    cache.update_candle('ETHUSDT', minute_candle(0))
+    updates = dict(cache.update_candle('ETHUSDT', minute_candle(1, is_closed=False)))
+
+    assert updates['15m']['is_closed'] is False
+    assert updates['15m']['open'] == 100.0
+    assert updates['15m']['close'] == 101.5
+    assert updates['15m']['volume'] == 2.0
+
+
+def test_missed_bucket_close_is_finalized():
+    cache = TimeframeCache(base_timeframe='1m', derived_timeframes=['5m'])
+    for i in range(4):  # Minute 4 (last of the bucket) never arrives
+        cache.update_candle('SOLUSDT', minute_candle(i))
+
+    updates = cache.update_candle('SOLUSDT', minute_candle(5, is_closed=False))
+    finalized = [c for tf, c in updates if tf == '5m' and c['is_closed']]
+
+    assert len(finalized) == 1
+    assert finalized[0]['timestamp'] == 0
+    assert finalized[0]['volume'] == 4.0
+
+
+def test_timeframe_keys_are_independent():
+    cache = TimeframeCache(base_timeframe='1m', derived_timeframes=['4h'])
+    cache.backfill('BTCUSDT', [{'timestamp': 0, 'open': 1, 'high': 2, 'low': 0.5,
+                                'close': 1.5, 'volume': 10, 'is_closed': True}], '4h')
+
+    assert len(cache.get_dataframe('BTCUSDT', '4h')) == 1
+    assert cache.get_dataframe('BTCUSDT', '1m').empty
+    assert timeframe_to_ms('4h') == 240 * MINUTE
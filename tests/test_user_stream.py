@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from nexus_system.core.shadow_wallet import ShadowWallet
+from nexus_system.uplink.user_stream import BinanceUserStream, BybitUserStream
+
+
+class FakeAdapter:
+    _markets_key = 'BINANCE'
+    _api_key = _api_secret = 'key'
+
+    def __init__(self, positions=(), balance=None, failures=0):
+        self._positions = list(positions)
+        self._balance = balance or {'total': 100.0, 'available': 80.0, 'currency': 'USDT'}
+        self.failures = failures
+        self.rest_calls = 0
+
+    async def get_positions(self, refresh=False, strict=False):
+        self.rest_calls += 1
+        if self.failures:
+            self.failures -= 1
+            if strict:
+                raise ConnectionError("HTTP 503")
+            return []
+        return self._positions
+
+    async def get_account_balance(self, refresh=False, strict=False):
+        self.rest_calls += 1
+        return self._balance
+
+    def _unformat_symbol(self, symbol):
+        return symbol
+
+
+def account_update(symbol, amount, entry, side='BOTH'):
+    return {'e': 'ACCOUNT_UPDATE', 'a': {'m': 'ORDER', 'B': [], 'P': [
+        {'s': symbol, 'pa': str(amount), 'ep': str(entry), 'up': '0', 'ps': side}]}}
+
+
+def test_binance_events_update_wallet_incrementally():
+    async def scenario():
+        wallet = ShadowWallet()
+        stream = BinanceUserStream(FakeAdapter(positions=[
+            {'symbol': 'ETHUSDT', 'side': 'LONG', 'quantity': 1.0, 'entryPrice': 3000.0, 'leverage': 5, 'exchange': 'BINANCE'},
+        ]), wallet, '42')
+        fills = []
+        wallet.add_listener(lambda kind, key: kind == 'fill' and fills.append(key))
+
+        await stream._snapshot()
+        assert [p['symbol'] for p in wallet.get_positions('42', 'BINANCE')] == ['ETHUSDT']
+        assert wallet.get_balance('42', 'BINANCE')['available'] == 80.0
+
+        stream._handle({'e': 'ORDER_TRADE_UPDATE', 'o': {
+            's': 'BTCUSDT', 'S': 'BUY', 'o': 'MARKET', 'X': 'PARTIALLY_FILLED', 'x': 'TRADE', 'i': 7,
+            'p': '0', 'sp': '0', 'q': '0.02', 'z': '0.01', 'L': '60000'}})
+        assert wallet.get_open_orders('42', 'BTCUSDT')[0]['filled'] == 0.01
+        assert fills == ['42:BTCUSDT']
+
+        stream._handle(account_update('BTCUSDT', 0.02, 60000))
+        stream._handle({'e': 'ACCOUNT_CONFIG_UPDATE', 'ac': {'s': 'BTCUSDT', 'l': 10}})
+        btc = wallet.get_position('42', 'BTCUSDT')
+        assert (btc['side'], btc['quantity'], btc['leverage']) == ('LONG', 0.02, 10)
+
+        # Closing one position leaves the other (and other exchanges' positions) alone
+        wallet.update_position('42', 'SOLUSDT', {'symbol': 'SOLUSDT', 'quantity': 3, 'exchange': 'BYBIT'})
+        stream._handle(account_update('ETHUSDT', 0, 0))
+        stream._handle(account_update('SOLUSDT', 0, 0))
+        assert sorted(p['symbol'] for p in wallet.get_positions('42')) == ['BTCUSDT', 'SOLUSDT']
+        assert stream._balance_task is not None  # Available balance is refreshed once per burst
+        stream._balance_task.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_failed_snapshot_retries_and_never_clears_wallet(monkeypatch):
+    async def no_wait(seconds):
+        pass
+
+    async def scenario():
+        monkeypatch.setattr(asyncio, 'sleep', no_wait)
+        wallet = ShadowWallet()
+        wallet.update_position('42', 'ETHUSDT', {'symbol': 'ETHUSDT', 'quantity': 1.0, 'exchange': 'BINANCE'})
+        btc = [{'symbol': 'BTCUSDT', 'side': 'LONG', 'quantity': 0.01, 'entryPrice': 60000.0, 'exchange': 'BINANCE'}]
+
+        # Transient errors are retried before the snapshot is applied
+        stream = BinanceUserStream(FakeAdapter(positions=btc, failures=2), wallet, '42')
+        await stream._snapshot()
+        assert [p['symbol'] for p in wallet.get_positions('42')] == ['BTCUSDT']
+
+        # A snapshot that keeps failing raises and leaves the wallet as it was
+        stream = BinanceUserStream(FakeAdapter(failures=3), wallet, '42')
+        with pytest.raises(ConnectionError):
+            await stream._snapshot()
+        assert [p['symbol'] for p in wallet.get_positions('42')] == ['BTCUSDT']
+        assert not stream.live and stream.stats['snapshots'] == 0
+
+    asyncio.run(scenario())
+
+
+def test_bybit_topics_and_live_reads():
+    wallet = ShadowWallet()
+    adapter = FakeAdapter()
+    stream = BybitUserStream(adapter, wallet, '7')
+
+    stream._handle({'topic': 'position', 'data': [
+        {'category': 'linear', 'symbol': 'BTCUSDT', 'side': 'Sell', 'size': '0.5', 'entryPrice': '61000',
+         'unrealisedPnl': '12.5', 'leverage': '3', 'takeProfit': '58000', 'stopLoss': '0'}]})
+    stream._handle({'topic': 'wallet', 'data': [
+        {'accountType': 'UNIFIED', 'totalEquity': '1500.5', 'totalAvailableBalance': '900', 'coin': []}]})
+    stream._handle({'topic': 'order', 'data': [
+        {'category': 'linear', 'symbol': 'BTCUSDT', 'orderId': 'a1', 'side': 'Buy', 'orderType': 'Limit',
+         'orderStatus': 'Cancelled', 'price': '59000', 'qty': '0.5', 'cumExecQty': '0'}]})
+
+    assert stream.positions() == [{
+        'symbol': 'BTCUSDT', 'side': 'SHORT', 'quantity': 0.5, 'entryPrice': 61000.0, 'unrealizedPnl': 12.5,
+        'leverage': 3, 'takeProfit': 58000.0, 'stopLoss': 0.0, 'exchange': 'BYBIT',
+    }]
+    assert stream.balance() == {'total': 1500.5, 'available': 900.0, 'currency': 'USDT'}
+    assert wallet.get_open_orders('7') == []
+    assert adapter.rest_calls == 0
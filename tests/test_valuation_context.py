@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+import ai_crypto_valuation
+from ai_crypto_valuation import AICryptoValuation
+
+
+class FakeResponse:
+    status = 200
+
+    def __init__(self, url):
+        self.url = url
+
+    async def __aenter__(self):
+        await asyncio.sleep(0.05)
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self, content_type=None):
+        if self.url.endswith('/global'):
+            return {'data': {'fear_greed_index': {'value': 30}, 'markets': 900}}
+        if self.url.endswith('/search/trending'):
+            return {'coins': [{'item': {'id': 'pepe', 'symbol': 'PEPE'}}]}
+        if self.url.endswith('/posts/'):
+            return {'results': [{'title': 'ETF inflows', 'votes': {'ludicrous': 3}}]}
+        return {'market_cap_rank': 1, 'categories': ['Layer 1']}
+
+
+class FakeSession:
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, headers=None, params=None):
+        self.urls.append(url.rsplit('/api/v3', 1)[-1])
+        return FakeResponse(url)
+
+
+def test_sources_fetched_in_parallel_and_global_feeds_shared(monkeypatch):
+    monkeypatch.setattr(ai_crypto_valuation, '_feed_flight', None)
+    monkeypatch.setattr(ai_crypto_valuation, 'CRYPTOPANIC_AVAILABLE', True)
+
+    async def scenario():
+        valuation = AICryptoValuation()
+        valuation.coingecko_available = True
+        session = FakeSession()
+
+        async def get_session():
+            return session
+
+        valuation._get_session = get_session
+
+        started = time.monotonic()
+        contexts = await asyncio.gather(*(
+            valuation.gather_market_context_async(coin, news_limit=5) for coin in ('bitcoin', 'ethereum', 'solana')))
+        assert time.monotonic() - started < 0.2  # Slowest source, not the sum
+
+        btc = contexts[0]
+        assert btc['fear_greed']['value'] == 30 and btc['global_crypto']['markets'] == 900
+        assert btc['trending_coins']['trending_coins'][0]['symbol'] == 'PEPE'
+        assert btc['cryptopanic_news']['market_sentiment'] == 'BULLISH'
+        assert btc['coingecko_metrics']['market_cap_rank'] == 1
+
+        # /global serves both fear/greed and global metrics; global feeds once for all symbols
+        assert sorted(session.urls) == sorted([
+            '/global', '/search/trending', '/posts/', '/coins/bitcoin', '/coins/ethereum', '/coins/solana'])
+
+        # Within the TTL a new symbol only costs its own coin metrics
+        await valuation.gather_market_context_async('ripple', news_limit=5)
+        assert session.urls[6:] == ['/coins/ripple']
+
+    asyncio.run(scenario())
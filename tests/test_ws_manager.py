@@ -0,0 +1,237 @@
+import asyncio
+import json
+
+from nexus_system.uplink.bybit_ws_manager import BybitWSManager
+from nexus_system.uplink.ws_manager import BinanceWSManager
+
+
+class FakeWS:
+    state = 1
+
+    def __init__(self):
+        self.sent = []
+        self.inbox = asyncio.Queue()
+
+    async def send(self, msg):
+        self.sent.append(json.loads(msg))
+
+    async def recv(self):
+        return await self.inbox.get()
+
+    async def close(self):
+        self.state = 3
+
+
+def kline(symbol, close, closed=False, ts=0):
+    return json.dumps({'stream': f'{symbol.lower()}@kline_1m', 'data': {'k': {
+        's': symbol, 't': ts, 'o': close, 'h': close, 'l': close, 'c': close,
+        'v': 1, 'x': closed, 'i': '1m',
+    }}}, separators=(',', ':'))  # Compact, like Binance
+
+
+def make_manager(symbols, cls=BinanceWSManager, **kwargs):
+    manager = cls(symbols, '1m', **kwargs)
+    manager.SUBSCRIBE_PAUSE = 0
+
+    async def open_socket(url):
+        return FakeWS()
+
+    manager._open_socket = open_socket
+    return manager
+
+
+def test_streams_are_sharded_and_resubscribed_live():
+    async def scenario():
+        manager = make_manager([f'C{i}USDT' for i in range(5)], streams_per_connection=2)
+        assert [len(s.streams) for s in manager._shards] == [2, 2, 1]
+        assert manager.build_stream_url(manager._shards[2]).endswith('streams=c4usdt@kline_1m')
+        await manager.connect()
+
+        result = await manager.set_symbols(['C0USDT', 'C2USDT', 'C3USDT', 'C4USDT', 'C5USDT'])
+        assert result == {'added': 1, 'removed': 1}
+        # C1 left shard 0, which had room for C5
+        assert manager._shards[0].ws.sent == [
+            {'method': 'UNSUBSCRIBE', 'params': ['c1usdt@kline_1m'], 'id': 1},
+            {'method': 'SUBSCRIBE', 'params': ['c5usdt@kline_1m'], 'id': 2},
+        ]
+        assert manager.get_status()['symbols'] == 5
+        await manager.close()
+
+    asyncio.run(scenario())
+
+
+def test_slow_consumer_does_not_block_receive_loop():
+    async def scenario():
+        manager = make_manager(['BTCUSDT'], queue_size=3)
+        fast, slow_started = [], asyncio.Event()
+
+        async def on_fast(symbol, candle):
+            fast.append(candle['close'])
+
+        async def on_slow(symbol, candle):
+            slow_started.set()
+            await asyncio.sleep(3600)
+
+        manager.add_callback(on_fast)
+        manager.add_callback(on_slow)
+        await manager.connect()
+        listener = asyncio.create_task(manager.listen())
+
+        ws = manager._shards[0].ws
+        for i in range(10):
+            ws.inbox.put_nowait(kline('BTCUSDT', 100 + i))
+        ws.inbox.put_nowait(kline('BTCUSDT', 200, closed=True))
+        await asyncio.wait_for(slow_started.wait(), 1)
+        for _ in range(100):
+            if manager._shards[0].messages == 11 and fast and fast[-1] == 200:
+                break
+            await asyncio.sleep(0.01)
+
+        assert manager._shards[0].messages == 11
+        assert fast[-1] == 200
+        # The stalled consumer's queue stays bounded and keeps the closed candle
+        slow = manager._consumers[1]
+        assert slow.queue.qsize() == 3 and slow.dropped > 0
+        assert list(slow.queue._queue)[-1][1]['is_closed']
+
+        await manager.close()
+        await listener
+
+    asyncio.run(scenario())
+
+
+def test_overflow_evicts_ticks_and_never_drops_closes():
+    from nexus_system.uplink.ws_manager import _Consumer
+
+    async def noop(symbol, candle):
+        pass
+
+    consumer = _Consumer(noop, maxsize=3)
+    consumer.offer(('A', {'close': 1, 'is_closed': True}))
+    consumer.offer(('A', {'close': 2, 'is_closed': False}))
+    consumer.offer(('B', {'close': 3, 'is_closed': True}))
+    consumer.offer(('A', {'close': 4, 'is_closed': False}))  # Full: tick dropped
+    consumer.offer(('C', {'close': 5, 'is_closed': True}))  # Evicts the queued tick, not a close
+    consumer.offer(('D', {'close': 6, 'is_closed': True}))  # Only closes left: queued past the bound
+
+    queued = [candle['close'] for _, candle in consumer.queue._queue]
+    assert queued == [1, 3, 5, 6]
+    assert consumer.dropped == 2
+
+
+def test_emptied_shard_is_stopped_not_reconnected():
+    async def scenario():
+        manager = make_manager(['C0USDT', 'C1USDT'], streams_per_connection=1)
+        opened = []
+        open_socket = manager._open_socket
+
+        async def counting_open(url):
+            opened.append(url)
+            return await open_socket(url)
+
+        manager._open_socket = counting_open
+        await manager.connect()
+        listener = asyncio.create_task(manager.listen())
+        await asyncio.sleep(0)
+        shard = manager._shards[1]
+        old_ws = shard.ws
+
+        await manager.set_symbols(['C0USDT'])
+        assert shard.task is None and shard.ws is None and old_ws.state == 3
+        await asyncio.sleep(0.05)
+        assert len(opened) == 2  # No reconnect with an empty ?streams=
+
+        # The idle shard is reused (and restarted) when streams come back
+        await manager.set_symbols(['C0USDT', 'C2USDT'])
+        assert shard.streams == ['c2usdt@kline_1m'] and shard.task is not None
+        assert opened[-1].endswith('streams=c2usdt@kline_1m')
+
+        await manager.close()
+        await listener
+
+    asyncio.run(scenario())
+
+
+def test_kline_decoding_and_closed_only_fast_path():
+    import pandas as pd
+    from nexus_system.uplink.price_cache import PriceCache
+    from nexus_system.uplink.ws_codec import decode_binance_kline
+
+    symbol, candle = decode_binance_kline(kline('BTCUSDT', '101.5', closed=True, ts=60000))
+    assert symbol == 'BTCUSDT'
+    assert candle['close'] == 101.5 and candle.get('is_closed') is True
+    assert dict(candle)['timestamp'] == 60000
+    assert decode_binance_kline(kline('BTCUSDT', '101.5')) is not None
+    assert decode_binance_kline(kline('BTCUSDT', '101.5'), closed_only=True) is None
+    assert decode_binance_kline('{"result": null, "id": 1}') is None
+
+    # Records drop into the dict-based caches unchanged
+    cache = PriceCache()
+    cache.update_candle(symbol, candle)
+    assert cache.get_dataframe(symbol)['close'].tolist() == [101.5]
+    assert isinstance(pd.DataFrame([candle]), pd.DataFrame)
+
+
+def test_closed_only_consumers_skip_ticks():
+    async def scenario():
+        manager = make_manager(['BTCUSDT'])
+        closes = []
+
+        async def on_close(symbol, candle):
+            closes.append(candle['close'])
+
+        manager.add_callback(on_close, closed_only=True)
+        for i in range(5):
+            manager._process_message(kline('BTCUSDT', 100 + i))
+        manager._process_message(kline('BTCUSDT', 200, closed=True))
+        assert manager._consumers[0].queue.qsize() == 1
+
+    asyncio.run(scenario())
+
+
+def bybit_kline(ticker, close, confirm=False, start=0):
+    return json.dumps({'topic': f'kline.1.{ticker}', 'type': 'snapshot', 'data': [{
+        'start': start, 'end': start + 59999, 'interval': '1', 'open': close, 'high': close,
+        'low': close, 'close': close, 'volume': '2', 'confirm': confirm, 'timestamp': start,
+    }]}, separators=(',', ':'))
+
+
+def test_bybit_topics_subscribed_on_connect_with_symbol_mapping():
+    async def scenario():
+        symbols = [f'C{i}USDT' for i in range(11)] + ['1000PEPEUSDT']
+        manager = make_manager(symbols, cls=BybitWSManager, symbol_map={'1000PEPEUSDT': 'PEPEUSDT'})
+        received, reconnected = [], []
+
+        async def on_candle(symbol, candle):
+            received.append((symbol, candle['close'], candle['is_closed'], candle['interval']))
+
+        async def on_reconnect(missed, down_since):
+            reconnected.append((missed, down_since))
+
+        manager.add_callback(on_candle)
+        manager.add_reconnect_callback(on_reconnect)
+        await manager.connect()
+
+        # Topics are sent after connecting, at most 10 per request
+        sent = manager._shards[0].ws.sent
+        assert [len(m['args']) for m in sent] == [10, 2]
+        assert sent[1]['args'][-1] == 'kline.1.PEPEUSDT'
+
+        listener = asyncio.create_task(manager.listen())
+        ws = manager._shards[0].ws
+        ws.inbox.put_nowait('{"success":true,"op":"subscribe"}')
+        ws.inbox.put_nowait(bybit_kline('PEPEUSDT', '0.01', confirm=True))
+        for _ in range(100):
+            if received:
+                break
+            await asyncio.sleep(0.01)
+        assert received == [('1000PEPEUSDT', 0.01, True, '1m')]
+
+        manager._notify_reconnect(manager._shards[0], 123.0)
+        await asyncio.sleep(0)
+        assert reconnected == [(symbols, 123.0)]
+
+        await manager.close()
+        await listener
+
+    asyncio.run(scenario())